@@ -0,0 +1,130 @@
+"""Add contact search keys and their trigram indexes.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+The backfill carries its own copy of the key normalisation in
+app/core/search_text.py and app/models/contact.py, so later changes to
+the application code cannot change what this revision writes.
+"""
+
+import re
+import unicodedata
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+_BACKFILL_BATCH = 5_000
+
+_contacts = sa.table(
+    "contacts",
+    sa.column("id"),
+    sa.column("full_name"),
+    sa.column("first_name"),
+    sa.column("last_name"),
+    sa.column("email"),
+    sa.column("company_name"),
+    sa.column("mobile_no"),
+    sa.column("phone"),
+    sa.column("search_text"),
+    sa.column("phone_digits"),
+)
+
+
+def _normalize(*values: str | None) -> str:
+    text = " ".join(v for v in values if v)
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", stripped.casefold()).strip()
+
+
+def _digits(*values: str | None) -> str:
+    return " ".join(d for d in (re.sub(r"\D+", "", v) for v in values if v) if d)
+
+
+def _search_keys(row) -> dict:
+    name = row["full_name"] or " ".join(p for p in (row["first_name"], row["last_name"]) if p)
+    return {
+        "_id": row["id"],
+        "_search_text": _normalize(name, row["email"], row["company_name"]) or None,
+        "_phone_digits": _digits(row["mobile_no"], row["phone"]) or None,
+    }
+
+
+def _backfill() -> None:
+    """Compute the keys in Python, in id order, one batch per UPDATE round."""
+    bind = op.get_bind()
+    last_id = None
+    while True:
+        query = sa.select(
+            _contacts.c.id,
+            _contacts.c.full_name,
+            _contacts.c.first_name,
+            _contacts.c.last_name,
+            _contacts.c.email,
+            _contacts.c.company_name,
+            _contacts.c.mobile_no,
+            _contacts.c.phone,
+        ).order_by(_contacts.c.id).limit(_BACKFILL_BATCH)
+        if last_id is not None:
+            query = query.where(_contacts.c.id > last_id)
+        rows = bind.execute(query).mappings().all()
+        if not rows:
+            return
+        bind.execute(
+            _contacts.update()
+            .where(_contacts.c.id == sa.bindparam("_id"))
+            .values(
+                search_text=sa.bindparam("_search_text"),
+                phone_digits=sa.bindparam("_phone_digits"),
+            ),
+            [_search_keys(row) for row in rows],
+        )
+        last_id = rows[-1]["id"]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column("contacts", sa.Column("search_text", sa.Text, nullable=True))
+    op.add_column("contacts", sa.Column("phone_digits", sa.String(120), nullable=True))
+    _backfill()
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_search_text_trgm",
+            "contacts",
+            ["search_text"],
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_contacts_phone_digits_trgm",
+            "contacts",
+            ["phone_digits"],
+            postgresql_using="gin",
+            postgresql_ops={"phone_digits": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_contacts_tenant_id_search_text",
+            "contacts",
+            ["tenant_id", "search_text"],
+            postgresql_ops={"search_text": "text_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contacts_tenant_id_search_text", table_name="contacts")
+    op.drop_index("ix_contacts_phone_digits_trgm", table_name="contacts")
+    op.drop_index("ix_contacts_search_text_trgm", table_name="contacts")
+    op.drop_column("contacts", "phone_digits")
+    op.drop_column("contacts", "search_text")
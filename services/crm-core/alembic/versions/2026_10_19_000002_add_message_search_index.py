@@ -0,0 +1,54 @@
+"""Add the Portuguese full-text search index on messages.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+
+The expression must match ``_document`` in
+app/services/message_search_service.py exactly.  ``messages`` is created by
+the legacy backend's schema; the upgrade fails if it does not exist yet
+rather than recording a revision without its index.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'crm_portuguese') THEN
+                CREATE TEXT SEARCH CONFIGURATION crm_portuguese (COPY = portuguese);
+                ALTER TEXT SEARCH CONFIGURATION crm_portuguese
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+            END IF;
+        END
+        $$
+        """
+    )
+
+    if op.get_bind().execute(sa.text("SELECT to_regclass('messages')")).scalar() is None:
+        raise RuntimeError(
+            "Table 'messages' does not exist: apply the legacy backend schema "
+            "before upgrading to revision 0004"
+        )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_tenant_id_search ON messages "
+            "USING gin (tenant_id, to_tsvector('crm_portuguese'::regconfig, coalesce(content, '')))"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_messages_tenant_id_search")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS crm_portuguese")
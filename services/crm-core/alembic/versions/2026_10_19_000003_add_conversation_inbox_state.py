@@ -0,0 +1,131 @@
+"""Add the conversation_inbox_state read model and per-user read cursors.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+Both tables reference ``conversations`` and are backfilled from
+``messages``, which the legacy backend's schema creates; the upgrade fails
+if they do not exist yet rather than recording a revision it did not apply.
+From then on app/services/inbox_state_service.py keeps the state current.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table in ("conversations", "messages"):
+        if bind.execute(sa.text(f"SELECT to_regclass('{table}')")).scalar() is None:
+            raise RuntimeError(
+                f"Table {table!r} does not exist: apply the legacy backend schema "
+                "before upgrading to revision 0005"
+            )
+
+    op.create_table(
+        "conversation_inbox_state",
+        sa.Column(
+            "conversation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("conversations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "tenant_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("last_message_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("last_message_preview", sa.String(160), nullable=True),
+        sa.Column("last_message_type", sa.String(20), nullable=True),
+        sa.Column("last_message_direction", sa.String(10), nullable=True),
+        sa.Column("last_sender_name", sa.String(255), nullable=True),
+        sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("unread_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("first_unanswered_inbound_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_inbound_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_table(
+        "conversation_read_cursors",
+        sa.Column(
+            "conversation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("conversations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+
+        sa.Column("last_read_message_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("last_read_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    # Unread / unanswered = inbound messages after the last outbound reply.
+    # The preview rule matches message_preview(): whitespace collapsed, 120 chars.
+    op.execute(
+        """
+        INSERT INTO conversation_inbox_state (
+            conversation_id, tenant_id, last_message_id, last_message_preview,
+            last_message_type, last_message_direction, last_sender_name, last_message_at,
+            unread_count, first_unanswered_inbound_at, last_inbound_at
+        )
+        SELECT
+            last.conversation_id, last.tenant_id, last.id,
+            CASE
+                WHEN length(last.preview) > 120 THEN rtrim(left(last.preview, 119)) || '…'
+                ELSE nullif(last.preview, '')
+            END,
+            last.type, last.direction, last.sender_name, last.timestamp,
+            coalesce(unanswered.n, 0), unanswered.first_at, inbound.last_at
+        FROM (
+            SELECT DISTINCT ON (conversation_id)
+                conversation_id, tenant_id, id, type, direction, sender_name, timestamp,
+                btrim(regexp_replace(content, '\\s+', ' ', 'g')) AS preview
+            FROM messages
+            ORDER BY conversation_id, timestamp DESC, id DESC
+        ) AS last
+        LEFT JOIN LATERAL (
+            SELECT max(timestamp) AS last_at
+            FROM messages
+            WHERE conversation_id = last.conversation_id AND direction = 'INBOUND'
+        ) AS inbound ON true
+        LEFT JOIN LATERAL (
+            SELECT count(*) AS n, min(i.timestamp) AS first_at
+            FROM messages AS i
+            WHERE i.conversation_id = last.conversation_id
+              AND i.direction = 'INBOUND'
+              AND i.timestamp > coalesce(
+                  (
+                      SELECT max(o.timestamp) FROM messages AS o
+                      WHERE o.conversation_id = last.conversation_id AND o.direction = 'OUTBOUND'
+                  ),
+                  '-infinity'
+              )
+        ) AS unanswered ON true
+        ON CONFLICT (conversation_id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS conversation_read_cursors")
+    op.execute("DROP TABLE IF EXISTS conversation_inbox_state")
@@ -0,0 +1,39 @@
+"""Add the per-conversation message counter to conversation_inbox_state.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+
+GET /conversations/{id}/messages reports ``total`` from this counter
+instead of COUNT(*) over the thread.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "conversation_inbox_state",
+        sa.Column("message_count", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE conversation_inbox_state AS s
+        SET message_count = c.n
+        FROM (
+            SELECT conversation_id, count(*) AS n FROM messages GROUP BY conversation_id
+        ) AS c
+        WHERE c.conversation_id = s.conversation_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE conversation_inbox_state DROP COLUMN IF EXISTS message_count")
@@ -28,7 +28,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.activity import ActivityListResponse
 from app.services.activity_service import activity_service
 
@@ -38,7 +38,7 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
 
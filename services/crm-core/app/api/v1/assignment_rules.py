@@ -23,8 +23,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id, require_roles
+from app.core.principal_cache import Principal
 from app.models.assignment import AssignmentRule
-from app.models.user import User
 from app.schemas.assignment_rule import (
     AssignmentRuleCreate,
     AssignmentRuleResponse,
@@ -40,8 +40,8 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
-AdminUser = Annotated[User, Depends(require_roles("ADMIN", "SUPER_ADMIN"))]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+AdminUser = Annotated[Principal, Depends(require_roles("ADMIN", "SUPER_ADMIN"))]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
 
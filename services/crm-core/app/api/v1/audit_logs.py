@@ -20,8 +20,8 @@ from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, get_tenant_id, require_roles
-from app.models.user import User
+from app.core.dependencies import get_current_user, get_read_db, get_tenant_id, require_roles
+from app.core.principal_cache import Principal
 from app.schemas.audit_log import (
     AuditLogListParams,
     AuditLogResponse,
@@ -38,9 +38,10 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
+ReadDB = Annotated[AsyncSession, Depends(get_read_db)]
 
 _ADMIN_ROLES = ("SUPER_ADMIN", "TENANT_ADMIN", "ADMIN")
 
@@ -97,10 +98,10 @@ ListParams = Annotated[AuditLogListParams, Depends(_audit_log_list_params)]
     status_code=status.HTTP_200_OK,
 )
 async def list_audit_logs(
-    db: DB,
+    db: ReadDB,
     tenant_id: TenantId,
     params: ListParams,
-    current_user: User = Depends(require_roles(*_ADMIN_ROLES)),
+    current_user: Principal = Depends(require_roles(*_ADMIN_ROLES)),
 ) -> PaginatedResponse[AuditLogResponse]:
     return await audit_log_service.list_audit_logs(
         db=db,
@@ -128,7 +129,7 @@ async def get_audit_log(
     audit_log_id: uuid.UUID,
     db: DB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles(*_ADMIN_ROLES)),
+    current_user: Principal = Depends(require_roles(*_ADMIN_ROLES)),
 ) -> AuditLogResponse:
     return await audit_log_service.get_audit_log(
         db=db,
@@ -19,11 +19,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.audit import emit_audit_log
 from app.core.exceptions import BadRequestError
+from app.core.principal_cache import Principal
 from app.core.rate_limit import AUTH_RATE_LIMIT, get_client_ip, limiter
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
-from app.models.user import User
 from app.schemas.auth import LoginRequest, LoginResponse, RefreshRequest, RefreshResponse
 from app.schemas.user import ChangePasswordRequest, UserResponse
 from app.services.auth_service import auth_service
@@ -37,7 +37,7 @@ router = APIRouter()
 # ---------------------------------------------------------------------------
 
 DB = Annotated[AsyncSession, Depends(get_db)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 
 
 # ---------------------------------------------------------------------------
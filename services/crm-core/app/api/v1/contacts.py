@@ -32,7 +32,7 @@ from __future__ import annotations
 
 import json
 import uuid
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 
 import structlog
 from fastapi import APIRouter, Depends, Query, Request, status
@@ -42,16 +42,17 @@ from sqlalchemy.orm import selectinload
 
 from app.core.audit import emit_audit_log
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, get_tenant_id, require_roles
+from app.core.dependencies import get_current_user, get_read_db, get_tenant_id, require_roles
 from app.core.exceptions import BadRequestError
+from app.core.principal_cache import Principal
 from app.models.deal import Deal
-from app.models.user import User
 from app.schemas.contact import (
     BulkDeleteRequest,
     BulkDeleteResponse,
     ContactCreate,
     ContactListItem,
     ContactListParams,
+    ContactPage,
     ContactResponse,
     ContactUpdate,
     PaginatedResponse,
@@ -68,9 +69,10 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
+ReadDB = Annotated[AsyncSession, Depends(get_read_db)]
 
 
 # ---------------------------------------------------------------------------
@@ -111,6 +113,7 @@ def _contact_list_params(
     sort_by: str | None = Query(None, alias="sortBy", description="Field to sort by (camelCase or snake_case)"),
     sort_order: str | None = Query(None, alias="sortOrder", description="Sort direction: asc or desc"),
     search: str | None = Query(None, max_length=200),
+    count: Literal["cached", "estimate", "none"] = Query("cached"),
     parsed_filters: dict[str, Any] | None = Depends(_parse_filters),
 ) -> ContactListParams:
     # Resolve page_size: limit alias takes precedence
@@ -130,6 +133,7 @@ def _contact_list_params(
         page_size=effective_page_size,
         order_by=effective_order_by,
         search=search,
+        count=count,
         filters=parsed_filters,
     )
 
@@ -150,13 +154,14 @@ ListParams = Annotated[ContactListParams, Depends(_contact_list_params)]
         "Use `search` for full-text search across first_name, last_name, email, "
         "and company_name. "
         "Use `filters` (JSON dict) to narrow results by any Contact field. "
-        "Use `order_by` for multi-column sorting (comma-separated 'field dir' tokens)."
+        "Use `order_by` for multi-column sorting (comma-separated 'field dir' tokens). "
+        "`count` selects a cached exact, estimated or omitted total_count."
     ),
-    response_model=PaginatedResponse[ContactListItem],
+    response_model=ContactPage,
     status_code=status.HTTP_200_OK,
 )
 async def list_contacts(
-    db: DB,
+    db: ReadDB,
     current_user: CurrentUser,
     tenant_id: TenantId,
     params: ListParams,
@@ -176,7 +181,7 @@ async def list_contacts(
     status_code=status.HTTP_200_OK,
 )
 async def get_contact_stats(
-    db: DB,
+    db: ReadDB,
     current_user: CurrentUser,
     tenant_id: TenantId,
 ) -> dict:
@@ -281,7 +286,7 @@ async def create_contact(
         entity_id=str(contact.id),
         user_id=current_user.id,
         request=request,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -328,7 +333,7 @@ async def update_contact(
     request: Request,
 ) -> ContactResponse:
     old = await contact_service.get_contact(db, tenant_id, contact_id)
-    old_snapshot = ContactResponse.model_validate(old).model_dump(mode="json")
+    old_snapshot = ContactResponse.model_validate(old)
     contact = await contact_service.update_contact(
         db=db,
         tenant_id=tenant_id,
@@ -345,7 +350,7 @@ async def update_contact(
         user_id=current_user.id,
         request=request,
         old_data=old_snapshot,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -371,7 +376,7 @@ async def patch_contact(
     request: Request,
 ) -> ContactResponse:
     old = await contact_service.get_contact(db, tenant_id, contact_id)
-    old_snapshot = ContactResponse.model_validate(old).model_dump(mode="json")
+    old_snapshot = ContactResponse.model_validate(old)
     contact = await contact_service.update_contact(
         db=db,
         tenant_id=tenant_id,
@@ -388,7 +393,7 @@ async def patch_contact(
         user_id=current_user.id,
         request=request,
         old_data=old_snapshot,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -483,7 +488,9 @@ async def delete_contact(
     db: DB,
     tenant_id: TenantId,
     request: Request,
-    current_user: User = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")),
+    current_user: Principal = Depends(
+        require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")
+    ),
 ):
     await contact_service.delete_contact(db, tenant_id, contact_id)
     await emit_audit_log(
@@ -514,7 +521,7 @@ async def delete_contact(
 )
 async def list_contact_deals(
     contact_id: uuid.UUID,
-    db: DB,
+    db: ReadDB,
     current_user: CurrentUser,
     tenant_id: TenantId,
     page: int = Query(1, ge=1),
@@ -583,7 +590,9 @@ async def bulk_delete_contacts(
     db: DB,
     tenant_id: TenantId,
     request: Request,
-    current_user: User = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")),
+    current_user: Principal = Depends(
+        require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")
+    ),
 ) -> BulkDeleteResponse:
     deleted_count = await contact_service.bulk_delete(
         db=db,
@@ -27,7 +27,7 @@ from __future__ import annotations
 
 import json
 import uuid
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 
 import structlog
 from fastapi import APIRouter, Depends, Query, status
@@ -39,17 +39,16 @@ from app.core.dependencies import get_current_user, get_tenant_id, require_roles
 from sqlalchemy import select
 
 from app.core.exceptions import BadRequestError, NotFoundError
+from app.core.principal_cache import Principal
 from app.models.conversation import Conversation
-from app.models.user import User
 from app.schemas.conversation import (
     AssignConversationRequest,
     ConversationCreate,
-    ConversationListItem,
     ConversationListParams,
+    ConversationPage,
     ConversationResponse,
     ConversationStats,
     ConversationUpdate,
-    PaginatedResponse,
 )
 from app.schemas.message import (
     IaLockRequest,
@@ -59,6 +58,7 @@ from app.schemas.message import (
     MessageResponse,
 )
 from app.services.conversation_service import conversation_service
+from app.services.inbox_state_service import inbox_state_service
 from app.services.message_service import message_service
 
 logger = structlog.get_logger()
@@ -69,7 +69,7 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
 
@@ -102,6 +102,11 @@ def _conversation_list_params(
     page_size: int = Query(20, ge=1, le=200),
     # `limit` is a camelCase-style alias accepted alongside page_size
     limit: int | None = Query(None, ge=1, le=200),
+    cursor: str | None = Query(
+        None, max_length=200, description="next_cursor of the previous page"
+    ),
+
+    count: Literal["cached", "estimate", "none"] = Query("cached"),
     order_by: str = Query("last_message_at desc"),
     search: str | None = Query(None, max_length=200),
     status: str | None = Query(None),
@@ -127,6 +132,8 @@ def _conversation_list_params(
     return ConversationListParams(
         page=page,
         page_size=actual_page_size,
+        cursor=cursor,
+        count=count,
         order_by=order_by,
         search=search,
         status=status,
@@ -149,11 +156,15 @@ ListParams = Annotated[ConversationListParams, Depends(_conversation_list_params
 
 
 def _message_list_params(
-    cursor: str | None = Query(None, description="Opaque cursor (last seen message UUID)"),
+    cursor: str | None = Query(
+        None, max_length=200, description="next_cursor / prev_cursor of a previous page"
+    ),
+
+    around: uuid.UUID | None = Query(None, description="Message ID to centre the page on"),
     limit: int = Query(50, ge=1, le=100),
     direction: str | None = Query(None),
 ) -> MessageListParams:
-    return MessageListParams(cursor=cursor, limit=limit, direction=direction)
+    return MessageListParams(cursor=cursor, around=around, limit=limit, direction=direction)
 
 
 MsgListParams = Annotated[MessageListParams, Depends(_message_list_params)]
@@ -172,9 +183,11 @@ MsgListParams = Annotated[MessageListParams, Depends(_message_list_params)]
         "ADMIN roles see all conversations; HEAD sees their hotel_unit; "
         "ATTENDANT sees assigned or same unit; SALES sees opportunity conversations only. "
         "Use `search` for contact name/phone. Use `filters` (JSON dict) for column equality. "
-        "Use `order_by` for sorting (comma-separated 'field dir' tokens)."
+        "Use `order_by` for sorting (comma-separated 'field dir' tokens). "
+        "With the default ordering, pass `next_cursor` back as `cursor` for constant-cost "
+        "deep pages; `count` selects a cached exact, estimated or omitted total_count."
     ),
-    response_model=PaginatedResponse[ConversationListItem],
+    response_model=ConversationPage,
     status_code=status.HTTP_200_OK,
 )
 async def list_conversations(
@@ -182,7 +195,7 @@ async def list_conversations(
     current_user: CurrentUser,
     tenant_id: TenantId,
     params: ListParams,
-) -> PaginatedResponse[ConversationListItem]:
+) -> ConversationPage:
     return await conversation_service.list_conversations(
         db=db,
         tenant_id=tenant_id,
@@ -427,7 +440,8 @@ async def toggle_ia_lock(
     description=(
         "Returns cursor-paginated messages in chronological order (oldest → newest). "
         "Omit `cursor` to get the most recent page. Pass the returned `next_cursor` "
-        "value as `cursor` in the next request to load older messages."
+        "as `cursor` to load older messages, or `prev_cursor` to load newer ones. "
+        "`around` returns the page centred on one message."
     ),
     response_model=MessageCursorResponse,
     status_code=status.HTTP_200_OK,
@@ -569,7 +583,12 @@ async def mark_conversation_read(
         user_id=current_user.id,
         user_hotel_unit=getattr(current_user, "hotel_unit", None),
     )
-    # No-op for now — unread tracking is handled client-side
+    await inbox_state_service.mark_read(
+        db=db,
+        tenant_id=tenant_id,
+        conversation_id=conversation_id,
+        user_id=current_user.id,
+    )
     return {"success": True}
 
 
@@ -588,7 +607,7 @@ async def delete_conversation(
     conversation_id: uuid.UUID,
     db: DB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN")),
+    current_user: Principal = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN")),
 ) -> dict:
     from sqlalchemy import delete as sql_delete
     from app.models.message import Message
@@ -17,9 +17,8 @@ import structlog
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user, get_tenant_id
-from app.models.user import User
+from app.core.dependencies import get_current_user, get_read_db, get_tenant_id
+from app.core.principal_cache import Principal
 from app.schemas.dashboard import DashboardStats
 from app.services.dashboard_service import dashboard_service
 
@@ -31,9 +30,9 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
-DB = Annotated[AsyncSession, Depends(get_db)]
+ReadDB = Annotated[AsyncSession, Depends(get_read_db)]
 
 
 # ---------------------------------------------------------------------------
@@ -54,7 +53,7 @@ DB = Annotated[AsyncSession, Depends(get_db)]
     status_code=status.HTTP_200_OK,
 )
 async def get_dashboard_stats(
-    db: DB,
+    db: ReadDB,
     current_user: CurrentUser,
     tenant_id: TenantId,
 ) -> DashboardStats:
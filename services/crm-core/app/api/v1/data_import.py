@@ -26,7 +26,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.data_import import DataImportMappingRequest, DataImportResponse
 from app.services.data_import_service import SUPPORTED_DOCTYPES, data_import_service
 
@@ -39,7 +39,7 @@ router = APIRouter()
 # ---------------------------------------------------------------------------
 
 DB = Annotated[AsyncSession, Depends(get_db)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 
 
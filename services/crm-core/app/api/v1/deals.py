@@ -23,9 +23,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.audit import emit_audit_log
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, get_tenant_id, require_roles
+from app.core.dependencies import get_current_user, get_read_db, get_tenant_id, require_roles
+from app.core.principal_cache import Principal
 from app.models.assignment import Assignment
-from app.models.user import User
 from app.schemas.deal import (
     AssignRequest,
     BulkDeleteRequest,
@@ -58,8 +58,8 @@ async def list_deals(
     deal_owner_id: uuid.UUID | None = Query(None, description="Filter by deal owner user"),
     organization_id: uuid.UUID | None = Query(None, description="Filter by organization"),
     search: str | None = Query(None, description="Full-text search on name / email / org"),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ):
     """Return deals in list, kanban, or group_by format for the authenticated tenant.
@@ -98,7 +98,7 @@ async def create_deal(
     body: DealCreate,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> DealResponse:
     """Create a new deal record for the authenticated tenant.
@@ -116,7 +116,7 @@ async def create_deal(
         entity_id=str(deal.id),
         user_id=current_user.id,
         request=request,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -135,7 +135,9 @@ async def bulk_delete_deals(
     body: BulkDeleteRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")),
+    current_user: Principal = Depends(
+        require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")
+    ),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> dict:
     """Delete multiple deals in a single request.
@@ -165,7 +167,7 @@ async def bulk_delete_deals(
 async def get_deal(
     deal_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> DealResponse:
     """Retrieve a single deal by ID, including all nested relationships."""
@@ -184,7 +186,7 @@ async def update_deal(
     body: DealUpdate,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> DealResponse:
     """Partially update a deal.
@@ -193,7 +195,7 @@ async def update_deal(
     retain their current database values.
     """
     old = await DealService.get_deal(db, tenant_id, deal_id)
-    old_snapshot = DealResponse.model_validate(old).model_dump(mode="json")
+    old_snapshot = DealResponse.model_validate(old)
     deal = await DealService.update_deal(db, tenant_id, deal_id, body)
     result = DealResponse.model_validate(deal)
     await emit_audit_log(
@@ -205,7 +207,7 @@ async def update_deal(
         user_id=current_user.id,
         request=request,
         old_data=old_snapshot,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -224,7 +226,9 @@ async def delete_deal(
     deal_id: uuid.UUID,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")),
+    current_user: Principal = Depends(
+        require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")
+    ),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ):
     """Permanently delete a single deal."""
@@ -250,7 +254,7 @@ async def mark_deal_won(
     deal_id: uuid.UUID,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> DealResponse:
     """Transition the deal to the tenant's Won pipeline stage.
@@ -268,7 +272,7 @@ async def mark_deal_won(
         entity_id=str(deal_id),
         user_id=current_user.id,
         request=request,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -284,7 +288,7 @@ async def mark_deal_lost(
     body: MarkLostRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> DealResponse:
     """Transition the deal to the tenant's Lost pipeline stage.
@@ -303,7 +307,7 @@ async def mark_deal_lost(
         entity_id=str(deal_id),
         user_id=current_user.id,
         request=request,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -322,7 +326,7 @@ async def assign_deal(
     deal_id: uuid.UUID,
     body: AssignRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> dict:
     """Assign a deal to a team member.
@@ -37,9 +37,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.audit import emit_audit_log
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, get_tenant_id, require_roles
+from app.core.dependencies import get_current_user, get_read_db, get_tenant_id, require_roles
 from app.core.exceptions import BadRequestError
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.lead import (
     AssignmentResponse,
     AssignRequest,
@@ -65,9 +65,10 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
+ReadDB = Annotated[AsyncSession, Depends(get_read_db)]
 
 
 # ---------------------------------------------------------------------------
@@ -141,7 +142,7 @@ ListParams = Annotated[LeadListParams, Depends(_lead_list_params)]
     status_code=status.HTTP_200_OK,
 )
 async def list_leads(
-    db: DB,
+    db: ReadDB,
     current_user: CurrentUser,
     tenant_id: TenantId,
     params: ListParams,
@@ -182,7 +183,7 @@ async def create_lead(
         entity_id=str(lead.id),
         user_id=current_user.id,
         request=request,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -229,7 +230,7 @@ async def update_lead(
     request: Request,
 ) -> LeadResponse:
     old = await lead_service.get_lead(db, tenant_id, lead_id)
-    old_snapshot = LeadResponse.model_validate(old).model_dump(mode="json")
+    old_snapshot = LeadResponse.model_validate(old)
     lead = await lead_service.update_lead(
         db=db,
         tenant_id=tenant_id,
@@ -247,7 +248,7 @@ async def update_lead(
         user_id=current_user.id,
         request=request,
         old_data=old_snapshot,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -267,7 +268,9 @@ async def delete_lead(
     db: DB,
     tenant_id: TenantId,
     request: Request,
-    current_user: User = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")),
+    current_user: Principal = Depends(
+        require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")
+    ),
 ):
     await lead_service.delete_lead(db, tenant_id, lead_id)
     await emit_audit_log(
@@ -319,7 +322,7 @@ async def convert_to_deal(
         entity_id=str(lead_id),
         user_id=current_user.id,
         request=request,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -404,7 +407,9 @@ async def bulk_delete_leads(
     db: DB,
     tenant_id: TenantId,
     request: Request,
-    current_user: User = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")),
+    current_user: Principal = Depends(
+        require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")
+    ),
 ) -> BulkDeleteResponse:
     deleted_count = await lead_service.bulk_delete(
         db=db,
@@ -25,7 +25,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id, require_roles
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.lgpd import (
     ConsentUpdateRequest,
     DataErasureResponse,
@@ -42,8 +42,8 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
-AdminUser = Annotated[User, Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN"))]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+AdminUser = Annotated[Principal, Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN"))]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
 
@@ -121,7 +121,7 @@ async def revoke_consent(
 )
 async def export_contact_data(
     contact_id: uuid.UUID,
-    db: DB,
+    db: DB,  # writes the LGPD_DATA_EXPORT audit row
     current_user: CurrentUser,
     tenant_id: TenantId,
 ) -> DataExportResponse:
@@ -20,14 +20,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id
 from app.core.exceptions import BadRequestError, NotFoundError
+from app.core.principal_cache import Principal
 from app.models.media_file import MediaFile
-from app.models.user import User
 
 logger = structlog.get_logger()
 
 router = APIRouter()
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
 
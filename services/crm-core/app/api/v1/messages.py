@@ -3,13 +3,14 @@
 Endpoints that operate on messages independently of a specific conversation.
 
 Endpoint map:
-  GET  /search      — global message search (ADMIN-only)
+  GET  /search      — full-text message search (role-scoped)
   POST /{id}/read   — mark a message as read (tenant-scoped)
 """
 
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 from typing import Annotated
 
 import structlog
@@ -18,13 +19,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, get_tenant_id, require_roles
+from app.core.dependencies import get_current_user, get_tenant_id
 from app.core.exceptions import NotFoundError
+from app.core.principal_cache import Principal
 from app.models.message import Message
-from app.models.user import User
-from app.schemas.message import MessageCursorResponse, MessageResponse
-from app.schemas.lead import PaginatedResponse
-from app.services.message_service import message_service
+from app.schemas.message import MessageResponse, MessageSearchParams, MessageSearchResponse
+from app.services.message_search_service import message_search_service
 
 logger = structlog.get_logger()
 
@@ -34,77 +34,67 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
 
 
 # ---------------------------------------------------------------------------
-# GET /search  — global message search (ADMIN-only)
+# GET /search  — full-text message search
 # ---------------------------------------------------------------------------
 
 
+def _message_search_params(
+    q: str = Query(
+        ..., min_length=1, max_length=200, description="Search query (web-search syntax)"
+    ),
+    cursor: str | None = Query(
+        None, max_length=300, description="next_cursor of the previous page"
+    ),
+
+    limit: int = Query(20, ge=1, le=50),
+    channel: str | None = Query(None),
+    direction: str | None = Query(None),
+    date_from: datetime | None = Query(None),
+    date_to: datetime | None = Query(None),
+) -> MessageSearchParams:
+    return MessageSearchParams(
+        q=q,
+        cursor=cursor,
+        limit=limit,
+        channel=channel,
+        direction=direction,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+
 @router.get(
     "/search",
-    summary="Global message search",
+    summary="Message search",
     description=(
-        "Full-text search across all messages in the tenant. "
-        "Returns messages whose content matches the query string. "
-        "Restricted to SUPER_ADMIN, TENANT_ADMIN, and ADMIN roles."
+        "Full-text search (Portuguese, accent-insensitive) across the messages the calling "
+        "user may see, with the same role scoping as the conversation list. "
+        "Returns highlighted snippets with conversation and contact context, ordered by "
+        "relevance and then recency. Filter by `channel`, `direction` and "
+        "`date_from`/`date_to`; pass `next_cursor` back as `cursor` for the next page."
     ),
-    response_model=PaginatedResponse[MessageResponse],
+    response_model=MessageSearchResponse,
     status_code=status.HTTP_200_OK,
 )
 async def search_messages(
     db: DB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN", "ADMIN")),
-    q: str = Query(..., min_length=1, max_length=200, description="Search query string"),
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
-) -> PaginatedResponse[MessageResponse]:
-    """Search messages by content substring within the calling user's tenant."""
-    from sqlalchemy import func
-
-    pattern = f"%{q}%"
-
-    base_q = (
-        select(Message)
-        .where(
-            Message.tenant_id == tenant_id,
-            Message.content.ilike(pattern),
-        )
-        .order_by(Message.timestamp.desc())
-    )
-
-    count_q = (
-        select(func.count())
-        .select_from(Message)
-        .where(
-            Message.tenant_id == tenant_id,
-            Message.content.ilike(pattern),
-        )
-    )
-
-    total_result = await db.execute(count_q)
-    total_count: int = total_result.scalar_one()
-
-    offset = (page - 1) * page_size
-    rows_result = await db.execute(base_q.offset(offset).limit(page_size))
-    messages = rows_result.scalars().all()
-
-    logger.info(
-        "message_search",
-        tenant_id=str(tenant_id),
-        query=q,
-        total_count=total_count,
-    )
-
-    return PaginatedResponse[MessageResponse](
-        data=[MessageResponse.model_validate(m) for m in messages],
-        total_count=total_count,
-        page=page,
-        page_size=page_size,
+    current_user: CurrentUser,
+    params: Annotated[MessageSearchParams, Depends(_message_search_params)],
+) -> MessageSearchResponse:
+    return await message_search_service.search_messages(
+        db=db,
+        tenant_id=tenant_id,
+        user_role=current_user.role,
+        user_id=current_user.id,
+        user_hotel_unit=getattr(current_user, "hotel_unit", None),
+        params=params,
     )
 
 
@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.lead import PaginatedResponse
 from app.schemas.notification import (
     MarkReadResponse,
@@ -28,7 +28,7 @@ async def list_notifications(
     page_size: int = 20,
     read: bool | None = None,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> PaginatedResponse[NotificationListItem]:
     params = NotificationListParams(page=page, page_size=page_size, read=read)
@@ -40,7 +40,7 @@ async def list_notifications(
 @router.get("/unread-count", summary="Get unread notification count")
 async def unread_count(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> UnreadCountResponse:
     count = await notification_service.get_unread_count(
@@ -57,7 +57,7 @@ async def unread_count(
 async def mark_read(
     notification_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ):
     await notification_service.mark_read(
@@ -68,7 +68,7 @@ async def mark_read(
 @router.put("/read-all", summary="Mark all notifications as read")
 async def mark_all_read(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> MarkReadResponse:
     count = await notification_service.mark_all_read(
@@ -32,11 +32,11 @@ from sqlalchemy.orm import selectinload
 
 from app.core.audit import emit_audit_log
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, get_tenant_id, require_roles
+from app.core.dependencies import get_current_user, get_read_db, get_tenant_id, require_roles
 from app.core.exceptions import BadRequestError
+from app.core.principal_cache import Principal
 from app.models.contact import Contact
 from app.models.deal import Deal
-from app.models.user import User
 from app.schemas.contact import ContactListItem, PaginatedResponse
 from app.schemas.deal import DealListItem
 from app.schemas.organization import (
@@ -58,9 +58,10 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
+ReadDB = Annotated[AsyncSession, Depends(get_read_db)]
 
 
 # ---------------------------------------------------------------------------
@@ -127,7 +128,7 @@ ListParams = Annotated[OrganizationListParams, Depends(_org_list_params)]
     status_code=status.HTTP_200_OK,
 )
 async def list_organizations(
-    db: DB,
+    db: ReadDB,
     current_user: CurrentUser,
     tenant_id: TenantId,
     params: ListParams,
@@ -171,7 +172,7 @@ async def create_organization(
         entity_id=str(org.id),
         user_id=current_user.id,
         request=request,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -221,7 +222,7 @@ async def update_organization(
     request: Request,
 ) -> OrganizationResponse:
     old = await organization_service.get_organization(db, tenant_id, organization_id)
-    old_snapshot = OrganizationResponse.model_validate(old).model_dump(mode="json")
+    old_snapshot = OrganizationResponse.model_validate(old)
     org = await organization_service.update_organization(
         db=db,
         tenant_id=tenant_id,
@@ -238,7 +239,7 @@ async def update_organization(
         user_id=current_user.id,
         request=request,
         old_data=old_snapshot,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
     return result
 
@@ -257,7 +258,9 @@ async def delete_organization(
     organization_id: uuid.UUID,
     db: DB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")),
+    current_user: Principal = Depends(
+        require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")
+    ),
 ):
     await organization_service.delete_organization(db, tenant_id, organization_id)
 
@@ -279,7 +282,7 @@ async def delete_organization(
 )
 async def list_organization_deals(
     organization_id: uuid.UUID,
-    db: DB,
+    db: ReadDB,
     current_user: CurrentUser,
     tenant_id: TenantId,
     page: int = Query(1, ge=1),
@@ -345,7 +348,7 @@ async def list_organization_deals(
 )
 async def list_organization_contacts(
     organization_id: uuid.UUID,
-    db: DB,
+    db: ReadDB,
     current_user: CurrentUser,
     tenant_id: TenantId,
     page: int = Query(1, ge=1),
@@ -424,7 +427,9 @@ async def bulk_delete_organizations(
     body: BulkDeleteRequest,
     db: DB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")),
+    current_user: Principal = Depends(
+        require_roles("SUPER_ADMIN", "TENANT_ADMIN", "HEAD", "SALES_MANAGER")
+    ),
 ) -> BulkDeleteResponse:
     deleted_count = await organization_service.bulk_delete(
         db=db,
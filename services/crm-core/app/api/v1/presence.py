@@ -0,0 +1,76 @@
+"""FastAPI router for the Presence resource — /api/v1/presence.
+
+All endpoints require a valid Bearer JWT (get_current_user) and resolve the
+calling user's tenant automatically (get_tenant_id — populated by
+get_current_user via request.state).
+
+Endpoint map:
+  GET  /   get_presence   — connected users (online / away) for the tenant
+
+Presence is read from Redis (app/realtime/presence.py) without any database
+query; live changes are pushed to clients as the presence:changed socket event.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Annotated
+
+import structlog
+from fastapi import APIRouter, Depends, Query, status
+
+from app.core.dependencies import get_current_user, get_tenant_id
+from app.core.principal_cache import Principal
+from app.realtime.presence import presence_service
+from app.schemas.presence import PresenceResponse, PresenceUser
+
+logger = structlog.get_logger()
+
+router = APIRouter()
+
+# ---------------------------------------------------------------------------
+# Common dependency aliases
+# ---------------------------------------------------------------------------
+
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
+
+
+# ---------------------------------------------------------------------------
+# GET /  — presence snapshot
+# ---------------------------------------------------------------------------
+
+
+@router.get(
+    "/",
+    summary="List connected users",
+    description=(
+        "Returns every user of the tenant with a live Socket.io connection and "
+        "their status (online or away). Filter by hotel_unit to see which "
+        "attendants of one unit are available."
+    ),
+    response_model=PresenceResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_presence(
+    current_user: CurrentUser,
+    tenant_id: TenantId,
+    hotel_unit: str | None = Query(None, description="Only users of this hotel unit"),
+) -> PresenceResponse:
+    entries = await presence_service.list_present(str(tenant_id), hotel_unit)
+    users = [
+        PresenceUser(
+            user_id=e.user_id,
+            name=e.name,
+            role=e.role,
+            hotel_unit=e.hotel_unit,
+            status=e.status,
+            last_seen=e.last_seen,
+        )
+        for e in sorted(entries, key=lambda e: e.name.lower())
+    ]
+    return PresenceResponse(
+        users=users,
+        online=sum(1 for u in users if u.status == "online"),
+        away=sum(1 for u in users if u.status == "away"),
+    )
@@ -26,7 +26,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id, require_roles
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.lead import PaginatedResponse
 from app.schemas.quick_reply import (
     QuickReplyCreate,
@@ -46,8 +46,8 @@ router = APIRouter()
 # ---------------------------------------------------------------------------
 
 DB = Annotated[AsyncSession, Depends(get_db)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
-AdminUser = Annotated[User, Depends(require_roles("ADMIN", "SUPER_ADMIN", "TENANT_ADMIN"))]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+AdminUser = Annotated[Principal, Depends(require_roles("ADMIN", "SUPER_ADMIN", "TENANT_ADMIN"))]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 
 
@@ -20,9 +20,8 @@ import structlog
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.dependencies import get_tenant_id, require_roles
-from app.models.user import User
+from app.core.dependencies import get_read_db, get_tenant_id, require_roles
+from app.core.principal_cache import Principal
 from app.services.report_service import report_service
 
 logger = structlog.get_logger()
@@ -34,7 +33,7 @@ router = APIRouter()
 # ---------------------------------------------------------------------------
 
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
-DB = Annotated[AsyncSession, Depends(get_db)]
+ReadDB = Annotated[AsyncSession, Depends(get_read_db)]
 
 # Role gate applied to every endpoint in this module.
 _ADMIN_ROLES = ("SUPER_ADMIN", "TENANT_ADMIN", "HEAD")
@@ -57,9 +56,9 @@ _ADMIN_ROLES = ("SUPER_ADMIN", "TENANT_ADMIN", "HEAD")
     status_code=status.HTTP_200_OK,
 )
 async def get_overview(
-    db: DB,
+    db: ReadDB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles(*_ADMIN_ROLES)),
+    current_user: Principal = Depends(require_roles(*_ADMIN_ROLES)),
     period: str = Query("30d", description="Reporting window: 7d | 30d | 90d | 1y"),
 ) -> dict[str, Any]:
     return await report_service.get_overview(
@@ -85,9 +84,9 @@ async def get_overview(
     status_code=status.HTTP_200_OK,
 )
 async def get_attendants_performance(
-    db: DB,
+    db: ReadDB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles(*_ADMIN_ROLES)),
+    current_user: Principal = Depends(require_roles(*_ADMIN_ROLES)),
     period: str = Query("30d", description="Reporting window: 7d | 30d | 90d | 1y"),
 ) -> list[dict[str, Any]]:
     return await report_service.get_attendants_performance(
@@ -113,9 +112,9 @@ async def get_attendants_performance(
     status_code=status.HTTP_200_OK,
 )
 async def get_hourly_volume(
-    db: DB,
+    db: ReadDB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles(*_ADMIN_ROLES)),
+    current_user: Principal = Depends(require_roles(*_ADMIN_ROLES)),
     period: str = Query("30d", description="Reporting window: 7d | 30d | 90d | 1y"),
 ) -> dict[str, Any]:
     return await report_service.get_hourly_volume(
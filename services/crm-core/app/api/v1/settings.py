@@ -13,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id, require_roles
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.settings import (
     LookupCreate,
     LookupItem,
@@ -40,7 +40,7 @@ router = APIRouter()
 async def list_statuses(
     doctype: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> list[StatusItem]:
     statuses = await settings_service.list_statuses(db, tenant_id, doctype)
@@ -56,7 +56,7 @@ async def create_status(
     doctype: str,
     data: StatusCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> StatusItem:
     s = await settings_service.create_status(
@@ -78,7 +78,7 @@ async def update_status(
     status_id: uuid.UUID,
     data: StatusUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> StatusItem:
     update_data = data.model_dump(exclude_none=True)
@@ -97,7 +97,7 @@ async def delete_status(
     doctype: str,
     status_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ):
     await settings_service.delete_status(db, tenant_id, doctype, status_id)
@@ -109,7 +109,7 @@ async def reorder_statuses(
     doctype: str,
     data: StatusReorderRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> list[StatusItem]:
     statuses = await settings_service.reorder_statuses(
@@ -127,7 +127,7 @@ async def reorder_statuses(
 async def list_lookups(
     lookup_type: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> list[LookupItem]:
     items = await settings_service.list_lookups(db, tenant_id, lookup_type)
@@ -143,7 +143,7 @@ async def create_lookup(
     lookup_type: str,
     data: LookupCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> LookupItem:
     item = await settings_service.create_lookup(db, tenant_id, lookup_type, data.name)
@@ -157,7 +157,7 @@ async def update_lookup(
     item_id: uuid.UUID,
     data: LookupCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> LookupItem:
     item = await settings_service.update_lookup(
@@ -176,7 +176,7 @@ async def delete_lookup(
     lookup_type: str,
     item_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ):
     await settings_service.delete_lookup(db, tenant_id, lookup_type, item_id)
@@ -191,7 +191,7 @@ async def delete_lookup(
 @router.get("/territories", summary="List territories")
 async def list_territories(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> list[TerritoryItem]:
     items = await settings_service.list_lookups(db, tenant_id, "territory")
@@ -206,7 +206,7 @@ async def list_territories(
 async def create_territory(
     data: TerritoryCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> TerritoryItem:
     item = await settings_service.create_lookup(
@@ -224,7 +224,7 @@ async def create_territory(
 @router.get("/products", summary="List products")
 async def list_products(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> list[ProductItem]:
     items = await settings_service.list_lookups(db, tenant_id, "product")
@@ -239,7 +239,7 @@ async def list_products(
 async def create_product(
     data: ProductCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> ProductItem:
     item = await settings_service.create_lookup(
@@ -260,7 +260,7 @@ async def update_product(
     product_id: uuid.UUID,
     data: ProductUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> ProductItem:
     update_data = data.model_dump(exclude_none=True)
@@ -279,7 +279,7 @@ async def update_product(
 async def delete_product(
     product_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
+    current_user: Principal = Depends(require_roles("ADMIN", "SUPER_ADMIN")),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ):
     await settings_service.delete_lookup(db, tenant_id, "product", product_id)
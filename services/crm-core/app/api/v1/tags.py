@@ -26,7 +26,7 @@ from fastapi.responses import Response as FastAPIResponse
 from app.core.audit import emit_audit_log
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id, require_roles
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.lead import PaginatedResponse
 from app.schemas.tag import (
     TagCreate,
@@ -45,8 +45,8 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
-AdminUser = Annotated[User, Depends(require_roles("SUPER_ADMIN", "ADMIN", "MANAGER"))]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+AdminUser = Annotated[Principal, Depends(require_roles("SUPER_ADMIN", "ADMIN", "MANAGER"))]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
 
@@ -39,7 +39,7 @@ from app.core.audit import emit_audit_log
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id
 from app.core.exceptions import BadRequestError
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.lead import KanbanResponse, PaginatedResponse
 from app.schemas.task import (
     TaskBulkDeleteRequest,
@@ -60,7 +60,7 @@ router = APIRouter()
 # Common dependency aliases
 # ---------------------------------------------------------------------------
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 DB = Annotated[AsyncSession, Depends(get_db)]
 
@@ -25,7 +25,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.audit import emit_audit_log
 from app.core.database import get_db
 from app.core.dependencies import require_roles
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.tenant_admin import (
     TenantCreate,
     TenantUpdate,
@@ -44,7 +44,7 @@ router = APIRouter()
 DB = Annotated[AsyncSession, Depends(get_db)]
 
 # Every route in this module requires SUPER_ADMIN.
-SuperAdmin = Annotated[User, Depends(require_roles("SUPER_ADMIN"))]
+SuperAdmin = Annotated[Principal, Depends(require_roles("SUPER_ADMIN"))]
 
 
 # ---------------------------------------------------------------------------
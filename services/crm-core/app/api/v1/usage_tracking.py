@@ -19,7 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_tenant_id, require_roles
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.usage_tracking import (
     CurrentUsageResponse,
     PaginatedResponse,
@@ -89,7 +89,7 @@ async def list_usage(
     db: DB,
     tenant_id: TenantId,
     params: ListParams,
-    current_user: User = Depends(require_roles(*_ADMIN_ROLES)),
+    current_user: Principal = Depends(require_roles(*_ADMIN_ROLES)),
 ) -> PaginatedResponse[UsageTrackingResponse]:
     return await usage_tracking_service.list_usage(
         db=db,
@@ -117,7 +117,7 @@ async def list_usage(
 async def get_current_usage(
     db: DB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles(*_ADMIN_ROLES)),
+    current_user: Principal = Depends(require_roles(*_ADMIN_ROLES)),
 ) -> CurrentUsageResponse:
     return await usage_tracking_service.get_current_month(
         db=db,
@@ -24,7 +24,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.audit import emit_audit_log
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id, require_roles
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.user import UserCreate, UserListItem, UserResponse, UserUpdate
 from app.services.user_service import user_service
 
@@ -37,8 +37,8 @@ router = APIRouter()
 # ---------------------------------------------------------------------------
 
 DB = Annotated[AsyncSession, Depends(get_db)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
-AdminUser = Annotated[User, Depends(require_roles("ADMIN", "SUPER_ADMIN", "TENANT_ADMIN"))]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+AdminUser = Annotated[Principal, Depends(require_roles("ADMIN", "SUPER_ADMIN", "TENANT_ADMIN"))]
 TenantId = Annotated[uuid.UUID, Depends(get_tenant_id)]
 
 
@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_tenant_id
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.view_settings import (
     ViewSettingsCreate,
     ViewSettingsResponse,
@@ -24,7 +24,7 @@ router = APIRouter()
 async def list_views(
     doctype: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> list[ViewSettingsResponse]:
     views = await view_service.list_views(db, tenant_id, current_user.id, doctype)
@@ -35,7 +35,7 @@ async def list_views(
 async def create_view(
     data: ViewSettingsCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> ViewSettingsResponse:
     view = await view_service.create_view(db, tenant_id, current_user.id, data)
@@ -47,7 +47,7 @@ async def update_view(
     view_id: uuid.UUID,
     data: ViewSettingsUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ) -> ViewSettingsResponse:
     view = await view_service.update_view(
@@ -64,7 +64,7 @@ async def update_view(
 async def delete_view(
     view_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     tenant_id: uuid.UUID = Depends(get_tenant_id),
 ):
     await view_service.delete_view(db, tenant_id, current_user.id, view_id)
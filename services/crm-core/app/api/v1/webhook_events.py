@@ -22,7 +22,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_tenant_id, require_roles
-from app.models.user import User
+from app.core.principal_cache import Principal
 from app.schemas.webhook_event import (
     PaginatedResponse,
     WebhookEventListParams,
@@ -88,7 +88,7 @@ async def list_webhook_events(
     db: DB,
     tenant_id: TenantId,
     params: ListParams,
-    current_user: User = Depends(require_roles(*_ADMIN_ROLES)),
+    current_user: Principal = Depends(require_roles(*_ADMIN_ROLES)),
 ) -> PaginatedResponse[WebhookEventResponse]:
     return await webhook_event_service.list_events(
         db=db,
@@ -116,7 +116,7 @@ async def get_webhook_event(
     event_id: uuid.UUID,
     db: DB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles(*_ADMIN_ROLES)),
+    current_user: Principal = Depends(require_roles(*_ADMIN_ROLES)),
 ) -> WebhookEventResponse:
     return await webhook_event_service.get_event(
         db=db,
@@ -145,7 +145,7 @@ async def replay_webhook_event(
     event_id: uuid.UUID,
     db: DB,
     tenant_id: TenantId,
-    current_user: User = Depends(require_roles(*_ADMIN_ROLES)),
+    current_user: Principal = Depends(require_roles(*_ADMIN_ROLES)),
 ) -> WebhookEventResponse:
     return await webhook_event_service.replay_event(
         db=db,
@@ -28,12 +28,13 @@ from app.channels.base import (
     QuickReplyPayload,
     SendResult,
 )
+from app.core.config import settings
 from app.core.exceptions import InternalServerError
 
 logger = structlog.get_logger()
 
 GRAPH_API_VERSION = "v21.0"
-GRAPH_API_BASE = f"https://graph.facebook.com/{GRAPH_API_VERSION}"
+GRAPH_API_BASE = f"{settings.META_GRAPH_API_URL}/{GRAPH_API_VERSION}"
 MESSAGES_ENDPOINT = f"{GRAPH_API_BASE}/me/messages"
 
 
@@ -0,0 +1,401 @@
+"""Outbound media cache for the WhatsApp Cloud API.
+
+Sending ``{"link": url}`` makes Meta fetch the URL again for every message,
+so a carousel of hotel room photos sent to 500 guests costs 500 x N remote
+fetches. Those fetches add seconds of latency and sometimes time out.
+This module uploads a URL's content **once per phone_number_id** to
+``POST /{phone_number_id}/media``. Later sends reference the returned
+``media_id`` instead.
+
+Keys:
+  - content  : (sha256(content), phone_number_id) -> media_id
+               TTL ``WHATSAPP_MEDIA_CACHE_TTL_DAYS`` (default 25 days), which
+               stays safely inside Meta's 30-day retention of uploaded media.
+  - url      : (sha256(url), phone_number_id) -> content hash
+               Short TTL (6h) so an image replaced behind the same URL is
+               picked up without a restart.
+
+Both maps live in-process (bounded dicts, same pattern as the n8n channel
+cache). They are mirrored to Redis so every API/worker process shares one
+upload. Redis is best-effort: on any error the cache keeps working in-process
+and skips Redis for a short cooldown.
+
+Concurrent sends of the same URL are collapsed into a single download and
+upload (single-flight), so a burst of carousel sends costs one upload.
+
+Every failure (download, oversized file, upload error) returns ``None``; the
+caller falls back to ``{"link": url}``, so behaviour is never worse than
+before.  Waiters on a leader that fails or is cancelled get ``None`` too.
+
+Downloads:
+  - Only ``WHATSAPP_MEDIA_ALLOWED_SCHEMES`` URLs on
+    ``WHATSAPP_MEDIA_ALLOWED_HOSTS`` are fetched.  With no hosts configured,
+    a host must resolve to public addresses only, so a caller-supplied URL
+    cannot reach internal services.  Redirects are followed by hand and
+    checked the same way.
+  - In that public-only mode the download connects to the address that was
+    checked.  The URL carries the IP, and the Host header and TLS SNI carry
+    the name, so certificates are still verified against it.  A second DNS
+    answer (DNS rebinding) therefore cannot send the request elsewhere.
+  - The body is streamed and abandoned as soon as it exceeds the upload
+    limit for its media type.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import ipaddress
+import time
+from typing import Any
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+import httpx
+import structlog
+
+from app.channels._http import retry_request
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+GRAPH_API_VERSION = "v21.0"
+
+# Meta upload limits per media type (bytes) — larger files are sent as links
+_MAX_UPLOAD_BYTES: dict[str, int] = {
+    "image": 5 * 1024 * 1024,
+    "video": 16 * 1024 * 1024,
+    "audio": 16 * 1024 * 1024,
+    "document": 100 * 1024 * 1024,
+}
+
+_DEFAULT_MIME: dict[str, str] = {
+    "image": "image/jpeg",
+    "video": "video/mp4",
+    "audio": "audio/mpeg",
+    "document": "application/pdf",
+}
+
+_URL_TTL = 6 * 60 * 60.0  # seconds
+_CACHE_MAX_SIZE = 10_000  # prevent unbounded memory growth
+_REDIS_COOLDOWN = 60.0  # seconds to skip Redis after an error
+_REDIS_PREFIX = "wa_media"
+_MAX_REDIRECTS = 3
+
+
+class _OversizedError(Exception):
+    """The download exceeded the upload limit for its media type."""
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _host_allowed(host: str) -> bool:
+    for allowed in settings.WHATSAPP_MEDIA_ALLOWED_HOSTS:
+        allowed = allowed.lower()
+        if host == allowed or (allowed.startswith(".") and host.endswith(allowed)):
+            return True
+    return False
+
+
+async def _check_url(url: str) -> tuple[bool, str | None]:
+    """Return (allowed, address to connect to) for *url*.
+
+    Scheme and host allowlist; the host is then trusted by name and the
+    address is None.  Without a host list the host must resolve to public
+    addresses only, and the first of them is returned for pinning.
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if parts.scheme not in settings.WHATSAPP_MEDIA_ALLOWED_SCHEMES or not host:
+        return False, None
+    if settings.WHATSAPP_MEDIA_ALLOWED_HOSTS:
+        return _host_allowed(host), None
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, parts.port or 443)
+    except OSError:
+        return False, None
+    addresses = [info[4][0] for info in infos]
+    if not addresses or not all(ipaddress.ip_address(a).is_global for a in addresses):
+        return False, None
+    return True, addresses[0]
+
+
+def _pinned(url: str, address: str) -> tuple[str, dict[str, str], dict[str, str]]:
+    """Return (url, headers, extensions) that reach *address* but name the URL's host."""
+    parts = urlsplit(url)
+    ip = f"[{address}]" if ":" in address else address
+    netloc = f"{ip}:{parts.port}" if parts.port else ip
+    host = parts.netloc.rpartition("@")[2]
+    return (
+        urlunsplit(parts._replace(netloc=netloc)),
+        {"Host": host},
+        {"sni_hostname": parts.hostname or ""},
+    )
+
+
+class OutboundMediaCache:
+    """Upload-once cache mapping media URLs to WhatsApp ``media_id`` values."""
+
+    def __init__(
+        self,
+        *,
+        redis_url: str | None = None,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        self._redis_url = redis_url
+        self._redis: Any = None
+        self._redis_disabled_until = 0.0
+        self._ttl = ttl_seconds or settings.WHATSAPP_MEDIA_CACHE_TTL_DAYS * 86400.0
+        self._by_content: dict[tuple[str, str], tuple[str, float]] = {}
+        self._by_url: dict[tuple[str, str], tuple[str, float]] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Future[str | None]] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get_media_id(
+        self,
+        *,
+        url: str,
+        media_type: str,
+        phone_number_id: str,
+        access_token: str,
+        client: httpx.AsyncClient | None = None,
+    ) -> str | None:
+        """Return a reusable media_id for *url*, uploading it if needed.
+
+        Returns None when the media cannot be uploaded; the caller should then
+        send ``{"link": url}`` as before.
+        """
+        if not settings.WHATSAPP_MEDIA_CACHE_ENABLED or media_type not in _MAX_UPLOAD_BYTES:
+            return None
+
+        url_key = (_sha256(url.encode()), phone_number_id)
+        content_hash = await self._lookup(self._by_url, url_key, "url")
+        if content_hash:
+            content_key = (content_hash, phone_number_id)
+            media_id = await self._lookup(self._by_content, content_key, "content")
+            if media_id:
+                return media_id
+
+        # Single-flight: one download/upload per (url, phone_number_id)
+        pending = self._inflight.get(url_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[str | None] = asyncio.get_running_loop().create_future()
+        self._inflight[url_key] = future
+        media_id = None
+        try:
+            media_id = await self._resolve(
+                url=url,
+                url_key=url_key,
+                media_type=media_type,
+                phone_number_id=phone_number_id,
+                access_token=access_token,
+                client=client,
+            )
+        except Exception as exc:
+            logger.warning(
+                "media_cache_resolve_failed",
+                phone_number_id=phone_number_id,
+                media_type=media_type,
+                error=str(exc),
+            )
+        finally:
+            # Also on cancellation, so waiters fall back instead of hanging
+            self._inflight.pop(url_key, None)
+            if not future.done():
+                future.set_result(media_id)
+        return media_id
+
+    def clear(self) -> None:
+        """Drop the in-process entries (Redis entries expire on their own)."""
+        self._by_content.clear()
+        self._by_url.clear()
+
+    # ------------------------------------------------------------------
+    # Download + upload
+    # ------------------------------------------------------------------
+
+    async def _resolve(
+        self,
+        *,
+        url: str,
+        url_key: tuple[str, str],
+        media_type: str,
+        phone_number_id: str,
+        access_token: str,
+        client: httpx.AsyncClient | None,
+    ) -> str | None:
+        if client is None:
+            async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as own:
+                return await self._resolve(
+                    url=url,
+                    url_key=url_key,
+                    media_type=media_type,
+                    phone_number_id=phone_number_id,
+                    access_token=access_token,
+                    client=own,
+                )
+
+        try:
+            downloaded = await self._download(client, url, _MAX_UPLOAD_BYTES[media_type])
+        except _OversizedError:
+            logger.info(
+                "media_cache_skip_oversized", phone_number_id=phone_number_id, media_type=media_type
+            )
+            return None
+        if downloaded is None:
+            logger.warning(
+                "media_cache_url_not_allowed",
+                phone_number_id=phone_number_id,
+                host=urlsplit(url).hostname,
+            )
+            return None
+        content, content_type = downloaded
+
+        content_hash = _sha256(content)
+        await self._store(self._by_url, url_key, content_hash, _URL_TTL, "url")
+
+        content_key = (content_hash, phone_number_id)
+        media_id = await self._lookup(self._by_content, content_key, "content")
+        if media_id:
+            return media_id
+
+        mime_type = content_type.split(";")[0].strip()
+        if not mime_type or mime_type == "application/octet-stream":
+            mime_type = _DEFAULT_MIME[media_type]
+
+        upload = await retry_request(
+            client,
+            "POST",
+            f"{settings.META_GRAPH_API_URL}/{GRAPH_API_VERSION}/{phone_number_id}/media",
+            headers={"Authorization": f"Bearer {access_token}"},
+            data={"messaging_product": "whatsapp", "type": mime_type},
+            files={"file": ("upload", content, mime_type)},
+            log_prefix="WhatsAppMedia",
+        )
+        media_id = upload.json().get("id")
+        if not media_id:
+            return None
+
+        await self._store(self._by_content, content_key, media_id, self._ttl, "content")
+        logger.info(
+            "media_cache_uploaded",
+            phone_number_id=phone_number_id,
+            media_type=media_type,
+            size=len(content),
+            media_id=media_id,
+        )
+        return media_id
+
+    @staticmethod
+    async def _download(
+        client: httpx.AsyncClient, url: str, limit: int
+    ) -> tuple[bytes, str] | None:
+        """Fetch *url* up to *limit* bytes; None if it (or a redirect) is not allowed."""
+        for _ in range(_MAX_REDIRECTS + 1):
+            allowed, address = await _check_url(url)
+            if not allowed:
+                return None
+            target, headers, extensions = url, {}, {}
+            if address is not None:
+                target, headers, extensions = _pinned(url, address)
+            async with client.stream(
+                "GET", target, headers=headers, extensions=extensions, follow_redirects=False
+            ) as response:
+
+                if response.is_redirect:
+                    url = urljoin(url, response.headers["location"])
+                    continue
+                response.raise_for_status()
+                if int(response.headers.get("content-length") or 0) > limit:
+                    raise _OversizedError
+                chunks: list[bytes] = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > limit:
+                        raise _OversizedError
+                    chunks.append(chunk)
+                return b"".join(chunks), response.headers.get("content-type", "")
+        return None
+
+    # ------------------------------------------------------------------
+    # Two-level storage (in-process dict + best-effort Redis)
+    # ------------------------------------------------------------------
+
+    async def _lookup(
+        self,
+        local: dict[tuple[str, str], tuple[str, float]],
+        key: tuple[str, str],
+        namespace: str,
+    ) -> str | None:
+        cached = local.get(key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            redis_key = f"{_REDIS_PREFIX}:{namespace}:{key[1]}:{key[0]}"
+            value, ttl = await asyncio.gather(redis.get(redis_key), redis.ttl(redis_key))
+        except Exception as exc:
+            self._disable_redis(exc)
+            return None
+        if value is None or ttl <= 0:
+            return None
+        value = value.decode() if isinstance(value, bytes) else value
+        self._remember(local, key, value, float(ttl))
+        return value
+
+    async def _store(
+        self,
+        local: dict[tuple[str, str], tuple[str, float]],
+        key: tuple[str, str],
+        value: str,
+        ttl: float,
+        namespace: str,
+    ) -> None:
+        self._remember(local, key, value, ttl)
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(f"{_REDIS_PREFIX}:{namespace}:{key[1]}:{key[0]}", value, ex=int(ttl))
+        except Exception as exc:
+            self._disable_redis(exc)
+
+    @staticmethod
+    def _remember(
+        local: dict[tuple[str, str], tuple[str, float]],
+        key: tuple[str, str],
+        value: str,
+        ttl: float,
+    ) -> None:
+        if len(local) >= _CACHE_MAX_SIZE:
+            local.clear()
+        local[key] = (value, time.monotonic() + ttl)
+
+    def _get_redis(self) -> Any:
+        if not self._redis_url or time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url, socket_timeout=1.0)
+        return self._redis
+
+    def _disable_redis(self, exc: Exception) -> None:
+        logger.warning(
+            "media_cache_redis_unavailable", error=str(exc), cooldown=_REDIS_COOLDOWN
+        )
+        self._redis_disabled_until = time.monotonic() + _REDIS_COOLDOWN
+
+
+# Shared across all WhatsAppAdapter instances in this process
+media_cache = OutboundMediaCache(redis_url=settings.REDIS_URL)
@@ -1,7 +1,8 @@
 """Channel router — factory and unified dispatch layer.
 
 get_adapter(channel, tenant) resolves the correct adapter for a given
-channel string and Tenant ORM instance, handling token decryption,
+channel string and Tenant ORM instance (or the n8n TenantSnapshot, which
+exposes the same attributes), handling token decryption,
 env-var fallback, and raising BadRequestError for missing config.
 
 channel_router is a convenience singleton that exposes high-level send
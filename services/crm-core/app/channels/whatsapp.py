@@ -12,10 +12,17 @@ Limits enforced (Meta policy):
   - List rows: max 24 chars title, 72 chars description, 10 items total
   - List button text: max 20 chars
   - Carousel: implemented as sequential interactive-button messages (one per card)
+  - Carousel template: native ``carousel`` component, max 10 cards
+
+Outbound media (send_media, carousel headers) is uploaded once per
+phone_number_id through ``media_cache`` and referenced by media_id; the
+public URL is only used as a fallback when the upload is not possible.
 """
 
 from __future__ import annotations
 
+import asyncio
+
 import structlog
 
 from app.channels._http import build_client, mask_token, retry_request
@@ -26,12 +33,14 @@ from app.channels.base import (
     ListSection,
     SendResult,
 )
+from app.channels.media_cache import media_cache
+from app.core.config import settings
 from app.core.exceptions import BadRequestError, InternalServerError
 
 logger = structlog.get_logger()
 
 GRAPH_API_VERSION = "v21.0"
-GRAPH_API_BASE = f"https://graph.facebook.com/{GRAPH_API_VERSION}"
+GRAPH_API_BASE = f"{settings.META_GRAPH_API_URL}/{GRAPH_API_VERSION}"
 
 
 class WhatsAppAdapter(ChannelAdapter):
@@ -76,6 +85,16 @@ class WhatsAppAdapter(ChannelAdapter):
             )
             return response.json()
 
+    async def _media_object(self, media_type: str, url: str) -> dict:
+        """Return ``{"id": media_id}`` for a cached upload, else ``{"link": url}``."""
+        media_id = await media_cache.get_media_id(
+            url=url,
+            media_type=media_type,
+            phone_number_id=self._phone_number_id,
+            access_token=self._access_token,
+        )
+        return {"id": media_id} if media_id else {"link": url}
+
     @staticmethod
     def _extract_message_id(data: dict) -> str:
         messages = data.get("messages") or []
@@ -134,7 +153,7 @@ class WhatsAppAdapter(ChannelAdapter):
         if media_type not in allowed_types:
             raise BadRequestError(f"Unsupported media type for WhatsApp: {media_type!r}")
 
-        media_payload: dict = {"link": media_url}
+        media_payload: dict = await self._media_object(media_type, media_url)
         if caption and media_type in {"image", "video", "document"}:
             media_payload["caption"] = caption
 
@@ -373,7 +392,7 @@ class WhatsAppAdapter(ChannelAdapter):
             if image_url:
                 interactive["header"] = {
                     "type": "image",
-                    "image": {"link": image_url},
+                    "image": await self._media_object("image", image_url),
                 }
 
             payload = {
@@ -403,6 +422,92 @@ class WhatsAppAdapter(ChannelAdapter):
 
         return results
 
+    async def send_carousel_template(
+        self,
+        recipient_id: str,
+        template_name: str,
+        cards: list[dict],
+        language: str = "pt_BR",
+        **kwargs,
+    ) -> SendResult:
+        """Send a pre-approved carousel template (native ``carousel`` component).
+
+        Each card is a dict with:
+          - imageUrl (str | None): header image (uploaded once, sent by media_id)
+          - bodyParams (list[str] | None): values for the card body {{n}} vars
+          - buttonPayloads (list[str]): one payload per quick_reply button
+        """
+        if len(cards) > 10:
+            raise BadRequestError("Maximo de 10 cards no carousel")
+
+        # Header media for all cards is resolved concurrently; once cached this
+        # is a dict lookup and the send is a single POST.
+        image_urls = [card.get("imageUrl") for card in cards]
+        headers = await asyncio.gather(
+            *(self._media_object("image", url) for url in image_urls if url)
+        )
+        header_iter = iter(headers)
+
+        carousel_cards: list[dict] = []
+        for index, card in enumerate(cards):
+            components: list[dict] = []
+            if card.get("imageUrl"):
+                components.append(
+                    {
+                        "type": "header",
+                        "parameters": [{"type": "image", "image": next(header_iter)}],
+                    }
+                )
+            body_params = card.get("bodyParams") or []
+            if body_params:
+                components.append(
+                    {
+                        "type": "body",
+                        "parameters": [{"type": "text", "text": p} for p in body_params],
+                    }
+                )
+            for btn_index, payload in enumerate(card.get("buttonPayloads") or []):
+                components.append(
+                    {
+                        "type": "button",
+                        "sub_type": "quick_reply",
+                        "index": btn_index,
+                        "parameters": [{"type": "payload", "payload": payload}],
+                    }
+                )
+            carousel_cards.append({"card_index": index, "components": components})
+
+        payload = {
+            "messaging_product": "whatsapp",
+            "to": recipient_id,
+            "type": "template",
+            "template": {
+                "name": template_name,
+                "language": {"code": language},
+                "components": [{"type": "carousel", "cards": carousel_cards}],
+            },
+        }
+        try:
+            data = await self._post(payload)
+            external_id = self._extract_message_id(data)
+            self._log.info(
+                "[WHATSAPP SEND] send_carousel_template OK",
+                recipient_masked=recipient_id[:6] + "***" if len(recipient_id) > 6 else "***",
+                template_name=template_name,
+                cards_count=len(cards),
+                media_ids=sum(1 for h in headers if "id" in h),
+                external_message_id=external_id,
+            )
+            return SendResult(external_message_id=external_id, success=True)
+        except Exception as exc:
+            self._log.error(
+                "[WHATSAPP SEND] send_carousel_template FAILED",
+                recipient_masked=recipient_id[:6] + "***" if len(recipient_id) > 6 else "***",
+                template_name=template_name,
+                error=str(exc),
+            )
+            raise InternalServerError(f"Falha ao enviar carousel template WhatsApp: {exc}") from exc
+
     async def mark_as_read(self, message_id: str, **kwargs) -> bool:
         """Mark an inbound message as read (best-effort — never raises)."""
         payload = {
@@ -0,0 +1,92 @@
+"""Run cache invalidations only after the surrounding transaction commits.
+
+Problem:
+  Services flush, then invalidate a cache (principal_cache, conversation
+  ACLs, the n8n tenant cache), but get_db commits at the end of the request.
+  A reader that lands between the flush and the commit still sees the old
+  row and caches it again, so the stale value outlives the invalidation by
+  a full TTL.
+
+Solution:
+  ``after_commit(db, fn, *args)`` queues ``fn(*args)`` on the session.  A
+  Session ``after_commit`` listener schedules the queue as tasks once the
+  outermost transaction has committed; a rollback discards it.
+  ``wait_after_commit(db)`` awaits those tasks — get_db calls it before the
+  response is sent, and callers that commit themselves (workers, background
+  tasks) may call it too.  Callback errors are logged, never raised: the
+  data is already committed.
+
+  Sessions that never commit (get_read_db) use ``run_soon(db, fn, *args)``,
+  which starts the task at once; get_read_db awaits it the same way.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = structlog.get_logger()
+
+_PENDING = "after_commit_callbacks"
+_TASKS = "after_commit_tasks"
+
+# Hold task references so they are not garbage-collected mid-flight
+_background: set[asyncio.Task] = set()
+
+
+def after_commit(db: Any, fn: Callable[..., Any], *args: Any) -> None:
+    """Call ``fn(*args)`` (sync or async) once *db*'s transaction has committed."""
+    db.info.setdefault(_PENDING, []).append((fn, args))
+
+
+async def _guarded(fn: Callable[..., Any], args: tuple) -> None:
+    try:
+        result = fn(*args)
+        if inspect.isawaitable(result):
+            await result
+    except Exception as exc:
+        logger.warning(
+            "after_commit_callback_failed",
+            callback=getattr(fn, "__name__", repr(fn)),
+            error=str(exc),
+        )
+
+
+def _start(info: dict, fn: Callable[..., Any], args: tuple) -> None:
+    task = asyncio.get_running_loop().create_task(_guarded(fn, args))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    info.setdefault(_TASKS, []).append(task)
+
+
+def run_soon(db: Any, fn: Callable[..., Any], *args: Any) -> None:
+    """Call ``fn(*args)`` now, in a task that ``wait_after_commit(db)`` awaits."""
+    _start(db.info, fn, args)
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule(session: Session) -> None:
+    callbacks = session.info.pop(_PENDING, None)
+    if not callbacks:
+        return
+    for fn, args in callbacks:
+        _start(session.info, fn, args)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+async def wait_after_commit(db: Any) -> None:
+    """Await the callbacks scheduled by *db*'s last commit (or ``run_soon``)."""
+
+    tasks = db.info.pop(_TASKS, None)
+    if tasks:
+        await asyncio.gather(*tasks)
@@ -10,18 +10,17 @@ Usage in route handlers:
         db=db, tenant_id=tenant_id, action="CONTACT_CREATED",
         entity="Contact", entity_id=str(result.id),
         user_id=current_user.id, request=request,
-        new_data=result.model_dump(mode="json"),
+        new_data=result,
     )
 
     # Update (snapshot before the call)
-    old = await contact_service.get_contact(...)
-    old_snapshot = old.model_dump(mode="json")
+    old_snapshot = await contact_service.get_contact(...)
     result = await contact_service.update_contact(...)
     await emit_audit_log(
         db=db, tenant_id=tenant_id, action="CONTACT_UPDATED",
         entity="Contact", entity_id=str(contact_id),
         user_id=current_user.id, request=request,
-        old_data=old_snapshot, new_data=result.model_dump(mode="json"),
+        old_data=old_snapshot, new_data=result,
     )
 
     # Delete
@@ -36,10 +35,13 @@ Design decisions:
   - emit_audit_log is a coroutine but is fire-and-forget in practice: all errors
     are already caught silently by AuditLogService.log(), so no try/catch is needed
     here. If the inner log() fails it emits a structlog ERROR and returns None.
+  - The row is written by the background audit writer after the request
+    commits (app/core/audit_writer.py), so pass response models as-is: the
+    writer dumps them, stringifies UUIDs and reduces old/new to a diff.
+    An old snapshot must still be a model or dict built *before* the
+    mutation.
   - IP extraction prefers X-Forwarded-For (typical behind a reverse proxy) and
     falls back to request.client.host.
-  - UUID values in old_data / new_data dicts are serialised to str so that the
-    JSON column in PostgreSQL accepts them without a custom encoder.
   - snapshot_model is a utility for converting SQLAlchemy ORM instances to a
     plain dict suitable for old_data / new_data fields.
 """
@@ -51,6 +53,7 @@ from typing import Any
 
 import structlog
 from fastapi import Request
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.audit_log_service import audit_log_service
@@ -81,30 +84,6 @@ def _extract_ip(request: Request | None) -> str | None:
     return None
 
 
-# ---------------------------------------------------------------------------
-# UUID serialisation
-# ---------------------------------------------------------------------------
-
-
-def _serialize_uuids(data: dict[str, Any] | None) -> dict[str, Any] | None:
-    """Return a copy of *data* with all uuid.UUID values converted to str.
-
-    Operates only on the top level — nested dicts/lists are left as-is
-    because Pydantic's model_dump(mode="json") already serialises nested UUIDs
-    when called correctly.  This guard handles cases where a raw SQLAlchemy
-    attribute dict is passed instead.
-    """
-    if data is None:
-        return None
-    result: dict[str, Any] = {}
-    for key, value in data.items():
-        if isinstance(value, uuid.UUID):
-            result[key] = str(value)
-        else:
-            result[key] = value
-    return result
-
-
 # ---------------------------------------------------------------------------
 # Model snapshot helper
 # ---------------------------------------------------------------------------
@@ -156,30 +135,31 @@ async def emit_audit_log(
     entity: str,
     entity_id: str | None = None,
     user_id: uuid.UUID | None = None,
-    old_data: dict[str, Any] | None = None,
-    new_data: dict[str, Any] | None = None,
+    old_data: dict[str, Any] | BaseModel | None = None,
+    new_data: dict[str, Any] | BaseModel | None = None,
     request: Request | None = None,
 ) -> None:
     """Emit a single audit log entry for a CUD operation.
 
     This is a thin wrapper around ``audit_log_service.log()`` that:
       - Extracts the caller IP from the FastAPI Request object.
-      - Serialises any bare uuid.UUID values in old_data / new_data to str.
-      - Delegates all error handling to AuditLogService (fire-and-forget).
+      - Delegates serialisation and the write to AuditLogService / the
+        audit writer, and all error handling to AuditLogService.
 
     This coroutine itself never raises — any exception inside log() is caught
     and logged at ERROR level by AuditLogService.
 
     Args:
         db: The current async SQLAlchemy session (must be the same session as
-            the surrounding request so it shares the transaction).
+            the surrounding request: the entry is written only if it commits).
         tenant_id: The tenant scoping this audit entry.
         action: A string constant describing the operation, e.g. "CONTACT_CREATED".
         entity: The entity type name, e.g. "Contact".
         entity_id: The string PK of the entity (UUID as str is fine).
         user_id: The ID of the user who performed the action.  None for
             unauthenticated actions (e.g. LOGIN_FAILED).
-        old_data: Snapshot of the entity state BEFORE the mutation (update/delete).
+        old_data: Snapshot of the entity state BEFORE the mutation (update/delete),
+            as a dict or pydantic model.
         new_data: Snapshot of the entity state AFTER the mutation (create/update).
         request: The FastAPI Request instance — used to extract the caller IP.
     """
@@ -190,7 +170,7 @@ async def emit_audit_log(
         user_id=user_id,
         entity=entity,
         entity_id=entity_id,
-        old_data=_serialize_uuids(old_data),
-        new_data=_serialize_uuids(new_data),
+        old_data=old_data,
+        new_data=new_data,
         ip_address=_extract_ip(request),
     )
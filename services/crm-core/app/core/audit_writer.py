@@ -0,0 +1,488 @@
+"""Background, batched writer for audit log rows.
+
+Problem:
+  ``audit_log_service.log()`` used to add and flush one AuditLog row inside
+  the request transaction.  Handlers also serialised full before/after
+  snapshots inline.  Every audited mutation therefore paid an extra INSERT
+  round-trip plus the JSON work, and bulk endpoints paid it per entity.
+
+Solution:
+  ``log()`` now builds an ``AuditRecord`` and stages it on the session
+  (``session.info``).  When the transaction commits, the staged records are
+  handed to the writer through ``after_commit``, which get_db awaits before
+  the response is sent; a rollback drops them.  An audit row therefore
+  exists exactly when its mutation does, as before.  Records logged on a
+  read-only session are handed over at once (``run_soon``; get_read_db
+  awaits it).
+
+  Handing over turns each record into a row: pydantic snapshots dumped,
+  UUIDs stringified, old/new reduced to the fields that changed.  The rows
+  wait in-process, up to ``AUDIT_QUEUE_SIZE``.  Every ``AUDIT_FLUSH_MS``, or
+  as soon as ``AUDIT_BATCH_SIZE`` rows are waiting, a background task
+  inserts each batch with one multi-row INSERT on its own session.
+
+Durability (at-least-once):
+  - Before the hand-over completes — so before the request that committed
+    returns — the rows are written ahead to the Redis hash
+    ``audit:journal`` (id -> row) in one HSET.  Each batch's ids are deleted
+    from it once the batch is inserted or spilled.
+  - Journal entries older than ``_JOURNAL_GRACE`` seconds have outlived the
+    process that wrote them (SIGKILL, OOM).  Any replica's writer inserts
+    them, checking every ``_SPILL_CHECK_SECONDS`` while it flushes.
+
+  - Without Redis the rows are inserted at once, still before the request
+    returns.  Only if that INSERT fails as well are they held in memory
+    alone, where a crash would lose them; that is logged.
+  - Record ids and timestamps are assigned at ``log()`` time and the INSERT
+    ignores duplicate ids, so batches and journal entries can be replayed.
+  - Rows beyond the queue bound, and batches whose INSERT keeps failing,
+    are spilled to the Redis list ``audit:spill``.  Any replica's writer
+    drains that list back into the table.  If Redis is down as well, they
+    stay queued and are retried.
+  - ``flush_audit_log()`` runs on API and worker shutdown.
+
+Set ``AUDIT_ASYNC_WRITES=false`` to insert inline in the request
+transaction (previous behaviour).
+
+Metrics (Prometheus, default registry):
+  audit_records_written_total   rows handed to a successful INSERT
+  audit_records_spilled_total   records pushed to the Redis spill list
+  audit_records_recovered_total journal entries inserted for a dead process
+  audit_write_errors_total      failed INSERT attempts
+  audit_batch_size              rows per INSERT
+  audit_queue_depth             records waiting in-process
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import structlog
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.core.after_commit import after_commit, run_soon
+from app.core.config import settings
+from app.core.metrics import counter, gauge, histogram
+
+logger = structlog.get_logger()
+
+_INFO_KEY = "audit_records"
+_SPILL_KEY = "audit:spill"
+_JOURNAL_KEY = "audit:journal"
+_JOURNAL_GRACE = 60.0
+_REDIS_COOLDOWN = 30.0
+_RETRY_DELAY = 5.0
+_SPILL_CHECK_SECONDS = 5.0
+
+_written = counter("audit_records_written_total", "Audit rows handed to a successful INSERT")
+_spilled = counter("audit_records_spilled_total", "Audit records pushed to the Redis spill list")
+_recovered = counter(
+    "audit_records_recovered_total", "Journal entries inserted for a process that died"
+)
+_write_errors = counter("audit_write_errors_total", "Failed audit INSERT attempts")
+_batch_size = histogram(
+    "audit_batch_size", "Rows per audit INSERT", buckets=(1, 2, 5, 10, 25, 50, 100, 200, 500)
+)
+_queue_depth = gauge("audit_queue_depth", "Audit records waiting in-process")
+
+
+# ---------------------------------------------------------------------------
+# Records
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class AuditRecord:
+    """One audit entry as captured on the request path.
+
+    ``old_data`` / ``new_data`` may be dicts or pydantic models; they are
+    serialised by the writer, not by the request.
+    """
+
+    tenant_id: uuid.UUID
+    action: str
+    user_id: uuid.UUID | None = None
+    entity: str | None = None
+    entity_id: str | None = None
+    old_data: Any = None
+    new_data: Any = None
+    metadata: dict[str, Any] | None = None
+    ip_address: str | None = None
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    def to_row(self) -> dict[str, Any]:
+        """Column values for ``audit_logs``, with old/new reduced to a diff."""
+        old_data, new_data = diff_snapshots(_json_safe(self.old_data), _json_safe(self.new_data))
+        return {
+            "id": self.id,
+            "tenant_id": self.tenant_id,
+            "user_id": self.user_id,
+            "action": self.action,
+            "entity": self.entity,
+            "entity_id": self.entity_id,
+            "old_data": old_data,
+            "new_data": new_data,
+            "metadata_json": self.metadata,
+            "ip_address": self.ip_address,
+            "created_at": self.created_at,
+            "updated_at": self.created_at,
+        }
+
+
+def _json_safe(data: Any) -> dict[str, Any] | None:
+    """Dump pydantic models; stringify top-level UUIDs of plain dicts."""
+    if data is None:
+        return None
+    if hasattr(data, "model_dump"):
+        return data.model_dump(mode="json")
+    return {
+        key: str(value) if isinstance(value, uuid.UUID) else value for key, value in data.items()
+    }
+
+
+def diff_snapshots(
+    old: dict[str, Any] | None, new: dict[str, Any] | None
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+    """Keep only the keys whose value differs when both snapshots are present."""
+    if old is None or new is None:
+        return old, new
+    changed = [key for key in old.keys() | new.keys() if old.get(key) != new.get(key)]
+    return (
+        {key: old[key] for key in changed if key in old},
+        {key: new[key] for key in changed if key in new},
+    )
+
+
+_UUID_FIELDS = ("id", "tenant_id", "user_id")
+_DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+def _row_to_json(row: dict[str, Any]) -> str:
+    return json.dumps(row, default=str)
+
+
+def _row_from_json(blob: bytes | str) -> dict[str, Any]:
+    row = json.loads(blob)
+    for key in _UUID_FIELDS:
+        if row.get(key) is not None:
+            row[key] = uuid.UUID(row[key])
+    for key in _DATETIME_FIELDS:
+        row[key] = datetime.fromisoformat(row[key])
+    return row
+
+
+def _insert_rows(dialect_name: str, rows: list[dict[str, Any]]):
+    """Multi-row INSERT that skips ids already written (retried batches)."""
+    from app.models.audit_log import AuditLog  # noqa: PLC0415 — models import database
+
+    table = AuditLog.__table__
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(table).values(rows)
+    return dialect_insert(table).values(rows).on_conflict_do_nothing(index_elements=["id"])
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+
+class AuditWriter:
+    """Bounded in-process queue of audit rows, flushed in multi-row INSERTs."""
+
+    def __init__(
+        self,
+        *,
+        queue_size: int = 10_000,
+        batch_size: int = 200,
+        flush_interval: float = 0.2,
+        redis_url: str | None = None,
+        session_factory: Any = None,
+    ) -> None:
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._redis_url = redis_url
+        self._session_factory = session_factory
+        self._pending: deque[dict[str, Any]] = deque()
+        self._overflow: list[dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._redis: Any = None
+        self._redis_disabled_until = 0.0
+        self._next_spill_check = 0.0
+        self._next_journal_check = 0.0
+
+    async def submit(self, records: Iterable[AuditRecord]) -> None:
+        """Journal committed records, then queue them; never raises.
+
+        Returns once the rows are durable: in the Redis journal or, without
+        Redis, in the table.
+        """
+        rows = self._rows(records)
+        if not rows:
+            return
+        if not await self._journal(rows):
+            if await self._write(rows):
+                return
+            logger.error("audit_records_not_durable", rows=len(rows))
+        for row in rows:
+            if len(self._pending) < self._queue_size:
+                self._pending.append(row)
+            else:
+                self._overflow.append(row)
+        _queue_depth.set(len(self._pending))
+        full = len(self._pending) >= self._batch_size or bool(self._overflow)
+        self._schedule(0.0 if full else self._flush_interval)
+
+    def _schedule(self, delay: float) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # picked up by the next submit() or flush_audit_log()
+        self._flush_task = loop.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    async def flush(self) -> bool:
+        """Write every queued row; False if some had to stay queued."""
+        async with self._flush_lock:
+            # Holding the lock, a scheduled flush can only be sleeping or
+            # waiting for the lock, so it is safe to cancel: this one covers it.
+            task = self._flush_task
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+            self._flush_task = None
+            ok = await self._flush_locked()
+        if self._pending or self._overflow:
+            self._schedule(self._flush_interval if ok else _RETRY_DELAY)
+        return ok
+
+    async def _flush_locked(self) -> bool:
+        if self._overflow:
+            overflow, self._overflow = self._overflow, []
+            if not await self._spill(overflow):
+                # Redis is down too: exceed the bound rather than lose rows
+                self._pending.extend(overflow)
+                _queue_depth.set(len(self._pending))
+
+        while self._pending:
+            count = min(self._batch_size, len(self._pending))
+            batch = [self._pending.popleft() for _ in range(count)]
+            _queue_depth.set(len(self._pending))
+            if await self._write(batch):
+                await self._forget(batch)
+            elif not await self._spill(batch):
+                self._pending.extendleft(reversed(batch))
+                _queue_depth.set(len(self._pending))
+                return False
+        return await self._drain_spill() and await self._recover_journal()
+
+    @staticmethod
+    def _rows(records: Iterable[AuditRecord]) -> list[dict[str, Any]]:
+        rows = []
+        for record in records:
+            try:
+                rows.append(record.to_row())
+            except Exception:  # noqa: BLE001 — one bad snapshot must not block the batch
+                logger.exception(
+                    "audit_record_unserialisable", action=record.action, entity=record.entity
+                )
+        return rows
+
+    async def _write(self, rows: list[dict[str, Any]]) -> bool:
+        factory = self._session_factory
+        if factory is None:
+            from app.core.database import async_session as factory  # noqa: PLC0415
+
+        for attempt in range(2):
+            try:
+                async with factory() as session:
+                    await session.execute(_insert_rows(session.bind.dialect.name, rows))
+                    await session.commit()
+            except Exception as exc:
+                _write_errors.inc()
+                logger.warning(
+                    "audit_write_error", attempt=attempt + 1, rows=len(rows), error=str(exc)
+                )
+                continue
+            _written.inc(len(rows))
+            _batch_size.observe(len(rows))
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Redis journal and spill
+    # ------------------------------------------------------------------
+
+    async def _journal(self, rows: list[dict[str, Any]]) -> bool:
+        redis = self._get_redis()
+        if redis is None:
+            return False
+        try:
+            await redis.hset(
+                _JOURNAL_KEY, mapping={str(row["id"]): _row_to_json(row) for row in rows}
+            )
+        except Exception as exc:
+            self._disable_redis(exc)
+            return False
+        return True
+
+    async def _forget(self, rows: list[dict[str, Any]]) -> None:
+        """Trim written rows from the journal; leftovers are replayed harmlessly."""
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.hdel(_JOURNAL_KEY, *[str(row["id"]) for row in rows])
+        except Exception as exc:
+            self._disable_redis(exc)
+
+    async def _spill(self, rows: list[dict[str, Any]]) -> bool:
+        redis = self._get_redis()
+        if redis is None:
+            return False
+        try:
+            pipe = redis.pipeline(transaction=True)
+            pipe.rpush(_SPILL_KEY, *[_row_to_json(row) for row in rows])
+            pipe.hdel(_JOURNAL_KEY, *[str(row["id"]) for row in rows])
+            await pipe.execute()
+        except Exception as exc:
+            self._disable_redis(exc)
+            return False
+        _spilled.inc(len(rows))
+        self._next_spill_check = 0.0
+        logger.warning("audit_records_spilled", rows=len(rows))
+        return True
+
+    async def _drain_spill(self) -> bool:
+        if time.monotonic() < self._next_spill_check:
+            return True
+        redis = self._get_redis()
+        if redis is None:
+            return True
+        while True:
+            try:
+                blobs = await redis.lpop(_SPILL_KEY, self._batch_size)
+            except Exception as exc:
+                self._disable_redis(exc)
+                return True
+            if not blobs:
+                self._next_spill_check = time.monotonic() + _SPILL_CHECK_SECONDS
+                return True
+            if not await self._write([_row_from_json(blob) for blob in blobs]):
+                try:
+                    await redis.lpush(_SPILL_KEY, *reversed(blobs))
+                except Exception as exc:
+                    self._disable_redis(exc)
+                    logger.error("audit_spill_requeue_failed", rows=len(blobs))
+                return False
+
+    async def _recover_journal(self) -> bool:
+        """Insert journal entries left behind by a process that died."""
+        if time.monotonic() < self._next_journal_check:
+            return True
+        redis = self._get_redis()
+        if redis is None:
+            return True
+        self._next_journal_check = time.monotonic() + _SPILL_CHECK_SECONDS
+        cutoff = datetime.now(UTC) - timedelta(seconds=_JOURNAL_GRACE)
+        cursor = 0
+        try:
+            while True:
+                cursor, entries = await redis.hscan(
+                    _JOURNAL_KEY, cursor, count=self._batch_size
+                )
+                rows = [_row_from_json(blob) for blob in entries.values()]
+                orphans = [row for row in rows if row["created_at"] < cutoff]
+                if orphans:
+                    if not await self._write(orphans):
+                        return False
+                    await redis.hdel(_JOURNAL_KEY, *[str(row["id"]) for row in orphans])
+                    _recovered.inc(len(orphans))
+                    logger.warning("audit_journal_recovered", rows=len(orphans))
+                if not cursor:
+                    return True
+        except Exception as exc:
+            self._disable_redis(exc)
+            return True
+
+    def _get_redis(self) -> Any:
+        if not self._redis_url or time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url, socket_timeout=1.0)
+        return self._redis
+
+    def _disable_redis(self, exc: Exception) -> None:
+        logger.warning("audit_redis_unavailable", error=str(exc), cooldown=_REDIS_COOLDOWN)
+        self._redis_disabled_until = time.monotonic() + _REDIS_COOLDOWN
+
+
+# ---------------------------------------------------------------------------
+# Session staging — records reach the writer only if their transaction commits
+# ---------------------------------------------------------------------------
+
+
+async def _submit(records: list[AuditRecord]) -> None:
+    await audit_writer.submit(records)
+
+
+def stage(db: Any, record: AuditRecord) -> None:
+    """Attach *record* to *db*'s current transaction.
+
+    Read-only sessions (``get_read_db``) are never committed, so a record
+    staged there would be dropped; it is handed to the writer at once
+    instead, and the misplaced write is logged.
+    """
+    if db.info.get("read_only"):
+        logger.warning("audit_staged_on_read_session", action=record.action, entity=record.entity)
+        run_soon(db, _submit, [record])
+        return
+    records = db.info.get(_INFO_KEY)
+    if records is None:
+        records = db.info[_INFO_KEY] = []
+        after_commit(db, _submit, records)
+    records.append(record)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_staged(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_INFO_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton
+# ---------------------------------------------------------------------------
+
+audit_writer = AuditWriter(
+    queue_size=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_MS / 1000.0,
+    redis_url=settings.REDIS_URL,
+)
+
+
+async def flush_audit_log() -> None:
+    """Write every queued audit record — call on API and worker shutdown."""
+    await audit_writer.flush()
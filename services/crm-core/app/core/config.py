@@ -14,15 +14,112 @@ class Settings(BaseSettings):
     DATABASE_ECHO: bool = False
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 10
+    # Optional streaming replica for list/report/dashboard/export reads
+    # (get_read_db).  Reads fall back to the primary while the replica lags
+    # more than DATABASE_REPLICA_MAX_LAG_SECONDS (re-checked every
+    # DATABASE_REPLICA_LAG_CHECK_SECONDS) and, for READ_YOUR_WRITES_SECONDS
+    # after a user's write, for that user.
+    DATABASE_READ_URL: str | None = None
+    DATABASE_READ_POOL_SIZE: int = 10
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_REPLICA_LAG_CHECK_SECONDS: float = 2.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Query instrumentation (app/core/query_stats.py).  Statements slower than
+    # DB_SLOW_QUERY_MS are logged with a fingerprint; a request or job running
+    # more than DB_QUERY_WARN_COUNT statements logs a warning (0 disables
+    # either).  DB_DEBUG_HEADERS adds X-DB-Queries / X-DB-Time-Ms to responses.
+    DB_SLOW_QUERY_MS: float = 200.0
+    DB_QUERY_WARN_COUNT: int = 50
+    DB_DEBUG_HEADERS: bool = False
+    # Audit rows are written in the background, in multi-row INSERTs, once the
+    # request transaction commits (app/core/audit_writer.py).  They are
+    # journaled to Redis first (inserted at once without Redis).  Up to
+    # AUDIT_QUEUE_SIZE records wait in-process; beyond that they spill to
+    # Redis.  AUDIT_ASYNC_WRITES=false restores the inline INSERT.
+    AUDIT_ASYNC_WRITES: bool = True
+    AUDIT_QUEUE_SIZE: int = 10_000
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_MS: float = 200.0
+    # GET /conversations and GET /contacts reuse an exact total_count for this
+    # many seconds per (tenant, role scope, filters, search); 0 counts on every
+    # request.  count=estimate uses the planner's row estimate above
+    # COUNT_ESTIMATE_THRESHOLD rows (app/core/list_counts.py).
+    CONVERSATION_COUNT_CACHE_SECONDS: int = 15
+    CONTACT_COUNT_CACHE_SECONDS: int = 15
+    COUNT_ESTIMATE_THRESHOLD: int = 10_000
+    # GET /messages/search ranks at most this many of the newest matches
+    # (app/services/message_search_service.py).
+    MESSAGE_SEARCH_MAX_CANDIDATES: int = 2_000
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Rate limiting (app/core/rate_limit.py, app/core/local_rate_limit.py).
+    # Decisions are made in-process; hits are reconciled with Redis every
+    # RATE_LIMIT_SYNC_INTERVAL_MS (0 keeps every replica independent).
+    # Strategy: "local-sliding-window" or "local-token-bucket".
+    RATE_LIMIT_STRATEGY: str = "local-sliding-window"
+    RATE_LIMIT_SYNC_INTERVAL_MS: int = 250
+
+    # n8n X-API-Key resolution is cached per key (app/n8n/tenant_cache.py):
+    # accepted keys for N8N_AUTH_CACHE_TTL_SECONDS, rejected keys for
+    # N8N_AUTH_NEGATIVE_TTL_SECONDS; 0 disables the respective kind.
+    N8N_AUTH_CACHE_TTL_SECONDS: int = 30
+    N8N_AUTH_NEGATIVE_TTL_SECONDS: int = 10
+
+    # Socket.io cross-process emit bus (app/realtime/emit_bus.py).  Workers and
+    # every API replica share one Redis pub/sub channel; disable only for a
+    # single-process deployment.
+    SOCKETIO_MESSAGE_QUEUE_ENABLED: bool = True
+    SOCKETIO_CHANNEL: str = "crm-core:socketio"
+    SOCKETIO_BUS_BATCH_SIZE: int = 200
+    SOCKETIO_BUS_FLUSH_MS: float = 2.0
+    # conversation:updated events for one conversation within this window are
+    # merged into a single trailing update (0 disables coalescing).
+    REALTIME_COALESCE_MS: int = 100
+    # Allow clients to negotiate the MessagePack protocol
+    # (app/realtime/compact.py); requires the msgpack package.  While on,
+    # every event is emitted a second time to the compact shadow rooms, and
+    # conversation:updated is sent as a delta against a version kept in Redis.
+
+    REALTIME_COMPACT_ENABLED: bool = False
+    # Tenant-scoped events are appended to a capped Redis Stream so that
+    # reconnecting clients can replay what they missed (realtime/event_log.py).
+    REALTIME_STREAM_ENABLED: bool = True
+    REALTIME_STREAM_MAXLEN: int = 10_000
+    # Appends are pipelined; an emit waits at most this long for its eventId
+    # and goes out without one when Redis is slower.
+    REALTIME_STREAM_APPEND_WAIT_MS: float = 5.0
+
+    # A replay needing more entries than this answers reset=true instead.
+    REALTIME_REPLAY_MAX_EVENTS: int = 2_000
+    # Socket.io connect admission (app/realtime/admission.py): connects/sec
+    # per process after an initial burst; slower connects wait with jitter
+    # up to MAX_WAIT, beyond that they are refused.  Rate 0 disables.
+    SOCKETIO_ADMISSION_RATE: float = 50.0
+    SOCKETIO_ADMISSION_BURST: int = 100
+    SOCKETIO_ADMISSION_MAX_WAIT_SECONDS: float = 10.0
+    # conversation:join access checks are answered from a cached ACL
+    # projection (app/realtime/conversation_acl.py); 0 disables the cache.
+    CONVERSATION_ACL_CACHE_TTL_SECONDS: int = 300
+    # conversation:typing is rebroadcast at most once per user and
+    # conversation per window (0 disables the throttle).
+    TYPING_THROTTLE_MS: int = 1000
+    # Presence entries expire this long after a socket's last heartbeat
+    # (app/realtime/presence.py); keep it well above the client ping period.
+    PRESENCE_TTL_SECONDS: int = 90
+
     # Auth (compatible with existing JWT tokens)
     JWT_SECRET: str  # MANDATORY — must be set via env var
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Authenticated principals are cached per (user, tenant) in-process for
+    # PRINCIPAL_CACHE_TTL_SECONDS and in Redis for
+    # PRINCIPAL_CACHE_REDIS_TTL_SECONDS (app/core/principal_cache.py);
+    # 0 disables the respective tier.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_REDIS_TTL_SECONDS: int = 300
 
     # Webhook verification tokens (set per environment)
     # WhatsApp: each tenant stores its own verify token in the DB.
@@ -32,6 +129,23 @@ class Settings(BaseSettings):
     INSTAGRAM_WEBHOOK_VERIFY_TOKEN: str | None = None
     INSTAGRAM_ACCOUNT_ID: str | None = None       # fallback for single-tenant dev
 
+    # Meta Graph API origin used by all channel adapters.  Point this at the
+    # local simulator (benchmarks/meta_graph_simulator.py) to exercise the
+    # channel layer without network access.
+    META_GRAPH_API_URL: str = "https://graph.facebook.com"
+
+    # Outbound WhatsApp media is uploaded once per phone_number_id and reused
+    # by media_id (app/channels/media_cache.py).  Meta keeps uploads for 30
+    # days, so the TTL must stay below that.
+    WHATSAPP_MEDIA_CACHE_ENABLED: bool = True
+    WHATSAPP_MEDIA_CACHE_TTL_DAYS: int = 25
+    # Which media URLs the cache may download.  Hosts match exactly, or by
+    # suffix when written as ".example.com".  With no hosts listed, any host
+    # resolving only to public addresses is allowed.  Other URLs are sent
+    # to Meta as links, never fetched here.
+    WHATSAPP_MEDIA_ALLOWED_SCHEMES: list[str] = ["https"]
+    WHATSAPP_MEDIA_ALLOWED_HOSTS: list[str] = []
+
     # Token encryption (Fernet) — generate with:
     #   python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"
     TOKEN_ENCRYPTION_KEY: str | None = None
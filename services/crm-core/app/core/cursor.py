@@ -0,0 +1,63 @@
+"""Opaque keyset-pagination cursors.
+
+A cursor is the sort key of the last row on a page (e.g.
+``(last_message_at, id)``), JSON-encoded and base64url'd so clients treat
+it as a token.  The next page is then a ``WHERE (key) < (cursor)`` range
+read on the matching index, which costs the same however deep it is,
+unlike ``OFFSET``, which reads and discards every earlier row.
+
+Datetimes and UUIDs are encoded as strings; callers parse the values they
+get back.  Malformed tokens raise ``BadRequestError``.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+from app.core.exceptions import BadRequestError
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> list[Any]:
+    """Return the ``size`` values encoded in ``token``."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError) as exc:
+        raise BadRequestError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise BadRequestError("Invalid cursor")
+    return values
+
+
+def parse_datetime(value: Any) -> datetime | None:
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError) as exc:
+        raise BadRequestError("Invalid cursor") from exc
+
+
+def parse_uuid(value: Any) -> uuid.UUID:
+    try:
+        return uuid.UUID(value)
+    except (TypeError, ValueError, AttributeError) as exc:
+        raise BadRequestError("Invalid cursor") from exc
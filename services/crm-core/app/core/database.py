@@ -1,32 +1,136 @@
+import time
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
+from app.core.after_commit import wait_after_commit
 from app.core.config import settings
+from app.core.metrics import gauge, histogram
+from app.core.query_stats import record_query
+from app.core.read_replica import ReplicaRouter
 
-_engine_kwargs: dict = {
-    "echo": settings.DATABASE_ECHO,
-}
+# ---------------------------------------------------------------------------
+# Pool instrumentation — tune DATABASE_POOL_SIZE / DATABASE_MAX_OVERFLOW from
+# these rather than by guesswork.
+# ---------------------------------------------------------------------------
 
-# SQLite (used in tests) does not support pool_size / max_overflow / pool_pre_ping
-if not settings.DATABASE_URL.startswith("sqlite"):
-    _engine_kwargs.update(
-        pool_size=settings.DATABASE_POOL_SIZE,
-        max_overflow=settings.DATABASE_MAX_OVERFLOW,
-        pool_pre_ping=True,
-    )
+_checkout_wait = histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+_checked_out = gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", ["engine"]
+)
+
+_overflow = gauge("db_pool_overflow", "Connections open beyond pool_size", ["engine"])
+
+
+class _InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _checkout_wait.labels(engine=self.logging_name).observe(time.perf_counter() - started)
+
+
+def _engine_kwargs(url: str, pool_size: int, role: str) -> dict:
+    kwargs: dict = {"echo": settings.DATABASE_ECHO}
+    # SQLite (used in tests) does not support pool_size / max_overflow / pool_pre_ping
+    if not url.startswith("sqlite"):
+        kwargs.update(
+            pool_size=pool_size,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            poolclass=_InstrumentedQueuePool,
+            pool_logging_name=role,
+        )
+    return kwargs
+
+
+def _instrument(async_engine: AsyncEngine, role: str) -> None:
+    """Attach pool gauges and per-statement timing (app/core/query_stats.py)."""
+    sync_engine = async_engine.sync_engine
+
+    def _pool_state(*_args) -> None:
+        pool = sync_engine.pool
+        if isinstance(pool, QueuePool):
+            _checked_out.labels(engine=role).set(pool.checkedout())
+            _overflow.labels(engine=role).set(max(0, pool.overflow()))
+
+    event.listen(sync_engine, "checkout", _pool_state)
+    event.listen(sync_engine, "checkin", _pool_state)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _query_started(conn, cursor, statement, parameters, context, executemany) -> None:
+        context._query_started = time.perf_counter()
 
-engine = create_async_engine(settings.DATABASE_URL, **_engine_kwargs)
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _query_finished(conn, cursor, statement, parameters, context, executemany) -> None:
+        record_query(statement, time.perf_counter() - context._query_started)
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    **_engine_kwargs(settings.DATABASE_URL, settings.DATABASE_POOL_SIZE, "primary"),
+)
+_instrument(engine, "primary")
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Read replica (app/core/read_replica.py) — None when DATABASE_READ_URL is unset
+read_engine = (
+    create_async_engine(
+        settings.DATABASE_READ_URL,
+        **_engine_kwargs(settings.DATABASE_READ_URL, settings.DATABASE_READ_POOL_SIZE, "replica"),
+    )
+    if settings.DATABASE_READ_URL
+    else None
+)
+if read_engine is not None:
+    _instrument(read_engine, "replica")
+async_read_session = (
+    async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
+replica_router = ReplicaRouter(read_engine, redis_url=settings.REDIS_URL) if read_engine else None
+
 
 class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+# ---------------------------------------------------------------------------
+# Write tracking — lets get_db pin the user's next reads to the primary
+# ---------------------------------------------------------------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _flagged_flush(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flagged_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         try:
             yield session
@@ -34,3 +138,14 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+        await wait_after_commit(session)
+        if replica_router is not None and session.info.get("wrote"):
+            user = getattr(request.state, "user", None)
+            await replica_router.mark_write(getattr(user, "id", None))
+
+
+async def read_session_for(user_id) -> async_sessionmaker[AsyncSession]:
+    """Pick the session factory for a read-only request by *user_id*."""
+    if replica_router is not None and await replica_router.use_replica(user_id):
+        return async_read_session
+    return async_session
@@ -1,14 +1,15 @@
+from collections.abc import AsyncGenerator
 from uuid import UUID
 
 import structlog
 from fastapi import Depends, Header, Request
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.after_commit import wait_after_commit
+from app.core.database import get_db, read_session_for
 from app.core.exceptions import ForbiddenError, UnauthorizedError
+from app.core.principal_cache import Principal, load_principal, principal_cache
 from app.core.security import decode_token
-from app.models.user import User
 
 logger = structlog.get_logger()
 
@@ -17,7 +18,7 @@ async def get_current_user(
     request: Request,
     authorization: str = Header(None),
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> Principal:
     if not authorization or not authorization.startswith("Bearer "):
         raise UnauthorizedError("Token not provided")
 
@@ -49,40 +50,52 @@ async def get_current_user(
 
     # Express uses "tenantId" (camelCase), CRM Core uses "tenant_id" — accept both
     token_tenant_id = payload.get("tenant_id") or payload.get("tenantId")
+    parsed_tenant_id = None
     if token_tenant_id:
         try:
             parsed_tenant_id = UUID(token_tenant_id)
         except (ValueError, AttributeError):
             raise UnauthorizedError("Invalid token payload")
-        result = await db.execute(
-            select(User).where(
-                User.id == parsed_user_id,
-                User.tenant_id == parsed_tenant_id,
-            )
-        )
-    else:
-        # Only SUPER_ADMIN users may have tenant_id=None
-        result = await db.execute(
-            select(User).where(
-                User.id == parsed_user_id,
-                User.tenant_id.is_(None),
-            )
-        )
-    user = result.scalar_one_or_none()
-
-    if not user:
-        raise UnauthorizedError("User not found")
-
-    if user.status != "ACTIVE":
+
+    # Shared with the Socket.io connect path; user_service/auth_service
+    # invalidate it whenever these columns change.
+    principal = await principal_cache.get(parsed_user_id, parsed_tenant_id, path="http")
+    if principal is None:
+        loaded_at = principal_cache.stamp()
+        principal = await load_principal(db, parsed_user_id, parsed_tenant_id)
+        if not principal:
+            raise UnauthorizedError("User not found")
+        await principal_cache.put(principal, loaded_at=loaded_at)
+
+    if principal.status != "ACTIVE":
         raise ForbiddenError("User account is not active")
 
-    request.state.user = user
-    request.state.tenant_id = user.tenant_id
-    return user
+    request.state.user = principal
+    request.state.tenant_id = principal.tenant_id
+    return principal
+
+
+async def get_read_db(
+    current_user: Principal = Depends(get_current_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session for list/report/dashboard/export routes.
+
+    Served by the read replica when one is configured, healthy and the user
+    has not written within READ_YOUR_WRITES_SECONDS (app/core/read_replica.py).
+    Nothing is committed; routes using it must not write.  The session is
+    flagged ``read_only`` so audit_writer.stage() hands records to the
+    writer at once; they are journaled before the response is sent.
+    """
+    factory = await read_session_for(current_user.id)
+    async with factory() as session:
+        session.info["read_only"] = True
+        yield session
+        await wait_after_commit(session)
+
 
 
 def require_roles(*allowed_roles: str):
-    async def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    async def role_checker(current_user: Principal = Depends(get_current_user)) -> Principal:
         if current_user.role not in allowed_roles:
             raise ForbiddenError("Insufficient permissions")
         return current_user
@@ -92,7 +105,7 @@ def require_roles(*allowed_roles: str):
 
 def get_tenant_id(
     request: Request,
-    _current_user: User = Depends(get_current_user),
+    _current_user: Principal = Depends(get_current_user),
 ) -> UUID:
     tenant_id = getattr(request.state, "tenant_id", None)
     if not tenant_id:
@@ -2,25 +2,36 @@
 
 Usage in models::
 
-    from app.core.encrypted_column import EncryptedText
+    from app.core.encrypted_column import EncryptedText, decrypted_property
 
     class Tenant(Base):
-        whatsapp_access_token: Mapped[str | None] = mapped_column(
-            EncryptedText, nullable=True
+        _whatsapp_access_token: Mapped[str | None] = mapped_column(
+            "whatsapp_access_token", EncryptedText(lazy=True), nullable=True
         )
+        whatsapp_access_token = decrypted_property("_whatsapp_access_token")
+
+Values are encrypted on INSERT/UPDATE.  With ``lazy=True`` loaded rows keep
+the ciphertext, and ``decrypted_property`` decrypts it only when the
+attribute is read.  Loading a Tenant for webhook routing or n8n auth then
+costs no Fernet work for tokens it never touches.  Without ``lazy`` the
+value is decrypted on SELECT, as before.  Both paths go through
+``decrypt_token_cached``, so a given ciphertext is decrypted once per
+process.
 
-Values are encrypted on INSERT/UPDATE and decrypted on SELECT automatically.
 See ``app.core.encryption`` for encryption details and graceful-degradation
 behaviour when TOKEN_ENCRYPTION_KEY is not set.
 """
 
 from __future__ import annotations
 
+from typing import Any
+
 from sqlalchemy import Text
 from sqlalchemy.engine.interfaces import Dialect
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.types import TypeDecorator
 
-from app.core.encryption import decrypt_token, encrypt_token
+from app.core.encryption import decrypt_token_cached, encrypt_token
 
 
 class EncryptedText(TypeDecorator):  # type: ignore[type-arg]
@@ -29,14 +40,43 @@ class EncryptedText(TypeDecorator):  # type: ignore[type-arg]
     impl = Text
     cache_ok = True
 
+    def __init__(self, *args: Any, lazy: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy = lazy
+
     def process_bind_param(self, value: str | None, dialect: Dialect) -> str | None:
-        """Encrypt before writing to the database."""
+        """Encrypt before writing to the database.
+
+        Values that are already ciphertext (a lazy attribute written back
+        unchanged) are stored as-is.
+        """
         if value is None:
             return None
         return encrypt_token(value)
 
     def process_result_value(self, value: str | None, dialect: Dialect) -> str | None:
-        """Decrypt after reading from the database."""
-        if value is None:
-            return None
-        return decrypt_token(value)
+        """Decrypt after reading from the database (unless ``lazy``)."""
+        if value is None or self.lazy:
+            return value
+        return decrypt_token_cached(value)
+
+
+def decrypted_property(column_attr: str) -> hybrid_property:
+    """Plaintext view of a ``lazy`` EncryptedText attribute named *column_attr*.
+
+    Reads decrypt on demand; writes store plaintext, which is encrypted on
+    flush.  At class level it is the column itself, so it still works in
+    queries and as a constructor keyword.
+    """
+
+    def fget(self: Any) -> str | None:
+        value = getattr(self, column_attr)
+        return None if value is None else decrypt_token_cached(value)
+
+    def fset(self: Any, value: str | None) -> None:
+        setattr(self, column_attr, value)
+
+    def expr(cls: Any) -> Any:
+        return getattr(cls, column_attr)
+
+    return hybrid_property(fget, fset, expr=expr)
@@ -8,11 +8,18 @@ Design decisions:
     plaintext, enabling gradual migration without downtime.
   - The encrypt/decrypt functions are pure (no DB access) and can be used
     anywhere tokens are read or written.
+  - decrypt_token_cached() memoizes plaintext in a bounded process-local LRU
+    keyed by the SHA-256 of the ciphertext.  The same few tenant tokens are
+    decrypted on every webhook, send and worker job; a Fernet decrypt (HMAC
+    verify + AES) costs far more than a digest and a dict lookup.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 
 from cryptography.fernet import Fernet, InvalidToken
 
@@ -20,10 +27,16 @@ logger = logging.getLogger(__name__)
 
 _PREFIX = "enc:"
 
+_DECRYPT_CACHE_SIZE = 1024
+
 # Lazy-initialised Fernet instance (None = encryption disabled).
 _fernet: Fernet | None = None
 _initialised = False
 
+# sha256(ciphertext) -> plaintext, least recently used first.
+_decrypt_cache: OrderedDict[bytes, str] = OrderedDict()
+_decrypt_cache_lock = threading.Lock()
+
 
 def _get_fernet() -> Fernet | None:
     """Return the Fernet instance, creating it on first call."""
@@ -112,3 +125,33 @@ def decrypt_token(ciphertext: str) -> str:
     except InvalidToken as exc:
         logger.error("Failed to decrypt token — key mismatch or corrupted data.")
         raise ValueError("Token decryption failed — wrong key or corrupted ciphertext.") from exc
+
+
+def decrypt_token_cached(ciphertext: str) -> str:
+    """``decrypt_token()`` with plaintext memoized per ciphertext.
+
+    Failures are not cached, so a fixed key or re-encrypted row is picked up
+    on the next call.
+    """
+    if not ciphertext or not is_encrypted(ciphertext):
+        return ciphertext
+
+    digest = hashlib.sha256(ciphertext.encode("utf-8")).digest()
+    with _decrypt_cache_lock:
+        plaintext = _decrypt_cache.get(digest)
+        if plaintext is not None:
+            _decrypt_cache.move_to_end(digest)
+            return plaintext
+
+    plaintext = decrypt_token(ciphertext)
+    with _decrypt_cache_lock:
+        _decrypt_cache[digest] = plaintext
+        if len(_decrypt_cache) > _DECRYPT_CACHE_SIZE:
+            _decrypt_cache.popitem(last=False)
+    return plaintext
+
+
+def clear_decrypt_cache() -> None:
+    """Drop every memoized plaintext (e.g. after rotating TOKEN_ENCRYPTION_KEY)."""
+    with _decrypt_cache_lock:
+        _decrypt_cache.clear()
@@ -0,0 +1,111 @@
+"""total_count for paginated list endpoints.
+
+An exact ``COUNT(*)`` over a filtered or searched list visits every matching
+row, so on a large tenant it costs more than the page itself, and list
+screens ask for it on every page turn and search keystroke.  List endpoints
+therefore take a ``count`` parameter:
+
+  cached    exact COUNT, reused for a few seconds per cache key (default)
+  estimate  PostgreSQL planner row estimate, flagged as such, when it is at
+            least COUNT_ESTIMATE_THRESHOLD; smaller results are counted
+            exactly (and cached), since that is where estimates are least
+            accurate
+  none      no total
+
+The cache is per process and bounded (cleared when full).  Cache keys must
+name everything that changes the result: endpoint, tenant, role scope,
+filters and search.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable
+from typing import Any, Literal
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.config import settings
+
+CountMode = Literal["cached", "estimate", "none"]
+
+_CACHE_MAX_SIZE = 10_000  # prevent unbounded memory growth
+_count_cache: dict[tuple, tuple[float, int]] = {}
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, for planner row estimates."""
+
+    inherit_cache = False
+
+    def __init__(self, statement) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_rows(db: AsyncSession, query) -> int | None:
+    """Planner row estimate for ``query``; None where EXPLAIN is unsupported."""
+    if db.bind.dialect.name != "postgresql":
+        return None
+    plan = (await db.execute(_Explain(query))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _cached_count(key: tuple) -> int | None:
+    entry = _count_cache.get(key)
+    if entry is None:
+        return None
+    expires, count = entry
+    if expires <= time.monotonic():
+        _count_cache.pop(key, None)
+        return None
+    return count
+
+
+def _remember_count(key: tuple, count: int, ttl: float) -> None:
+    if ttl <= 0:
+        return
+    if len(_count_cache) >= _CACHE_MAX_SIZE:
+        _count_cache.clear()
+    _count_cache[key] = (time.monotonic() + ttl, count)
+
+
+async def count_total(
+    db: AsyncSession,
+    model: Any,
+    scoped: Callable[[Select], Select],
+    *,
+    mode: CountMode,
+    cache_key: tuple,
+    ttl: float,
+) -> tuple[int | None, bool]:
+    """Return (total_count, is_estimate) for the *model* rows ``scoped`` selects.
+
+    ``scoped`` adds the tenant, role, filter and search conditions to a bare
+    ``SELECT`` over *model*; it is applied to both the COUNT and the query
+    that is EXPLAINed.
+    """
+    if mode == "none":
+        return None, False
+
+    if mode == "estimate":
+        estimate = await estimate_rows(db, scoped(select(model.id)))
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+            return estimate, True
+
+    total_count = _cached_count(cache_key)
+    if total_count is None:
+        count_query = scoped(select(func.count()).select_from(model))
+        total_count = (await db.execute(count_query)).scalar_one()
+        _remember_count(cache_key, total_count, ttl)
+    return total_count, False
@@ -0,0 +1,288 @@
+"""In-process rate limiting strategies with batched Redis reconciliation.
+
+Problem:
+  slowapi's Redis storage costs a synchronous Redis round trip on the event
+  loop for every rate-limited request, including the 5000/minute n8n limit
+  and the webhook limit.  Fixed windows also allow 2x bursts across a
+  window edge.
+
+Solution:
+  Two ``limits`` strategies that decide from in-process state alone.  A
+  decision is a dict lookup and a few float operations, with no I/O.
+
+    local-sliding-window  (default) sliding-window counter.  The previous
+                          window's total is weighted by how much of it still
+                          overlaps the sliding window, which caps any
+                          window-length span at roughly the limit.
+    local-token-bucket    token bucket holding ``amount`` tokens, refilled
+                          at ``amount / window`` per second.
+
+  They are registered in ``limits.strategies.STRATEGIES`` under those names,
+  so the slowapi ``Limiter`` in rate_limit.py selects one via ``strategy=``.
+
+Cluster accuracy:
+  Every key touched since the last sync is reconciled with Redis every
+  ``RATE_LIMIT_SYNC_INTERVAL_MS``, in one pipeline:
+
+    INCRBY rl:{key}:{window} <local hits since last sync>   (EXPIRE 2 windows)
+
+  The reply is the cluster-wide total for the current fixed window.  The part
+  that other replicas consumed is folded into local state:
+    - sliding window: it is added to the current window count;
+    - token bucket:   it is removed from the bucket.
+  Between syncs a key can therefore overshoot by what the other replicas
+  admit in one interval.
+
+  If Redis is unavailable, each replica enforces the limit on its own until
+  the cooldown ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import structlog
+from limits import RateLimitItem
+from limits.strategies import STRATEGIES, RateLimiter
+from limits.util import WindowStats
+
+from app.core.config import settings
+from app.core.metrics import counter
+
+logger = structlog.get_logger()
+
+_CACHE_MAX_SIZE = 100_000  # prevent unbounded memory growth
+_REDIS_COOLDOWN = 30.0
+_KEY_PREFIX = "rl"
+
+_syncs = counter(
+    "rate_limit_syncs_total", "Rate-limit reconciliations with Redis by outcome", ["outcome"]
+)
+
+
+class _KeyState:
+    """Per-key counters; ``own``/``remote`` cover the current fixed window."""
+
+    __slots__ = ("expiry", "window", "own", "remote", "previous", "pending", "tokens", "updated")
+
+    def __init__(self, expiry: int, window: int, tokens: float, now: float) -> None:
+        self.expiry = expiry
+        self.window = window
+        self.own = 0  # hits admitted here in this window
+        self.remote = 0  # hits admitted by other replicas in this window (last seen)
+        self.previous = 0  # cluster total of the previous window
+        self.pending = 0  # own hits not yet pushed to Redis
+        self.tokens = tokens
+        self.updated = now
+
+
+class LocalRateLimiter(RateLimiter):
+    """Base for the in-process strategies; subclasses implement the decision."""
+
+    def __init__(self, storage: Any, redis_url: str | None = None) -> None:
+        super().__init__(storage)
+        self._redis_url = redis_url if redis_url is not None else settings.REDIS_URL
+        self._states: dict[str, _KeyState] = {}
+        self._dirty: set[str] = set()
+        self._backlog: list[tuple[str, int, int, int]] = []  # (key, window, expiry, hits)
+        self._redis: Any = None
+        self._redis_disabled_until = 0.0
+        self._sync_task: asyncio.Task | None = None
+
+    # ------------------------------------------------------------------
+    # Strategy-specific
+    # ------------------------------------------------------------------
+
+    def _available(self, item: RateLimitItem, state: _KeyState, now: float) -> float:
+        raise NotImplementedError
+
+    def _reset_time(self, item: RateLimitItem, state: _KeyState, now: float) -> float:
+        raise NotImplementedError
+
+    def _consume(self, state: _KeyState, cost: int) -> None:
+        pass
+
+    def _absorb_remote(self, state: _KeyState, delta: int) -> None:
+        pass
+
+    # ------------------------------------------------------------------
+    # limits.strategies.RateLimiter
+    # ------------------------------------------------------------------
+
+    def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        key = item.key_for(*identifiers)
+        now = time.time()
+        state = self._state(key, item, now)
+        if self._available(item, state, now) < cost:
+            return False
+        state.own += cost
+        state.pending += cost
+        self._consume(state, cost)
+        self._dirty.add(key)
+        self._ensure_sync()
+        return True
+
+    def test(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        now = time.time()
+        state = self._state(item.key_for(*identifiers), item, now)
+        return self._available(item, state, now) >= cost
+
+    def get_window_stats(self, item: RateLimitItem, *identifiers: str) -> WindowStats:
+        now = time.time()
+        state = self._state(item.key_for(*identifiers), item, now)
+        remaining = max(0, int(self._available(item, state, now)))
+        return WindowStats(self._reset_time(item, state, now), remaining)
+
+    def clear(self, item: RateLimitItem, *identifiers: str) -> None:
+        key = item.key_for(*identifiers)
+        self._states.pop(key, None)
+        self._dirty.discard(key)
+
+    # ------------------------------------------------------------------
+    # Local state
+    # ------------------------------------------------------------------
+
+    def _state(self, key: str, item: RateLimitItem, now: float) -> _KeyState:
+        expiry = item.get_expiry()
+        window = int(now // expiry)
+        state = self._states.get(key)
+        if state is None:
+            if len(self._states) >= _CACHE_MAX_SIZE:
+                self._evict(now)
+            state = self._states[key] = _KeyState(expiry, window, float(item.amount), now)
+        elif state.window != window:
+            if state.pending:
+                self._backlog.append((key, state.window, expiry, state.pending))
+            state.previous = state.own + state.remote if window == state.window + 1 else 0
+            state.window = window
+            state.own = state.remote = state.pending = 0
+        return state
+
+    def _evict(self, now: float) -> None:
+        """Drop keys idle for a full window; fall back to clearing everything."""
+        stale = [k for k, s in self._states.items() if now - s.updated > s.expiry]
+        for key in stale:
+            self._states.pop(key, None)
+            self._dirty.discard(key)
+        if len(self._states) >= _CACHE_MAX_SIZE:
+            self._states.clear()
+            self._dirty.clear()
+
+    # ------------------------------------------------------------------
+    # Redis reconciliation
+    # ------------------------------------------------------------------
+
+    def _ensure_sync(self) -> None:
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        if not self._redis_url or settings.RATE_LIMIT_SYNC_INTERVAL_MS <= 0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._sync_task = loop.create_task(self._sync_loop())
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.RATE_LIMIT_SYNC_INTERVAL_MS / 1000.0)
+            if self._dirty or self._backlog:
+                await self.sync()
+
+    async def sync(self) -> None:
+        """Push local hits to Redis and fold in what other replicas consumed."""
+        redis = self._get_redis()
+        if redis is None:
+            # Nothing to reconcile against; forget what we could not push.
+            self._dirty.clear()
+            self._backlog.clear()
+            for state in self._states.values():
+                state.pending = 0
+            return
+
+        batch: list[tuple[str, _KeyState, int]] = []
+        pipe = redis.pipeline(transaction=False)
+        for key, window, expiry, hits in self._backlog:
+            pipe.incrby(f"{_KEY_PREFIX}:{key}:{window}", hits)
+            pipe.expire(f"{_KEY_PREFIX}:{key}:{window}", 2 * expiry)
+        backlog_len, self._backlog = len(self._backlog), []
+
+        for key in self._dirty:
+            state = self._states.get(key)
+            if state is None:
+                continue
+            redis_key = f"{_KEY_PREFIX}:{key}:{state.window}"
+            pipe.incrby(redis_key, state.pending)
+            pipe.expire(redis_key, 2 * state.expiry)
+            batch.append((key, state, state.window))
+            state.pending = 0
+        self._dirty = set()
+
+        try:
+            replies = await pipe.execute()
+        except Exception as exc:
+            self._disable_redis(exc)
+            _syncs.labels(outcome="error").inc()
+            return
+
+        totals = replies[2 * backlog_len :: 2]
+        for (_key, state, window), total in zip(batch, totals):
+            if state.window != window:
+                continue  # rolled over while the pipeline was in flight
+            remote = max(0, int(total) - (state.own - state.pending))
+            delta = remote - state.remote
+            if delta > 0:
+                state.remote = remote
+                self._absorb_remote(state, delta)
+        _syncs.labels(outcome="ok").inc()
+
+    def _get_redis(self) -> Any:
+        if not self._redis_url or time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url, socket_timeout=1.0)
+        return self._redis
+
+    def _disable_redis(self, exc: Exception) -> None:
+        logger.warning("rate_limit_redis_unavailable", error=str(exc), cooldown=_REDIS_COOLDOWN)
+        self._redis_disabled_until = time.monotonic() + _REDIS_COOLDOWN
+
+
+class LocalSlidingWindowRateLimiter(LocalRateLimiter):
+    """Sliding-window counter over the cluster-wide window totals."""
+
+    def _available(self, item: RateLimitItem, state: _KeyState, now: float) -> float:
+        state.updated = now
+        elapsed = (now % state.expiry) / state.expiry
+        weighted = state.previous * (1.0 - elapsed) + state.own + state.remote
+        return item.amount - weighted
+
+    def _reset_time(self, item: RateLimitItem, state: _KeyState, now: float) -> float:
+        return (state.window + 1) * state.expiry
+
+
+class LocalTokenBucketRateLimiter(LocalRateLimiter):
+    """Token bucket of ``amount`` tokens refilled over one window."""
+
+    def _available(self, item: RateLimitItem, state: _KeyState, now: float) -> float:
+        rate = item.amount / state.expiry
+        state.tokens = min(float(item.amount), state.tokens + (now - state.updated) * rate)
+        state.updated = now
+        return state.tokens
+
+    def _reset_time(self, item: RateLimitItem, state: _KeyState, now: float) -> float:
+        return now + max(0.0, item.amount - state.tokens) * state.expiry / item.amount
+
+    def _consume(self, state: _KeyState, cost: int) -> None:
+        state.tokens -= cost
+
+    def _absorb_remote(self, state: _KeyState, delta: int) -> None:
+        state.tokens -= delta
+
+
+STRATEGIES["local-sliding-window"] = LocalSlidingWindowRateLimiter
+STRATEGIES["local-token-bucket"] = LocalTokenBucketRateLimiter
@@ -0,0 +1,73 @@
+"""Prometheus metric factories with a no-op fallback.
+
+prometheus_client is a production dependency (pulled in by
+prometheus-fastapi-instrumentator) but is optional in dev/test, mirroring the
+``try/except ImportError`` around the instrumentator in main.py.  Modules
+declare their metrics through these helpers so they never need to guard
+every ``.inc()`` / ``.observe()`` call.
+
+Metrics registered here live in the default registry and are therefore
+served by the ``/metrics`` endpoint exposed in main.py.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+try:
+    import prometheus_client as _prom
+except ImportError:  # pragma: no cover — prometheus_client not installed
+    _prom = None
+
+
+class _NoopMetric:
+    """Accepts every metric call and does nothing."""
+
+    def labels(self, *args: Any, **kwargs: Any) -> _NoopMetric:
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+_registry: dict[str, Any] = {}
+
+
+def _get_or_create(kind: str, name: str, documentation: str, **kwargs: Any) -> Any:
+    # Idempotent: modules re-imported in tests must not trip the
+    # "Duplicated timeseries" error from the default registry.
+    if name in _registry:
+        return _registry[name]
+    metric = _NoopMetric() if _prom is None else getattr(_prom, kind)(name, documentation, **kwargs)
+    _registry[name] = metric
+    return metric
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Any:
+    return _get_or_create("Counter", name, documentation, labelnames=labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Any:
+    return _get_or_create("Gauge", name, documentation, labelnames=labelnames)
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] | None = None,
+) -> Any:
+    kwargs: dict[str, Any] = {"labelnames": labelnames}
+    if buckets is not None:
+        kwargs["buckets"] = buckets
+    return _get_or_create("Histogram", name, documentation, **kwargs)
@@ -0,0 +1,173 @@
+"""Pure-ASGI HTTP middleware for the FastAPI app.
+
+Each ``@app.middleware("http")`` function or ``BaseHTTPMiddleware`` subclass
+runs the downstream app in a separate task. It relays the response through an
+in-memory stream and re-wraps streaming bodies, once per layer and once per
+request. The classes below instead act on the ASGI messages themselves:
+
+  TrailingSlashMiddleware    rewrites ``scope["path"]`` before routing
+  SecurityHeadersMiddleware  adds headers to ``http.response.start``
+  RateLimitMiddleware        slowapi's default limits, checked before the app
+  QueryStatsMiddleware       per-request DB query count / time (query_stats.py)
+
+RequestIDMiddleware (app/core/request_id.py) follows the same pattern.
+
+Behaviour matches the layers they replace. Body chunks are passed through
+untouched, so large and streaming responses are no longer buffered per layer.
+Non-HTTP scopes (websocket, lifespan) go straight to the wrapped app.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+
+# _should_exempt and Limiter._inject_asgi_headers are slowapi internals:
+# requirements.txt pins slowapi exactly, and tests/test_http_middleware.py
+# fails if an upgrade drops them.
+from slowapi.middleware import _should_exempt, async_check_limits
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import query_stats
+from app.core.config import settings
+
+_SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    ("Permissions-Policy", "camera=(), microphone=(), geolocation=()"),
+    ("X-XSS-Protection", "1; mode=block"),
+)
+_HSTS = ("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
+
+
+def _route_handler(routes: Iterable[BaseRoute], scope: Scope) -> Callable | None:
+    """Endpoint of the last route that fully matches *scope*, as slowapi picks it."""
+    handler = None
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL and hasattr(route, "endpoint"):
+            handler = route.endpoint
+    return handler
+
+
+class TrailingSlashMiddleware:
+    """Strip a trailing slash so ``/path`` and ``/path/`` hit the same route.
+
+    Nginx may forward requests with trailing slash (e.g. /api/v1/auth/login/)
+    while routes are registered without one.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path != "/" and path.endswith("/"):
+                scope["path"] = path.rstrip("/")
+        await self.app(scope, receive, send)
+
+
+class SecurityHeadersMiddleware:
+    """Add the standard hardening headers (and HSTS over https) to every response."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        https = scope.get("scheme") == "https"
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in _SECURITY_HEADERS:
+                    headers[name] = value
+                if https:
+                    headers[_HSTS[0]] = _HSTS[1]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class RateLimitMiddleware:
+    """Apply ``app.state.limiter`` default limits before the route runs.
+
+    Same checks as slowapi's ``SlowAPIMiddleware``. slowapi's own ASGI
+    variant re-sends ``http.response.start`` for every body chunk, which
+    breaks streaming responses, so it is not used here.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        app = scope["app"]
+        limiter = app.state.limiter
+        if not limiter.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        handler = _route_handler(app.routes, scope)
+        if _should_exempt(limiter, handler):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive=receive, send=send)
+        error_response, inject_headers = await async_check_limits(limiter, request, handler, app)
+        if error_response is not None:
+            await error_response(scope, receive, send)
+            return
+        if not inject_headers:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_limit_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                limiter._inject_asgi_headers(
+                    MutableHeaders(scope=message), request.state.view_rate_limit
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_limit_headers)
+
+
+class QueryStatsMiddleware:
+    """Count the statements and DB time spent on each request.
+
+    With ``DB_DEBUG_HEADERS`` on, the totals so far are also returned as
+    ``X-DB-Queries`` / ``X-DB-Time-Ms``. Statements run after the response
+    has started (streaming bodies, background tasks) are only logged.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = query_stats.begin()
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.DB_DEBUG_HEADERS:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.queries)
+                headers["X-DB-Time-Ms"] = str(stats.millis)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            query_stats.end("http", stats, token, path=scope["path"])
@@ -0,0 +1,301 @@
+"""Two-tier cache of authenticated principals.
+
+Both auth paths resolve the same thing: a JWT subject maps to a user with a
+role, tenant, hotel_unit and status.
+  - HTTP: ``get_current_user`` in dependencies.py.
+  - Socket.io: ``authenticate_connection`` in realtime/auth.py.
+
+Without a cache every authenticated request costs a ``select(User)``, and a
+reconnect storm after a deploy hits the same pool that API requests need.
+
+``Principal`` is an immutable snapshot of the columns those paths need:
+  (id, tenant_id, name, role, hotel_unit, status)
+It exposes them under the same names as the ORM ``User``; route handlers
+annotate ``current_user`` as ``Principal`` and load the row themselves on
+the rare occasion they need more than these columns.
+
+Tiers (keyed by ``(user_id, tenant_id)``):
+  1. In-process TTL map — ``PRINCIPAL_CACHE_TTL_SECONDS`` (default 60 s).
+  2. Redis JSON value ``principal:{tenant_id}:{user_id}`` —
+     ``PRINCIPAL_CACHE_REDIS_TTL_SECONDS`` (default 300 s), shared by all
+     replicas so a fresh replica does not start cold.
+  A miss on both tiers runs one column-only SELECT (``load_principal``).
+
+Invalidation:
+  ``invalidate_principal(user_id, tenant_id)`` is queued by user_service
+  (update, deactivation) and auth_service (password change) with
+  ``after_commit`` (app/core/after_commit.py), so it runs once the new row
+  is visible and cannot be undone by a reader of the old one.
+  - The local entries are dropped at once and the Redis key is deleted.
+  - A lookup that started before the invalidation does not store its
+    result (``put(..., loaded_at=stamp())``): it may have read the old row.
+  - The user id is published on ``<SOCKETIO_CHANNEL>:principal`` so other
+    replicas drop their local copy too.
+  - If Redis is unavailable, staleness is bounded by the local TTL.
+
+Non-ACTIVE users are cached as well; callers check ``status`` and produce
+their usual error, so a deactivated account is rejected without a DB hit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import counter
+from app.models.user import User
+
+logger = structlog.get_logger()
+
+_CACHE_MAX_SIZE = 10_000  # prevent unbounded memory growth
+_REDIS_COOLDOWN = 60.0
+_KEY_PREFIX = "principal"
+
+_lookups = counter(
+    "principal_cache_lookups_total",
+    "Principal cache lookups by auth path and result",
+    ["path", "result"],
+)
+_invalidations = counter(
+    "principal_cache_invalidations_total", "Principal cache invalidations by origin", ["origin"]
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: uuid.UUID
+    tenant_id: uuid.UUID | None
+    name: str
+    role: str
+    hotel_unit: str | None
+    status: str
+
+    @classmethod
+    def from_row(cls, row: Any) -> Principal:
+        return cls(
+            id=row.id,
+            tenant_id=row.tenant_id,
+            name=row.name,
+            role=row.role,
+            hotel_unit=row.hotel_unit,
+            status=row.status,
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["id"] = str(self.id)
+        data["tenant_id"] = str(self.tenant_id) if self.tenant_id else None
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> Principal:
+        data = json.loads(raw)
+        data["id"] = uuid.UUID(data["id"])
+        data["tenant_id"] = uuid.UUID(data["tenant_id"]) if data["tenant_id"] else None
+        return cls(**data)
+
+
+async def load_principal(
+    db: AsyncSession, user_id: uuid.UUID, tenant_id: uuid.UUID | None
+) -> Principal | None:
+    """Column-only lookup of the principal snapshot (no ORM entity)."""
+    stmt = select(
+        User.id, User.tenant_id, User.name, User.role, User.hotel_unit, User.status
+    ).where(User.id == user_id)
+    if tenant_id:
+        stmt = stmt.where(User.tenant_id == tenant_id)
+    else:
+        # Only SUPER_ADMIN users may have tenant_id=None
+        stmt = stmt.where(User.tenant_id.is_(None))
+    row = (await db.execute(stmt)).one_or_none()
+    return Principal.from_row(row) if row is not None else None
+
+
+def _key(user_id: Any, tenant_id: Any) -> tuple[str, str]:
+    return (str(user_id), str(tenant_id) if tenant_id else "")
+
+
+class PrincipalCache:
+    """In-process TTL map backed by a shared Redis tier."""
+
+    def __init__(
+        self,
+        ttl_seconds: float | None = None,
+        redis_url: str | None = None,
+        redis_ttl_seconds: int | None = None,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._redis_ttl = redis_ttl_seconds
+        self._redis_url = redis_url
+        self._entries: dict[tuple[str, str], tuple[Principal, float]] = {}
+        self._invalidated_at: dict[str, float] = {}
+        self._redis: Any = None
+        self._redis_disabled_until = 0.0
+        self._listener: asyncio.Task | None = None
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else float(settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+    @property
+    def redis_ttl(self) -> int:
+        if self._redis_ttl is not None:
+            return self._redis_ttl
+        return settings.PRINCIPAL_CACHE_REDIS_TTL_SECONDS
+
+    @property
+    def channel(self) -> str:
+        return f"{settings.SOCKETIO_CHANNEL}:principal"
+
+    @staticmethod
+    def redis_key(user_id: Any, tenant_id: Any) -> str:
+        return f"{_KEY_PREFIX}:{tenant_id or '-'}:{user_id}"
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    async def get(self, user_id: Any, tenant_id: Any, *, path: str) -> Principal | None:
+        """Return the cached principal, or None when both tiers miss."""
+        self.ensure_listener()
+        key = _key(user_id, tenant_id)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            _lookups.labels(path=path, result="hit").inc()
+            return entry[0]
+        if entry is not None:
+            self._entries.pop(key, None)
+
+        redis = self._get_redis() if self.redis_ttl > 0 else None
+        if redis is not None:
+            try:
+                raw = await redis.get(self.redis_key(*key))
+            except Exception as exc:
+                self._disable_redis(exc)
+                raw = None
+            if raw is not None:
+                principal = Principal.from_json(raw)
+                self._remember(key, principal)
+                _lookups.labels(path=path, result="redis_hit").inc()
+                return principal
+
+        _lookups.labels(path=path, result="miss").inc()
+        return None
+
+    @staticmethod
+    def stamp() -> float:
+        """Take before loading a principal; pass to ``put`` as ``loaded_at``."""
+        return time.monotonic()
+
+    async def put(self, principal: Principal, *, loaded_at: float | None = None) -> None:
+        """Cache *principal* unless it was invalidated after ``loaded_at``."""
+        if loaded_at is not None and self._invalidated_at.get(str(principal.id), -1.0) >= loaded_at:
+            return
+        key = _key(principal.id, principal.tenant_id)
+        self._remember(key, principal)
+        redis = self._get_redis() if self.redis_ttl > 0 else None
+        if redis is None:
+            return
+        try:
+            await redis.set(self.redis_key(*key), principal.to_json(), ex=self.redis_ttl)
+        except Exception as exc:
+            self._disable_redis(exc)
+
+    def _remember(self, key: tuple[str, str], principal: Principal) -> None:
+        if self.ttl <= 0:
+            return
+        if len(self._entries) >= _CACHE_MAX_SIZE:
+            self._entries.clear()
+        self._entries[key] = (principal, time.monotonic() + self.ttl)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def _drop_local(self, user_id: str) -> None:
+        for key in [k for k in self._entries if k[0] == user_id]:
+            self._entries.pop(key, None)
+        if len(self._invalidated_at) >= _CACHE_MAX_SIZE:
+            self._invalidated_at.clear()
+        self._invalidated_at[user_id] = time.monotonic()
+
+    async def invalidate_user(self, user_id: Any, tenant_id: Any = None) -> None:
+        """Drop the user from both tiers and tell the other replicas."""
+        user_id = str(user_id)
+        self._drop_local(user_id)
+        _invalidations.labels(origin="local").inc()
+
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(self.redis_key(user_id, tenant_id))
+            await redis.publish(self.channel, user_id)
+        except Exception as exc:
+            self._disable_redis(exc)
+
+    def ensure_listener(self) -> None:
+        """Start the cross-replica invalidation subscriber (idempotent)."""
+        if not self._redis_url or (self._listener is not None and not self._listener.done()):
+            return
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        import redis.asyncio as aioredis
+
+        while True:
+            pubsub = None
+            try:
+                pubsub = aioredis.from_url(self._redis_url).pubsub()
+                await pubsub.subscribe(self.channel)
+                # Entries cached while we were not subscribed may have missed
+                # an invalidation.
+                self._entries.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = message["data"]
+                    self._drop_local(data.decode() if isinstance(data, bytes) else str(data))
+                    _invalidations.labels(origin="remote").inc()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("principal_cache_listener_error", error=str(exc))
+                await asyncio.sleep(_REDIS_COOLDOWN)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+
+    def _get_redis(self) -> Any:
+        if not self._redis_url or time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url, socket_timeout=1.0)
+        return self._redis
+
+    def _disable_redis(self, exc: Exception) -> None:
+        logger.warning(
+            "principal_cache_redis_unavailable", error=str(exc), cooldown=_REDIS_COOLDOWN
+        )
+        self._redis_disabled_until = time.monotonic() + _REDIS_COOLDOWN
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache(redis_url=settings.REDIS_URL)
+
+
+async def invalidate_principal(user_id: Any, tenant_id: Any = None) -> None:
+    await principal_cache.invalidate_user(user_id, tenant_id)
@@ -0,0 +1,111 @@
+"""Per-request / per-job database usage accounting.
+
+database.py's engine hooks call ``record_query()`` after every statement.
+The time is added to the ``QueryStats`` of the current unit of work, which is
+an HTTP request (QueryStatsMiddleware) or an ARQ job (workers/config.py
+hooks), held in a contextvar.  SQLAlchemy's greenlet bridge carries the
+contextvar into the driver call, so no session plumbing is needed.
+
+At the end of a unit:
+  - ``db_queries`` / ``db_time_ms`` are bound into structlog context;
+  - the counts feed ``db_unit_queries`` / ``db_unit_seconds`` histograms;
+  - more than ``DB_QUERY_WARN_COUNT`` queries logs ``db_query_count_high``.
+    That is the usual signature of an N+1 or an eager-load cascade.
+
+Statements slower than ``DB_SLOW_QUERY_MS`` are logged with a fingerprint
+(literals and bind placeholders collapsed) so repeats group together.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import histogram
+
+logger = structlog.get_logger()
+
+_FINGERPRINT_MAX_LEN = 300
+
+_unit_queries = histogram(
+    "db_unit_queries",
+    "Database statements per HTTP request / ARQ job",
+    ["kind"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250, 500),
+)
+_unit_seconds = histogram("db_unit_seconds", "Database time per HTTP request / ARQ job", ["kind"])
+_query_seconds = histogram("db_query_seconds", "Duration of individual database statements")
+
+
+@dataclass(slots=True)
+class QueryStats:
+    queries: int = 0
+    seconds: float = 0.0
+
+    @property
+    def millis(self) -> float:
+        return round(self.seconds * 1000.0, 1)
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def begin() -> tuple[QueryStats, Token]:
+    """Start accounting for a new unit of work in the current context."""
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def end(kind: str, stats: QueryStats, token: Token, **log_fields) -> None:
+    """Close the unit: reset the contextvar, bind log context, observe metrics."""
+    _current.reset(token)
+    structlog.contextvars.bind_contextvars(db_queries=stats.queries, db_time_ms=stats.millis)
+    _unit_queries.labels(kind=kind).observe(stats.queries)
+    _unit_seconds.labels(kind=kind).observe(stats.seconds)
+    if settings.DB_QUERY_WARN_COUNT and stats.queries > settings.DB_QUERY_WARN_COUNT:
+        logger.warning(
+            "db_query_count_high",
+            kind=kind,
+            queries=stats.queries,
+            db_time_ms=stats.millis,
+            **log_fields,
+        )
+
+
+def record_query(statement: str, elapsed: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+    _query_seconds.observe(elapsed)
+    if settings.DB_SLOW_QUERY_MS and elapsed * 1000.0 >= settings.DB_SLOW_QUERY_MS:
+        text, digest = fingerprint(statement)
+        logger.warning(
+            "db_slow_query",
+            duration_ms=round(elapsed * 1000.0, 1),
+            fingerprint=digest,
+            statement=text,
+        )
+
+
+_WS_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"(?:\$\d+|%\(\w+\)s|:\w+|\?)")
+_LIST_RE = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+
+
+def fingerprint(statement: str) -> tuple[str, str]:
+    """Return ``(normalised statement, short digest)`` for grouping slow queries."""
+    text = _WS_RE.sub(" ", statement).strip()
+    text = _STRING_RE.sub("?", text)
+    text = _PARAM_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _LIST_RE.sub("(?+)", text)
+    digest = hashlib.sha1(text.encode()).hexdigest()[:12]
+    return text[:_FINGERPRINT_MAX_LEN], digest
@@ -1,7 +1,12 @@
 """Application-layer rate limiting via slowapi.
 
-Uses Redis as the storage backend for distributed rate limiting across
-multiple workers/containers. Falls back to in-memory if Redis is unavailable.
+slowapi supplies the decorators, the default-limit middleware and the 429
+handler.  The decisions come from the in-process strategies in
+local_rate_limit.py, which reconcile with Redis in periodic batches instead
+of one round trip per request (``RATE_LIMIT_STRATEGY``).
+
+n8n limits scale with the tenant's plan (``PLAN_N8N_RATE_LIMITS``).  The plan
+is recorded by the n8n auth dependency, which runs before the limit check.
 """
 
 from __future__ import annotations
@@ -11,6 +16,7 @@ from fastapi import Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from app.core import local_rate_limit  # noqa: F401 — registers the local-* strategies
 from app.core.config import settings
 
 logger = structlog.get_logger()
@@ -24,6 +30,16 @@ WEBHOOK_RATE_LIMIT = "1000/minute"
 N8N_RATE_LIMIT = "5000/minute"
 API_RATE_LIMIT = "100/minute"
 
+# Per-plan n8n limits; tenants with no (or an unknown) plan get N8N_RATE_LIMIT
+PLAN_N8N_RATE_LIMITS = {
+    "BASIC": N8N_RATE_LIMIT,
+    "PROFESSIONAL": "10000/minute",
+    "ENTERPRISE": "30000/minute",
+}
+
+_PLAN_CACHE_MAX_SIZE = 10_000  # prevent unbounded memory growth
+_tenant_plans: dict[str, str | None] = {}
+
 # ---------------------------------------------------------------------------
 # Key functions
 # ---------------------------------------------------------------------------
@@ -57,23 +73,35 @@ def get_api_key(request: Request) -> str:
     return get_client_ip(request)
 
 
+# ---------------------------------------------------------------------------
+# Plan-aware limits
+# ---------------------------------------------------------------------------
+
+
+def remember_tenant_plan(slug: str, plan: str | None) -> None:
+    """Record *slug*'s plan for ``n8n_rate_limit`` (called by n8n auth)."""
+    if _tenant_plans.get(slug, "") == plan:
+        return
+    if len(_tenant_plans) >= _PLAN_CACHE_MAX_SIZE:
+        _tenant_plans.clear()
+    _tenant_plans[slug] = plan
+
+
+def n8n_rate_limit(key: str) -> str:
+    """Dynamic n8n limit for an X-API-Key ``{tenantSlug}:{channelId}`` key."""
+    plan = _tenant_plans.get(key.split(":", 1)[0])
+    return PLAN_N8N_RATE_LIMITS.get((plan or "").upper(), N8N_RATE_LIMIT)
+
+
 # ---------------------------------------------------------------------------
 # Limiter instance
 # ---------------------------------------------------------------------------
 
-_storage_uri: str | None = None
-try:
-    # Validate Redis URL is usable for slowapi storage
-    redis_url = settings.REDIS_URL
-    if redis_url:
-        _storage_uri = redis_url
-        logger.info("rate_limit.storage", backend="redis", url=redis_url.split("@")[-1])
-except Exception as exc:
-    logger.warning("rate_limit.redis_unavailable", error=str(exc), fallback="memory")
+logger.info("rate_limit.strategy", strategy=settings.RATE_LIMIT_STRATEGY)
 
 limiter = Limiter(
     key_func=get_client_ip,
     default_limits=[API_RATE_LIMIT],
-    storage_uri=_storage_uri,
-    strategy="fixed-window",
+    storage_uri="memory://",
+    strategy=settings.RATE_LIMIT_STRATEGY,
 )
@@ -0,0 +1,160 @@
+"""Routing of read-only sessions between the primary and a read replica.
+
+Problem:
+  List, report, dashboard and export endpoints share one engine with the
+  webhook and send paths.  A heavy report holds primary connections (and a
+  read-write transaction that is committed for nothing) while inbound
+  messages wait for the pool.
+
+Solution:
+  When ``DATABASE_READ_URL`` is set, database.py builds a second engine and
+  ``get_read_db`` (dependencies.py) opens its session from
+  ``ReplicaRouter.use_replica()``.  The replica is skipped:
+
+  - while its measured lag exceeds ``DATABASE_REPLICA_MAX_LAG_SECONDS``, or
+    the lag probe fails.  The probe is re-run at most every
+    ``DATABASE_REPLICA_LAG_CHECK_SECONDS``.
+  - for ``READ_YOUR_WRITES_SECONDS`` after the requesting user committed a
+    write.  ``get_db`` calls ``mark_write()`` after every commit that
+    changed rows, so a user who saves a record and goes back to the list
+    sees the change.
+
+Sticky marks are kept in-process and mirrored to Redis
+(``rw:sticky:{user_id}`` with a TTL), so the user's next request can land
+on another API replica.  If Redis is unavailable, only the local mark is
+used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import structlog
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.metrics import counter, gauge
+
+logger = structlog.get_logger()
+
+_CACHE_MAX_SIZE = 10_000  # prevent unbounded memory growth
+_REDIS_COOLDOWN = 30.0
+_STICKY_PREFIX = "rw:sticky"
+
+# 0 when the replica has replayed everything it received; otherwise the age
+# of the last replayed transaction.
+_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+_routes = counter(
+    "db_read_routes_total", "get_read_db sessions by target and reason", ["target", "reason"]
+)
+_lag = gauge("db_replica_lag_seconds", "Last measured read-replica replay lag")
+
+
+class ReplicaRouter:
+    """Decides per request whether a read may go to the replica."""
+
+    def __init__(self, replica_engine: Any, redis_url: str | None = None) -> None:
+        self._engine = replica_engine
+        self._redis_url = redis_url
+        self._healthy = False
+        self._next_check = 0.0
+        self._check_lock = asyncio.Lock()
+        self._sticky: dict[str, float] = {}
+        self._redis: Any = None
+        self._redis_disabled_until = 0.0
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    async def use_replica(self, user_id: Any) -> bool:
+        if not await self._replica_healthy():
+            _routes.labels(target="primary", reason="lag").inc()
+            return False
+        if user_id is not None and await self._is_sticky(str(user_id)):
+            _routes.labels(target="primary", reason="sticky").inc()
+            return False
+        _routes.labels(target="replica", reason="ok").inc()
+        return True
+
+    async def _replica_healthy(self) -> bool:
+        if time.monotonic() < self._next_check:
+            return self._healthy
+        async with self._check_lock:
+            if time.monotonic() < self._next_check:
+                return self._healthy
+            self._healthy = await self._probe()
+            self._next_check = time.monotonic() + settings.DATABASE_REPLICA_LAG_CHECK_SECONDS
+        return self._healthy
+
+    async def _probe(self) -> bool:
+        if self._engine.dialect.name != "postgresql":
+            return True
+        try:
+            async with self._engine.connect() as conn:
+                lag = float((await conn.execute(_LAG_SQL)).scalar() or 0.0)
+        except Exception as exc:
+            logger.warning("db_replica_probe_failed", error=str(exc))
+            return False
+        _lag.set(lag)
+        if lag > settings.DATABASE_REPLICA_MAX_LAG_SECONDS:
+            logger.warning("db_replica_lagging", lag_seconds=round(lag, 2))
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Read-your-writes
+    # ------------------------------------------------------------------
+
+    async def mark_write(self, user_id: Any) -> None:
+        """Pin *user_id*'s reads to the primary for READ_YOUR_WRITES_SECONDS."""
+        window = settings.READ_YOUR_WRITES_SECONDS
+        if user_id is None or window <= 0:
+            return
+        user_id = str(user_id)
+        if len(self._sticky) >= _CACHE_MAX_SIZE:
+            self._sticky.clear()
+        self._sticky[user_id] = time.monotonic() + window
+
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(f"{_STICKY_PREFIX}:{user_id}", b"1", px=int(window * 1000))
+        except Exception as exc:
+            self._disable_redis(exc)
+
+    async def _is_sticky(self, user_id: str) -> bool:
+        deadline = self._sticky.get(user_id)
+        if deadline is not None:
+            if deadline > time.monotonic():
+                return True
+            self._sticky.pop(user_id, None)
+
+        redis = self._get_redis()
+        if redis is None:
+            return False
+        try:
+            return bool(await redis.exists(f"{_STICKY_PREFIX}:{user_id}"))
+        except Exception as exc:
+            self._disable_redis(exc)
+            return False
+
+    def _get_redis(self) -> Any:
+        if not self._redis_url or time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url, socket_timeout=1.0)
+        return self._redis
+
+    def _disable_redis(self, exc: Exception) -> None:
+        logger.warning("read_replica_redis_unavailable", error=str(exc), cooldown=_REDIS_COOLDOWN)
+        self._redis_disabled_until = time.monotonic() + _REDIS_COOLDOWN
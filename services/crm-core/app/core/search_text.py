@@ -0,0 +1,78 @@
+"""Normalised search keys and trigram helpers.
+
+Problem:
+  Inbox and contact searches were ``ILIKE '%term%'`` ORs over five or six
+  columns.  No index can serve them, so every search scanned the whole
+  tenant, and "Joao" never matched "João".
+
+Solution:
+  Searchable rows carry denormalised keys, written by the application
+  (as with ``Contact.full_name``):
+
+  - ``search_text``: the searchable fields folded to lower case with the
+    accents stripped (``normalize_search_text``), so Portuguese names match
+    however they are typed.
+  - ``phone_digits``: the digits of every phone field (``phone_digits``), so
+    "+55 (11) 99999-0000", "11999990000" and "99990000" all match.
+
+  PostgreSQL serves substring matches on both through pg_trgm GIN indexes
+  (``LIKE '%term%'`` with three or more characters) and shorter prefix
+  matches through a btree on (tenant_id, search_text).  Search terms are
+  normalised in Python with the same function, so the column never needs
+  ``unaccent()``, which is not IMMUTABLE and cannot be indexed directly.
+
+  ``Similarity()`` compiles to pg_trgm's function on PostgreSQL and to a
+  constant elsewhere, so SQLite tests run the same queries unranked.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+from sqlalchemy import Float
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_DIGITS = re.compile(r"\D+")
+
+# pg_trgm GIN indexes only help patterns with at least one full trigram
+TRIGRAM_MIN_LENGTH = 3
+
+
+def normalize_search_text(*values: str | None) -> str:
+    """Lower-case, accent-free, single-spaced join of ``values``."""
+    text = " ".join(v for v in values if v)
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _WHITESPACE.sub(" ", stripped.casefold()).strip()
+
+
+def phone_digits(*values: str | None) -> str:
+    """Space-separated digit-only forms of the given phone numbers."""
+    return " ".join(d for d in (_NON_DIGITS.sub("", v) for v in values if v) if d)
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcard characters (use with ``escape="\\\\"``)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class Similarity(FunctionElement):
+    """pg_trgm ``similarity(a, b)``; 0 on other dialects."""
+
+    type = Float()
+    name = "similarity"
+    inherit_cache = True
+
+
+@compiles(Similarity)
+def _similarity_default(element, compiler, **kw):
+    # Not "0": a bare integer in ORDER BY is read as a column position
+    return "0.0"
+
+
+@compiles(Similarity, "postgresql")
+def _similarity_postgresql(element, compiler, **kw):
+    return f"similarity({compiler.process(element.clauses, **kw)})"
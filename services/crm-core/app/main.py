@@ -6,11 +6,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
 
 from app.core.config import settings
 from app.core.exceptions import AppException
+from app.core.middleware import (
+    QueryStatsMiddleware,
+    RateLimitMiddleware,
+    SecurityHeadersMiddleware,
+    TrailingSlashMiddleware,
+)
 from app.core.rate_limit import limiter
+from app.core.request_id import RequestIDMiddleware
 
 # Socket.io server must be imported before the FastAPI app is built so that
 # the sio instance is created and event handlers are registered at startup.
@@ -25,6 +31,16 @@ async def lifespan(app: FastAPI):
     yield
     # --- Graceful shutdown (HIGH-001) ---
     logger.info("CRM Core shutting down — cleaning up resources")
+    try:
+        from app.realtime.emit_bus import flush_emit_bus
+        await flush_emit_bus()
+    except Exception:
+        pass
+    try:
+        from app.core.audit_writer import flush_audit_log
+        await flush_audit_log()
+    except Exception:
+        logger.exception("audit_flush_on_shutdown_failed")
     try:
         from app.services.hbook_scraper import hbook_scraper_service
         await hbook_scraper_service.close_browser()
@@ -57,52 +73,33 @@ app.add_middleware(
 )
 
 # ---------------------------------------------------------------------------
+# HTTP middleware — all pure ASGI (app/core/middleware.py).  The last one
+# added is the outermost, so requests pass through them bottom-up:
+#   security headers -> trailing slash -> rate limit -> request ID
+#   -> query stats -> CORS
+# ---------------------------------------------------------------------------
+
+# Per-request DB query count / time (app/core/query_stats.py).  Inside the
+# request ID layer so db_query_count_high warnings carry the request_id.
+app.add_middleware(QueryStatsMiddleware)
+
 # Request ID middleware (MED-006) — must be added before rate limiting so
 # that the request_id is available in structlog context for all downstream
 # middleware and route handlers.
-# ---------------------------------------------------------------------------
-from app.core.request_id import RequestIDMiddleware  # noqa: E402
 app.add_middleware(RequestIDMiddleware)
 
-# ---------------------------------------------------------------------------
 # Rate limiting middleware (after CORS so preflight requests are not limited)
-# ---------------------------------------------------------------------------
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-app.add_middleware(SlowAPIMiddleware)
-
+app.add_middleware(RateLimitMiddleware)
 
-# ---------------------------------------------------------------------------
-# Security headers middleware
-# ---------------------------------------------------------------------------
+# Trailing-slash normalization.  Nginx may forward requests with trailing
+# slash (e.g. /api/v1/auth/login/).  Routes are registered without trailing
+# slash, so both /path and /path/ resolve to the same handler.
+app.add_middleware(TrailingSlashMiddleware)
 
-# ---------------------------------------------------------------------------
-# Trailing-slash normalization middleware
-# Nginx may forward requests with trailing slash (e.g. /api/v1/auth/login/).
-# Routes are registered without trailing slash. This middleware strips it
-# so both /path and /path/ resolve to the same handler.
-# ---------------------------------------------------------------------------
-
-@app.middleware("http")
-async def strip_trailing_slash_middleware(request: Request, call_next):
-    path = request.scope["path"]
-    if path != "/" and path.endswith("/"):
-        request.scope["path"] = path.rstrip("/")
-    response = await call_next(request)
-    return response
-
-
-@app.middleware("http")
-async def security_headers_middleware(request: Request, call_next):
-    response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    if request.url.scheme == "https":
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    return response
+# Security headers
+app.add_middleware(SecurityHeadersMiddleware)
 
 
 # ---------------------------------------------------------------------------
@@ -185,6 +182,7 @@ from app.api.v1 import (  # noqa: E402
     webhook_events,
     lgpd,
     media,
+    presence,
 )
 from app.webhooks import whatsapp as wa_webhook  # noqa: E402
 from app.webhooks import messenger as msg_webhook  # noqa: E402
@@ -277,6 +275,9 @@ app.include_router(
 app.include_router(
     media.router, prefix=f"{settings.API_PREFIX}/media", tags=["Media"]
 )
+app.include_router(
+    presence.router, prefix=f"{settings.API_PREFIX}/presence", tags=["Presence"]
+)
 
 # ---------------------------------------------------------------------------
 # N8N integration routes (X-API-Key auth — higher rate limit: 5000 req/min)
@@ -35,6 +35,7 @@ from app.models.conversation import Conversation
 from app.models.message import Message
 from app.models.escalation import Escalation
 from app.models.media_file import MediaFile
+from app.models.conversation_inbox_state import ConversationInboxState, ConversationReadCursor
 
 # Operational / observability models
 from app.models.webhook_event import WebhookEvent
@@ -81,6 +82,8 @@ __all__ = [
     "Message",
     "Escalation",
     "MediaFile",
+    "ConversationInboxState",
+    "ConversationReadCursor",
     # Operational / observability
     "WebhookEvent",
     "UsageTracking",
@@ -2,10 +2,11 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Index, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.search_text import normalize_search_text, phone_digits
 from app.models.base import TenantBase
 
 if TYPE_CHECKING:
@@ -19,6 +20,26 @@ class Contact(TenantBase):
         # Composite index for multi-tenant email lookups — avoids full-table
         # scans when filtering contacts by email within a tenant scope.
         Index("ix_contacts_tenant_id_email", "tenant_id", "email"),
+        # Contact search (app/services/contact_search.py): trigram GIN indexes
+        # for substring matches, a pattern-ops btree for short prefixes.
+        Index(
+            "ix_contacts_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_contacts_phone_digits_trgm",
+            "phone_digits",
+            postgresql_using="gin",
+            postgresql_ops={"phone_digits": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_contacts_tenant_id_search_text",
+            "tenant_id",
+            "search_text",
+            postgresql_ops={"search_text": "text_pattern_ops"},
+        ),
     )
 
     # Personal identity
@@ -42,6 +63,18 @@ class Contact(TenantBase):
     company_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     designation: Mapped[str | None] = mapped_column(String(150), nullable=True)
 
+    # Search keys — maintained by _refresh_search_keys below
+    search_text: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Computed: accent-free lower-case names, email and company",
+    )
+    phone_digits: Mapped[str | None] = mapped_column(
+        String(120),
+        nullable=True,
+        comment="Computed: digit-only mobile_no and phone",
+    )
+
     # Classification FKs — nullable because contacts can exist without these
     industry_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
@@ -85,3 +118,41 @@ class Contact(TenantBase):
 
     def __repr__(self) -> str:
         return f"<Contact id={self.id} tenant_id={self.tenant_id}>"
+
+
+def contact_search_keys(
+    *,
+    full_name: str | None = None,
+    first_name: str | None = None,
+    last_name: str | None = None,
+    email: str | None = None,
+    company_name: str | None = None,
+    mobile_no: str | None = None,
+    phone: str | None = None,
+) -> dict[str, str | None]:
+    """search_text / phone_digits values for a contact's fields."""
+    return {
+        "search_text": normalize_search_text(
+            full_name or " ".join(p for p in (first_name, last_name) if p),
+            email,
+            company_name,
+        )
+        or None,
+        "phone_digits": phone_digits(mobile_no, phone) or None,
+    }
+
+
+@event.listens_for(Contact, "before_insert")
+@event.listens_for(Contact, "before_update")
+def _refresh_search_keys(mapper, connection, target: Contact) -> None:
+    keys = contact_search_keys(
+        full_name=target.full_name,
+        first_name=target.first_name,
+        last_name=target.last_name,
+        email=target.email,
+        company_name=target.company_name,
+        mobile_no=target.mobile_no,
+        phone=target.phone,
+    )
+    target.search_text = keys["search_text"]
+    target.phone_digits = keys["phone_digits"]
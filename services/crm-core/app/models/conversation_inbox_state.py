@@ -0,0 +1,107 @@
+"""Inbox read model — one row per conversation, plus per-user read cursors.
+
+The conversation sidebar shows, for every thread, the last message preview,
+its sender, how many guest messages are waiting and since when.  Deriving
+that from ``messages`` on every inbox load means a lateral/aggregate query
+per conversation, so it is kept here instead and updated in the same
+transaction that writes the message (see app/services/inbox_state_service.py).
+
+ConversationInboxState
+  last_message_*             the newest message (out-of-order deliveries
+                             never replace a newer one)
+  unread_count               inbound messages since the last reply or the
+                             last time someone opened the thread
+  first_unanswered_inbound_at  oldest inbound message still without a reply
+  last_inbound_at            newest inbound message, compared against the
+                             read cursors below
+  message_count              every message in the thread, served as the
+                             ``total`` of GET /conversations/{id}/messages
+
+ConversationReadCursor
+  How far each user has read a conversation.  A thread is unread for a user
+  while ``last_inbound_at`` is newer than their ``last_read_at``.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ConversationInboxState(Base):
+    """Denormalised sidebar state of a conversation (1:1 with conversations)."""
+
+    __tablename__ = "conversation_inbox_state"
+
+    conversation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("conversations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    last_message_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    last_message_preview: Mapped[str | None] = mapped_column(String(160), nullable=True)
+    last_message_type: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    last_message_direction: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    last_sender_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_message_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    first_unanswered_inbound_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Oldest inbound message not yet followed by an outbound reply",
+    )
+    last_inbound_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    message_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ConversationInboxState conversation_id={self.conversation_id} "
+            f"unread_count={self.unread_count}>"
+        )
+
+
+class ConversationReadCursor(Base):
+    """The last message a user has seen in a conversation."""
+
+    __tablename__ = "conversation_read_cursors"
+
+    conversation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("conversations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    last_read_message_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+
+    last_read_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ConversationReadCursor conversation_id={self.conversation_id} "
+            f"user_id={self.user_id}>"
+        )
@@ -42,6 +42,8 @@ class Message(TenantBase):
         # Chronological fetch within a single conversation (no tenant scope
         # needed here because conversation_id already implies the tenant)
         Index("ix_messages_conversation_id_timestamp", "conversation_id", "timestamp"),
+        # Full-text search: ix_messages_tenant_id_search, a PostgreSQL-only GIN
+        # expression index created by migration 0004 (message_search_service).
     )
 
     # --- Foreign keys ---
@@ -116,10 +118,14 @@ class Message(TenantBase):
 
     # --- Relationships ---
 
+    # Never loaded implicitly: a selectin here also pulled the conversation's
+    # contact / assigned_to / tags for every message SELECT.  Call sites that
+    # need it use selectinload()/joinedload() explicitly; anything else
+    # raises instead of issuing hidden queries.
     conversation: Mapped["Conversation"] = relationship(
         "Conversation",
         back_populates="messages",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     # Media attachments — noload because they are fetched on-demand in the
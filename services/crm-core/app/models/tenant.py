@@ -3,7 +3,7 @@ from datetime import datetime
 
 from sqlalchemy import DateTime, String, Text, func  # noqa: F401 — Text kept for non-encrypted columns
 
-from app.core.encrypted_column import EncryptedText
+from app.core.encrypted_column import EncryptedText, decrypted_property
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -30,19 +30,31 @@ class Tenant(Base):
     # Branding
     logo_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
+    # Channel access tokens are stored encrypted and decrypted only when read
+    # (app/core/encrypted_column.py).
+    #
     # WhatsApp Cloud API
     whatsapp_phone_number_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    whatsapp_access_token: Mapped[str | None] = mapped_column(EncryptedText, nullable=True)
+    _whatsapp_access_token: Mapped[str | None] = mapped_column(
+        "whatsapp_access_token", EncryptedText(lazy=True), nullable=True
+    )
+    whatsapp_access_token = decrypted_property("_whatsapp_access_token")
     whatsapp_verify_token: Mapped[str | None] = mapped_column(String(255), nullable=True)
     whatsapp_webhook_secret: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     # Instagram
     instagram_page_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    instagram_access_token: Mapped[str | None] = mapped_column(EncryptedText, nullable=True)
+    _instagram_access_token: Mapped[str | None] = mapped_column(
+        "instagram_access_token", EncryptedText(lazy=True), nullable=True
+    )
+    instagram_access_token = decrypted_property("_instagram_access_token")
 
     # Messenger
     messenger_page_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    messenger_access_token: Mapped[str | None] = mapped_column(EncryptedText, nullable=True)
+    _messenger_access_token: Mapped[str | None] = mapped_column(
+        "messenger_access_token", EncryptedText(lazy=True), nullable=True
+    )
+    messenger_access_token = decrypted_property("_messenger_access_token")
 
     # Billing (Stripe)
     stripe_customer_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
@@ -10,7 +10,9 @@ Example:
 This is intentionally separate from the standard JWT Bearer auth so that
 N8N workflows can authenticate without issuing a user-scoped JWT.
 
-The resolved Tenant ORM instance is injected into each route handler.
+The resolved TenantSnapshot (app/n8n/tenant_cache.py) is injected into each
+route handler.  It carries the Tenant attributes the n8n routes and channel
+adapters read, with tokens decrypted on access.
 request.state.tenant_id is also set so downstream utilities that read
 from request.state (e.g. logging middleware) work correctly.
 """
@@ -19,25 +21,57 @@ from __future__ import annotations
 
 import structlog
 from fastapi import Depends, Header, Request
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.exceptions import ForbiddenError, UnauthorizedError
-from app.models.tenant import Tenant
+from app.core.exceptions import AppException, ForbiddenError, UnauthorizedError
+from app.core.rate_limit import remember_tenant_plan
+from app.n8n.tenant_cache import TenantSnapshot, load_tenant_snapshot, n8n_auth_cache
 
 logger = structlog.get_logger()
 
 
+def _check_tenant(tenant: TenantSnapshot | None, slug: str, phone_id: str) -> None:
+    """Raise the auth error for *tenant* / *phone_id*, if any."""
+    if not tenant:
+        logger.warning(
+            "N8N auth: tenant not found",
+            slug=slug,
+        )
+        raise UnauthorizedError(f"Tenant with slug '{slug}' not found")
+
+    if tenant.status != "ACTIVE":
+        raise ForbiddenError("Tenant is not active")
+
+    # Validate the secret portion against known channel identifiers.
+    # Support WhatsApp phone_number_id, Messenger page_id, or Instagram account_id
+    # so non-WhatsApp tenants can also authenticate with N8N.
+    if not tenant.channel_ids:
+        raise ForbiddenError(
+            "Tenant does not have any channel configured (no phone_number_id, "
+            "page_id, or instagram_account_id)"
+        )
+
+    if phone_id not in tenant.channel_ids:
+        logger.warning(
+            "N8N auth: invalid channel identifier",
+            slug=slug,
+        )
+        raise UnauthorizedError("Invalid API key — channel identifier does not match")
+
+
 async def get_n8n_tenant(
     request: Request,
     x_api_key: str | None = Header(None, alias="X-API-Key"),
     db: AsyncSession = Depends(get_db),
-) -> Tenant:
+) -> TenantSnapshot:
     """Authenticate N8N requests via X-API-Key header.
 
     Format: {tenantSlug}:{whatsappPhoneNumberId}
 
+    Both accepted and rejected keys are cached (app/n8n/tenant_cache.py),
+    so a steady stream of calls with one key costs no database work.
+
     Raises:
         UnauthorizedError: if the header is missing, malformed, or the
                            tenant slug does not exist.
@@ -59,47 +93,28 @@ async def get_n8n_tenant(
             "Expected format: {tenantSlug}:{whatsappPhoneNumberId}"
         )
 
-    result = await db.execute(
-        select(Tenant).where(Tenant.slug == slug)
-    )
-    tenant = result.scalar_one_or_none()
-
-    if not tenant:
-        logger.warning(
-            "N8N auth: tenant not found",
-            slug=slug,
-        )
-        raise UnauthorizedError(f"Tenant with slug '{slug}' not found")
-
-    if tenant.status != "ACTIVE":
-        raise ForbiddenError("Tenant is not active")
-
-    # Validate the secret portion against known channel identifiers.
-    # Support WhatsApp phone_number_id, Messenger page_id, or Instagram account_id
-    # so non-WhatsApp tenants can also authenticate with N8N.
-    valid_ids = [
-        getattr(tenant, "whatsapp_phone_number_id", None),
-        getattr(tenant, "messenger_page_id", None),
-        getattr(tenant, "instagram_page_id", None),
-    ]
-    valid_ids = [v for v in valid_ids if v]
-
-    if not valid_ids:
-        raise ForbiddenError(
-            "Tenant does not have any channel configured (no phone_number_id, "
-            "page_id, or instagram_account_id)"
-        )
-
-    if phone_id not in valid_ids:
-        logger.warning(
-            "N8N auth: invalid channel identifier",
-            slug=slug,
-        )
-        raise UnauthorizedError("Invalid API key — channel identifier does not match")
+    cached = n8n_auth_cache.get(x_api_key)
+    if isinstance(cached, AppException):
+        raise cached
+    tenant = cached
+    if tenant is None:
+        loaded_at = n8n_auth_cache.stamp()
+        tenant = await load_tenant_snapshot(db, slug)
+        try:
+            _check_tenant(tenant, slug, phone_id)
+        except AppException as exc:
+            n8n_auth_cache.put_error(
+                x_api_key, slug, tenant.id if tenant else None, exc, loaded_at=loaded_at
+            )
+            raise
+        n8n_auth_cache.put_tenant(x_api_key, tenant, loaded_at=loaded_at)
 
     # Populate request.state so logging middleware and other utilities can
     # read the tenant without an extra argument.
     request.state.tenant_id = tenant.id
+    # The route's rate limit is checked after this dependency and scales
+    # with the plan (app/core/rate_limit.py).
+    remember_tenant_plan(tenant.slug, tenant.plan)
 
     logger.info(
         "N8N request authenticated",
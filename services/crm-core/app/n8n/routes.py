@@ -34,7 +34,7 @@ from typing import Annotated, Any
 import structlog
 from fastapi import APIRouter, Depends, Request, status
 
-from app.core.rate_limit import N8N_RATE_LIMIT, get_api_key, limiter
+from app.core.rate_limit import get_api_key, limiter, n8n_rate_limit
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -46,12 +46,12 @@ from app.channels.base import (
 )
 from app.channels.router import channel_router, get_adapter
 from app.channels.whatsapp import WhatsAppAdapter
+from app.core.after_commit import after_commit
 from app.core.database import get_db
 from app.core.exceptions import BadRequestError, NotFoundError
 from app.models.conversation import Conversation
 from app.models.escalation import Escalation
 from app.models.message import Message
-from app.models.tenant import Tenant
 from app.n8n.auth import get_n8n_tenant
 from app.n8n.schemas import (
     CheckAvailabilityRequest,
@@ -71,6 +71,9 @@ from app.n8n.schemas import (
     SendTextRequest,
     SetHotelUnitRequest,
 )
+from app.n8n.tenant_cache import TenantSnapshot
+from app.realtime.conversation_acl import invalidate_conversation_acl
+from app.services.inbox_state_service import inbox_state_service
 
 logger = structlog.get_logger()
 
@@ -78,7 +81,7 @@ router = APIRouter()
 
 # Type aliases for dependency injection
 DB = Annotated[AsyncSession, Depends(get_db)]
-N8NTenant = Annotated[Tenant, Depends(get_n8n_tenant)]
+N8NTenant = Annotated[TenantSnapshot, Depends(get_n8n_tenant)]
 
 # ---------------------------------------------------------------------------
 # Channel auto-detect cache
@@ -246,6 +249,8 @@ async def _save_outbound_message(
                 .where(Conversation.id == conversation.id)
                 .values(last_message_at=datetime.now(timezone.utc))
             )
+            await db.flush()
+            await inbox_state_service.record_message(db, message)
 
             await db.commit()
     except Exception as exc:
@@ -348,7 +353,7 @@ async def _find_active_conversation(
     summary="Send text message",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def send_text(
     request: Request,
     body: SendTextRequest,
@@ -397,7 +402,7 @@ async def send_text(
     summary="Send interactive buttons (max 3)",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def send_buttons(
     request: Request,
     body: SendButtonsRequest,
@@ -452,7 +457,7 @@ async def send_buttons(
     summary="Send interactive list (max 10 sections)",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def send_list(
     request: Request,
     body: SendListRequest,
@@ -529,7 +534,7 @@ async def send_list(
     summary="Send media message (image/video/audio/document)",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def send_media(
     request: Request,
     body: SendMediaRequest,
@@ -613,7 +618,7 @@ async def send_media(
     summary="Send approved template message",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def send_template(
     request: Request,
     body: SendTemplateRequest,
@@ -668,7 +673,7 @@ async def send_template(
     summary="Send carousel template or interactive carousel",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def send_carousel(
     request: Request,
     body: SendCarouselRequest,
@@ -871,7 +876,7 @@ async def send_carousel(
     summary="Send quick reply buttons (max 13)",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def send_quick_replies(
     request: Request,
     body: SendQuickRepliesRequest,
@@ -922,7 +927,7 @@ async def send_quick_replies(
     status_code=status.HTTP_200_OK,
     response_model=IaLockResponse,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def check_ia_lock(
     request: Request,
     body: CheckIaLockRequest,
@@ -965,7 +970,7 @@ async def check_ia_lock(
     summary="Escalate conversation to human attendant",
     status_code=status.HTTP_201_CREATED,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def escalate(
     request: Request,
     body: EscalateRequest,
@@ -991,6 +996,8 @@ async def escalate(
         .where(Conversation.id == conversation.id)
         .values(**update_data)
     )
+    if body.hotel_unit:
+        after_commit(db, invalidate_conversation_acl, conversation.id)
 
     # Create escalation record
     escalation = Escalation(
@@ -1005,6 +1012,7 @@ async def escalate(
     db.add(escalation)
 
     # Import message history if provided
+    history: list[Message] = []
     if body.message_history:
         for item in body.message_history:
             direction = "INBOUND" if item.role in ("user", "customer") else "OUTBOUND"
@@ -1019,8 +1027,11 @@ async def escalate(
                 metadata_json={"importedFromN8N": True},
             )
             db.add(hist_msg)
+            history.append(hist_msg)
 
     await db.flush()
+    if history:
+        await inbox_state_service.record_messages(db, history)
     await db.refresh(escalation)
 
     logger.info(
@@ -1056,7 +1067,7 @@ async def escalate(
     summary="Set hotel unit for an active conversation",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def set_hotel_unit(
     request: Request,
     body: SetHotelUnitRequest,
@@ -1075,6 +1086,7 @@ async def set_hotel_unit(
         .values(hotel_unit=body.hotel_unit)
     )
     await db.flush()
+    after_commit(db, invalidate_conversation_acl, conversation.id)
 
     logger.info(
         "N8N set-hotel-unit: updated",
@@ -1097,7 +1109,7 @@ async def set_hotel_unit(
     summary="Mark follow-up as sent and flag conversation as opportunity",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def mark_followup_sent(
     request: Request,
     body: MarkFollowupRequest,
@@ -1132,6 +1144,7 @@ async def mark_followup_sent(
         )
     )
     await db.flush()
+    after_commit(db, invalidate_conversation_acl, conversation.id)
 
     logger.info(
         "N8N mark-followup-sent: conversation marked as opportunity",
@@ -1155,7 +1168,7 @@ async def mark_followup_sent(
     summary="Mark conversation as sales opportunity",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def mark_opportunity(
     request: Request,
     body: MarkOpportunityRequest,
@@ -1197,6 +1210,7 @@ async def mark_opportunity(
         )
     )
     await db.flush()
+    after_commit(db, invalidate_conversation_acl, conversation.id)
 
     logger.info(
         "N8N mark-opportunity: conversation marked",
@@ -1221,7 +1235,7 @@ async def mark_opportunity(
     summary="Mark messages as read for a contact",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def mark_read(
     request: Request,
     body: MarkReadRequest,
@@ -1286,7 +1300,7 @@ async def mark_read(
     summary="Check room availability via HBook scraper",
     status_code=status.HTTP_200_OK,
 )
-@limiter.limit(N8N_RATE_LIMIT, key_func=get_api_key)
+@limiter.limit(n8n_rate_limit, key_func=get_api_key)
 async def check_availability(
     request: Request,
     body: CheckAvailabilityRequest,
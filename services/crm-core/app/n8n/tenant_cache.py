@@ -0,0 +1,333 @@
+"""Per-API-key cache of n8n authentication outcomes.
+
+n8n calls arrive at up to ``N8N_RATE_LIMIT`` per key while conversations
+are live.  ``get_n8n_tenant`` used to resolve ``{tenantSlug}:{channelId}``
+with a full ``select(Tenant)`` on every one of them.
+
+``TenantSnapshot`` is an immutable copy of the columns the n8n routes and
+the channel adapters need: id, slug, plan, status, the channel ids and the
+three access tokens.  Tokens are kept as ciphertext and decrypted on
+attribute access through the process-local LRU
+(``decrypt_token_cached``).  The attribute names match the ORM ``Tenant``,
+so ``channel_router`` / ``get_adapter`` accept either.
+
+Entries are keyed by the raw X-API-Key and hold the whole outcome:
+  - accepted keys -> the snapshot, for ``N8N_AUTH_CACHE_TTL_SECONDS``;
+  - rejected keys (unknown slug, inactive tenant, wrong channel id) -> the
+    error to raise, for ``N8N_AUTH_NEGATIVE_TTL_SECONDS``.  A misconfigured
+    workflow retrying in a loop then costs no database work.
+
+Both maps are LRUs, and rejections have their own, smaller bound: a spray
+of random keys only evicts other rejections, never the snapshots of the
+tenants that are actually calling.
+
+Invalidation:
+  tenant_admin_service queues ``invalidate_n8n_tenant(tenant_id, slug)`` with
+  ``after_commit`` on create / update / channel configuration.  Once the
+  change is committed it drops every entry for that tenant id or slug, then
+  publishes on ``<SOCKETIO_CHANNEL>:n8n-tenant`` so the other replicas do the
+  same.  A lookup that started before the invalidation is not cached.  If
+  Redis is unavailable, staleness is bounded by the TTLs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.encryption import decrypt_token_cached
+from app.core.exceptions import AppException
+from app.core.metrics import counter
+from app.models.tenant import Tenant
+
+logger = structlog.get_logger()
+
+_CACHE_MAX_SIZE = 10_000  # prevent unbounded memory growth
+_NEGATIVE_MAX_SIZE = 1_000
+_REDIS_COOLDOWN = 60.0
+
+_lookups = counter(
+    "n8n_auth_cache_lookups_total", "n8n API-key cache lookups by result", ["result"]
+)
+
+
+@dataclass(frozen=True, slots=True)
+class TenantSnapshot:
+    id: uuid.UUID
+    slug: str
+    plan: str | None
+    status: str
+    whatsapp_phone_number_id: str | None
+    messenger_page_id: str | None
+    instagram_page_id: str | None
+    whatsapp_token_ciphertext: str | None
+    messenger_token_ciphertext: str | None
+    instagram_token_ciphertext: str | None
+
+    @property
+    def whatsapp_access_token(self) -> str | None:
+        return _decrypted(self.whatsapp_token_ciphertext)
+
+    @property
+    def messenger_access_token(self) -> str | None:
+        return _decrypted(self.messenger_token_ciphertext)
+
+    @property
+    def instagram_access_token(self) -> str | None:
+        return _decrypted(self.instagram_token_ciphertext)
+
+    @property
+    def channel_ids(self) -> tuple[str, ...]:
+        """Identifiers accepted as the secret half of the API key."""
+        ids = (self.whatsapp_phone_number_id, self.messenger_page_id, self.instagram_page_id)
+        return tuple(i for i in ids if i)
+
+
+def _decrypted(ciphertext: str | None) -> str | None:
+    return None if ciphertext is None else decrypt_token_cached(ciphertext)
+
+
+# Same order as the TenantSnapshot fields
+_SNAPSHOT_COLUMNS = (
+    Tenant.id,
+    Tenant.slug,
+    Tenant.plan,
+    Tenant.status,
+    Tenant.whatsapp_phone_number_id,
+    Tenant.messenger_page_id,
+    Tenant.instagram_page_id,
+    Tenant._whatsapp_access_token,
+    Tenant._messenger_access_token,
+    Tenant._instagram_access_token,
+)
+
+
+async def load_tenant_snapshot(db: AsyncSession, slug: str) -> TenantSnapshot | None:
+    """Column-only lookup by slug; tokens stay encrypted."""
+    row = (await db.execute(select(*_SNAPSHOT_COLUMNS).where(Tenant.slug == slug))).one_or_none()
+    return TenantSnapshot(*row) if row is not None else None
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    slug: str
+    tenant_id: str | None
+    snapshot: TenantSnapshot | None
+    error: tuple[type[AppException], str] | None
+    expires: float
+
+
+class N8nAuthCache:
+    """In-process TTL map of X-API-Key -> snapshot or rejection."""
+
+    def __init__(
+        self,
+        ttl_seconds: float | None = None,
+        negative_ttl_seconds: float | None = None,
+        redis_url: str | None = None,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._negative_ttl = negative_ttl_seconds
+        self._redis_url = redis_url
+        # Least recently used first; accepted keys and rejections apart
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._rejections: OrderedDict[str, _Entry] = OrderedDict()
+        # Last invalidation time per "id:<tenant_id>" / "slug:<slug>"
+        self._invalidated_at: dict[str, float] = {}
+        self._redis: Any = None
+        self._redis_disabled_until = 0.0
+        self._listener: asyncio.Task | None = None
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else float(settings.N8N_AUTH_CACHE_TTL_SECONDS)
+
+    @property
+    def negative_ttl(self) -> float:
+        if self._negative_ttl is not None:
+            return self._negative_ttl
+        return float(settings.N8N_AUTH_NEGATIVE_TTL_SECONDS)
+
+    @property
+    def channel(self) -> str:
+        return f"{settings.SOCKETIO_CHANNEL}:n8n-tenant"
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, api_key: str) -> TenantSnapshot | AppException | None:
+        """Return the cached snapshot, a fresh copy of the cached error, or None."""
+        self.ensure_listener()
+        entries = self._entries if api_key in self._entries else self._rejections
+        entry = entries.get(api_key)
+        if entry is None or entry.expires <= time.monotonic():
+            if entry is not None:
+                entries.pop(api_key, None)
+            _lookups.labels(result="miss").inc()
+            return None
+        entries.move_to_end(api_key)
+        if entry.error is not None:
+            _lookups.labels(result="negative_hit").inc()
+            error_type, detail = entry.error
+            return error_type(detail)
+        _lookups.labels(result="hit").inc()
+        return entry.snapshot
+
+    @staticmethod
+    def stamp() -> float:
+        """Take before loading; pass to put_* so a racing invalidation wins."""
+        return time.monotonic()
+
+    def put_tenant(
+        self, api_key: str, snapshot: TenantSnapshot, loaded_at: float | None = None
+    ) -> None:
+        if self.ttl <= 0:
+            return
+        self._remember(
+            api_key,
+            _Entry(snapshot.slug, str(snapshot.id), snapshot, None, time.monotonic() + self.ttl),
+            loaded_at,
+        )
+
+    def put_error(
+        self,
+        api_key: str,
+        slug: str,
+        tenant_id: Any,
+        error: AppException,
+        loaded_at: float | None = None,
+    ) -> None:
+        if self.negative_ttl <= 0:
+            return
+        self._remember(
+            api_key,
+            _Entry(
+                slug,
+                str(tenant_id) if tenant_id else None,
+                None,
+                (type(error), error.detail),
+                time.monotonic() + self.negative_ttl,
+            ),
+            loaded_at,
+        )
+
+    def _remember(self, api_key: str, entry: _Entry, loaded_at: float | None) -> None:
+        if loaded_at is not None:
+            invalidated_at = max(
+                self._invalidated_at.get(f"id:{entry.tenant_id}", -1.0),
+                self._invalidated_at.get(f"slug:{entry.slug}", -1.0),
+            )
+            if invalidated_at >= loaded_at:
+                return
+        if entry.error is None:
+            entries, other, max_size = self._entries, self._rejections, _CACHE_MAX_SIZE
+        else:
+            entries, other, max_size = self._rejections, self._entries, _NEGATIVE_MAX_SIZE
+        other.pop(api_key, None)
+        entries[api_key] = entry
+        entries.move_to_end(api_key)
+        while len(entries) > max_size:
+            entries.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def _drop_local(self, tenant_id: str | None, slug: str | None) -> None:
+        if len(self._invalidated_at) >= _CACHE_MAX_SIZE:
+            self._invalidated_at.clear()
+        now = time.monotonic()
+        if tenant_id:
+            self._invalidated_at[f"id:{tenant_id}"] = now
+        if slug:
+            self._invalidated_at[f"slug:{slug}"] = now
+        for entries in (self._entries, self._rejections):
+            stale = [
+                key
+                for key, entry in entries.items()
+                if (tenant_id and entry.tenant_id == tenant_id) or (slug and entry.slug == slug)
+            ]
+            for key in stale:
+                entries.pop(key, None)
+
+    async def invalidate_tenant(self, tenant_id: Any = None, slug: str | None = None) -> None:
+        """Drop every entry for the tenant id or slug here and on the other replicas."""
+        tenant_id = str(tenant_id) if tenant_id else None
+        self._drop_local(tenant_id, slug)
+
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.publish(self.channel, json.dumps({"id": tenant_id, "slug": slug}))
+        except Exception as exc:
+            self._disable_redis(exc)
+
+    def ensure_listener(self) -> None:
+        """Start the cross-replica invalidation subscriber (idempotent)."""
+        if not self._redis_url or (self._listener is not None and not self._listener.done()):
+            return
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        import redis.asyncio as aioredis
+
+        while True:
+            pubsub = None
+            try:
+                pubsub = aioredis.from_url(self._redis_url).pubsub()
+                await pubsub.subscribe(self.channel)
+                # Entries cached while we were not subscribed may have missed
+                # an invalidation.
+                self.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    self._drop_local(data.get("id"), data.get("slug"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("n8n_auth_cache_listener_error", error=str(exc))
+                await asyncio.sleep(_REDIS_COOLDOWN)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+
+    def _get_redis(self) -> Any:
+        if not self._redis_url or time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url, socket_timeout=1.0)
+        return self._redis
+
+    def _disable_redis(self, exc: Exception) -> None:
+        logger.warning(
+            "n8n_auth_cache_redis_unavailable", error=str(exc), cooldown=_REDIS_COOLDOWN
+        )
+        self._redis_disabled_until = time.monotonic() + _REDIS_COOLDOWN
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._rejections.clear()
+
+
+
+n8n_auth_cache = N8nAuthCache(redis_url=settings.REDIS_URL)
+
+
+async def invalidate_n8n_tenant(tenant_id: Any = None, slug: str | None = None) -> None:
+    await n8n_auth_cache.invalidate_tenant(tenant_id, slug)
@@ -1,8 +1,9 @@
 """Socket.io authentication middleware and room provisioning.
 
 authenticate_connection() is called by the connect handler in socket_manager.py.
-It extracts the JWT from the handshake, decodes it, loads the user from the DB,
-and returns a plain dict that is stored in the socket session.
+It extracts the JWT from the handshake, decodes it, resolves the user through
+the shared principal cache (falling back to the DB), and returns a plain dict
+that is stored in the socket session.
 
 join_rooms_for_user() is called immediately after a successful auth to place the
 socket into the correct rooms based on role and hotel_unit.
@@ -13,16 +14,20 @@ Room hierarchy (mirrors Express implementation in deploy-backend/src/config/sock
   tenant:{tenant_id}:admins       — TENANT_ADMIN and SUPER_ADMIN
   tenant:{tenant_id}:unit:{unit}  — ATTENDANT and HEAD for a specific hotel unit
   user:{user_id}                  — Personal / direct notifications
+
+Sockets on the compact protocol join the ``~c`` shadow of each room instead
+(see compact.py).
 """
 
 from __future__ import annotations
 
-import structlog
-from sqlalchemy import select
+import uuid
 
+import structlog
 from app.core.database import async_session
+from app.core.principal_cache import Principal, load_principal, principal_cache
 from app.core.security import decode_token
-from app.models.user import User
+from app.realtime.compact import room_name
 
 logger = structlog.get_logger()
 
@@ -84,28 +89,35 @@ async def authenticate_connection(
     # already normalised by decode_token(), so tenant_id is the canonical key.
     tenant_id_raw: str | None = payload.get("tenant_id") or payload.get("tenantId")
 
-    async with async_session() as db:
-        stmt = select(User).where(User.id == user_id_raw)
-        if tenant_id_raw:
-            stmt = stmt.where(User.tenant_id == tenant_id_raw)
-        else:
-            stmt = stmt.where(User.tenant_id.is_(None))
-
-        result = await db.execute(stmt)
-        user: User | None = result.scalar_one_or_none()
+    # Parse UUIDs safely — malformed values should not crash the handler
+    try:
+        parsed_user_id = uuid.UUID(str(user_id_raw))
+        parsed_tenant_id = uuid.UUID(str(tenant_id_raw)) if tenant_id_raw else None
+    except ValueError as exc:
+        raise ValueError("Invalid token payload") from exc
+
+    principal = await principal_cache.get(parsed_user_id, parsed_tenant_id, path="socket")
+    if principal is None:
+        loaded_at = principal_cache.stamp()
+        async with async_session() as db:
+            principal = await load_principal(db, parsed_user_id, parsed_tenant_id)
+        if not principal:
+            raise ValueError("User not found")
+        await principal_cache.put(principal, loaded_at=loaded_at)
+
+    if principal.status != "ACTIVE":
+        raise ValueError("User account is not active")
 
-    if not user:
-        raise ValueError("User not found")
+    return _session_data(principal)
 
-    if user.status != "ACTIVE":
-        raise ValueError("User account is not active")
 
+def _session_data(principal: Principal) -> dict:
     return {
-        "user_id": str(user.id),
-        "tenant_id": str(user.tenant_id) if user.tenant_id else None,
-        "name": user.name,
-        "role": user.role,
-        "hotel_unit": user.hotel_unit,
+        "user_id": str(principal.id),
+        "tenant_id": str(principal.tenant_id) if principal.tenant_id else None,
+        "name": principal.name,
+        "role": principal.role,
+        "hotel_unit": principal.hotel_unit,
     }
 
 
@@ -123,10 +135,12 @@ async def join_rooms_for_user(
     tenant_id: str | None = user_data.get("tenant_id")
     role: str = user_data.get("role", "")
     hotel_unit: str | None = user_data.get("hotel_unit")
+    compact: bool = bool(user_data.get("compact"))
 
     # 1. Personal room — direct notifications
-    await sio.enter_room(sid, f"user:{user_id}")
-    logger.debug("socket_joined_room", sid=sid, room=f"user:{user_id}")
+    user_room = room_name(f"user:{user_id}", compact)
+    await sio.enter_room(sid, user_room)
+    logger.debug("socket_joined_room", sid=sid, room=user_room)
 
     if not tenant_id:
         # SUPER_ADMIN without a fixed tenant gets personal room only;
@@ -134,13 +148,13 @@ async def join_rooms_for_user(
         return
 
     # 2. Tenant-wide room
-    tenant_room = f"tenant:{tenant_id}"
+    tenant_room = room_name(f"tenant:{tenant_id}", compact)
     await sio.enter_room(sid, tenant_room)
     logger.debug("socket_joined_room", sid=sid, room=tenant_room)
 
     # 3. Admins room
     if role in _ADMIN_ROLES:
-        admins_room = f"tenant:{tenant_id}:admins"
+        admins_room = room_name(f"tenant:{tenant_id}:admins", compact)
         await sio.enter_room(sid, admins_room)
         logger.info(
             "socket_joined_admins_room",
@@ -152,7 +166,7 @@ async def join_rooms_for_user(
 
     # 4. Hotel-unit room
     if role in _UNIT_ROLES and hotel_unit:
-        unit_room = f"tenant:{tenant_id}:unit:{hotel_unit}"
+        unit_room = room_name(f"tenant:{tenant_id}:unit:{hotel_unit}", compact)
         await sio.enter_room(sid, unit_room)
         logger.info(
             "socket_joined_unit_room",
@@ -0,0 +1,254 @@
+"""Opt-in compact realtime protocol: MessagePack frames.
+
+Clients negotiate it in the Socket.io handshake::
+
+    io(url, { auth: { token, protocol: "compact" } })
+
+Negotiation succeeds only if the server has ``msgpack`` installed and
+``REALTIME_COMPACT_ENABLED`` is true.  The result is stored in the socket
+session as ``compact`` and echoed to the client in a ``realtime:protocol``
+event.  Clients that do not opt in keep receiving plain JSON events.
+
+Routing:
+  A compact socket joins shadow rooms (``<room>~c``) instead of the normal
+  ones.  ``emitter.emit_to_rooms`` sends every event once to the JSON rooms
+  and once, encoded by ``encode_event``, to the shadow rooms.  Room names are
+  the only thing that crosses the Redis emit bus, so this works across
+  workers and API replicas.  Each socket still gets exactly one copy.
+  Room membership is per process, so an emitter cannot tell whether any
+  compact client exists: the second emit (and bus publish) is made only
+  while ``REALTIME_COMPACT_ENABLED`` is on, which is off by default.
+
+Frame format: the same payload as the JSON event, MessagePack-encoded and
+sent as a Socket.io binary attachment, except for conversation:updated.
+
+conversation:updated deltas:
+  The version base lives in Redis, so every worker and replica that emits
+  for a conversation shares it:
+
+    realtime:conv:{tenant_id}:{conversation_id}    HASH, TTL _STATE_TTL
+      _v        version, +1 per update
+      <field>   JSON value of every field seen so far
+
+  Fields are the payload's top-level keys, with dict values flattened one
+  level (``conversation.status``, ``updates.assignedToId``).  As in the
+  coalescing merge, ``None`` means "not sent" and never clears a field.  A
+  Lua script stores the changed fields and bumps ``_v`` atomically, and the
+  frame carries only what changed::
+
+    {conversationId, v, changed: {"conversation.status": "OPEN", ...}}
+
+  A room emit cannot pick frames per socket, so the base check is made by
+  the client.  A client applies the frame if it last saw ``v - 1`` for the
+  conversation and ignores it if it already has ``v`` or newer.  For
+  anything else, including a conversation it has no version for yet, it
+  emits ``realtime:resync {conversationId}``.  The ack carries the full
+  object ``{conversationId, v, full}``, or ``reset: true`` when Redis has no
+  state (expired, or Redis down) and the client must reload over REST.
+  Without Redis, updates go out as complete frames with no ``v``.
+
+Transport compression: polling responses use Engine.IO HTTP compression
+(``http_compression``/``compression_threshold`` on the AsyncServer).
+WebSocket frames use permessage-deflate, which uvicorn negotiates by default
+(``ws_per_message_deflate``).
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import counter
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover — msgpack not installed
+    msgpack = None
+
+logger = structlog.get_logger()
+
+COMPACT_ROOM_SUFFIX = "~c"
+PROTOCOL_NAME = "compact"
+DELTA_EVENTS = frozenset({"conversation:updated"})
+
+_STATE_PREFIX = "realtime:conv"
+_STATE_TTL = 86_400
+_VERSION_FIELD = "_v"
+_REDIS_COOLDOWN = 30.0
+# Frame fields that identify the update rather than describe the conversation
+_ENVELOPE_FIELDS = frozenset({"conversationId", "eventId"})
+
+# KEYS[1] state hash; ARGV[1] TTL, then field/value pairs.  Returns the new
+# version followed by the names of the fields whose value changed.
+_UPDATE_SCRIPT = """
+local changed = {}
+for i = 2, #ARGV, 2 do
+  if redis.call('HGET', KEYS[1], ARGV[i]) ~= ARGV[i + 1] then
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    changed[#changed + 1] = ARGV[i]
+  end
+end
+local version = redis.call('HINCRBY', KEYS[1], '_v', 1)
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+table.insert(changed, 1, version)
+return changed
+"""
+
+_frames = counter("realtime_compact_frames_total", "conversation:updated compact frames", ["kind"])
+
+
+def is_available() -> bool:
+    return msgpack is not None and settings.REALTIME_COMPACT_ENABLED
+
+
+def negotiate(environ: dict, auth: dict) -> bool:
+    """Return True if the connecting client asked for (and may use) compact mode."""
+    requested = auth.get("protocol")
+    if not requested:
+        query = environ.get("QUERY_STRING", "")
+        requested = PROTOCOL_NAME if f"protocol={PROTOCOL_NAME}" in query.split("&") else None
+    return requested == PROTOCOL_NAME and is_available()
+
+
+def room_name(room: str, compact: bool) -> str:
+    """Map a logical room to the one a socket should actually join."""
+    return f"{room}{COMPACT_ROOM_SUFFIX}" if compact else room
+
+
+def compact_rooms(rooms: list[str]) -> list[str]:
+    return [f"{room}{COMPACT_ROOM_SUFFIX}" for room in rooms]
+
+
+def tenant_of(rooms: list[str]) -> str | None:
+    """Return the tenant id named by the first ``tenant:`` room, if any."""
+    for room in rooms:
+        if room.startswith("tenant:"):
+            return room.split(":", 2)[1]
+    return None
+
+
+def encode_event(payload: dict[str, Any]) -> bytes:
+    """Encode *payload* as a compact MessagePack frame."""
+    return msgpack.packb(payload, use_bin_type=True, default=str)
+
+
+async def encode_for(event: str, payload: dict[str, Any], tenant_id: str | None) -> bytes:
+    """Encode *event* for the shadow rooms: a delta frame where one applies."""
+    conversation_id = payload.get("conversationId")
+    if event not in DELTA_EVENTS or not tenant_id or not conversation_id:
+        return encode_event(payload)
+    update = await conversation_state.update(str(tenant_id), str(conversation_id), payload)
+    if update is None:
+        _frames.labels(kind="full").inc()
+        return encode_event(payload)
+    version, changed = update
+    frame: dict[str, Any] = {"conversationId": conversation_id, "v": version, "changed": changed}
+
+    if "eventId" in payload:
+        frame["eventId"] = payload["eventId"]
+    _frames.labels(kind="delta").inc()
+    return encode_event(frame)
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def flatten(payload: dict[str, Any]) -> dict[str, Any]:
+    """Map an update payload to its state fields (see the module docstring)."""
+    fields: dict[str, Any] = {}
+    for key, value in payload.items():
+        if key in _ENVELOPE_FIELDS or value is None:
+            continue
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                fields[f"{key}.{sub_key}"] = sub_value
+        else:
+            fields[key] = value
+    return fields
+
+
+def unflatten(fields: dict[str, Any]) -> dict[str, Any]:
+    """Inverse of ``flatten``: rebuild the nested object from state fields."""
+    result: dict[str, Any] = {}
+    for name, value in fields.items():
+        key, dot, sub_key = name.partition(".")
+        if dot:
+            result.setdefault(key, {})[sub_key] = value
+        else:
+            result[key] = value
+    return result
+
+
+class ConversationState:
+    """Per-conversation version and field state in Redis, shared by every emitter."""
+
+    def __init__(self, redis_url: str | None = None) -> None:
+        self._redis_url = redis_url
+        self._redis: Any = None
+        self._redis_disabled_until = 0.0
+
+    @staticmethod
+    def state_key(tenant_id: str, conversation_id: str) -> str:
+        return f"{_STATE_PREFIX}:{tenant_id}:{conversation_id}"
+
+    async def update(
+        self, tenant_id: str, conversation_id: str, payload: dict[str, Any]
+    ) -> tuple[int, dict[str, Any]] | None:
+        """Record *payload*; return (new version, changed fields) or None without Redis."""
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        fields = flatten(payload)
+        args: list[Any] = [_STATE_TTL]
+        for name, value in fields.items():
+            args += [name, json.dumps(value, default=str, sort_keys=True)]
+        try:
+            reply = await redis.eval(
+                _UPDATE_SCRIPT, 1, self.state_key(tenant_id, conversation_id), *args
+            )
+        except Exception as exc:
+            self._disable_redis(exc)
+            return None
+        version, *names = reply
+        return int(version), {_decode(name): fields[_decode(name)] for name in names}
+
+    async def snapshot(self, tenant_id: str, conversation_id: str) -> dict[str, Any]:
+        """Return the full object for a ``realtime:resync`` ack."""
+        redis = self._get_redis()
+        if redis is None:
+            return {"conversationId": conversation_id, "reset": True}
+        try:
+            raw = await redis.hgetall(self.state_key(tenant_id, conversation_id))
+        except Exception as exc:
+            self._disable_redis(exc)
+            return {"conversationId": conversation_id, "reset": True}
+        fields = {_decode(k): _decode(v) for k, v in raw.items()}
+        version = fields.pop(_VERSION_FIELD, None)
+        if version is None:
+            return {"conversationId": conversation_id, "reset": True}
+        full = unflatten({name: json.loads(value) for name, value in fields.items()})
+        return {"conversationId": conversation_id, "v": int(version), "full": full}
+
+    def _get_redis(self) -> Any:
+        if not self._redis_url or time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url, socket_timeout=1.0)
+        return self._redis
+
+    def _disable_redis(self, exc: Exception) -> None:
+        logger.warning(
+            "realtime_compact_redis_unavailable", error=str(exc), cooldown=_REDIS_COOLDOWN
+        )
+        self._redis_disabled_until = time.monotonic() + _REDIS_COOLDOWN
+
+
+conversation_state = ConversationState(redis_url=settings.REDIS_URL)
+
@@ -0,0 +1,241 @@
+"""Cached access-control projection for conversation:join.
+
+Attendants open and close chats constantly, and each ``conversation:join``
+used to load the full Conversation row.  That load also pulled in contact,
+assigned_to and tags through selectin eager loads, even though the join check
+needs only four columns.
+
+``ConversationAcl`` holds exactly those columns:
+  (tenant_id, assigned_to_id, hotel_unit, is_opportunity)
+
+``get_acl()`` answers from an in-process TTL map.  On a miss it runs a single
+column-only SELECT, with no ORM entity and no eager loads.
+
+Invalidation:
+  Queue ``invalidate_conversation_acl(conversation_id)`` with
+  ``after_commit`` (app/core/after_commit.py) wherever the assignee,
+  hotel_unit or is_opportunity changes.  This happens in ConversationService
+  and in the n8n routes.
+  - The local entry is dropped once the change is committed.
+  - A lookup that began before the invalidation does not cache its result.
+  - The id is then published on ``<SOCKETIO_CHANNEL>:acl`` so that other API
+    replicas drop their copy as well.
+  - Replicas subscribe when their first socket joins a conversation.
+  - If Redis is unavailable, staleness is still bounded by
+    ``CONVERSATION_ACL_CACHE_TTL_SECONDS``.
+
+Negative results (not found / wrong tenant) are never cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.metrics import counter
+from app.models.conversation import Conversation  # type: ignore[attr-defined]
+
+logger = structlog.get_logger()
+
+_CACHE_MAX_SIZE = 10_000  # prevent unbounded memory growth
+_REDIS_COOLDOWN = 60.0
+
+_lookups = counter(
+    "conversation_acl_lookups_total", "conversation:join ACL lookups by result", ["result"]
+)
+_invalidations = counter(
+    "conversation_acl_invalidations_total", "Conversation ACL invalidations by origin", ["origin"]
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ConversationAcl:
+    tenant_id: str
+    assigned_to_id: str | None
+    hotel_unit: str | None
+    is_opportunity: bool
+
+    def allows(self, *, user_id: str, role: str, hotel_unit: str | None) -> bool:
+        """Apply the join rule: ATTENDANT needs assignment or the same unit."""
+        if role != "ATTENDANT":
+            return True
+        return self.assigned_to_id == user_id or bool(hotel_unit and self.hotel_unit == hotel_unit)
+
+
+class ConversationAclCache:
+    """In-process TTL map of conversation id -> ``ConversationAcl``."""
+
+    def __init__(self, ttl_seconds: float | None = None, redis_url: str | None = None) -> None:
+        self._ttl = ttl_seconds
+        self._redis_url = redis_url
+        self._entries: dict[str, tuple[ConversationAcl, float]] = {}
+        self._invalidated_at: dict[str, float] = {}
+        self._redis: Any = None
+        self._redis_disabled_until = 0.0
+        self._listener: asyncio.Task | None = None
+        self._publishes: set[asyncio.Task] = set()
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is not None:
+            return self._ttl
+        return float(settings.CONVERSATION_ACL_CACHE_TTL_SECONDS)
+
+    @property
+    def channel(self) -> str:
+        return f"{settings.SOCKETIO_CHANNEL}:acl"
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    async def get_acl(self, conversation_id: str, tenant_id: str | None) -> ConversationAcl | None:
+        """Return the ACL projection, or None if the conversation is not visible.
+
+        *tenant_id* None (SUPER_ADMIN) skips the tenant check.
+        """
+        entry = self._entries.get(conversation_id)
+        if entry is not None and entry[1] > time.monotonic():
+            _lookups.labels(result="hit").inc()
+            acl = entry[0]
+        else:
+            _lookups.labels(result="miss").inc()
+            loaded_at = time.monotonic()
+            acl = await self._load(conversation_id)
+            if acl is None:
+                return None
+            # An invalidation during the load means the row may be stale
+            if self._invalidated_at.get(conversation_id, -1.0) < loaded_at:
+                self._remember(conversation_id, acl)
+
+        if tenant_id and acl.tenant_id != str(tenant_id):
+            return None
+        return acl
+
+    async def _load(self, conversation_id: str) -> ConversationAcl | None:
+        try:
+            parsed_id = uuid.UUID(conversation_id)
+        except ValueError:
+            return None
+        stmt = select(
+            Conversation.tenant_id,
+            Conversation.assigned_to_id,
+            Conversation.hotel_unit,
+            Conversation.is_opportunity,
+        ).where(Conversation.id == parsed_id)
+        async with async_session() as db:
+            row = (await db.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        return ConversationAcl(
+            tenant_id=str(row.tenant_id),
+            assigned_to_id=str(row.assigned_to_id) if row.assigned_to_id else None,
+            hotel_unit=row.hotel_unit,
+            is_opportunity=bool(row.is_opportunity),
+        )
+
+    def _remember(self, conversation_id: str, acl: ConversationAcl) -> None:
+        if self.ttl <= 0:
+            return
+        if len(self._entries) >= _CACHE_MAX_SIZE:
+            self._entries.clear()
+        self._entries[conversation_id] = (acl, time.monotonic() + self.ttl)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def _drop(self, conversation_id: str) -> None:
+        self._entries.pop(conversation_id, None)
+        if len(self._invalidated_at) >= _CACHE_MAX_SIZE:
+            self._invalidated_at.clear()
+        self._invalidated_at[conversation_id] = time.monotonic()
+
+    def invalidate(self, conversation_id: str | Any) -> None:
+        """Drop the local entry and tell the other replicas to do the same."""
+        conversation_id = str(conversation_id)
+        self._drop(conversation_id)
+        _invalidations.labels(origin="local").inc()
+
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._publish(redis, conversation_id))
+        self._publishes.add(task)
+        task.add_done_callback(self._publishes.discard)
+
+    async def _publish(self, redis: Any, conversation_id: str) -> None:
+        try:
+            await redis.publish(self.channel, conversation_id)
+        except Exception as exc:
+            self._disable_redis(exc)
+
+    def ensure_listener(self) -> None:
+        """Start the cross-replica invalidation subscriber (idempotent)."""
+        if not self._redis_url or (self._listener is not None and not self._listener.done()):
+            return
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        import redis.asyncio as aioredis
+
+        while True:
+            pubsub = None
+            try:
+                pubsub = aioredis.from_url(self._redis_url).pubsub()
+                await pubsub.subscribe(self.channel)
+                # Entries cached while we were not subscribed may have missed
+                # an invalidation.
+                self._entries.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = message["data"]
+                    conversation_id = data.decode() if isinstance(data, bytes) else str(data)
+                    self._drop(conversation_id)
+                    _invalidations.labels(origin="remote").inc()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("conversation_acl_listener_error", error=str(exc))
+                await asyncio.sleep(_REDIS_COOLDOWN)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+
+    def _get_redis(self) -> Any:
+        if not self._redis_url or time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url, socket_timeout=1.0)
+        return self._redis
+
+    def _disable_redis(self, exc: Exception) -> None:
+        logger.warning(
+            "conversation_acl_redis_unavailable", error=str(exc), cooldown=_REDIS_COOLDOWN
+        )
+        self._redis_disabled_until = time.monotonic() + _REDIS_COOLDOWN
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+acl_cache = ConversationAclCache(redis_url=settings.REDIS_URL)
+
+
+def invalidate_conversation_acl(conversation_id: str | Any) -> None:
+    acl_cache.invalidate(conversation_id)
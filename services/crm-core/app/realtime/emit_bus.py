@@ -0,0 +1,180 @@
+"""Cross-process Socket.io emit bus backed by Redis pub/sub.
+
+Problem:
+  The ARQ worker process imports ``sio`` and calls ``sio.emit``.  Without a
+  message queue that AsyncServer has no connected clients, so worker events
+  (message:new, message:status, conversation:updated) never reach browsers.
+  The same is true across API replicas: each one only knows its own sockets.
+
+Solution:
+  ``sio`` is built with ``BatchingRedisManager`` — a python-socketio
+  ``AsyncRedisManager`` that every process shares through one Redis channel:
+
+    - API replicas subscribe (the listener starts on the first socket
+      connection) and fan out every published emit to their local sockets.
+    - Workers never accept connections, so their manager is never initialised
+      and acts as a write-only emitter: ``sio.emit`` publishes and returns.
+
+  Publishes are queued and flushed as one pipelined batch of PUBLISH commands
+  (up to ``SOCKETIO_BUS_BATCH_SIZE`` messages, or every
+  ``SOCKETIO_BUS_FLUSH_MS``), so a burst of emits costs one Redis round-trip
+  and ``sio.emit`` never waits on Redis.  Message format is unchanged, so
+  replicas running the stock ``AsyncRedisManager`` interoperate.
+
+Metrics (Prometheus, default registry):
+  socketio_bus_published_total{event}        messages written to Redis
+  socketio_bus_undelivered_total{event}      PUBLISH reached zero subscribers
+  socketio_bus_publish_errors_total          messages dropped after retry
+  socketio_bus_batch_size                    messages per pipelined flush
+  socketio_bus_flush_seconds                 flush round-trip latency
+  socketio_bus_received_total{event}         remote emits fanned out locally
+
+Set ``SOCKETIO_MESSAGE_QUEUE_ENABLED=false`` for a single-process deployment
+(in-memory manager, previous behaviour).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import pickle
+import time
+
+import socketio
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import counter, histogram
+
+logger = structlog.get_logger()
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+_published = counter(
+    "socketio_bus_published_total", "Socket.io bus messages published to Redis", ["event"]
+)
+_undelivered = counter(
+    "socketio_bus_undelivered_total",
+    "Socket.io bus messages that reached no subscribed API replica",
+    ["event"],
+)
+_publish_errors = counter(
+    "socketio_bus_publish_errors_total", "Socket.io bus messages dropped after a Redis error"
+)
+_batch_size = histogram(
+    "socketio_bus_batch_size",
+    "Messages per pipelined Socket.io bus flush",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+_flush_seconds = histogram("socketio_bus_flush_seconds", "Socket.io bus flush round-trip latency")
+_received = counter(
+    "socketio_bus_received_total",
+    "Remote Socket.io bus emits fanned out to local sockets",
+    ["event"],
+)
+
+
+# ---------------------------------------------------------------------------
+# Client manager
+# ---------------------------------------------------------------------------
+
+
+class BatchingRedisManager(socketio.AsyncRedisManager):
+    """AsyncRedisManager that pipelines publishes and records delivery metrics."""
+
+    name = "crm-batching-redis"
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        channel: str,
+        batch_size: int = 200,
+        flush_interval: float = 0.002,
+    ) -> None:
+        super().__init__(url, channel=channel)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: list[tuple[str, bytes]] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+
+    async def _publish(self, data: dict) -> None:
+        """Queue *data* for the next pipelined flush (never blocks on Redis)."""
+        self._pending.append((data.get("event") or data.get("method", ""), pickle.dumps(data)))
+        if len(self._pending) >= self._batch_size:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._flush_interval)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Publish every queued message in one pipeline, preserving order."""
+        task = self._flush_task
+        if task is not None and not task.done() and task is not asyncio.current_task():
+            task.cancel()  # this flush covers whatever the timer would have sent
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            started = time.perf_counter()
+            receivers = await self._execute_batch(batch)
+            _flush_seconds.observe(time.perf_counter() - started)
+            _batch_size.observe(len(batch))
+
+            if receivers is None:
+                _publish_errors.inc(len(batch))
+                logger.error("socketio_bus_publish_failed", dropped=len(batch))
+                return
+            for (event, _), count in zip(batch, receivers):
+                _published.labels(event=event).inc()
+                if not count:
+                    _undelivered.labels(event=event).inc()
+
+    async def _execute_batch(self, batch: list[tuple[str, bytes]]) -> list[int] | None:
+        """Run the PUBLISH pipeline, reconnecting once on a Redis error."""
+        for attempt in range(2):
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for _, blob in batch:
+                    pipe.publish(self.channel, blob)
+                return await pipe.execute()
+            except Exception as exc:
+                logger.warning("socketio_bus_publish_error", attempt=attempt + 1, error=str(exc))
+                self._redis_connect()
+        return None
+
+    async def _handle_emit(self, message: dict) -> None:
+        if message.get("host_id") != self.host_id:
+            _received.labels(event=message.get("event", "")).inc()
+        await super()._handle_emit(message)
+
+
+def build_client_manager() -> socketio.AsyncManager | None:
+    """Return the Redis bus manager, or None for the default in-memory one."""
+    if not settings.SOCKETIO_MESSAGE_QUEUE_ENABLED:
+        return None
+    return BatchingRedisManager(
+        settings.REDIS_URL,
+        channel=settings.SOCKETIO_CHANNEL,
+        batch_size=settings.SOCKETIO_BUS_BATCH_SIZE,
+        flush_interval=settings.SOCKETIO_BUS_FLUSH_MS / 1000.0,
+    )
+
+
+async def flush_emit_bus() -> None:
+    """Flush coalesced updates and queued publishes — call on API and worker shutdown."""
+    from app.realtime.emitter import flush_coalesced_updates  # noqa: PLC0415
+    from app.realtime.event_log import event_log  # noqa: PLC0415
+    from app.realtime.socket_manager import sio  # noqa: PLC0415
+
+    await flush_coalesced_updates()
+    await event_log.flush()
+
+    manager = sio.manager
+    if isinstance(manager, BatchingRedisManager):
+        await manager.flush()
@@ -24,19 +24,55 @@ Design decisions that mirror the Express implementation
   emit_contact_event (created/updated/deleted):
     - tenant-wide room   (all authenticated users of the tenant)
 
+  emit_presence_changed:
+    - tenant-wide room
+
 All functions are fire-and-forget coroutines; callers should await them.
 If sio is not yet ready (unlikely in production but possible in tests)
 the functions log a warning and return without raising.
+
+Emission cost:
+  - Every event goes out through ``emit_to_rooms`` as ONE ``sio.emit`` with a
+    list of rooms.  python-socketio encodes the packet once, sends it once
+    per socket in the union of those rooms, and the Redis emit bus publishes
+    a single message instead of one per room.
+  - ``conversation:updated`` is coalesced per conversation: the first update
+    goes out immediately, and later ones arriving within
+    ``REALTIME_COALESCE_MS`` (default 100 ms) are merged into one trailing
+    update.  A chatty guest produces at most ~10 sidebar updates per second
+    per conversation instead of one per message.
+
+Replay:
+  Tenant-scoped events are appended to a capped per-tenant Redis Stream and
+  carry its id as ``eventId``.  A reconnecting client sends its last id with
+  ``realtime:replay`` and receives only what it missed (see event_log.py).
+  Appends are pipelined across concurrent emits, and an emit waits for its id
+  for at most ``REALTIME_STREAM_APPEND_WAIT_MS``.  Past that it goes out
+  without ``eventId``.
 """
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterable
 from typing import Any
 
 import structlog
 
+from app.core.config import settings
+from app.core.metrics import counter
+from app.realtime import compact
+from app.realtime.event_log import event_log
+
 logger = structlog.get_logger()
 
+_emits = counter(
+    "realtime_emits_total", "Socket.io events emitted (one per multi-room emit)", ["event"]
+)
+_coalesced = counter(
+    "realtime_coalesced_updates_total", "conversation:updated events merged into a pending update"
+)
+
 
 def _get_sio():
     """Lazy import to avoid circular dependency at module load time."""
@@ -44,6 +80,167 @@ def _get_sio():
     return sio
 
 
+def resolve_rooms(rooms: Iterable[str | None]) -> list[str]:
+    """Reduce *rooms* to the smallest equivalent target set.
+
+    - falsy entries and duplicates are dropped (order preserved);
+    - ``tenant:{id}:*`` sub-rooms (admins, unit) are dropped when the
+      tenant-wide ``tenant:{id}`` room is also targeted, since every member of
+      a sub-room is already a member of the tenant room.
+
+    Per-socket deduplication across the remaining rooms is done by the
+    python-socketio manager, which unions the sids of a room list from its
+    room -> sid index before sending.
+    """
+    targets = list(dict.fromkeys(r for r in rooms if r))
+    tenant_rooms = {r for r in targets if r.startswith("tenant:") and r.count(":") == 1}
+    if not tenant_rooms:
+        return targets
+    return [
+        r for r in targets
+        if r in tenant_rooms or not any(r.startswith(f"{t}:") for t in tenant_rooms)
+    ]
+
+
+async def emit_to_rooms(
+    event: str,
+    payload: dict[str, Any],
+    rooms: Iterable[str | None],
+    *,
+    skip_sid: str | None = None,
+    tenant_id: str | None = None,
+) -> None:
+    """Emit *event* once to the union of *rooms* (falsy entries are skipped).
+
+    A socket that is in several of the rooms receives the event exactly once.
+    Sockets on the compact protocol (see compact.py) sit in shadow rooms and
+    receive the same event as a MessagePack frame instead (a versioned delta
+    for conversation:updated); that second emit is only made while the
+    protocol is enabled.
+
+    Tenant-scoped events are first appended to the tenant's replay log
+    (event_log.py) and carry its id as ``eventId``, unless Redis is too slow
+    to return one within ``REALTIME_STREAM_APPEND_WAIT_MS``.  *tenant_id*
+    defaults to the tenant named by the rooms.
+
+    """
+    targets = resolve_rooms(rooms)
+    if not targets:
+        return
+    tenant_id = tenant_id or compact.tenant_of(targets)
+    if tenant_id:
+        event_id = await event_log.append(str(tenant_id), event, payload, targets)
+        if event_id is not None:
+            payload = {**payload, "eventId": event_id}
+    sio = _get_sio()
+    await sio.emit(event, payload, room=_room_arg(targets), skip_sid=skip_sid)
+    _emits.labels(event=event).inc()
+
+    if compact.is_available():
+        await sio.emit(
+            event,
+            await compact.encode_for(event, payload, tenant_id),
+
+            room=_room_arg(compact.compact_rooms(targets)),
+            skip_sid=skip_sid,
+        )
+
+
+def _room_arg(targets: list[str]) -> str | list[str]:
+    return targets[0] if len(targets) == 1 else targets
+
+
+# ---------------------------------------------------------------------------
+# conversation:updated coalescing
+# ---------------------------------------------------------------------------
+
+
+class _PendingUpdate:
+    __slots__ = ("payload", "rooms", "timer")
+
+    def __init__(self) -> None:
+        self.payload: dict[str, Any] | None = None
+        self.rooms: list[str] = []
+        self.timer: asyncio.Task | None = None
+
+
+_pending_updates: dict[str, _PendingUpdate] = {}
+
+
+def _merge_update(target: dict[str, Any], incoming: dict[str, Any]) -> None:
+    """Merge *incoming* into *target*; nested ``updates`` dicts merge key-wise."""
+    for key, value in incoming.items():
+        if key == "updates" and isinstance(value, dict) and isinstance(target.get(key), dict):
+            target[key] = {**target[key], **value}
+        elif value is not None or key not in target:
+            target[key] = value
+
+
+async def emit_coalesced_update(
+    conversation_id: str,
+    payload: dict[str, Any],
+    rooms: Iterable[str | None],
+) -> None:
+    """Emit conversation:updated now, or fold it into the open coalescing window.
+
+    Public so worker tasks that build their own payloads share the same
+    per-conversation window as the helpers below.
+    """
+    window = settings.REALTIME_COALESCE_MS / 1000.0
+    targets = resolve_rooms(rooms)
+    if window <= 0:
+        await emit_to_rooms("conversation:updated", payload, targets)
+        return
+
+    state = _pending_updates.get(conversation_id)
+    if state is not None:
+        # Window open — merge and let the timer send one trailing update
+        if state.payload is None:
+            state.payload = dict(payload)
+        else:
+            _merge_update(state.payload, payload)
+        state.rooms = resolve_rooms([*state.rooms, *targets])
+        _coalesced.inc()
+        return
+
+    state = _PendingUpdate()
+    _pending_updates[conversation_id] = state
+    state.timer = asyncio.get_running_loop().create_task(
+        _close_update_window(conversation_id, state, window)
+    )
+    await emit_to_rooms("conversation:updated", payload, targets)
+
+
+async def _close_update_window(conversation_id: str, state: _PendingUpdate, window: float) -> None:
+    while True:
+        await asyncio.sleep(window)
+        if state.payload is None:
+            if _pending_updates.get(conversation_id) is state:
+                del _pending_updates[conversation_id]
+            return
+        payload, rooms = state.payload, state.rooms
+        state.payload, state.rooms = None, []
+        try:
+            await emit_to_rooms("conversation:updated", payload, rooms)
+        except Exception as exc:
+            logger.warning(
+                "socket_emit_coalesced_update_failed",
+                conversation_id=conversation_id,
+                error=str(exc),
+            )
+
+
+async def flush_coalesced_updates() -> None:
+    """Send every pending coalesced update now (shutdown hook)."""
+    states = list(_pending_updates.items())
+    _pending_updates.clear()
+    for conversation_id, state in states:
+        if state.timer is not None:
+            state.timer.cancel()
+        if state.payload is not None:
+            await emit_to_rooms("conversation:updated", state.payload, state.rooms)
+
+
 # ---------------------------------------------------------------------------
 # message events
 # ---------------------------------------------------------------------------
@@ -67,13 +264,13 @@ async def emit_new_message(
         conversation:    Full conversation object (optional but recommended).
         hotel_unit:      Hotel unit string; if None it is read from conversation.
     """
-    sio = _get_sio()
-
     resolved_unit: str | None = hotel_unit or (
         conversation.get("hotel_unit") or conversation.get("hotelUnit")
         if conversation
         else None
     )
+    admins_room = f"tenant:{tenant_id}:admins"
+    unit_room = f"tenant:{tenant_id}:unit:{resolved_unit}" if resolved_unit else None
 
     payload: dict[str, Any] = {
         "message": message_data,
@@ -81,30 +278,21 @@ async def emit_new_message(
         "conversationId": conversation_id,
     }
 
-    # Users actively viewing the conversation
-    await sio.emit("message:new", payload, room=f"conversation:{conversation_id}")
-
-    # TENANT_ADMIN and SUPER_ADMIN see all conversations
-    await sio.emit("message:new", payload, room=f"tenant:{tenant_id}:admins")
-
-    # Unit-scoped attendants
-    if resolved_unit:
-        await sio.emit("message:new", payload, room=f"tenant:{tenant_id}:unit:{resolved_unit}")
+    # Chat viewers, TENANT_ADMIN/SUPER_ADMIN and unit-scoped attendants
+    await emit_to_rooms(
+        "message:new",
+        payload,
+        [f"conversation:{conversation_id}", admins_room, unit_room],
+    )
 
-    # Keep conversation list in sync
+    # Keep conversation list in sync (coalesced per conversation)
     update_payload: dict[str, Any] = {
         "conversationId": conversation_id,
         "conversation": conversation,
         "lastMessage": message_data,
         "lastMessageAt": message_data.get("timestamp") or message_data.get("createdAt"),
     }
-    await sio.emit("conversation:updated", update_payload, room=f"tenant:{tenant_id}:admins")
-    if resolved_unit:
-        await sio.emit(
-            "conversation:updated",
-            update_payload,
-            room=f"tenant:{tenant_id}:unit:{resolved_unit}",
-        )
+    await emit_coalesced_update(conversation_id, update_payload, [admins_room, unit_room])
 
     logger.info(
         "socket_emit_message_new",
@@ -125,14 +313,12 @@ async def emit_message_status(
     """Emit message:status to all users in the conversation room.
 
     Args:
-        tenant_id:       Tenant UUID string (used for logging only).
+        tenant_id:       Tenant UUID string (replay log and logging).
         conversation_id: Conversation UUID string.
         message_id:      Message UUID string.
         status:          New status string (e.g. "DELIVERED", "READ", "FAILED").
         error_info:      Optional dict with keys code/message/details for FAILED.
     """
-    sio = _get_sio()
-
     payload: dict[str, Any] = {
         "conversationId": conversation_id,
         "messageId": message_id,
@@ -141,7 +327,9 @@ async def emit_message_status(
     if status == "FAILED" and error_info:
         payload["errorInfo"] = error_info
 
-    await sio.emit("message:status", payload, room=f"conversation:{conversation_id}")
+    await emit_to_rooms(
+        "message:status", payload, [f"conversation:{conversation_id}"], tenant_id=tenant_id
+    )
 
     logger.info(
         "socket_emit_message_status",
@@ -170,22 +358,22 @@ async def emit_new_conversation(
         conversation_data: Serialized conversation payload.
         hotel_unit:        Hotel unit string; falls back to conversation_data field.
     """
-    sio = _get_sio()
-
     resolved_unit: str | None = hotel_unit or (
         conversation_data.get("hotel_unit") or conversation_data.get("hotelUnit")
     )
 
     payload: dict[str, Any] = {"conversation": conversation_data}
 
-    await sio.emit("conversation:new", payload, room=f"tenant:{tenant_id}:admins")
+    await emit_to_rooms(
+        "conversation:new",
+        payload,
+        [
+            f"tenant:{tenant_id}:admins",
+            f"tenant:{tenant_id}:unit:{resolved_unit}" if resolved_unit else None,
+        ],
+    )
 
     if resolved_unit:
-        await sio.emit(
-            "conversation:new",
-            payload,
-            room=f"tenant:{tenant_id}:unit:{resolved_unit}",
-        )
         logger.info(
             "socket_emit_conversation_new",
             tenant_id=tenant_id,
@@ -211,30 +399,30 @@ async def emit_conversation_updated(
 ) -> None:
     """Emit conversation:updated to admin room, unit room, and conversation room.
 
+    Updates for the same conversation within the coalescing window are merged
+    (``updates`` dicts key-wise, latest value wins).
+
     Args:
         tenant_id:       Tenant UUID string.
         conversation_id: Conversation UUID string.
         updates:         Dict of changed fields.
         hotel_unit:      Hotel unit to notify; omit if not applicable.
     """
-    sio = _get_sio()
-
     payload: dict[str, Any] = {
         "conversationId": conversation_id,
         "updates": updates,
     }
 
-    await sio.emit("conversation:updated", payload, room=f"tenant:{tenant_id}:admins")
-
-    if hotel_unit:
-        await sio.emit(
-            "conversation:updated",
-            payload,
-            room=f"tenant:{tenant_id}:unit:{hotel_unit}",
-        )
-
-    # Users viewing the conversation chat window
-    await sio.emit("conversation:updated", payload, room=f"conversation:{conversation_id}")
+    await emit_coalesced_update(
+        conversation_id,
+        payload,
+        [
+            f"tenant:{tenant_id}:admins",
+            f"tenant:{tenant_id}:unit:{hotel_unit}" if hotel_unit else None,
+            # Users viewing the conversation chat window
+            f"conversation:{conversation_id}",
+        ],
+    )
 
     logger.debug(
         "socket_emit_conversation_updated",
@@ -264,9 +452,7 @@ async def emit_conversation_typing(
         user_name:       Display name of the user who is typing.
         is_typing:       True if typing started, False if stopped.
     """
-    sio = _get_sio()
-
-    await sio.emit(
+    await emit_to_rooms(
         "conversation:typing",
         {
             "conversationId": conversation_id,
@@ -274,7 +460,7 @@ async def emit_conversation_typing(
             "userName": user_name,
             "isTyping": is_typing,
         },
-        room=f"conversation:{conversation_id}",
+        [f"conversation:{conversation_id}"],
     )
 
     logger.debug(
@@ -300,9 +486,7 @@ async def emit_notification(
         user_id:           Target user UUID string.
         notification_data: Notification payload (structure defined by callers).
     """
-    sio = _get_sio()
-
-    await sio.emit("notification", notification_data, room=f"user:{user_id}")
+    await emit_to_rooms("notification", notification_data, [f"user:{user_id}"])
 
     logger.debug(
         "socket_emit_notification",
@@ -333,8 +517,6 @@ async def emit_contact_event(
     Raises:
         ValueError: If event_type is not one of the allowed values.
     """
-    sio = _get_sio()
-
     allowed_events = {"created", "updated", "deleted"}
     if event_type not in allowed_events:
         raise ValueError(f"event_type must be one of {allowed_events}, got {event_type!r}")
@@ -347,7 +529,7 @@ async def emit_contact_event(
         payload = {"contact": contact_data}
 
     # All authenticated users of the tenant see contact changes
-    await sio.emit(event_name, payload, room=f"tenant:{tenant_id}")
+    await emit_to_rooms(event_name, payload, [f"tenant:{tenant_id}"])
 
     logger.debug(
         "socket_emit_contact_event",
@@ -355,3 +537,25 @@ async def emit_contact_event(
         event_type=event_type,
         contact_id=contact_id or (contact_data.get("id") if contact_data else None),
     )
+
+
+# ---------------------------------------------------------------------------
+# presence events
+# ---------------------------------------------------------------------------
+
+
+async def emit_presence_changed(tenant_id: str, presence: dict[str, Any]) -> None:
+    """Emit presence:changed (online / away / offline) to all tenant users.
+
+    Args:
+        tenant_id: Tenant UUID string.
+        presence:  ``PresenceEntry.to_payload()`` of the user whose state changed.
+    """
+    await emit_to_rooms("presence:changed", presence, [f"tenant:{tenant_id}"])
+
+    logger.debug(
+        "socket_emit_presence_changed",
+        tenant_id=tenant_id,
+        user_id=presence.get("userId"),
+        status=presence.get("status"),
+    )
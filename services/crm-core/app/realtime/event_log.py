@@ -0,0 +1,235 @@
+"""Per-tenant realtime event log for missed-event replay.
+
+Problem:
+  After a network blip a reconnecting socket cannot tell what it missed.  The
+  frontend therefore reloads the conversation list and the open chat over
+  REST, and every attendant does the same at the same moment.
+
+Solution:
+  ``emitter.emit_to_rooms`` appends each tenant-scoped event to a capped
+  Redis Stream before emitting it:
+
+    realtime:stream:{tenant_id}    XADD MAXLEN ~ REALTIME_STREAM_MAXLEN
+      fields: e (event), r (JSON room list), p (JSON payload)
+
+  - The stream id (``"<ms>-<seq>"``, monotonically increasing per tenant) is
+    delivered with the event as ``payload["eventId"]``.
+  - On reconnect the client emits ``realtime:replay {lastEventId}``.  The ack
+    carries only the events it missed, filtered to the rooms the socket is in
+    now.
+  - When the gap can no longer be served, the ack carries ``reset: true`` and
+    the client falls back to a full REST reload.  That happens when the id has
+    been trimmed out of the stream, when there are more than
+    ``REALTIME_REPLAY_MAX_EVENTS`` newer entries, or when the id is unknown.
+
+Append cost:
+  Appends are queued and written as one pipelined batch of XADDs, so a burst
+  of emits costs one Redis round-trip, and only one batch is in flight at a
+  time.  An emit waits at most ``REALTIME_STREAM_APPEND_WAIT_MS`` for its id.
+  If Redis is slower than that, the event goes out without ``eventId`` and the
+  append still lands.  A client that later replays from an earlier id may
+  therefore receive that event again, so replay handling must be idempotent
+  (message and conversation ids, not event ids).
+
+Replayed events are plain JSON (also for compact-protocol clients), and a
+replayed conversation:updated carries its own payload, not a delta.
+
+Not logged:
+  - ephemeral events (typing, presence);
+  - events whose rooms name no tenant (personal notifications).
+
+Those carry no ``eventId``.  If Redis is unavailable, events are still emitted
+without an id, and replay answers ``reset: true``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import counter
+
+logger = structlog.get_logger()
+
+_REDIS_COOLDOWN = 30.0
+_STREAM_PREFIX = "realtime:stream"
+
+# Events that only matter while they happen — never replayed
+EPHEMERAL_EVENTS = frozenset({"conversation:typing", "presence:changed"})
+
+_appends = counter("realtime_stream_appends_total", "Realtime events appended to the tenant stream")
+_replays = counter("realtime_replays_total", "realtime:replay requests by outcome", ["outcome"])
+_late = counter(
+    "realtime_stream_late_appends_total", "Events emitted without eventId: append exceeded the wait"
+)
+
+
+def _parse_id(stream_id: str) -> tuple[int, int]:
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+@dataclass
+class ReplayResult:
+    events: list[dict[str, Any]] = field(default_factory=list)
+    reset: bool = False
+    last_event_id: str | None = None
+
+    def to_payload(self) -> dict[str, Any]:
+        return {"events": self.events, "reset": self.reset, "lastEventId": self.last_event_id}
+
+
+class RealtimeEventLog:
+    """Capped per-tenant Redis Stream of emitted realtime events."""
+
+    def __init__(self, redis_url: str | None = None) -> None:
+        self._redis_url = redis_url
+        self._redis: Any = None
+        self._redis_disabled_until = 0.0
+        self._pending: list[tuple[str, dict[str, str], asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+
+    @staticmethod
+    def stream_key(tenant_id: str) -> str:
+        return f"{_STREAM_PREFIX}:{tenant_id}"
+
+    async def append(
+        self,
+        tenant_id: str,
+        event: str,
+        payload: dict[str, Any],
+        rooms: list[str],
+    ) -> str | None:
+        """Queue an event for the next XADD batch and return its stream id.
+
+        Returns None if the event is not logged, or if the batch did not
+        complete within ``REALTIME_STREAM_APPEND_WAIT_MS``.
+        """
+        if event in EPHEMERAL_EVENTS or not settings.REALTIME_STREAM_ENABLED:
+            return None
+        if self._get_redis() is None:
+            return None
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        fields = {"e": event, "r": json.dumps(rooms), "p": json.dumps(payload, default=str)}
+        self._pending.append((self.stream_key(tenant_id), fields, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush())
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), settings.REALTIME_STREAM_APPEND_WAIT_MS / 1000.0
+            )
+        except TimeoutError:
+            _late.inc()
+            return None
+
+    async def flush(self) -> None:
+        """Wait for queued appends to be written (shutdown hook)."""
+        if self._flush_task is not None:
+            await self._flush_task
+
+    async def _flush(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending, []
+            stream_ids = await self._execute_batch(batch)
+            for (_, _, future), stream_id in zip(batch, stream_ids, strict=True):
+                if not future.done():
+                    future.set_result(stream_id)
+
+    async def _execute_batch(
+        self, batch: list[tuple[str, dict[str, str], asyncio.Future]]
+    ) -> list[str | None]:
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                pipe = redis.pipeline(transaction=False)
+                for key, fields, _ in batch:
+                    pipe.xadd(
+                        key, fields, maxlen=settings.REALTIME_STREAM_MAXLEN, approximate=True
+                    )
+                replies = await pipe.execute()
+            except Exception as exc:
+                self._disable_redis(exc)
+            else:
+                _appends.inc(len(batch))
+                return [_decode(stream_id) for stream_id in replies]
+        return [None] * len(batch)
+
+
+    async def replay(self, tenant_id: str, last_event_id: str, rooms: set[str]) -> ReplayResult:
+        """Return the events after *last_event_id* addressed to any of *rooms*."""
+        redis = self._get_redis()
+        try:
+            after = _parse_id(last_event_id)
+        except ValueError:
+            after = None
+        if redis is None or after is None:
+            _replays.labels(outcome="reset").inc()
+            return ReplayResult(reset=True)
+
+        limit = settings.REALTIME_REPLAY_MAX_EVENTS
+        key = self.stream_key(tenant_id)
+        try:
+            pipe = redis.pipeline(transaction=False)
+            pipe.xrange(key, "-", "+", count=1)
+            pipe.xrevrange(key, "+", "-", count=1)
+            pipe.xrange(key, f"{after[0]}-{after[1] + 1}", "+", count=limit + 1)
+            oldest, newest, entries = await pipe.execute()
+        except Exception as exc:
+            self._disable_redis(exc)
+            _replays.labels(outcome="reset").inc()
+            return ReplayResult(reset=True)
+
+        newest_id = _decode(newest[0][0]) if newest else None
+        if (
+            not oldest
+            or _parse_id(_decode(oldest[0][0])) > after  # gap trimmed away
+            or _parse_id(newest_id) < after  # id from a stream we no longer have
+            or len(entries) > limit
+        ):
+            _replays.labels(outcome="reset").inc()
+            return ReplayResult(reset=True, last_event_id=newest_id)
+
+        events: list[dict[str, Any]] = []
+        for raw_id, raw_fields in entries:
+            fields = {_decode(k): _decode(v) for k, v in raw_fields.items()}
+            if not rooms.intersection(json.loads(fields["r"])):
+                continue
+            event_id = _decode(raw_id)
+            events.append(
+                {
+                    "id": event_id,
+                    "event": fields["e"],
+                    "payload": {**json.loads(fields["p"]), "eventId": event_id},
+                }
+            )
+        _replays.labels(outcome="replayed").inc()
+        return ReplayResult(events=events, last_event_id=newest_id)
+
+    def _get_redis(self) -> Any:
+        if not self._redis_url or time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url, socket_timeout=1.0)
+        return self._redis
+
+    def _disable_redis(self, exc: Exception) -> None:
+        logger.warning(
+            "realtime_stream_redis_unavailable", error=str(exc), cooldown=_REDIS_COOLDOWN
+        )
+        self._redis_disabled_until = time.monotonic() + _REDIS_COOLDOWN
+
+
+event_log = RealtimeEventLog(redis_url=settings.REDIS_URL)
@@ -14,17 +14,24 @@ Events handled here (client -> server):
   conversation:join       — enter a conversation room with access control
   conversation:leave      — leave a conversation room
   conversation:typing     — broadcast typing indicator to other room members
+                            (throttled server-side, see presence.py)
   messages:mark-read      — acknowledge messages as read
-  ping                    — keep-alive; responds with pong
+  realtime:replay         — return the tenant events missed since a given eventId
+  realtime:resync         — return the full conversation:updated state (compact
+                            clients whose delta base diverged)
+  presence:set            — set own presence status (online | away)
+  ping                    — keep-alive; responds with pong and refreshes presence
 """
 
 from __future__ import annotations
 
 import structlog
-from sqlalchemy import select
 
-from app.core.database import async_session
-from app.models.conversation import Conversation  # type: ignore[attr-defined]
+from app.realtime import compact
+from app.realtime.conversation_acl import acl_cache
+from app.realtime.emitter import emit_presence_changed, emit_to_rooms
+from app.realtime.event_log import ReplayResult, event_log
+from app.realtime.presence import presence_service, typing_throttle
 
 logger = structlog.get_logger()
 
@@ -45,12 +52,16 @@ def register_event_handlers(sio: object) -> None:
           - ATTENDANT may only join conversations assigned to them OR in
             their hotel_unit (mirrors Express ATTENDANT check).
           - TENANT_ADMIN, SUPER_ADMIN, HEAD, SALES: unrestricted within tenant.
+
+        The check reads the cached ACL projection (conversation_acl.py); a
+        miss costs one column-only SELECT.
         """
         async with sio.session(sid) as session:
             user_id: str = session.get("user_id", "")
             tenant_id: str | None = session.get("tenant_id")
             role: str = session.get("role", "")
             hotel_unit: str | None = session.get("hotel_unit")
+            is_compact: bool = bool(session.get("compact"))
 
         conversation_id: str = (
             data if isinstance(data, str) else data.get("conversationId", "")
@@ -64,18 +75,11 @@ def register_event_handlers(sio: object) -> None:
             await sio.emit("error", {"message": "Access denied"}, to=sid)
             return
 
+        acl_cache.ensure_listener()
         try:
-            async with async_session() as db:
-                stmt = select(Conversation).where(
-                    Conversation.id == conversation_id,
-                )
-                if tenant_id:
-                    stmt = stmt.where(Conversation.tenant_id == tenant_id)
-
-                result = await db.execute(stmt)
-                conversation: Conversation | None = result.scalar_one_or_none()
+            acl = await acl_cache.get_acl(conversation_id, tenant_id)
 
-            if not conversation:
+            if acl is None:
                 await sio.emit("error", {"message": "Conversation not found"}, to=sid)
                 logger.warning(
                     "socket_conversation_join_denied",
@@ -87,21 +91,17 @@ def register_event_handlers(sio: object) -> None:
                 return
 
             # ATTENDANT access control
-            if role == "ATTENDANT":
-                is_assigned = str(getattr(conversation, "assigned_to_id", None)) == user_id
-                conv_unit = getattr(conversation, "hotel_unit", None)
-                is_same_unit = hotel_unit and conv_unit == hotel_unit
-                if not is_assigned and not is_same_unit:
-                    await sio.emit("error", {"message": "Access denied"}, to=sid)
-                    logger.warning(
-                        "socket_conversation_join_denied",
-                        sid=sid,
-                        user_id=user_id,
-                        conversation_id=conversation_id,
-                        role="ATTENDANT",
-                        reason="not_assigned_and_different_unit",
-                    )
-                    return
+            if not acl.allows(user_id=user_id, role=role, hotel_unit=hotel_unit):
+                await sio.emit("error", {"message": "Access denied"}, to=sid)
+                logger.warning(
+                    "socket_conversation_join_denied",
+                    sid=sid,
+                    user_id=user_id,
+                    conversation_id=conversation_id,
+                    role="ATTENDANT",
+                    reason="not_assigned_and_different_unit",
+                )
+                return
 
         except Exception as exc:
             logger.error(
@@ -114,7 +114,7 @@ def register_event_handlers(sio: object) -> None:
             await sio.emit("error", {"message": "Internal error"}, to=sid)
             return
 
-        room = f"conversation:{conversation_id}"
+        room = compact.room_name(f"conversation:{conversation_id}", is_compact)
         await sio.enter_room(sid, room)
         await sio.emit("conversation:joined", {"conversationId": conversation_id}, to=sid)
 
@@ -138,6 +138,7 @@ def register_event_handlers(sio: object) -> None:
         """
         async with sio.session(sid) as session:
             user_id: str = session.get("user_id", "")
+            is_compact: bool = bool(session.get("compact"))
 
         conversation_id: str = (
             data if isinstance(data, str) else data.get("conversationId", "")
@@ -147,7 +148,7 @@ def register_event_handlers(sio: object) -> None:
             await sio.emit("error", {"message": "conversationId is required"}, to=sid)
             return
 
-        room = f"conversation:{conversation_id}"
+        room = compact.room_name(f"conversation:{conversation_id}", is_compact)
         await sio.leave_room(sid, room)
         await sio.emit("conversation:left", {"conversationId": conversation_id}, to=sid)
 
@@ -167,7 +168,8 @@ def register_event_handlers(sio: object) -> None:
         """Broadcast a typing indicator to others in the same conversation room.
 
         The emitting socket is excluded (skip_sid) so the sender does not
-        receive their own typing event.
+        receive their own typing event.  Keystroke-rate events are collapsed
+        by ``typing_throttle`` to one state change per interval.
         """
         async with sio.session(sid) as session:
             user_id: str = session.get("user_id", "")
@@ -180,18 +182,20 @@ def register_event_handlers(sio: object) -> None:
             await sio.emit("error", {"message": "conversationId is required"}, to=sid)
             return
 
-        room = f"conversation:{conversation_id}"
-        await sio.emit(
-            "conversation:typing",
-            {
-                "conversationId": conversation_id,
-                "userId": user_id,
-                "userName": user_name,
-                "isTyping": is_typing,
-            },
-            room=room,
-            skip_sid=sid,
-        )
+        async def send(state: bool) -> None:
+            await emit_to_rooms(
+                "conversation:typing",
+                {
+                    "conversationId": conversation_id,
+                    "userId": user_id,
+                    "userName": user_name,
+                    "isTyping": state,
+                },
+                [f"conversation:{conversation_id}"],
+                skip_sid=sid,
+            )
+
+        await typing_throttle.submit(conversation_id, user_id, is_typing, send)
 
         logger.debug(
             "socket_typing_indicator",
@@ -231,11 +235,127 @@ def register_event_handlers(sio: object) -> None:
             count=len(message_ids),
         )
 
+    # ------------------------------------------------------------------
+    # realtime:replay
+    # ------------------------------------------------------------------
+
+    @sio.on("realtime:replay")
+    async def realtime_replay(sid: str, data: dict | str) -> dict:
+        """Return the events this socket missed since ``lastEventId``.
+
+        Call after reconnecting and re-joining conversation rooms; only events
+        addressed to rooms the socket is in now are returned.  ``reset: true``
+        means the gap is too old to replay and the client must reload over REST.
+        """
+        async with sio.session(sid) as session:
+            tenant_id: str | None = session.get("tenant_id")
+
+        last_event_id: str = (
+            data if isinstance(data, str) else (data or {}).get("lastEventId", "")
+        )
+        if not tenant_id or not last_event_id:
+            return ReplayResult(reset=True).to_payload()
+
+        rooms = {
+            room.removesuffix(compact.COMPACT_ROOM_SUFFIX)
+            for room in sio.rooms(sid)
+            if room != sid
+        }
+        result = await event_log.replay(tenant_id, last_event_id, rooms)
+
+        logger.info(
+            "socket_realtime_replay",
+            sid=sid,
+            tenant_id=tenant_id,
+            replayed=len(result.events),
+            reset=result.reset,
+        )
+        return result.to_payload()
+
+    # ------------------------------------------------------------------
+    # realtime:resync
+    # ------------------------------------------------------------------
+
+    @sio.on("realtime:resync")
+    async def realtime_resync(sid: str, data: dict | str) -> dict | None:
+        """Return the full conversation:updated object for a compact client.
+
+        Sent when a delta frame's ``v`` does not follow the last version the
+        client applied (see compact.py).  The ack is ``{conversationId, v,
+        full}``, or ``reset: true`` when no state is held and the client must
+        reload the conversation over REST.  Same access check as
+        conversation:join.
+        """
+        async with sio.session(sid) as session:
+            user_id: str = session.get("user_id", "")
+            tenant_id: str | None = session.get("tenant_id")
+            role: str = session.get("role", "")
+            hotel_unit: str | None = session.get("hotel_unit")
+
+        conversation_id: str = (
+            data if isinstance(data, str) else (data or {}).get("conversationId", "")
+        )
+        if not conversation_id or not tenant_id:
+            await sio.emit("error", {"message": "conversationId is required"}, to=sid)
+            return None
+
+        acl_cache.ensure_listener()
+        acl = await acl_cache.get_acl(conversation_id, tenant_id)
+        if acl is None or not acl.allows(user_id=user_id, role=role, hotel_unit=hotel_unit):
+            await sio.emit("error", {"message": "Access denied"}, to=sid)
+            return None
+
+        snapshot = await compact.conversation_state.snapshot(tenant_id, conversation_id)
+        logger.debug(
+            "socket_realtime_resync",
+            sid=sid,
+            conversation_id=conversation_id,
+            reset=snapshot.get("reset", False),
+        )
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # presence:set
+    # ------------------------------------------------------------------
+
+
+    @sio.on("presence:set")
+    async def presence_set(sid: str, data: dict | str) -> None:
+        """Set the caller's presence status ("online" or "away").
+
+        Clients send "away" when the tab goes idle and "online" when the
+        user returns.  The status is per socket; the user is online while any
+        tab is, and a change is broadcast to the tenant as presence:changed.
+        """
+        async with sio.session(sid) as session:
+            user = dict(session)
+
+        status: str = data if isinstance(data, str) else (data or {}).get("status", "")
+
+        try:
+            changed = await presence_service.set_status(sid, user, status)
+        except ValueError as exc:
+            await sio.emit("error", {"message": str(exc)}, to=sid)
+            return
+
+        if changed is not None:
+            await emit_presence_changed(user["tenant_id"], changed.to_payload())
+
     # ------------------------------------------------------------------
     # ping
     # ------------------------------------------------------------------
 
     @sio.event
     async def ping(sid: str) -> None:
-        """Simple keep-alive. Client sends ping, server responds with pong."""
+        """Simple keep-alive. Client sends ping, server responds with pong.
+
+        Also refreshes this socket's presence entry, which the server-side
+        heartbeat (PresenceService.start_heartbeat) keeps alive regardless.
+        """
         await sio.emit("pong", {}, to=sid)
+
+        async with sio.session(sid) as session:
+            user = dict(session)
+        changed = await presence_service.heartbeat(sid, user)
+        if changed is not None:
+            await emit_presence_changed(user["tenant_id"], changed.to_payload())
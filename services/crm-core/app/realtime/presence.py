@@ -0,0 +1,519 @@
+"""Attendant presence and server-side typing throttle.
+
+Typing:
+  Clients send ``conversation:typing`` on every keystroke.  ``TypingThrottle``
+  limits the rebroadcast to at most one emit per (conversation, user) per
+  ``TYPING_THROTTLE_MS``:
+    - the first event goes out at once;
+    - repeats inside the window are collapsed, and only the last state is
+      kept;
+    - when the window closes, that state is emitted if it differs from the
+      one last sent.  A "stopped typing" is therefore never lost.
+  A repeated ``isTyping: true`` after the window is re-sent so remote
+  indicators stay alive while the user keeps typing.  Each socket lives on
+  one process, so the state is in-process.
+
+Presence:
+  ``PresenceService`` tracks who is connected, per tenant and hotel unit, in
+  Redis so every API replica and the assignment logic share one view:
+
+    presence:{tenant}:users             ZSET  user_id -> expires_at
+    presence:{tenant}:user:{user_id}    HASH  name, role, hotel_unit, status, last_seen
+    presence:{tenant}:sockets:{uid}     ZSET  sid -> expires_at
+    presence:{tenant}:socket_status:{uid}  HASH  sid -> online | away
+
+  - The process holding a socket refreshes its entries every third of
+    ``PRESENCE_TTL_SECONDS`` (``start_heartbeat``), so clients need not send
+    anything.  All of the process's sockets are refreshed together, in two
+    pipelines per tick however many there are.  ``ping`` and
+    ``presence:set`` refresh a single socket as well.  Entries
+    expire ``PRESENCE_TTL_SECONDS`` after the last heartbeat, so a crashed
+    replica cannot leave users online forever.
+  - A user is offline once the last socket disconnects, or once every socket
+    has expired.
+  - status is ``online`` or ``away`` and is kept per socket: the client sets
+    ``away`` through ``presence:set`` when its tab goes idle.  The user is
+    ``online`` while any live socket is, so one idle tab does not mark a
+    user away who is active in another.
+  - State transitions are broadcast to the tenant room as
+    ``presence:changed``.  Users that silently expire are dropped from
+    ``GET /presence`` and ``online_user_ids()`` without an event.
+
+Redis errors are logged and then suppressed for a cooldown.  During that time
+presence reads as empty, and sockets keep working.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import counter
+
+logger = structlog.get_logger()
+
+_CACHE_MAX_SIZE = 10_000  # prevent unbounded memory growth
+_REDIS_COOLDOWN = 30.0
+_REDIS_PREFIX = "presence"
+
+STATUSES = frozenset({"online", "away"})
+
+_typing_events = counter(
+    "realtime_typing_events_total", "conversation:typing events by throttle outcome", ["outcome"]
+)
+_presence_changes = counter("presence_changes_total", "Presence state transitions", ["status"])
+
+
+# ---------------------------------------------------------------------------
+# Typing throttle
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _TypingState:
+    sent: bool
+    sent_at: float
+    pending: bool | None = None
+    timer: asyncio.Task | None = None
+
+
+class TypingThrottle:
+    """Collapse typing indicators to one state change per key per interval."""
+
+    def __init__(self, interval_ms: int | None = None) -> None:
+        self._interval_ms = interval_ms
+        self._states: dict[tuple[str, str], _TypingState] = {}
+
+    @property
+    def interval(self) -> float:
+        ms = self._interval_ms if self._interval_ms is not None else settings.TYPING_THROTTLE_MS
+        return ms / 1000.0
+
+    async def submit(
+        self,
+        conversation_id: str,
+        user_id: str,
+        is_typing: bool,
+        send: Callable[[bool], Awaitable[None]],
+    ) -> None:
+        """Forward *is_typing* through *send* now, later, or not at all."""
+        if self.interval <= 0:
+            await send(is_typing)
+            return
+
+        key = (conversation_id, user_id)
+        now = time.monotonic()
+        state = self._states.get(key)
+
+        if state is None or (state.timer is None and now - state.sent_at >= self.interval):
+            if state is not None and not is_typing and not state.sent:
+                _typing_events.labels(outcome="dropped").inc()
+                return
+            if len(self._states) >= _CACHE_MAX_SIZE:
+                self._states.clear()
+            self._states[key] = _TypingState(sent=is_typing, sent_at=now)
+            _typing_events.labels(outcome="sent").inc()
+            await send(is_typing)
+            return
+
+        # Inside the window: keep only the latest state for the trailing edge
+        state.pending = is_typing
+        _typing_events.labels(outcome="collapsed").inc()
+        if state.timer is None:
+            delay = max(0.0, state.sent_at + self.interval - now)
+            state.timer = asyncio.get_running_loop().create_task(
+                self._close_window(key, state, delay, send)
+            )
+
+    async def _close_window(
+        self,
+        key: tuple[str, str],
+        state: _TypingState,
+        delay: float,
+        send: Callable[[bool], Awaitable[None]],
+    ) -> None:
+        await asyncio.sleep(delay)
+        state.timer = None
+        pending, state.pending = state.pending, None
+        if pending is None or pending == state.sent:
+            return
+        state.sent, state.sent_at = pending, time.monotonic()
+        _typing_events.labels(outcome="sent").inc()
+        try:
+            await send(pending)
+        except Exception as exc:
+            logger.error("typing_trailing_emit_failed", conversation_id=key[0], error=str(exc))
+
+    def forget_user(self, user_id: str) -> list[str]:
+        """Drop a user's typing state; return conversations where they were typing."""
+        typing_in: list[str] = []
+        for key in [k for k in self._states if k[1] == user_id]:
+            state = self._states.pop(key)
+            if state.timer is not None:
+                state.timer.cancel()
+            if state.sent or state.pending:
+                typing_in.append(key[0])
+        return typing_in
+
+
+typing_throttle = TypingThrottle()
+
+
+# ---------------------------------------------------------------------------
+# Presence
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class PresenceEntry:
+    user_id: str
+    name: str
+    role: str
+    hotel_unit: str | None
+    status: str  # online | away | offline
+    last_seen: float
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "userId": self.user_id,
+            "name": self.name,
+            "role": self.role,
+            "hotelUnit": self.hotel_unit,
+            "status": self.status,
+            "lastSeen": self.last_seen,
+        }
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _entry_from_hash(user_id: str, data: dict) -> PresenceEntry:
+    fields = {_decode(k): _decode(v) for k, v in data.items()}
+    return PresenceEntry(
+        user_id=user_id,
+        name=fields.get("name", ""),
+        role=fields.get("role", ""),
+        hotel_unit=fields.get("hotel_unit") or None,
+        status=fields.get("status", "online"),
+        last_seen=float(fields.get("last_seen") or 0),
+    )
+
+
+def _aggregate(statuses: Iterable[str]) -> str:
+    """A user is online while any of their sockets is."""
+    return "online" if any(status == "online" for status in statuses) else "away"
+
+
+class PresenceService:
+    """Redis-backed presence shared by every API replica."""
+
+    def __init__(self, redis_url: str | None = None, ttl_seconds: int | None = None) -> None:
+        self._redis_url = redis_url
+        self._ttl = ttl_seconds
+        self._redis: Any = None
+        self._redis_disabled_until = 0.0
+        # Sockets connected to this process: sid -> user session
+        self._local: dict[str, dict] = {}
+        self._heartbeat: asyncio.Task | None = None
+
+    @property
+    def ttl(self) -> int:
+        return self._ttl if self._ttl is not None else settings.PRESENCE_TTL_SECONDS
+
+    # -- keys --------------------------------------------------------------
+
+    @staticmethod
+    def _users_key(tenant_id: str) -> str:
+        return f"{_REDIS_PREFIX}:{tenant_id}:users"
+
+    @staticmethod
+    def _user_key(tenant_id: str, user_id: str) -> str:
+        return f"{_REDIS_PREFIX}:{tenant_id}:user:{user_id}"
+
+    @staticmethod
+    def _sockets_key(tenant_id: str, user_id: str) -> str:
+        return f"{_REDIS_PREFIX}:{tenant_id}:sockets:{user_id}"
+
+    @staticmethod
+    def _socket_status_key(tenant_id: str, user_id: str) -> str:
+        return f"{_REDIS_PREFIX}:{tenant_id}:socket_status:{user_id}"
+
+    # -- socket lifecycle --------------------------------------------------
+
+    async def connect(self, sid: str, user: dict) -> PresenceEntry | None:
+        """Register *sid*; return the new entry if the user just came online."""
+        self._local[sid] = user
+        return await self._touch(sid, user, status="online")
+
+    async def heartbeat(self, sid: str, user: dict) -> PresenceEntry | None:
+        """Refresh *sid*; returns an entry only if the user had expired."""
+        return await self._touch(sid, user, status=None)
+
+    async def set_status(self, sid: str, user: dict, status: str) -> PresenceEntry | None:
+        """Set online/away; return the entry if the status changed."""
+        if status not in STATUSES:
+            raise ValueError(f"status must be one of {sorted(STATUSES)}")
+        return await self._touch(sid, user, status=status)
+
+    async def _touch(self, sid: str, user: dict, *, status: str | None) -> PresenceEntry | None:
+        redis = self._get_redis()
+        if redis is None or not user.get("tenant_id") or not user.get("user_id"):
+            return None
+        changed = await self._touch_users(redis, [(user, [sid], status)])
+        return changed[0][1] if changed else None
+
+    async def _touch_users(
+        self, redis: Any, batch: list[tuple[dict, list[str], str | None]]
+    ) -> list[tuple[str, PresenceEntry]]:
+        """Refresh each (user, sids, status); return (tenant_id, entry) for changed users.
+
+        Two pipelines however long *batch* is: the first refreshes the
+        sockets and reads back each user's live sockets, the second writes
+        the aggregated user hashes.  ``status=None`` keeps each socket's
+        status (new sockets start online).
+        """
+        now = time.time()
+        expires_at = now + self.ttl
+        changed: list[tuple[str, PresenceEntry]] = []
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for user, sids, status in batch:
+                tenant_id, user_id = user["tenant_id"], user["user_id"]
+                sockets_key = self._sockets_key(tenant_id, user_id)
+                status_key = self._socket_status_key(tenant_id, user_id)
+                pipe.hget(self._user_key(tenant_id, user_id), "status")
+                pipe.zadd(sockets_key, dict.fromkeys(sids, expires_at))
+                pipe.zremrangebyscore(sockets_key, "-inf", now)
+                pipe.expire(sockets_key, self.ttl)
+                for sid in sids:
+                    if status is None:
+                        pipe.hsetnx(status_key, sid, "online")
+                    else:
+                        pipe.hset(status_key, sid, status)
+                pipe.expire(status_key, self.ttl)
+                pipe.zrange(sockets_key, 0, -1)
+                pipe.hgetall(status_key)
+            results = await pipe.execute()
+
+            pipe = redis.pipeline(transaction=False)
+            offset = 0
+            for user, sids, _status in batch:
+                tenant_id, user_id = user["tenant_id"], user["user_id"]
+                replies = results[offset : offset + 7 + len(sids)]
+                offset += len(replies)
+                previous = _decode(replies[0]) if replies[0] is not None else None
+                live = {_decode(s) for s in replies[-2]}
+                by_socket = {_decode(k): _decode(v) for k, v in replies[-1].items()}
+                new_status = _aggregate(by_socket.get(s, "online") for s in live)
+
+                user_key = self._user_key(tenant_id, user_id)
+                stale = [s for s in by_socket if s not in live]
+                if stale:
+                    pipe.hdel(self._socket_status_key(tenant_id, user_id), *stale)
+                pipe.hset(
+                    user_key,
+                    mapping={
+                        "name": user.get("name") or "",
+                        "role": user.get("role") or "",
+                        "hotel_unit": user.get("hotel_unit") or "",
+                        "status": new_status,
+                        "last_seen": f"{now:.3f}",
+                    },
+                )
+                pipe.expire(user_key, self.ttl)
+                pipe.zadd(self._users_key(tenant_id), {user_id: expires_at})
+                if previous != new_status:
+                    entry = PresenceEntry(
+                        user_id=user_id,
+                        name=user.get("name") or "",
+                        role=user.get("role") or "",
+                        hotel_unit=user.get("hotel_unit"),
+                        status=new_status,
+                        last_seen=now,
+                    )
+                    changed.append((tenant_id, entry))
+            await pipe.execute()
+        except Exception as exc:
+            self._disable_redis(exc)
+            return []
+
+        for _tenant_id, entry in changed:
+            _presence_changes.labels(status=entry.status).inc()
+        return changed
+
+    async def disconnect(self, sid: str, user: dict) -> PresenceEntry | None:
+        """Remove *sid*; return the user's entry if their status changed.
+
+        That is an offline entry when *sid* was the last socket, or an
+        ``away`` one when the only active tab closed.
+        """
+        self._local.pop(sid, None)
+        tenant_id, user_id = user.get("tenant_id"), user.get("user_id")
+        redis = self._get_redis()
+        if redis is None or not tenant_id or not user_id:
+            return None
+
+        now = time.time()
+        user_key = self._user_key(tenant_id, user_id)
+        sockets_key = self._sockets_key(tenant_id, user_id)
+        status_key = self._socket_status_key(tenant_id, user_id)
+        try:
+            pipe = redis.pipeline(transaction=False)
+            pipe.zrem(sockets_key, sid)
+            pipe.hdel(status_key, sid)
+            pipe.zremrangebyscore(sockets_key, "-inf", now)
+            pipe.zrange(sockets_key, 0, -1)
+            pipe.hgetall(status_key)
+            pipe.hget(user_key, "status")
+            *_, live, by_socket, previous = await pipe.execute()
+            if live:
+                by_socket = {_decode(k): _decode(v) for k, v in by_socket.items()}
+                new_status = _aggregate(by_socket.get(_decode(s), "online") for s in live)
+                if previous is None or _decode(previous) == new_status:
+                    return None
+                await redis.hset(user_key, "status", new_status)
+                _presence_changes.labels(status=new_status).inc()
+                return PresenceEntry(
+                    user_id=user_id,
+                    name=user.get("name") or "",
+                    role=user.get("role") or "",
+                    hotel_unit=user.get("hotel_unit"),
+                    status=new_status,
+                    last_seen=now,
+                )
+            pipe = redis.pipeline(transaction=False)
+            pipe.zrem(self._users_key(tenant_id), user_id)
+            pipe.delete(user_key, sockets_key, status_key)
+            await pipe.execute()
+        except Exception as exc:
+            self._disable_redis(exc)
+            return None
+
+        _presence_changes.labels(status="offline").inc()
+        return PresenceEntry(
+            user_id=user_id,
+            name=user.get("name") or "",
+            role=user.get("role") or "",
+            hotel_unit=user.get("hotel_unit"),
+            status="offline",
+            last_seen=now,
+        )
+
+    # -- server-side heartbeat ----------------------------------------------
+
+    @property
+    def heartbeat_interval(self) -> float:
+        return max(self.ttl / 3, 1.0)
+
+    def start_heartbeat(self, on_change: Callable[[str, dict], Awaitable[None]]) -> None:
+        """Refresh this process's sockets periodically (idempotent).
+
+        *on_change(tenant_id, payload)* is called for users that had expired,
+        e.g. after a Redis outage, and are back.
+        """
+        if self._heartbeat is not None and not self._heartbeat.done():
+            return
+        self._heartbeat = asyncio.get_running_loop().create_task(self._beat(on_change))
+
+    async def _beat(self, on_change: Callable[[str, dict], Awaitable[None]]) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                for tenant_id, entry in await self.refresh_local():
+                    await on_change(tenant_id, entry.to_payload())
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("presence_heartbeat_failed", error=str(exc))
+
+    async def refresh_local(self) -> list[tuple[str, PresenceEntry]]:
+        """Heartbeat every socket on this process; return users that came back."""
+        redis = self._get_redis()
+        if redis is None:
+            return []
+        by_user: dict[tuple[str, str], tuple[dict, list[str]]] = {}
+        for sid, user in self._local.items():
+            tenant_id, user_id = user.get("tenant_id"), user.get("user_id")
+            if tenant_id and user_id:
+                by_user.setdefault((tenant_id, user_id), (user, []))[1].append(sid)
+        if not by_user:
+            return []
+        return await self._touch_users(
+            redis, [(user, sids, None) for user, sids in by_user.values()]
+        )
+
+
+    # -- reads -------------------------------------------------------------
+
+    async def list_present(
+        self, tenant_id: str, hotel_unit: str | None = None
+    ) -> list[PresenceEntry]:
+        """Return online and away users of *tenant_id*, optionally for one unit."""
+        redis = self._get_redis()
+        if redis is None:
+            return []
+
+        users_key = self._users_key(str(tenant_id))
+        now = time.time()
+        try:
+            pipe = redis.pipeline(transaction=False)
+            pipe.zremrangebyscore(users_key, "-inf", now)
+            pipe.zrange(users_key, 0, -1)
+            user_ids = [_decode(u) for u in (await pipe.execute())[-1]]
+            if not user_ids:
+                return []
+            pipe = redis.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.hgetall(self._user_key(str(tenant_id), user_id))
+            hashes = await pipe.execute()
+        except Exception as exc:
+            self._disable_redis(exc)
+            return []
+
+        entries = [
+            _entry_from_hash(user_id, data)
+            for user_id, data in zip(user_ids, hashes)
+            if data
+        ]
+        if hotel_unit:
+            entries = [e for e in entries if e.hotel_unit == hotel_unit]
+        return entries
+
+    async def online_user_ids(
+        self,
+        tenant_id: str,
+        hotel_unit: str | None = None,
+        *,
+        include_away: bool = False,
+    ) -> list[str]:
+        """User ids available for assignment, without touching the database."""
+        return [
+            e.user_id
+            for e in await self.list_present(tenant_id, hotel_unit)
+            if e.status == "online" or include_away
+        ]
+
+    # -- redis -------------------------------------------------------------
+
+    def _get_redis(self) -> Any:
+        if not self._redis_url or time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(self._redis_url, socket_timeout=1.0)
+        return self._redis
+
+    def _disable_redis(self, exc: Exception) -> None:
+        logger.warning("presence_redis_unavailable", error=str(exc), cooldown=_REDIS_COOLDOWN)
+        self._redis_disabled_until = time.monotonic() + _REDIS_COOLDOWN
+
+
+presence_service = PresenceService(redis_url=settings.REDIS_URL)
@@ -10,14 +10,21 @@ Design decisions:
     events are emitted via structlog at the relevant handler sites.
   - CORS origins are sourced from settings.CORS_ORIGINS so there is a single
     source of truth for allowed origins across HTTP and WebSocket.
+  - The client manager is the Redis emit bus (emit_bus.py), so emits from ARQ
+    workers and other API replicas reach sockets connected to this process.
 """
 
 import socketio
 import structlog
 
 from app.core.config import settings
+from app.realtime import compact
+from app.realtime.admission import AdmissionRejectedError, admission_limiter, record_connect
 from app.realtime.auth import authenticate_connection, join_rooms_for_user
+from app.realtime.emit_bus import build_client_manager
+from app.realtime.emitter import emit_presence_changed, emit_to_rooms
 from app.realtime.events import register_event_handlers
+from app.realtime.presence import presence_service, typing_throttle
 
 logger = structlog.get_logger()
 
@@ -27,12 +34,17 @@ logger = structlog.get_logger()
 
 sio: socketio.AsyncServer = socketio.AsyncServer(
     async_mode="asgi",
+    client_manager=build_client_manager(),
     cors_allowed_origins=settings.CORS_ORIGINS,
     logger=False,
     engineio_logger=False,
     # Keep-alive mirrors Express configuration (pingTimeout=60s, pingInterval=25s)
     ping_timeout=60,
     ping_interval=25,
+    # Engine.IO HTTP compression for polling payloads above 1 KiB; WebSocket
+    # frames rely on uvicorn's permessage-deflate (see compact.py).
+    http_compression=True,
+    compression_threshold=1024,
 )
 
 # ---------------------------------------------------------------------------
@@ -53,10 +65,20 @@ async def connect(sid: str, environ: dict, auth: dict | None) -> bool:
     Returns False to reject the connection; raises ConnectionRefusedError
     with a human-readable message on auth failure so the JS client receives
     a meaningful error in socket.on("connect_error").
+
+    Connects first pass the admission limiter, which smooths reconnect storms
+    by delaying (with jitter) or refusing connects beyond the configured rate.
     """
+    try:
+        await admission_limiter.admit()
+    except AdmissionRejectedError as exc:
+        logger.warning("socket_connect_throttled", sid=sid, reason=str(exc))
+        raise ConnectionRefusedError("Server busy, retry shortly")
+
     try:
         user_data = await authenticate_connection(sid, environ, auth or {})
     except ValueError as exc:
+        record_connect("rejected_auth")
         logger.warning(
             "socket_connect_rejected",
             sid=sid,
@@ -65,11 +87,22 @@ async def connect(sid: str, environ: dict, auth: dict | None) -> bool:
         # python-socketio surfaces this string to the client as connect_error.data
         raise ConnectionRefusedError(str(exc))
 
+    user_data["compact"] = compact.negotiate(environ, auth or {})
+
     # Persist user context in the server-side session for this socket.
     async with sio.session(sid) as session:
         session.update(user_data)
 
     await join_rooms_for_user(sio, sid, user_data)
+    if user_data["compact"]:
+        await sio.emit("realtime:protocol", {"protocol": compact.PROTOCOL_NAME}, to=sid)
+    record_connect("accepted")
+
+    # Server-side presence heartbeat for this process's sockets
+    presence_service.start_heartbeat(emit_presence_changed)
+    came_online = await presence_service.connect(sid, user_data)
+    if came_online is not None:
+        await emit_presence_changed(user_data["tenant_id"], came_online.to_payload())
 
     logger.info(
         "socket_connected",
@@ -78,6 +111,7 @@ async def connect(sid: str, environ: dict, auth: dict | None) -> bool:
         tenant_id=user_data.get("tenant_id"),
         role=user_data.get("role"),
         hotel_unit=user_data.get("hotel_unit"),
+        compact=user_data["compact"],
     )
 
     return True  # explicit True = accept
@@ -85,11 +119,29 @@ async def connect(sid: str, environ: dict, auth: dict | None) -> bool:
 
 @sio.event
 async def disconnect(sid: str) -> None:
-    """Log disconnect; python-socketio cleans up rooms automatically."""
+    """Clear typing and presence state; python-socketio cleans up rooms automatically."""
     async with sio.session(sid) as session:
-        user_id = session.get("user_id", "<unknown>")
-        tenant_id = session.get("tenant_id")
-        role = session.get("role")
+        user = dict(session)
+    user_id = user.get("user_id", "<unknown>")
+    tenant_id = user.get("tenant_id")
+    role = user.get("role")
+
+    # Stop any typing indicator this user left running
+    for conversation_id in typing_throttle.forget_user(user_id):
+        await emit_to_rooms(
+            "conversation:typing",
+            {
+                "conversationId": conversation_id,
+                "userId": user_id,
+                "userName": user.get("name", ""),
+                "isTyping": False,
+            },
+            [f"conversation:{conversation_id}"],
+        )
+
+    went_offline = await presence_service.disconnect(sid, user)
+    if went_offline is not None:
+        await emit_presence_changed(tenant_id, went_offline.to_payload())
 
     logger.info(
         "socket_disconnected",
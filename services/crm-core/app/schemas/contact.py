@@ -6,6 +6,7 @@ Schema hierarchy:
   ContactResponse      — full representation returned from GET /contacts/{id}
   ContactListItem      — lightweight projection used in list views
   ContactListParams    — validated query-string parameters for GET /contacts
+  ContactPage          — GET /contacts envelope (optional / estimated total_count)
   PaginatedResponse    — generic envelope (re-exported from lead.py)
   BulkDeleteRequest    — body for POST /contacts/bulk-delete
   BulkDeleteResponse   — result of bulk delete
@@ -15,7 +16,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, computed_field, field_validator
 
@@ -373,6 +374,13 @@ class ContactListParams(BaseModel):
     # Pagination
     page: int = Field(1, ge=1, description="1-based page number")
     page_size: int = Field(20, ge=1, le=200, description="Results per page (max 200)")
+    count: Literal["cached", "estimate", "none"] = Field(
+        "cached",
+        description=(
+            "How total_count is produced: exact COUNT reused for a few seconds, "
+            "planner estimate, or omitted"
+        ),
+    )
 
     # Sorting — format: "field_name asc|desc"
     order_by: str = Field(
@@ -380,7 +388,7 @@ class ContactListParams(BaseModel):
         description='Comma-separated sort tokens, e.g. "created_at desc,first_name asc"',
     )
 
-    # Full-text search across first_name, last_name, email, company_name
+    # Accent-insensitive search across name, email, company and phone digits
     search: str | None = Field(None, max_length=200)
 
     # Arbitrary filter dict — keys are Contact column names
@@ -416,6 +424,17 @@ class ContactListParams(BaseModel):
         return ",".join(normalised_tokens)
 
 
+class ContactPage(PaginatedResponse[ContactListItem]):
+    """GET /contacts envelope.
+
+    total_count is None when count="none" was requested; total_is_estimate is
+    set when it came from the planner.
+    """
+
+    total_count: int | None = None  # type: ignore[assignment]
+    total_is_estimate: bool = False
+
+
 # ---------------------------------------------------------------------------
 # BulkDelete request/response schemas
 # ---------------------------------------------------------------------------
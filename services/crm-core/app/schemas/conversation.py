@@ -6,6 +6,7 @@ Schema hierarchy:
   ConversationResponse     — full representation with nested contact/user/tags
   ConversationListItem     — lightweight projection for list views
   ConversationListParams   — validated query-string parameters for GET /conversations
+  ConversationPage         — GET /conversations envelope (approximate total, keyset cursor)
   ConversationStats        — aggregated counts for dashboard widgets
   AssignConversationRequest — body for POST /conversations/{id}/assign
 """
@@ -14,7 +15,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
 
@@ -28,6 +29,7 @@ __all__ = [
     "ConversationResponse",
     "ConversationListItem",
     "ConversationListParams",
+    "ConversationPage",
     "ConversationStats",
     "AssignConversationRequest",
     "PaginatedResponse",
@@ -256,8 +258,16 @@ class ConversationListItem(BaseModel):
 
     last_message_at: datetime | None = None
 
-    # Short preview from the most recent message (populated by the service layer)
+    # Inbox read model (conversation_inbox_state), filled by the service layer
+    last_message_id: uuid.UUID | None = None
     last_message_preview: str | None = None
+    last_message_type: str | None = None
+    last_message_direction: str | None = None
+    last_sender_name: str | None = None
+    unread_count: int = 0
+    first_unanswered_inbound_at: datetime | None = None
+    # Guest messages arrived after the current user's read cursor
+    is_unread: bool = False
 
     created_at: datetime
     updated_at: datetime
@@ -316,8 +326,8 @@ class ConversationListItem(BaseModel):
     @computed_field  # type: ignore[misc]
     @property
     def unreadCount(self) -> int:
-        """Unread message count. Defaults to 0 — tracking is handled client-side."""
-        return getattr(self, "unread_count", 0) or 0
+        """Inbound messages since the last reply or the last mark-as-read."""
+        return self.unread_count
 
     @computed_field  # type: ignore[misc]
     @property
@@ -341,6 +351,18 @@ class ConversationListParams(BaseModel):
     # Pagination
     page: int = Field(1, ge=1, description="1-based page number")
     page_size: int = Field(20, ge=1, le=200, description="Results per page (max 200)")
+    cursor: str | None = Field(
+        None,
+        max_length=200,
+        description="Opaque next_cursor from the previous page; replaces page (default order_by only)",
+    )
+    count: Literal["cached", "estimate", "none"] = Field(
+        "cached",
+        description=(
+            "How total_count is produced: exact COUNT reused for a few seconds, "
+            "planner estimate, or omitted"
+        ),
+    )
 
     # Sorting
     order_by: str = Field(
@@ -386,6 +408,19 @@ class ConversationListParams(BaseModel):
         return v
 
 
+class ConversationPage(PaginatedResponse[ConversationListItem]):
+    """GET /conversations envelope.
+
+    total_count is None when count="none" was requested; total_is_estimate is
+    set when it came from the planner.  next_cursor is present while more
+    rows follow in the default last_message_at ordering.
+    """
+
+    total_count: int | None = None  # type: ignore[assignment]
+    total_is_estimate: bool = False
+    next_cursor: str | None = None
+
+
 # ---------------------------------------------------------------------------
 # ConversationStats — aggregated dashboard counts
 # ---------------------------------------------------------------------------
@@ -521,11 +521,12 @@ class PaginatedResponse(BaseModel, Generic[DataT]):
     @property
     def pagination(self) -> PaginationInfo:
         import math
-        total_pages = math.ceil(self.total_count / self.page_size) if self.page_size > 0 else 0
+        total = self.total_count or 0
+        total_pages = math.ceil(total / self.page_size) if self.page_size > 0 else 0
         return PaginationInfo(
             page=self.page,
             limit=self.page_size,
-            total=self.total_count,
+            total=total,
             totalPages=total_pages,
             pages=total_pages,
         )
@@ -535,7 +536,7 @@ class PaginatedResponse(BaseModel, Generic[DataT]):
         if self.page_size == 0:
             return 0
         import math
-        return math.ceil(self.total_count / self.page_size)
+        return math.ceil((self.total_count or 0) / self.page_size)
 
 
 # ---------------------------------------------------------------------------
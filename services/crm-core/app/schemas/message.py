@@ -6,6 +6,8 @@ Schema hierarchy:
   MessageListParams      — cursor-based pagination parameters for GET /messages
   MessageCursorResponse  — envelope for cursor-paginated message lists
   MessageStats           — aggregated message counts
+  MessageSearchParams    — query-string parameters for GET /messages/search
+  MessageSearchResponse  — relevance-ranked hits with snippets and context
   SendTemplateRequest    — body for POST /conversations/{id}/send-template
   SendButtonsRequest     — body for POST /conversations/{id}/send-buttons
   SendListRequest        — body for POST /conversations/{id}/send-list
@@ -25,6 +27,9 @@ __all__ = [
     "MessageListParams",
     "MessageCursorResponse",
     "MessageStats",
+    "MessageSearchParams",
+    "MessageSearchHit",
+    "MessageSearchResponse",
     "SendTemplateRequest",
     "SendButtonsRequest",
     "SendListRequest",
@@ -217,13 +222,25 @@ class MessageResponse(BaseModel):
 class MessageListParams(BaseModel):
     """Query-string parameters for GET /conversations/{id}/messages.
 
-    Uses cursor-based pagination (by message ID) rather than offset pagination
+    Uses keyset pagination on (timestamp, id) rather than offset pagination
     to guarantee stable ordering when new messages arrive during scrollback.
+    ``cursor`` is a next_cursor / prev_cursor from a previous page (a bare
+    message UUID is still accepted and means "older than that message");
+    ``around`` opens the page centred on one message instead.
     """
 
     cursor: str | None = Field(
         None,
-        description="Opaque cursor (last seen message UUID). Omit to get the most recent page.",
+        max_length=200,
+        description=(
+            "next_cursor (older) or prev_cursor (newer) from a previous page. "
+            "Omit for the most recent page."
+        ),
+
+    )
+    around: uuid.UUID | None = Field(
+        None,
+        description="Message ID to centre the page on (jump to a search hit or a quoted reply)",
     )
     limit: int = Field(50, ge=1, le=100, description="Number of messages per page (max 100)")
     direction: str | None = Field(
@@ -260,12 +277,20 @@ class MessageCursorResponse(BaseModel):
     data: list[MessageResponse]
     next_cursor: str | None = Field(
         None,
-        description="Pass this value as `cursor` in the next request to load the previous page",
+        description="Pass this value as `cursor` in the next request to load older messages",
     )
-    has_more: bool
-    total: int = Field(
-        0,
-        description="Total number of messages in the conversation (used for pagination compat)",
+    prev_cursor: str | None = Field(
+        None,
+        description="Pass this value as `cursor` in the next request to load newer messages",
+    )
+    has_more: bool = Field(description="Older messages exist before this page")
+    has_newer: bool = Field(False, description="Newer messages exist after this page")
+    total: int | None = Field(
+        None,
+        description=(
+            "Total number of messages in the conversation, from the maintained "
+            "per-conversation counter; null when filtered by direction"
+        ),
     )
 
     @computed_field  # type: ignore[misc]
@@ -282,11 +307,84 @@ class MessageCursorResponse(BaseModel):
         return {
             "page": 1,
             "limit": limit,
-            "total": self.total,
+            "total": self.total or 0,
             "totalPages": 1,
         }
 
 
+# ---------------------------------------------------------------------------
+# Message search — GET /messages/search
+# ---------------------------------------------------------------------------
+
+
+class MessageSearchParams(BaseModel):
+    """Query-string parameters for GET /messages/search.
+
+    ``q`` uses web-search syntax: words are AND-ed, "quoted phrases" match in
+    order, ``or`` between words and a leading ``-`` to exclude a word.
+    """
+
+    q: str = Field(..., min_length=1, max_length=200, description="Search query")
+    cursor: str | None = Field(None, max_length=300, description="next_cursor of the previous page")
+    limit: int = Field(20, ge=1, le=50, description="Hits per page (max 50)")
+    channel: str | None = Field(None, description="Filter by conversation channel")
+    direction: str | None = Field(None, description="Filter by direction: INBOUND or OUTBOUND")
+    date_from: datetime | None = Field(None, description="Only messages at or after this time")
+    date_to: datetime | None = Field(None, description="Only messages before this time")
+
+    @field_validator("direction")
+    @classmethod
+    def validate_direction(cls, v: str | None) -> str | None:
+        if v is None:
+            return v
+        normalised = v.upper()
+        if normalised not in _VALID_DIRECTIONS:
+            raise ValueError(
+                f"direction {v!r} is not valid. Allowed: {sorted(_VALID_DIRECTIONS)}"
+            )
+        return normalised
+
+    @field_validator("channel")
+    @classmethod
+    def normalise_channel(cls, v: str | None) -> str | None:
+        return v.upper() if v else v
+
+
+class MessageSearchHit(BaseModel):
+    """One matching message with its highlighted snippet and thread context.
+
+    ``snippet`` holds plain text with matched terms wrapped in
+    ``<mark>…</mark>``; everything else in it is escaped.
+    """
+
+    id: uuid.UUID
+    conversation_id: uuid.UUID
+    direction: str
+    type: str
+    sender_name: str | None = None
+    timestamp: datetime
+    snippet: str
+    rank: float
+
+    # Conversation / contact context for the result list
+    channel: str | None = None
+    conversation_status: str | None = None
+    contact_id: uuid.UUID | None = None
+    contact_name: str | None = None
+    contact_phone: str | None = None
+
+
+class MessageSearchResponse(BaseModel):
+    """Relevance-ranked message hits, newest first among equal relevance."""
+
+    data: list[MessageSearchHit]
+    next_cursor: str | None = Field(
+        None,
+        description="Pass this value as `cursor` to load the next page",
+    )
+    has_more: bool
+
+
 # ---------------------------------------------------------------------------
 # MessageStats — aggregated counts
 # ---------------------------------------------------------------------------
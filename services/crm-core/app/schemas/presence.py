@@ -0,0 +1,32 @@
+"""Pydantic v2 schemas for the Presence resource.
+
+Schemas:
+  PresenceUser     — one connected user as returned by GET /api/v1/presence
+  PresenceResponse — the list plus online/away counts
+
+Presence lives in Redis (app/realtime/presence.py); these schemas never
+touch the database.
+"""
+
+from __future__ import annotations
+
+from app.schemas.common import CamelModel
+
+
+class PresenceUser(CamelModel):
+    """A user with at least one live socket."""
+
+    user_id: str
+    name: str
+    role: str
+    hotel_unit: str | None = None
+    status: str  # online | away
+    last_seen: float  # epoch seconds of the last heartbeat
+
+
+class PresenceResponse(CamelModel):
+    """Presence snapshot for the caller's tenant (optionally one hotel unit)."""
+
+    users: list[PresenceUser]
+    online: int = 0
+    away: int = 0
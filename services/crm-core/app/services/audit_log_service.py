@@ -4,13 +4,16 @@ Design decisions:
   - log() is fire-and-forget: errors are caught silently so that a logging
     failure never disrupts the main request flow.  Structlog captures the
     exception at ERROR level for monitoring dashboards.
+  - log() stages the entry on the session; app/core/audit_writer.py writes
+    it in a background multi-row INSERT after the caller commits.
   - Audit rows are never updated or deleted by this service (append-only).
   - Every read query includes tenant_id in the WHERE clause for multi-tenant
     isolation.
   - ORDER BY is hard-coded to created_at DESC — audit logs have only one
     meaningful read order.  A column whitelist on the params validates any
     override to prevent SQL injection.
-  - Use db.flush() not db.commit() — caller owns transaction.
+  - Use db.flush() not db.commit() — caller owns transaction (inline mode,
+    AUDIT_ASYNC_WRITES=false).
 """
 
 from __future__ import annotations
@@ -20,9 +23,12 @@ from datetime import datetime
 from typing import Any
 
 import structlog
+from pydantic import BaseModel
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.audit_writer import AuditRecord, stage
+from app.core.config import settings
 from app.core.exceptions import BadRequestError, NotFoundError
 from app.models.audit_log import AuditLog
 from app.schemas.audit_log import AuditLogListParams, AuditLogResponse
@@ -87,29 +93,39 @@ class AuditLogService:
         user_id: uuid.UUID | None = None,
         entity: str | None = None,
         entity_id: str | None = None,
-        old_data: dict[str, Any] | None = None,
-        new_data: dict[str, Any] | None = None,
+        old_data: dict[str, Any] | BaseModel | None = None,
+        new_data: dict[str, Any] | BaseModel | None = None,
         metadata: dict[str, Any] | None = None,
         ip_address: str | None = None,
     ) -> None:
-        """Persist a single audit log entry.
+        """Record a single audit log entry.
+
+        With AUDIT_ASYNC_WRITES the entry is staged on *db* and written by
+        the background writer once the caller's transaction commits
+        (app/core/audit_writer.py).  Otherwise it is flushed inline.
+        ``old_data`` / ``new_data`` may be dicts or pydantic models.
 
         Errors are caught silently — this method must never raise.
         """
+        entry = None
         try:
-            entry = AuditLog(
+            record = AuditRecord(
                 tenant_id=tenant_id,
-                user_id=user_id,
                 action=action,
+                user_id=user_id,
                 entity=entity,
                 entity_id=entity_id,
                 old_data=old_data,
                 new_data=new_data,
-                metadata_json=metadata,
+                metadata=metadata,
                 ip_address=ip_address,
             )
-            db.add(entry)
-            await db.flush()
+            if settings.AUDIT_ASYNC_WRITES or db.info.get("read_only"):
+                stage(db, record)
+            else:
+                entry = AuditLog(**record.to_row())
+                db.add(entry)
+                await db.flush()
 
             logger.debug(
                 "audit_log_created",
@@ -123,7 +139,8 @@ class AuditLogService:
             # Expunge the failed entry to prevent session corruption from
             # propagating to subsequent operations on the same session.
             try:
-                db.expunge(entry)
+                if entry is not None:
+                    db.expunge(entry)
             except Exception:  # noqa: BLE001
                 pass
             logger.exception(
@@ -25,7 +25,9 @@ import structlog
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.after_commit import after_commit
 from app.core.exceptions import BadRequestError, ForbiddenError, NotFoundError, UnauthorizedError
+from app.core.principal_cache import invalidate_principal
 from app.core.security import (
     create_access_token,
     create_refresh_token,
@@ -247,6 +249,7 @@ class AuthService:
             update_query.values(password_hash=hash_password(data.new_password))
         )
         await db.flush()
+        after_commit(db, invalidate_principal, user_id, tenant_id)
         logger.info("password_changed", user_id=str(user_id))
 
 
@@ -0,0 +1,85 @@
+"""Contact search predicates and relevance ordering.
+
+Shared by contact_service (GET /contacts?search=) and conversation_service
+(inbox search by guest).  Both match against the denormalised
+``Contact.search_text`` / ``Contact.phone_digits`` keys (see
+app/core/search_text.py), which PostgreSQL indexes with pg_trgm.
+
+Term handling:
+  - Only digits and phone punctuation, at least three digits: a substring
+    match on phone_digits.  Numbers ending in the typed digits (the local
+    part, without country or area code) rank first.
+  - Anything else: every word of the normalised term must occur in
+    search_text, so "joao silva" finds "João da Silva".  Words of three or
+    more characters use the trigram index.  A single shorter word is
+    matched as a prefix of the name through the pattern-ops btree, because
+    no index can serve a one- or two-letter substring.  Rows whose name
+    starts with the term rank first, then by trigram similarity.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy import ColumnElement, and_, case, or_
+
+from app.core.search_text import (
+    TRIGRAM_MIN_LENGTH,
+    Similarity,
+    escape_like,
+    normalize_search_text,
+    phone_digits,
+)
+from app.models.contact import Contact
+
+
+@dataclass(frozen=True, slots=True)
+class ContactSearch:
+    condition: ColumnElement[bool]
+    order_by: tuple[ColumnElement, ...]
+
+
+def _contains(column, value: str) -> ColumnElement[bool]:
+    return column.like(f"%{escape_like(value)}%", escape="\\")
+
+
+def build_contact_search(term: str | None) -> ContactSearch | None:
+    """Return the WHERE clause and relevance ORDER BY for ``term``."""
+    if not term or not term.strip():
+        return None
+
+    text = normalize_search_text(term)
+    digits = phone_digits(term).replace(" ", "")
+    if len(digits) >= TRIGRAM_MIN_LENGTH and not any(ch.isalpha() for ch in term):
+        suffix = escape_like(digits)
+        return ContactSearch(
+            condition=_contains(Contact.phone_digits, digits),
+            order_by=(
+                case(
+                    (
+                        or_(
+                            Contact.phone_digits.like(f"%{suffix}", escape="\\"),
+                            Contact.phone_digits.like(f"%{suffix} %", escape="\\"),
+                        ),
+                        0,
+                    ),
+                    else_=1,
+                ),
+            ),
+        )
+
+    words = text.split()
+    if not words:
+        return None
+    if len(words) == 1 and len(words[0]) < TRIGRAM_MIN_LENGTH:
+        condition = Contact.search_text.like(f"{escape_like(words[0])}%", escape="\\")
+    else:
+        condition = and_(*(_contains(Contact.search_text, word) for word in words))
+
+    return ContactSearch(
+        condition=condition,
+        order_by=(
+            case((Contact.search_text.like(f"{escape_like(text)}%", escape="\\"), 0), else_=1),
+            Similarity(Contact.search_text, text).desc(),
+        ),
+    )
@@ -7,31 +7,40 @@ Design decisions:
   - full_name is computed at write time from salutation + first_name + last_name
     and stored as a denormalised column for fast search/display.
   - Filtering supports equality filters via the `filters` dict from
-    ContactListParams.  The `search` parameter performs a case-insensitive
-    ILIKE across first_name, last_name, email, and company_name.
+    ContactListParams.  The `search` parameter matches names, email and
+    company (accent-insensitive) or phone digits through the indexed search
+    keys (app/services/contact_search.py); with the default ordering the
+    results come back by relevance.
+  - list_contacts reuses total_count for CONTACT_COUNT_CACHE_SECONDS per
+    (tenant, filters, search), or asks the planner (app/core/list_counts.py),
+    so paging through search results does not COUNT on every request.
   - Use db.flush() not db.commit() — the caller (FastAPI route via get_db
     context manager) owns the transaction lifecycle.
 """
 
 from __future__ import annotations
 
+import json
 import uuid
 from typing import Any
 
 import structlog
-from sqlalchemy import delete, func, or_, select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
 from app.core.exceptions import BadRequestError, NotFoundError
+from app.core.list_counts import count_total
 from app.models.contact import Contact
+from app.services.contact_search import build_contact_search
 from app.schemas.contact import (
     BulkDeleteRequest,
     ContactCreate,
     ContactListItem,
     ContactListParams,
+    ContactPage,
     ContactUpdate,
-    PaginatedResponse,
 )
 
 logger = structlog.get_logger()
@@ -63,6 +72,9 @@ _CONTACT_COLUMNS: frozenset[str] = frozenset(
 )
 
 
+_DEFAULT_ORDER_BY = "created_at desc"
+
+
 def _validate_column(name: str) -> None:
     """Raise BadRequestError if `name` is not a known Contact column."""
     if name not in _CONTACT_COLUMNS:
@@ -108,26 +120,12 @@ def _apply_filters(query, filters: dict[str, Any] | None):
     return query
 
 
-def _escape_ilike(value: str) -> str:
-    """Escape SQL ILIKE wildcard characters to prevent pattern injection."""
-    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
-
-
 def _apply_search(query, search: str | None):
-    """Append ILIKE search across first_name, last_name, email, company_name."""
-    if not search:
+    """Restrict to contacts matching `search` (indexed name / phone match)."""
+    contact_search = build_contact_search(search)
+    if contact_search is None:
         return query
-    pattern = f"%{_escape_ilike(search)}%"
-    query = query.where(
-        or_(
-            Contact.first_name.ilike(pattern),
-            Contact.last_name.ilike(pattern),
-            Contact.full_name.ilike(pattern),
-            Contact.email.ilike(pattern),
-            Contact.company_name.ilike(pattern),
-        )
-    )
-    return query
+    return query.where(contact_search.condition)
 
 
 def _apply_ordering(query, order_by: str):
@@ -143,6 +141,14 @@ def _apply_ordering(query, order_by: str):
     return query
 
 
+def _apply_search_ordering(query, search: str | None, order_by: str):
+    """Rank search results by relevance unless the caller chose an ordering."""
+    contact_search = build_contact_search(search)
+    if contact_search is not None and order_by == _DEFAULT_ORDER_BY:
+        query = query.order_by(*contact_search.order_by)
+    return _apply_ordering(query, order_by)
+
+
 def _compute_full_name(
     salutation: str | None,
     first_name: str,
@@ -170,39 +176,51 @@ class ContactService:
         db: AsyncSession,
         tenant_id: uuid.UUID,
         params: ContactListParams,
-    ) -> PaginatedResponse[ContactListItem]:
-        """Return a paginated list of Contacts for the given tenant."""
+    ) -> ContactPage:
+        """Return a paginated list of Contacts for the given tenant.
+
+        ``params.count`` picks how ``total_count`` is produced: an exact COUNT
+        reused for CONTACT_COUNT_CACHE_SECONDS ("cached"), the planner
+        estimate ("estimate") or nothing ("none").
+        """
         base_query = _build_contact_query(tenant_id)
         base_query = _apply_filters(base_query, params.filters)
         base_query = _apply_search(base_query, params.search)
 
-        # Count total matching rows (before pagination)
-        count_query = (
-            select(func.count())
-            .select_from(Contact)
-            .where(Contact.tenant_id == tenant_id)
-        )
-        count_query = _apply_filters(count_query, params.filters)
-        count_query = _apply_search(count_query, params.search)
+        def scoped(query):
+            query = query.where(Contact.tenant_id == tenant_id)
+            query = _apply_filters(query, params.filters)
+            return _apply_search(query, params.search)
 
-        total_result = await db.execute(count_query)
-        total_count = total_result.scalar_one()
+        counted = json.dumps(
+            params.model_dump(include={"search", "filters"}, mode="json"), sort_keys=True
+        )
+        total_count, estimated = await count_total(
+            db,
+            Contact,
+            scoped,
+            mode=params.count,
+            cache_key=("contacts", str(tenant_id), counted),
+            ttl=settings.CONTACT_COUNT_CACHE_SECONDS,
+        )
 
         # Paginated data
-        data_query = _apply_ordering(base_query, params.order_by)
+        data_query = _apply_search_ordering(base_query, params.search, params.order_by)
         offset = (params.page - 1) * params.page_size
         data_query = data_query.offset(offset).limit(params.page_size)
 
         rows = await db.execute(data_query)
         contacts = rows.scalars().all()
 
-        return PaginatedResponse[ContactListItem](
+        return ContactPage(
             data=[ContactListItem.model_validate(contact) for contact in contacts],
             total_count=total_count,
+            total_is_estimate=estimated,
             page=params.page,
             page_size=params.page_size,
         )
 
+
     # ------------------------------------------------------------------
     # get_contact
     # ------------------------------------------------------------------
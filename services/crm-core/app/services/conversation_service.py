@@ -9,33 +9,48 @@ Design decisions:
     so they are always available without extra round trips.
   - Use db.flush() not db.commit() — the caller (FastAPI route via get_db
     context manager) owns the transaction lifecycle.
+  - list_conversations reads the inbox read model (conversation_inbox_state,
+    maintained by inbox_state_service) and the caller's read cursor in the
+    same statement as the page, with contact / assignee / tags joined-eager,
+    so the sidebar loads in one indexed query.
+  - list_conversations pages by keyset on (last_message_at, id) when given
+    a cursor, and reuses total_count for CONVERSATION_COUNT_CACHE_SECONDS
+    (or asks the planner), so deep inbox pages cost the same as page 1.
 """
 
 from __future__ import annotations
 
+import json
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import structlog
-from sqlalchemy import func, or_, select
+from sqlalchemy import and_, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.core.after_commit import after_commit
+from app.core.config import settings
+from app.core.cursor import decode_cursor, encode_cursor, parse_datetime, parse_uuid
 from app.core.exceptions import BadRequestError, ForbiddenError, NotFoundError
+from app.core.list_counts import count_total
 from app.models.contact import Contact
 from app.models.conversation import Conversation
+from app.models.conversation_inbox_state import ConversationInboxState, ConversationReadCursor
 from app.models.conversation_tag import ConversationTag
 from app.models.tag import Tag
 from app.models.user import User
+from app.realtime.conversation_acl import invalidate_conversation_acl
 from app.schemas.conversation import (
     ConversationCreate,
     ConversationListItem,
     ConversationListParams,
+    ConversationPage,
     ConversationStats,
     ConversationUpdate,
-    PaginatedResponse,
 )
+from app.services.contact_search import build_contact_search
 
 logger = structlog.get_logger()
 
@@ -92,7 +107,60 @@ def _build_conversation_query(tenant_id: uuid.UUID):
     )
 
 
-def _apply_role_filter(
+def _build_inbox_query(tenant_id: uuid.UUID, user_id: uuid.UUID | None):
+    """Base SELECT for list views: (Conversation, inbox state, caller's last_read_at).
+
+    Everything the sidebar renders comes back in this one statement — the
+    state row joins on its primary key and the read cursor on
+    (conversation_id, user_id).
+    """
+    return (
+        select(Conversation, ConversationInboxState, ConversationReadCursor.last_read_at)
+        .outerjoin(
+            ConversationInboxState,
+            ConversationInboxState.conversation_id == Conversation.id,
+        )
+        .outerjoin(
+            ConversationReadCursor,
+            and_(
+                ConversationReadCursor.conversation_id == Conversation.id,
+                ConversationReadCursor.user_id == user_id,
+            ),
+        )
+        .where(Conversation.tenant_id == tenant_id)
+        .options(
+            joinedload(Conversation.contact).options(
+                joinedload(Contact.industry), joinedload(Contact.territory)
+            ),
+            joinedload(Conversation.assigned_to),
+            joinedload(Conversation.tags),
+        )
+    )
+
+
+def _inbox_item(
+    conversation: Conversation,
+    state: ConversationInboxState | None,
+    last_read_at: datetime | None,
+) -> ConversationListItem:
+    """ConversationListItem with the sidebar fields filled from the read model."""
+    item = ConversationListItem.model_validate(conversation)
+    if state is None:
+        return item
+    item.last_message_id = state.last_message_id
+    item.last_message_preview = state.last_message_preview
+    item.last_message_type = state.last_message_type
+    item.last_message_direction = state.last_message_direction
+    item.last_sender_name = state.last_sender_name
+    item.unread_count = state.unread_count
+    item.first_unanswered_inbound_at = state.first_unanswered_inbound_at
+    item.is_unread = state.last_inbound_at is not None and (
+        last_read_at is None or last_read_at < state.last_inbound_at
+    )
+    return item
+
+
+def apply_role_filter(
     query,
     user_role: str,
     user_id: uuid.UUID | None,
@@ -172,25 +240,19 @@ def _apply_filters(query, params: ConversationListParams):
     return query
 
 
-def _escape_ilike(value: str) -> str:
-    """Escape SQL ILIKE wildcard characters to prevent pattern injection."""
-    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+def _apply_search(query, tenant_id: uuid.UUID, search: str | None):
+    """Restrict to conversations whose contact matches `search` (name / phone).
 
-
-def _apply_search(query, search: str | None):
-    """ILIKE search across contact name and phone (via join)."""
-    if not search:
+    A semi-join on the indexed contact search keys (contact_search), so the
+    conversation side keeps its own ordering and index.
+    """
+    contact_search = build_contact_search(search)
+    if contact_search is None:
         return query
-    pattern = f"%{_escape_ilike(search)}%"
-    query = query.outerjoin(Contact, Conversation.contact_id == Contact.id).where(
-        or_(
-            Contact.full_name.ilike(pattern),
-            Contact.first_name.ilike(pattern),
-            Contact.mobile_no.ilike(pattern),
-            Contact.phone.ilike(pattern),
-        )
+    matching_contacts = select(Contact.id).where(
+        Contact.tenant_id == tenant_id, contact_search.condition
     )
-    return query
+    return query.where(Conversation.contact_id.in_(matching_contacts))
 
 
 def _apply_ordering(query, order_by: str):
@@ -206,6 +268,74 @@ def _apply_ordering(query, order_by: str):
     return query
 
 
+# ---------------------------------------------------------------------------
+# Keyset pagination and counts
+# ---------------------------------------------------------------------------
+
+# Only the default inbox ordering is served by an index
+# (ix_conversations_tenant_id_last_message_at); id breaks ties.  NULLS FIRST
+# is what PostgreSQL does for DESC anyway and matches a backward scan of
+# that ascending index.
+_KEYSET_ORDER = "last_message_at desc"
+
+_COUNTED_PARAMS = {
+    "search",
+    "status",
+    "priority",
+    "channel",
+    "assigned_to_id",
+    "hotel_unit",
+    "is_opportunity",
+    "ia_locked",
+    "filters",
+}
+
+
+def _uses_keyset(order_by: str) -> bool:
+    return " ".join(order_by.lower().split()) == _KEYSET_ORDER
+
+
+def _apply_keyset(query, cursor: str | None):
+    """ORDER BY last_message_at DESC NULLS FIRST, id DESC, after ``cursor``."""
+    query = query.order_by(
+        Conversation.last_message_at.desc().nullsfirst(), Conversation.id.desc()
+    )
+    if not cursor:
+        return query
+    raw_at, raw_id = decode_cursor(cursor, 2)
+    last_at, last_id = parse_datetime(raw_at), parse_uuid(raw_id)
+    if last_at is None:
+        # Still inside the NULL block, which sorts first
+        return query.where(
+            or_(
+                and_(Conversation.last_message_at.is_(None), Conversation.id < last_id),
+                Conversation.last_message_at.is_not(None),
+            )
+        )
+    return query.where(
+        tuple_(Conversation.last_message_at, Conversation.id) < tuple_(last_at, last_id)
+    )
+
+
+def _count_cache_key(
+    tenant_id: uuid.UUID,
+    user_role: str,
+    user_id: uuid.UUID | None,
+    user_hotel_unit: str | None,
+    params: ConversationListParams,
+) -> tuple:
+    role = user_role.upper()
+    scope: tuple = ()
+    if role == "HEAD":
+        scope = (user_hotel_unit,)
+    elif role == "ATTENDANT":
+        scope = (str(user_id), user_hotel_unit)
+    filters = json.dumps(
+        params.model_dump(include=_COUNTED_PARAMS, mode="json"), sort_keys=True
+    )
+    return ("conversations", str(tenant_id), role, scope, filters)
+
+
 # ---------------------------------------------------------------------------
 # ConversationService
 # ---------------------------------------------------------------------------
@@ -226,43 +356,83 @@ class ConversationService:
         user_id: uuid.UUID | None,
         user_hotel_unit: str | None,
         params: ConversationListParams,
-    ) -> PaginatedResponse[ConversationListItem]:
+    ) -> ConversationPage:
         """Return a paginated list of Conversations for the given tenant.
 
         Role-based scoping is applied at the query level to prevent
         attendants or sales users from seeing conversations they should not.
+
+        With the default ``last_message_at desc`` ordering every page carries
+        a ``next_cursor``; passing it back replaces ``page`` with a keyset
+        range read.  ``params.count`` picks how ``total_count`` is produced:
+        an exact COUNT reused for CONVERSATION_COUNT_CACHE_SECONDS
+        ("cached"), the planner estimate ("estimate") or nothing ("none").
         """
-        base_query = _build_conversation_query(tenant_id)
-        base_query = _apply_role_filter(base_query, user_role, user_id, user_hotel_unit)
+        keyset = _uses_keyset(params.order_by)
+        if params.cursor and not keyset:
+            raise BadRequestError(f"cursor requires order_by={_KEYSET_ORDER!r}")
+
+        base_query = _build_inbox_query(tenant_id, user_id)
+        base_query = apply_role_filter(base_query, user_role, user_id, user_hotel_unit)
         base_query = _apply_filters(base_query, params)
-        base_query = _apply_search(base_query, params.search)
+        base_query = _apply_search(base_query, tenant_id, params.search)
 
-        # Count total matching rows (before pagination)
-        count_query = (
-            select(func.count())
-            .select_from(Conversation)
-            .where(Conversation.tenant_id == tenant_id)
+        total_count, estimated = await self._count(
+            db, tenant_id, user_role, user_id, user_hotel_unit, params
         )
-        count_query = _apply_role_filter(count_query, user_role, user_id, user_hotel_unit)
-        count_query = _apply_filters(count_query, params)
-        count_query = _apply_search(count_query, params.search)
-
-        total_result = await db.execute(count_query)
-        total_count = total_result.scalar_one()
-
-        # Paginated data
-        data_query = _apply_ordering(base_query, params.order_by)
-        offset = (params.page - 1) * params.page_size
-        data_query = data_query.offset(offset).limit(params.page_size)
-
-        rows = await db.execute(data_query)
-        conversations = rows.scalars().all()
 
-        return PaginatedResponse[ConversationListItem](
-            data=[ConversationListItem.model_validate(c) for c in conversations],
+        # Paginated data — one extra row tells whether another page follows
+        if keyset:
+            data_query = _apply_keyset(base_query, params.cursor)
+            if not params.cursor:
+                data_query = data_query.offset((params.page - 1) * params.page_size)
+        else:
+            data_query = _apply_ordering(base_query, params.order_by)
+            data_query = data_query.offset((params.page - 1) * params.page_size)
+        data_query = data_query.limit(params.page_size + 1)
+
+        rows = (await db.execute(data_query)).unique().all()
+        has_more = len(rows) > params.page_size
+        rows = rows[: params.page_size]
+
+        next_cursor = None
+        if keyset and has_more:
+            last = rows[-1][0]
+            next_cursor = encode_cursor(last.last_message_at, last.id)
+
+        return ConversationPage(
+            data=[_inbox_item(*row) for row in rows],
             total_count=total_count,
+            total_is_estimate=estimated,
             page=params.page,
             page_size=params.page_size,
+            next_cursor=next_cursor,
+        )
+
+    async def _count(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        user_role: str,
+        user_id: uuid.UUID | None,
+        user_hotel_unit: str | None,
+        params: ConversationListParams,
+    ) -> tuple[int | None, bool]:
+        """Return (total_count, is_estimate) according to ``params.count``."""
+
+        def scoped(query):
+            query = query.where(Conversation.tenant_id == tenant_id)
+            query = apply_role_filter(query, user_role, user_id, user_hotel_unit)
+            query = _apply_filters(query, params)
+            return _apply_search(query, tenant_id, params.search)
+
+        return await count_total(
+            db,
+            Conversation,
+            scoped,
+            mode=params.count,
+            cache_key=_count_cache_key(tenant_id, user_role, user_id, user_hotel_unit, params),
+            ttl=settings.CONVERSATION_COUNT_CACHE_SECONDS,
         )
 
     # ------------------------------------------------------------------
@@ -444,6 +614,7 @@ class ConversationService:
             conversation.status = "IN_PROGRESS"
 
         await db.flush()
+        after_commit(db, invalidate_conversation_acl, conversation_id)
 
         conversation = await self.get_conversation(db, tenant_id, conversation_id)
         logger.info(
@@ -487,6 +658,8 @@ class ConversationService:
             conversation.closed_at = datetime.now(timezone.utc)
 
         await db.flush()
+        if {"hotel_unit", "is_opportunity"} & update_data.keys():
+            after_commit(db, invalidate_conversation_acl, conversation_id)
 
         conversation = await self.get_conversation(db, tenant_id, conversation_id)
         logger.info(
@@ -544,7 +717,7 @@ class ConversationService:
             .group_by(Conversation.status)
         )
         if user_role:
-            base = _apply_role_filter(base, user_role, user_id, user_hotel_unit)
+            base = apply_role_filter(base, user_role, user_id, user_hotel_unit)
 
         by_status_rows = (await db.execute(base)).all()
         by_status: dict[str, int] = {row.status: row.n for row in by_status_rows}
@@ -556,7 +729,7 @@ class ConversationService:
             .group_by(Conversation.priority)
         )
         if user_role:
-            priority_q = _apply_role_filter(priority_q, user_role, user_id, user_hotel_unit)
+            priority_q = apply_role_filter(priority_q, user_role, user_id, user_hotel_unit)
         priority_rows = (await db.execute(priority_q)).all()
         by_priority: dict[str, int] = {row.priority: row.n for row in priority_rows}
 
@@ -566,7 +739,7 @@ class ConversationService:
             .group_by(Conversation.channel)
         )
         if user_role:
-            channel_q = _apply_role_filter(channel_q, user_role, user_id, user_hotel_unit)
+            channel_q = apply_role_filter(channel_q, user_role, user_id, user_hotel_unit)
         channel_rows = (await db.execute(channel_q)).all()
         by_channel: dict[str, int] = {row.channel: row.n for row in channel_rows}
 
@@ -580,7 +753,7 @@ class ConversationService:
             )
         )
         if user_role:
-            unassigned_q = _apply_role_filter(unassigned_q, user_role, user_id, user_hotel_unit)
+            unassigned_q = apply_role_filter(unassigned_q, user_role, user_id, user_hotel_unit)
         unassigned_result = await db.execute(unassigned_q)
         unassigned = unassigned_result.scalar_one()
 
@@ -0,0 +1,188 @@
+"""InboxStateService — keeps the conversation_inbox_state read model current.
+
+Design decisions:
+  - Writers call ``record_message`` in the transaction that inserts the
+    message (process_incoming_message, MessageService outbound saves, the
+    n8n routes), so the sidebar never shows a preview for a message that
+    was rolled back.
+  - Each update is a single INSERT ... ON CONFLICT DO UPDATE keyed by
+    conversation_id: no read-modify-write, so concurrent workers appending
+    to the same thread cannot lose an unread increment.
+  - last_message_* only move forward in time; a late-delivered older
+    message still counts as unread but does not replace the preview.
+  - An outbound message answers everything before it: unread_count drops
+    to 0 and first_unanswered_inbound_at is cleared.
+  - message_count counts every recorded message, so MessageService can
+    report a thread's total without COUNT(*).
+  - ``mark_read`` resets the conversation's unread_count and moves the
+    caller's read cursor to the current last message.
+  - Use db.flush() not db.commit() — the caller owns the transaction.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+import structlog
+from sqlalchemy import case, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.conversation_inbox_state import ConversationInboxState, ConversationReadCursor
+from app.models.message import Message
+
+logger = structlog.get_logger()
+
+PREVIEW_MAX_CHARS = 120
+
+
+def _dialect_insert(db: AsyncSession, model):
+    """INSERT with on_conflict_do_update() for the session's dialect."""
+    dialect_name = db.bind.dialect.name
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:  # pragma: no cover — only PostgreSQL and SQLite are deployed
+        raise NotImplementedError(f"Upsert not supported on {dialect_name}")
+    return dialect_insert(model)
+
+
+def message_preview(content: str | None) -> str | None:
+    """Single-line, length-capped preview of a message body."""
+    if not content:
+        return None
+    text = " ".join(content.split())
+    if len(text) <= PREVIEW_MAX_CHARS:
+        return text or None
+    return text[: PREVIEW_MAX_CHARS - 1].rstrip() + "…"
+
+
+class InboxStateService:
+    """Incremental writer for ConversationInboxState / ConversationReadCursor."""
+
+    async def record_message(self, db: AsyncSession, message: Message) -> None:
+        """Fold a newly persisted message into its conversation's inbox state.
+
+        ``message.id`` must be assigned — flush before calling.
+        """
+        state = ConversationInboxState
+        inbound = message.direction == "INBOUND"
+        stmt = _dialect_insert(db, state).values(
+            conversation_id=message.conversation_id,
+            tenant_id=message.tenant_id,
+            last_message_id=message.id,
+            last_message_preview=message_preview(message.content),
+            last_message_type=message.type,
+            last_message_direction=message.direction,
+            last_sender_name=message.sender_name,
+            last_message_at=message.timestamp,
+            unread_count=1 if inbound else 0,
+            first_unanswered_inbound_at=message.timestamp if inbound else None,
+            last_inbound_at=message.timestamp if inbound else None,
+            message_count=1,
+        )
+        new = stmt.excluded
+        newer = or_(state.last_message_at.is_(None), new.last_message_at >= state.last_message_at)
+
+        set_ = {
+            column: case((newer, getattr(new, column)), else_=getattr(state, column))
+            for column in (
+                "last_message_id",
+                "last_message_preview",
+                "last_message_type",
+                "last_message_direction",
+                "last_sender_name",
+                "last_message_at",
+            )
+        }
+        if inbound:
+            set_["unread_count"] = state.unread_count + 1
+            set_["first_unanswered_inbound_at"] = case(
+                (
+                    or_(
+                        state.first_unanswered_inbound_at.is_(None),
+                        new.first_unanswered_inbound_at < state.first_unanswered_inbound_at,
+                    ),
+                    new.first_unanswered_inbound_at,
+                ),
+                else_=state.first_unanswered_inbound_at,
+            )
+            set_["last_inbound_at"] = case(
+                (
+                    or_(
+                        state.last_inbound_at.is_(None),
+                        new.last_inbound_at > state.last_inbound_at,
+                    ),
+                    new.last_inbound_at,
+                ),
+                else_=state.last_inbound_at,
+            )
+        else:
+            set_["unread_count"] = case((newer, 0), else_=state.unread_count)
+            set_["first_unanswered_inbound_at"] = case(
+                (newer, None), else_=state.first_unanswered_inbound_at
+            )
+        set_["message_count"] = state.message_count + 1
+        set_["updated_at"] = datetime.now(UTC)
+
+        await db.execute(
+            stmt.on_conflict_do_update(index_elements=[state.conversation_id], set_=set_)
+        )
+
+    async def record_messages(self, db: AsyncSession, messages: list[Message]) -> None:
+        """``record_message`` for a batch, oldest first."""
+        for message in sorted(messages, key=lambda m: m.timestamp):
+            await self.record_message(db, message)
+
+    async def mark_read(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        conversation_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> None:
+        """Reset the unread counter and move ``user_id``'s cursor to the last message."""
+        state = ConversationInboxState
+        row = (
+            await db.execute(
+                update(state)
+                .where(state.conversation_id == conversation_id, state.tenant_id == tenant_id)
+                .values(unread_count=0, updated_at=datetime.now(UTC))
+                .returning(state.last_message_id, state.last_message_at)
+            )
+        ).first()
+
+        # The cursor sits on the newest message, in channel time like the
+        # last_inbound_at it is compared against.
+        last_read_message_id = row.last_message_id if row else None
+        last_read_at = (row.last_message_at if row else None) or datetime.now(UTC)
+
+        stmt = _dialect_insert(db, ConversationReadCursor).values(
+            conversation_id=conversation_id,
+            user_id=user_id,
+            last_read_message_id=last_read_message_id,
+            last_read_at=last_read_at,
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    ConversationReadCursor.conversation_id,
+                    ConversationReadCursor.user_id,
+                ],
+                set_={
+                    "last_read_message_id": stmt.excluded.last_read_message_id,
+                    "last_read_at": stmt.excluded.last_read_at,
+                },
+            )
+        )
+        await db.flush()
+        logger.info(
+            "conversation_marked_read",
+            conversation_id=str(conversation_id),
+            tenant_id=str(tenant_id),
+            user_id=str(user_id),
+        )
+
+
+inbox_state_service = InboxStateService()
@@ -11,7 +11,8 @@ Design decisions:
   - Every query MUST include tenant_id in the WHERE clause.
   - Erasure anonymises PII fields instead of hard-deleting rows so that
     referential integrity and audit trail are preserved.
-  - Message content is replaced with a LGPD redaction notice.
+  - Message content (and the inbox last-message preview) is replaced with a
+    LGPD redaction notice.
   - All operations are logged to the audit trail via audit_log_service.
   - Use db.flush() not db.commit() -- caller owns the transaction.
 """
@@ -29,12 +30,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import NotFoundError
 from app.models.contact import Contact
 from app.models.conversation import Conversation
+from app.models.conversation_inbox_state import ConversationInboxState
 from app.models.deal import Deal
 from app.models.lead import Lead
 from app.models.message import Message
 from app.models.tenant import Tenant
 from app.schemas.contact import ContactResponse
 from app.services.audit_log_service import audit_log_service
+from app.services.inbox_state_service import message_preview
 
 logger = structlog.get_logger()
 
@@ -163,25 +166,42 @@ class LGPDService:
         contact = await self._get_contact(db, tenant_id, contact_id)
 
         # Conversations
+        # Column projections: the export needs no relationships, and entity
+        # loads would cascade into contact / assigned_to / tags per row.
         conv_result = await db.execute(
-            select(Conversation).where(
+            select(
+                Conversation.id,
+                Conversation.status,
+                Conversation.channel,
+                Conversation.created_at,
+                Conversation.last_message_at,
+            ).where(
                 Conversation.tenant_id == tenant_id,
                 Conversation.contact_id == contact_id,
             )
         )
-        conversations = conv_result.scalars().all()
+        conversations = conv_result.all()
 
         # Messages from those conversations
         conversation_ids = [c.id for c in conversations]
         messages: list[Any] = []
         if conversation_ids:
             msg_result = await db.execute(
-                select(Message).where(
+                select(
+                    Message.id,
+                    Message.conversation_id,
+                    Message.direction,
+                    Message.type,
+                    Message.content,
+                    Message.timestamp,
+                )
+                .where(
                     Message.tenant_id == tenant_id,
                     Message.conversation_id.in_(conversation_ids),
                 )
+                .order_by(Message.timestamp)
             )
-            messages = msg_result.scalars().all()
+            messages = msg_result.all()
 
         # Leads (via email or mobile_no match within tenant)
         leads: list[Any] = []
@@ -371,6 +391,12 @@ class LGPDService:
                 .values(content=_REDACTED_CONTENT)
             )
             messages_redacted = result.rowcount  # type: ignore[assignment]
+            # The inbox read model carries a copy of the last message body
+            await db.execute(
+                update(ConversationInboxState)
+                .where(ConversationInboxState.conversation_id.in_(conversation_ids))
+                .values(last_message_preview=message_preview(_REDACTED_CONTENT))
+            )
             await db.flush()
 
         await audit_log_service.log(
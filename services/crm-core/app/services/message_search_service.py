@@ -0,0 +1,228 @@
+"""MessageSearchService — full-text search over message content.
+
+Attendants search for what a guest said ("late check-out", "berço"), so
+messages are indexed with a Portuguese text-search configuration:
+
+  - ``crm_portuguese`` (migration 0004) is ``portuguese`` with ``unaccent``
+    ahead of the stemmer, so "cafe da manha" matches "café da manhã" and
+    "reservas" matches "reserva".
+  - ``ix_messages_tenant_id_search`` is a GIN expression index (btree_gin)
+    on (tenant_id, to_tsvector('crm_portuguese', coalesce(content, ''))).
+    The expression in ``_document`` must stay identical to it, or the
+    planner will not use the index.
+
+Ranking on tens of millions of rows:
+  Every match is found through the index, but only the newest
+  ``MESSAGE_SEARCH_MAX_CANDIDATES`` matches in the user's scope are ranked
+  (``ts_rank_cd``), and ``ts_headline`` runs only for the rows on the
+  returned page.  Results are ordered by relevance, then recency, and paged
+  with an opaque (rank, timestamp, id) keyset cursor.
+
+Scope:
+  Rows are joined to their conversation and filtered with the same
+  ``apply_role_filter`` as GET /conversations, so attendants only find
+  messages in threads they may open.
+
+Other dialects (SQLite in tests and local runs) fall back to case-insensitive
+LIKE on every word, unranked, with the snippet cut in Python.
+"""
+
+from __future__ import annotations
+
+import html
+import uuid
+
+import structlog
+from sqlalchemy import and_, func, literal, literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.cursor import decode_cursor, encode_cursor, parse_datetime, parse_uuid
+from app.core.exceptions import BadRequestError
+from app.core.search_text import escape_like
+from app.models.contact import Contact
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.schemas.message import MessageSearchHit, MessageSearchParams, MessageSearchResponse
+from app.services.conversation_service import apply_role_filter
+
+logger = structlog.get_logger()
+
+_TS_CONFIG = literal_column("'crm_portuguese'::regconfig")
+# ts_headline wraps matches in these; the rest of the snippet is escaped
+# before they are turned into <mark> tags.
+_MARK_START, _MARK_STOP = "\x02", "\x03"
+_HEADLINE_OPTIONS = (
+    f"StartSel={_MARK_START}, StopSel={_MARK_STOP}, "
+    "MaxWords=25, MinWords=8, ShortWord=2, MaxFragments=2, FragmentDelimiter=\" … \""
+)
+_FALLBACK_SNIPPET_CHARS = 160
+
+
+def _document(content):
+    """The indexed tsvector expression (see ix_messages_tenant_id_search)."""
+    return func.to_tsvector(_TS_CONFIG, func.coalesce(content, literal_column("''")))
+
+
+def _render_snippet(raw: str | None) -> str:
+    escaped = html.escape(raw or "")
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_STOP, "</mark>")
+
+
+def _fallback_snippet(content: str | None, words: list[str]) -> str:
+    """Cut a window around the first matching word and mark every match."""
+    text = content or ""
+    lowered = text.lower()
+    hits = [lowered.find(w) for w in words if lowered.find(w) >= 0]
+    start = max(0, min(hits, default=0) - _FALLBACK_SNIPPET_CHARS // 4)
+    window = text[start : start + _FALLBACK_SNIPPET_CHARS]
+    marked = window
+    for word in words:
+        out, rest = [], marked
+        while (i := rest.lower().find(word)) >= 0:
+            out += [rest[:i], _MARK_START, rest[i : i + len(word)], _MARK_STOP]
+            rest = rest[i + len(word) :]
+        marked = "".join(out) + rest
+    prefix = "… " if start else ""
+    suffix = " …" if start + _FALLBACK_SNIPPET_CHARS < len(text) else ""
+    return prefix + _render_snippet(marked) + suffix
+
+
+class MessageSearchService:
+    """Relevance-ranked, role-scoped message search for one tenant per call."""
+
+    async def search_messages(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        user_role: str,
+        user_id: uuid.UUID | None,
+        user_hotel_unit: str | None,
+        params: MessageSearchParams,
+    ) -> MessageSearchResponse:
+        full_text = db.bind.dialect.name == "postgresql"
+        words = params.q.lower().split()
+        if not words:
+            raise BadRequestError("Search query is empty")
+
+        if full_text:
+            ts_query = func.websearch_to_tsquery(_TS_CONFIG, params.q)
+            match = _document(Message.content).op("@@")(ts_query)
+        else:
+            match = and_(
+                *(Message.content.ilike(f"%{escape_like(w)}%", escape="\\") for w in words)
+            )
+
+        # 1. Newest matches in scope, bounded — the GIN index finds them
+        candidates = (
+            select(Message.id, Message.timestamp, Message.content)
+            .join(Conversation, Conversation.id == Message.conversation_id)
+            .where(Message.tenant_id == tenant_id, Conversation.tenant_id == tenant_id, match)
+        )
+        candidates = apply_role_filter(candidates, user_role, user_id, user_hotel_unit)
+        if params.channel:
+            candidates = candidates.where(Conversation.channel == params.channel)
+        if params.direction:
+            candidates = candidates.where(Message.direction == params.direction)
+        if params.date_from:
+            candidates = candidates.where(Message.timestamp >= params.date_from)
+        if params.date_to:
+            candidates = candidates.where(Message.timestamp < params.date_to)
+        candidates = (
+            candidates.order_by(Message.timestamp.desc())
+            .limit(settings.MESSAGE_SEARCH_MAX_CANDIDATES)
+            .subquery("candidates")
+        )
+
+        # 2. Rank the candidates and cut one page after the cursor
+        if full_text:
+            rank = func.ts_rank_cd(_document(candidates.c.content), ts_query)
+        else:
+            rank = literal(0.0)
+        page = select(
+            candidates.c.id, candidates.c.timestamp, rank.label("rank")
+        )
+        if params.cursor:
+            raw_rank, raw_at, raw_id = decode_cursor(params.cursor, 3)
+            if not isinstance(raw_rank, (int, float)):
+                raise BadRequestError("Invalid cursor")
+            page = page.where(
+                tuple_(rank, candidates.c.timestamp, candidates.c.id)
+                < tuple_(float(raw_rank), parse_datetime(raw_at), parse_uuid(raw_id))
+            )
+        page = (
+            page.order_by(rank.desc(), candidates.c.timestamp.desc(), candidates.c.id.desc())
+            .limit(params.limit + 1)
+            .subquery("page")
+        )
+
+        # 3. Snippets and thread context for the page only
+        snippet = (
+            func.ts_headline(_TS_CONFIG, Message.content, ts_query, _HEADLINE_OPTIONS)
+            if full_text
+            else Message.content
+        )
+        rows = (
+            await db.execute(
+                select(
+                    Message.id,
+                    Message.conversation_id,
+                    Message.direction,
+                    Message.type,
+                    Message.sender_name,
+                    Message.timestamp,
+                    snippet.label("snippet"),
+                    page.c.rank,
+                    Conversation.channel,
+                    Conversation.status,
+                    Contact.id.label("contact_id"),
+                    Contact.full_name,
+                    Contact.mobile_no,
+                )
+                .join(page, page.c.id == Message.id)
+                .join(Conversation, Conversation.id == Message.conversation_id)
+                .outerjoin(Contact, Contact.id == Conversation.contact_id)
+                .order_by(page.c.rank.desc(), Message.timestamp.desc(), Message.id.desc())
+            )
+        ).all()
+
+        has_more = len(rows) > params.limit
+        rows = rows[: params.limit]
+        hits = [
+            MessageSearchHit(
+                id=row.id,
+                conversation_id=row.conversation_id,
+                direction=row.direction,
+                type=row.type,
+                sender_name=row.sender_name,
+                timestamp=row.timestamp,
+                snippet=(
+                    _render_snippet(row.snippet)
+                    if full_text
+                    else _fallback_snippet(row.snippet, words)
+                ),
+                rank=float(row.rank),
+                channel=row.channel,
+                conversation_status=row.status,
+                contact_id=row.contact_id,
+                contact_name=row.full_name,
+                contact_phone=row.mobile_no,
+            )
+            for row in rows
+        ]
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(float(last.rank), last.timestamp, last.id)
+
+        logger.info(
+            "message_search",
+            tenant_id=str(tenant_id),
+            hits=len(hits),
+            has_more=has_more,
+            paged=params.cursor is not None,
+        )
+        return MessageSearchResponse(data=hits, next_cursor=next_cursor, has_more=has_more)
+
+
+message_search_service = MessageSearchService()
@@ -3,11 +3,16 @@
 Design decisions:
   - All methods are async and accept an AsyncSession injected by the caller.
   - Every query MUST include tenant_id in the WHERE clause (multi-tenant isolation).
-  - Messages are paginated with cursor-based pagination (by message UUID / timestamp)
-    rather than offset pagination to guarantee stable ordering when new messages
-    arrive during a user's scrollback session.
+  - Messages are paginated by keyset on (timestamp, id) with opaque cursors,
+    in both directions or around one message, rather than offset pagination
+    to guarantee stable ordering when new messages arrive during a user's
+    scrollback session.
   - Idempotency is enforced at the external_message_id unique constraint level:
     save_outbound_message checks for an existing record before inserting.
+  - Read paths select the MessageResponse columns (_RESPONSE_COLUMNS) rather
+    than Message entities; Message.conversation is never loaded implicitly.
+  - Message writes also update conversation_inbox_state (inbox_state_service)
+    in the same transaction.
   - Use db.flush() not db.commit() — the caller owns the transaction.
 """
 
@@ -18,12 +23,14 @@ from datetime import datetime, timezone
 from typing import Any
 
 import structlog
-from sqlalchemy import func, select, update
+from sqlalchemy import exists, func, literal, select, tuple_, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cursor import decode_cursor, encode_cursor, parse_datetime, parse_uuid
 from app.core.exceptions import BadRequestError, ConflictError, NotFoundError
 from app.models.contact import Contact
 from app.models.conversation import Conversation
+from app.models.conversation_inbox_state import ConversationInboxState
 from app.models.message import Message
 from app.schemas.message import (
     MessageCreate,
@@ -32,6 +39,7 @@ from app.schemas.message import (
     MessageResponse,
     MessageStats,
 )
+from app.services.inbox_state_service import inbox_state_service
 
 logger = structlog.get_logger()
 
@@ -44,6 +52,55 @@ def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+# Columns MessageResponse is built from.  Read paths select these instead of
+# Message entities, so no relationship loader or identity-map work runs.
+_RESPONSE_COLUMNS = (
+    Message.id,
+    Message.tenant_id,
+    Message.conversation_id,
+    Message.external_message_id,
+    Message.direction,
+    Message.type,
+    Message.content,
+    Message.metadata_json,
+    Message.status,
+    Message.error_info,
+    Message.sender_name,
+    Message.timestamp,
+    Message.created_at,
+)
+
+
+def _to_response(row: Any) -> MessageResponse:
+    return MessageResponse.model_validate(row)
+
+
+# Message list cursors are ``encode_cursor(side, timestamp, id)``: the side
+# to page towards and the (timestamp, id) key of the boundary row, so the
+# next page is a range read with no lookup of the cursor message.
+_OLDER, _NEWER, _AROUND = "before", "after", "around"
+
+
+def _parse_cursor(
+    token: str,
+) -> tuple[str, tuple[datetime, uuid.UUID] | None, uuid.UUID | None]:
+    """Return (side, key, anchor_id) for a list_messages cursor.
+
+    Bare message UUIDs (the cursor format before opaque tokens) are still
+    accepted as "older than this message"; their key is looked up as
+    ``anchor_id``.
+    """
+    try:
+        return _OLDER, None, uuid.UUID(token)
+    except ValueError:
+        pass
+    side, raw_at, raw_id = decode_cursor(token, 3)
+    timestamp = parse_datetime(raw_at)
+    if side not in (_OLDER, _NEWER) or timestamp is None:
+        raise BadRequestError("Invalid cursor")
+    return side, (timestamp, parse_uuid(raw_id)), None
+
+
 # ---------------------------------------------------------------------------
 # MessageService
 # ---------------------------------------------------------------------------
@@ -63,31 +120,31 @@ class MessageService:
         conversation_id: uuid.UUID,
         params: MessageListParams,
     ) -> MessageCursorResponse:
-        """Return a cursor-paginated page of messages for a conversation.
+        """Return a keyset-paginated page of messages for a conversation.
 
         Pagination strategy:
-          - Primary sort: timestamp DESC (newest first within the query so we
-            can apply a simple WHERE timestamp < cursor_timestamp).
-          - The returned list is then reversed before serialisation so that the
-            UI receives messages in chronological order (oldest → newest).
-          - next_cursor points to the oldest message on the current page,
-            which becomes the upper-bound for the next (older) page.
+          - Pages are range reads on (timestamp, id) from a cursor that
+            carries that key (see _parse_cursor), so page N costs the same
+            as page 1 however long the thread is.
+          - No cursor: the newest ``limit`` messages.  next_cursor pages
+            older (``has_more``), prev_cursor pages newer (``has_newer``).
+          - ``around``: the anchor message with up to half a page on each
+            side, for jumping to a search hit or a quoted reply.
+          - Rows are always returned in chronological order (oldest → newest).
+          - ``total`` comes from conversation_inbox_state.message_count, not
+            COUNT(*); it is None when filtered by direction.
+
+        Two queries per page: one for the tenant check, the counter and (for
+        ``around`` / legacy UUID cursors) the anchor's timestamp, one for
+        the rows.
 
         Security: tenant_id is always included in the WHERE clause.  The
         conversation_id FK already implies the tenant, but we add the explicit
         tenant check to guard against cross-tenant ID probing.
         """
-        # Verify that the conversation belongs to this tenant
-        conv_result = await db.execute(
-            select(Conversation).where(
-                Conversation.id == conversation_id,
-                Conversation.tenant_id == tenant_id,
-            )
-        )
-        if not conv_result.scalar_one_or_none():
-            raise NotFoundError(f"Conversation {conversation_id} not found")
+        if params.cursor and params.around:
+            raise BadRequestError("cursor and around are mutually exclusive")
 
-        # Base filter predicate — re-used for both the count and the page query.
         base_filters = [
             Message.tenant_id == tenant_id,
             Message.conversation_id == conversation_id,
@@ -95,64 +152,105 @@ class MessageService:
         if params.direction:
             base_filters.append(Message.direction == params.direction)
 
-        # Total count for the pagination compat layer (runs once, cheap index scan)
-        count_result = await db.execute(
-            select(func.count()).select_from(Message).where(*base_filters)
+        side, key, anchor_id = _OLDER, None, None
+        if params.cursor:
+            side, key, anchor_id = _parse_cursor(params.cursor)
+        elif params.around:
+            side, anchor_id = _AROUND, params.around
+
+        meta_query = select(
+            exists()
+            .where(Conversation.id == conversation_id, Conversation.tenant_id == tenant_id)
+            .label("found"),
+            select(ConversationInboxState.message_count)
+            .where(
+                ConversationInboxState.conversation_id == conversation_id,
+                ConversationInboxState.tenant_id == tenant_id,
+            )
+            .scalar_subquery()
+            .label("total"),
         )
-        total: int = count_result.scalar_one()
-
-        query = (
-            select(Message)
+        if anchor_id is not None:
+            meta_query = meta_query.add_columns(
+                select(Message.timestamp)
+                .where(
+                    Message.id == anchor_id,
+                    Message.tenant_id == tenant_id,
+                    Message.conversation_id == conversation_id,
+                )
+                .scalar_subquery()
+                .label("anchor_ts")
+            )
+        meta = (await db.execute(meta_query)).one()
+        if not meta.found:
+            raise NotFoundError(f"Conversation {conversation_id} not found")
+        if anchor_id is not None:
+            if meta.anchor_ts is None:
+                raise BadRequestError(f"Message {anchor_id} not found in this conversation")
+            key = (meta.anchor_ts, anchor_id)
+
+        page_key = tuple_(Message.timestamp, Message.id)
+        older = (
+            select(*_RESPONSE_COLUMNS, literal(_OLDER).label("side"))
             .where(*base_filters)
             .order_by(Message.timestamp.desc(), Message.id.desc())
         )
+        newer = (
+            select(*_RESPONSE_COLUMNS, literal(_NEWER).label("side"))
+            .where(*base_filters)
+            .order_by(Message.timestamp.asc(), Message.id.asc())
+        )
 
-        # Cursor: fetch messages older than the cursor message
-        if params.cursor:
-            try:
-                cursor_id = uuid.UUID(params.cursor)
-            except ValueError:
-                raise BadRequestError(f"Invalid cursor value: {params.cursor!r}")
-
-            cursor_row = await db.execute(
-                select(Message.timestamp).where(
-                    Message.id == cursor_id,
-                    Message.tenant_id == tenant_id,
-                )
-            )
-            cursor_ts = cursor_row.scalar_one_or_none()
-            if cursor_ts is None:
-                raise BadRequestError(f"Cursor message {params.cursor} not found")
-
-            # Messages strictly older than the cursor timestamp
-            query = query.where(
-                (Message.timestamp < cursor_ts)
-                | (
-                    (Message.timestamp == cursor_ts)
-                    & (Message.id < cursor_id)
-                )
+        # Each side fetches one extra row to tell whether more lie beyond it
+        if side == _OLDER:
+            n_older, n_newer = params.limit, 0
+            if key is not None:
+                older = older.where(page_key < tuple_(*key))
+            query = older.limit(n_older + 1)
+        elif side == _NEWER:
+            n_older, n_newer = 0, params.limit
+            query = newer.where(page_key > tuple_(*key)).limit(n_newer + 1)
+        else:
+            n_older = (params.limit + 1) // 2  # includes the anchor
+            n_newer = params.limit - n_older
+            query = union_all(
+                select(older.where(page_key <= tuple_(*key)).limit(n_older + 1).subquery()),
+                select(newer.where(page_key > tuple_(*key)).limit(n_newer + 1).subquery()),
             )
+        rows = (await db.execute(query)).all()
 
-        # Fetch limit + 1 to detect if more pages exist
-        query = query.limit(params.limit + 1)
-        rows = await db.execute(query)
-        messages: list[Message] = list(rows.scalars().all())
-
-        has_more = len(messages) > params.limit
-        if has_more:
-            messages = messages[: params.limit]
-
-        # Determine next cursor (oldest message on this page)
-        next_cursor: str | None = str(messages[-1].id) if (has_more and messages) else None
+        older_rows = sorted(
+            (r for r in rows if r.side == _OLDER), key=lambda r: (r.timestamp, r.id), reverse=True
+        )
+        newer_rows = sorted(
+            (r for r in rows if r.side == _NEWER), key=lambda r: (r.timestamp, r.id)
+        )
 
-        # Reverse to chronological order for the client
-        messages.reverse()
+        if side == _OLDER:
+            has_more = len(older_rows) > n_older
+            has_newer = key is not None
+        elif side == _NEWER:
+            has_more = True
+            has_newer = len(newer_rows) > n_newer
+        else:
+            has_more = len(older_rows) > n_older
+            has_newer = len(newer_rows) > n_newer
+        page = older_rows[:n_older][::-1] + newer_rows[:n_newer]
+
+        next_cursor = prev_cursor = None
+        if page:
+            if has_more:
+                next_cursor = encode_cursor(_OLDER, page[0].timestamp, page[0].id)
+            if has_newer:
+                prev_cursor = encode_cursor(_NEWER, page[-1].timestamp, page[-1].id)
 
         return MessageCursorResponse(
-            data=[MessageResponse.model_validate(m) for m in messages],
+            data=[_to_response(row) for row in page],
             next_cursor=next_cursor,
-            has_more=has_more,
-            total=total,
+            prev_cursor=prev_cursor,
+            has_more=has_more and bool(page),
+            has_newer=has_newer and bool(page),
+            total=None if params.direction else (meta.total or 0),
         )
 
     # ------------------------------------------------------------------
@@ -207,6 +305,7 @@ class MessageService:
         conversation.last_message_at = now
 
         await db.flush()
+        await inbox_state_service.record_message(db, message)
         logger.info(
             "message_created",
             message_id=str(message.id),
@@ -286,6 +385,7 @@ class MessageService:
         conversation.last_message_at = now
 
         await db.flush()
+        await inbox_state_service.record_message(db, message)
         logger.info(
             "outbound_message_saved",
             message_id=str(message.id),
@@ -305,7 +405,7 @@ class MessageService:
         external_message_id: str,
         status: str,
         error_info: str | None = None,
-    ) -> Message | None:
+    ) -> MessageResponse | None:
         """Update delivery status for a message identified by external_message_id.
 
         Called by webhook workers when the channel reports DELIVERED / READ /
@@ -313,14 +413,22 @@ class MessageService:
         (e.g. the outbound save happened before the webhook arrived).
         No tenant_id required here because external_message_id is globally
         unique (unique constraint on the column).
+
+        A single UPDATE … RETURNING; the message is never loaded as an entity.
         """
+        values: dict[str, Any] = {"status": status}
+        if error_info is not None:
+            values["error_info"] = error_info
+
         result = await db.execute(
-            select(Message).where(
-                Message.external_message_id == external_message_id
-            )
+            update(Message)
+            .where(Message.external_message_id == external_message_id)
+            .values(**values)
+            .returning(*_RESPONSE_COLUMNS)
+            .execution_options(synchronize_session=False)
         )
-        message = result.scalar_one_or_none()
-        if not message:
+        row = result.one_or_none()
+        if row is None:
             logger.warning(
                 "message_status_update_not_found",
                 external_message_id=external_message_id,
@@ -328,18 +436,13 @@ class MessageService:
             )
             return None
 
-        message.status = status
-        if error_info is not None:
-            message.error_info = error_info
-
-        await db.flush()
         logger.info(
             "message_status_updated",
-            message_id=str(message.id),
+            message_id=str(row.id),
             external_message_id=external_message_id,
             status=status,
         )
-        return message
+        return _to_response(row)
 
     # ------------------------------------------------------------------
     # get_message_stats
@@ -27,11 +27,13 @@ import structlog
 from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.after_commit import after_commit
 from app.core.config import settings
 from app.core.exceptions import BadRequestError, ConflictError, NotFoundError
 from app.core.security import hash_password
 from app.models.tenant import Tenant
 from app.models.user import User
+from app.n8n.tenant_cache import invalidate_n8n_tenant
 from app.schemas.lead import PaginatedResponse
 from app.schemas.tenant_admin import TenantCreate, TenantResponse, TenantUpdate
 
@@ -152,6 +154,8 @@ class TenantAdminService:
         )
         db.add(tenant)
         await db.flush()  # populate tenant.id
+        # Drop any cached "tenant not found" for this slug
+        after_commit(db, invalidate_n8n_tenant, tenant.id, tenant.slug)
 
         # ------------------------------------------------------------------
         # 4. Create TENANT_ADMIN user with a temporary password
@@ -384,6 +388,7 @@ class TenantAdminService:
             setattr(tenant, field, value)
 
         await db.flush()
+        after_commit(db, invalidate_n8n_tenant, tenant.id, tenant.slug)
 
         logger.info(
             "tenant_updated",
@@ -425,6 +430,7 @@ class TenantAdminService:
             tenant.whatsapp_webhook_secret = app_secret
 
         await db.flush()
+        after_commit(db, invalidate_n8n_tenant, tenant.id, tenant.slug)
 
         logger.info(
             "tenant_whatsapp_configured",
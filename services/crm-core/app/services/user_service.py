@@ -26,7 +26,9 @@ import structlog
 from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.after_commit import after_commit
 from app.core.exceptions import BadRequestError, ConflictError, ForbiddenError, NotFoundError
+from app.core.principal_cache import invalidate_principal
 from app.core.security import hash_password
 from app.models.user import User
 from app.schemas.user import UserCreate, UserListItem, UserResponse, UserUpdate
@@ -225,6 +227,7 @@ class UserService:
             )
             await db.flush()
             await db.refresh(user)
+            after_commit(db, invalidate_principal, user_id, tenant_id)
 
         logger.info("user_updated", user_id=str(user_id), tenant_id=str(tenant_id))
         return UserResponse.model_validate(user)
@@ -264,6 +267,7 @@ class UserService:
             .values(status="INACTIVE")
         )
         await db.flush()
+        after_commit(db, invalidate_principal, user_id, tenant_id)
         logger.info("user_deactivated", user_id=str(user_id), tenant_id=str(tenant_id))
 
 
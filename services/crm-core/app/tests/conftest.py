@@ -37,7 +37,7 @@ os.environ.setdefault("TOKEN_ENCRYPTION_KEY", "")
 
 from app.core.config import settings  # noqa: E402
 from app.core.database import Base, get_db  # noqa: E402
-from app.core.dependencies import get_current_user  # noqa: E402
+from app.core.dependencies import get_current_user, get_read_db  # noqa: E402
 from app.core.security import create_access_token, hash_password  # noqa: E402
 from app.main import app  # noqa: E402
 from app.models.tenant import Tenant  # noqa: E402
@@ -177,6 +177,7 @@ async def app_instance(db_session: AsyncSession, test_user: User):
         return test_user
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
     app.dependency_overrides[get_current_user] = _override_get_current_user
     yield app
     app.dependency_overrides.clear()
@@ -205,6 +206,7 @@ async def unauth_client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient,
         yield db_session
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
     try:
         async with AsyncClient(
             transport=ASGITransport(app=app),
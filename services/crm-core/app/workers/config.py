@@ -97,6 +97,35 @@ def get_redis_settings() -> RedisSettings:
     )
 
 
+# ---------------------------------------------------------------------------
+# Lifecycle hooks
+# ---------------------------------------------------------------------------
+
+
+async def on_job_start(ctx: dict) -> None:
+    """Start counting the job's database statements (app/core/query_stats.py)."""
+    from app.core import query_stats
+
+    ctx["query_stats"] = query_stats.begin()
+
+
+async def on_job_end(ctx: dict) -> None:
+    from app.core import query_stats
+
+    started = ctx.pop("query_stats", None)
+    if started is not None:
+        query_stats.end("job", *started, job_id=ctx.get("job_id"))
+
+
+async def on_shutdown(ctx: dict) -> None:
+    """Publish queued Socket.io events and write queued audit records."""
+    from app.core.audit_writer import flush_audit_log
+    from app.realtime.emit_bus import flush_emit_bus
+
+    await flush_emit_bus()
+    await flush_audit_log()
+
+
 # ---------------------------------------------------------------------------
 # ARQ worker settings class
 # ---------------------------------------------------------------------------
@@ -131,6 +160,13 @@ class WorkerSettings:
         if set, otherwise no automatic retry).  Each task decides whether
         to raise (triggering a retry) or return silently (consuming the job
         without retry).
+    on_job_start / on_job_end:
+        Count the statements and DB time of each job; ``end()`` logs
+        ``db_query_count_high`` for jobs that exceed DB_QUERY_WARN_COUNT.
+    on_shutdown:
+        Flushes the Socket.io emit bus so events emitted by the last jobs
+        still reach the API replicas, and the audit writer so their audit
+        records are not lost.
     """
 
     redis_settings: RedisSettings = get_redis_settings()
@@ -148,6 +184,9 @@ class WorkerSettings:
     poll_delay: float = 0.5      # seconds
     keep_result: int = 3600      # 1 hour
     retry_jobs: bool = True
+    on_job_start = on_job_start
+    on_job_end = on_job_end
+    on_shutdown = on_shutdown
 
 
 # ---------------------------------------------------------------------------
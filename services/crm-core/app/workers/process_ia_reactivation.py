@@ -39,7 +39,7 @@ from sqlalchemy import select
 
 from app.core.database import async_session
 from app.models.conversation import Conversation
-from app.realtime.socket_manager import sio
+from app.realtime.emitter import emit_coalesced_update
 
 logger = structlog.get_logger()
 
@@ -66,8 +66,11 @@ async def _emit_conversation_updated(
         "conversationId": conversation_id,
         "updates": updates,
     }
-    await sio.emit("conversation:updated", payload, room=f"tenant:{tenant_id}")
-    await sio.emit("conversation:updated", payload, room=f"conversation:{conversation_id}")
+    await emit_coalesced_update(
+        conversation_id,
+        payload,
+        [f"tenant:{tenant_id}", f"conversation:{conversation_id}"],
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -6,7 +6,8 @@ Responsibilities
 2. Find or create an active Conversation for that contact.
 3. Check idempotency using the channel's external_message_id.
 4. Persist the Message (direction=INBOUND, status=DELIVERED).
-5. Update conversation.last_message_at; reopen CLOSED conversations.
+5. Update conversation.last_message_at and the inbox read model; reopen
+   CLOSED conversations.
 6. Emit Socket.io events: ``message:new`` and ``conversation:updated``
    (or ``conversation:new`` for newly-created conversations).
 7. If ia_locked is False, forward to the AI/N8N pipeline for processing.
@@ -40,7 +41,8 @@ from app.models.contact import Contact
 from app.models.conversation import Conversation
 from app.models.message import Message
 from app.models.usage_tracking import UsageTracking
-from app.realtime.socket_manager import sio
+from app.realtime.emitter import emit_coalesced_update, emit_to_rooms
+from app.services.inbox_state_service import inbox_state_service
 
 logger = structlog.get_logger()
 
@@ -320,23 +322,22 @@ async def _emit_message_new(
         },
     }
 
-    event_name = "conversation:new" if is_new_conversation else "conversation:updated"
+    # tenant_room already contains every unit attendant, so the unit room is
+    # pruned by resolve_rooms() and each socket receives each event once.
+    rooms = [
+        tenant_room,
+        f"tenant:{tenant_id}:unit:{conversation.hotel_unit}" if conversation.hotel_unit else None,
+    ]
 
-    await sio.emit(
+    await emit_to_rooms(
         "message:new",
         {"message": message_payload, "conversation": conversation_payload},
-        room=tenant_room,
+        rooms,
     )
-    await sio.emit(event_name, conversation_payload, room=tenant_room)
-
-    if conversation.hotel_unit:
-        unit_room = f"tenant:{tenant_id}:unit:{conversation.hotel_unit}"
-        await sio.emit(
-            "message:new",
-            {"message": message_payload, "conversation": conversation_payload},
-            room=unit_room,
-        )
-        await sio.emit(event_name, conversation_payload, room=unit_room)
+    if is_new_conversation:
+        await emit_to_rooms("conversation:new", conversation_payload, rooms)
+    else:
+        await emit_coalesced_update(conversation_id, conversation_payload, rooms)
 
 
 # ---------------------------------------------------------------------------
@@ -480,6 +481,8 @@ async def process_incoming_message(
             conversation.last_message_at = msg_ts
 
             try:
+                await db.flush()
+                await inbox_state_service.record_message(db, message)
                 await db.commit()
                 await db.refresh(message)
                 await db.refresh(conversation)
@@ -128,7 +128,7 @@ async def _fetch_whatsapp_media_url(
        Returns JSON with ``url`` (expires in ~5 minutes).
     2. GET {url} with Authorization header → binary content.
     """
-    graph_url = f"https://graph.facebook.com/v21.0/{media_id}"
+    graph_url = f"{settings.META_GRAPH_API_URL}/v21.0/{media_id}"
     params = {"phone_number_id": phone_number_id}
     headers = {"Authorization": f"Bearer {access_token}"}
 
@@ -46,7 +46,7 @@ from app.core.database import async_session
 from app.models.conversation import Conversation
 from app.models.message import Message
 from app.models.tenant import Tenant
-from app.realtime.socket_manager import sio
+from app.realtime.emitter import emit_to_rooms
 
 logger = structlog.get_logger()
 
@@ -72,9 +72,11 @@ async def _emit_message_status(
     if error_info:
         payload["errorInfo"] = error_info
 
-    tenant_room = f"tenant:{tenant_id}"
-    await sio.emit("message:status", payload, room=tenant_room)
-    await sio.emit("message:status", payload, room=f"conversation:{conversation_id}")
+    await emit_to_rooms(
+        "message:status",
+        payload,
+        [f"tenant:{tenant_id}", f"conversation:{conversation_id}"],
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -31,7 +31,7 @@ from sqlalchemy import select
 from app.core.database import async_session
 from app.models.conversation import Conversation
 from app.models.message import Message
-from app.realtime.socket_manager import sio
+from app.realtime.emitter import emit_to_rooms
 
 logger = structlog.get_logger()
 
@@ -95,8 +95,11 @@ async def _emit_message_status(
     if error_detail:
         payload["errorInfo"] = error_detail
 
-    await sio.emit("message:status", payload, room=f"tenant:{tenant_id}")
-    await sio.emit("message:status", payload, room=f"conversation:{conversation_id}")
+    await emit_to_rooms(
+        "message:status",
+        payload,
+        [f"tenant:{tenant_id}", f"conversation:{conversation_id}"],
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,5 @@
+"""Offline benchmark suites and local stand-ins for external services.
+
+Nothing in this package is imported by the application at runtime.  Run the
+suites from ``services/crm-core`` with ``python -m benchmarks.<module>``.
+"""
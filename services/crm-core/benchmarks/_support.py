@@ -0,0 +1,147 @@
+"""Helpers shared by the benchmark suites.
+
+The suites import ``app.*`` lazily: ``app.core.config.settings`` is built at
+import time, so ``prepare_env()`` must run before the first application
+import to point the service at local stand-ins (SQLite, the Graph API
+simulator) instead of real infrastructure.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import socket
+import tempfile
+from collections.abc import Iterable, Sequence
+
+_BENCH_JWT_SECRET = "benchmark-secret-that-is-at-least-32-chars"
+
+
+def free_port() -> int:
+    """Return a TCP port that is currently free on 127.0.0.1."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare_env(*, database_url: str | None = None, **overrides: str) -> str:
+    """Set the env vars the app reads at import time; return the DATABASE_URL.
+
+    Defaults to a throwaway SQLite file so suites never touch a real database.
+    """
+    if database_url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="crm-bench-"), "bench.db")
+        database_url = f"sqlite+aiosqlite:///{path}"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("JWT_SECRET", _BENCH_JWT_SECRET)
+    for key, value in overrides.items():
+        os.environ[key] = value
+    return database_url
+
+
+def configure_quiet_logging(level: str = "ERROR") -> None:
+    """Drop structlog output below *level* so logging does not skew timings."""
+    import structlog
+
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, level.upper())),
+    )
+    logging.getLogger().setLevel(level.upper())
+
+
+async def create_tables(table_names: Iterable[str]) -> None:
+    """Create only the named tables on the benchmark engine.
+
+    ``Base.metadata.create_all`` over the full model set is not SQLite-safe
+    (duplicate index names across tables), so suites create what they need.
+    """
+    import app.models  # noqa: F401 — register every mapper on Base.metadata
+    from app.core.database import Base, engine
+
+    wanted = set(table_names)
+    tables = [t for name, t in Base.metadata.tables.items() if name in wanted]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+
+
+def serialize_sqlite_transactions() -> None:
+    """Make every SQLite transaction ``BEGIN IMMEDIATE`` on the app engine.
+
+    pysqlite's deferred transactions deadlock when two connections read and
+    then both try to upgrade to a write lock, which concurrent worker tasks
+    do constantly.  Taking the write lock up front turns that into queueing
+    behind a generous busy timeout.  No-op for non-SQLite URLs; use Postgres via
+    ``--database-url`` for realistic concurrent-write numbers.
+    """
+    from sqlalchemy import event
+
+    from app.core.database import engine
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record) -> None:
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA busy_timeout = 60000")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin_immediate(conn) -> None:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def enable_sqlite_wal() -> None:
+    """Put the app engine's SQLite database in WAL mode with a busy timeout.
+
+    In WAL mode readers never block the single writer, so read-mostly load
+    (socket auth, ACL lookups) stays concurrent while writes queue.  Suites
+    that run writes concurrently should use ``serialize_sqlite_transactions``
+    instead.  No-op for non-SQLite URLs.
+    """
+    from sqlalchemy import event
+
+    from app.core.database import engine
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _wal(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA busy_timeout = 60000")
+        cursor.close()
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of *samples* (0 for an empty sequence)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def parse_int_list(raw: str) -> list[int]:
+    return [int(part) for part in raw.split(",") if part.strip()]
+
+
+def print_table(rows: list[dict], columns: list[tuple[str, str]]) -> None:
+    """Print *rows* as an aligned text table; *columns* is (key, header) pairs."""
+    rendered = [[_fmt(row.get(key)) for key, _ in columns] for row in rows]
+    widths = [
+        max(len(header), *(len(r[i]) for r in rendered)) if rendered else len(header)
+        for i, (_, header) in enumerate(columns)
+    ]
+    print("  ".join(header.rjust(w) for (_, header), w in zip(columns, widths)))
+    for r in rendered:
+        print("  ".join(cell.rjust(w) for cell, w in zip(r, widths)))
+
+
+def _fmt(value: object) -> str:
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return "" if value is None else str(value)
@@ -0,0 +1,355 @@
+"""Channel-layer throughput benchmark against the local Graph API simulator.
+
+Drives two entry points at increasing concurrency:
+
+  router  ``channel_router.send_text`` — adapter construction, ``_http``
+          retry/backoff and the per-service circuit breaker, no database.
+  worker  ``process_outgoing_message`` — the full ARQ task: Message/Tenant
+          loads, adapter send, SENT/FAILED bookkeeping and the Socket.io
+          emit, against a throwaway SQLite database (or ``--database-url``).
+          The emit goes to the in-process Socket.io manager, with the Redis
+          emit bus and replay log switched off, so no Redis is needed and
+          the numbers exclude the bus publish.
+
+For every (target, channel, concurrency) level it reports throughput,
+p50/p99 latency, failures, HTTP retries (requests served by the simulator
+minus first attempts) and sends short-circuited by an OPEN breaker.
+
+Examples::
+
+    # Clean-path baseline
+    python -m benchmarks.bench_channels --concurrency 1,8,32,128 --requests 500
+
+    # Fault injection with production backoff compressed 20x
+    python -m benchmarks.bench_channels --latency lognormal:60:0.6 \\
+        --rate-limit 0.03 --server-error 0.01 --backoff-scale 0.05
+
+    # CI gate: exit 1 if any level's p99 exceeds the budget
+    python -m benchmarks.bench_channels --latency fixed:20 --max-p99-ms 150 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from benchmarks._support import (
+    configure_quiet_logging,
+    create_tables,
+    free_port,
+    parse_int_list,
+    percentile,
+    prepare_env,
+    print_table,
+    serialize_sqlite_transactions,
+)
+from benchmarks.meta_graph_simulator import (
+    LatencyModel,
+    MetaGraphSimulator,
+    SimulatorConfig,
+)
+
+_ACCESS_TOKEN = "EAAB" + "x" * 60
+_PHONE_NUMBER_ID = "100000000000001"
+_RECIPIENT = "5511999990000"
+
+_WORKER_TABLES = (
+    "tenants",
+    "users",
+    "industries",
+    "territories",
+    "contacts",
+    "tags",
+    "conversations",
+    "conversation_tags",
+    "messages",
+)
+
+
+@dataclass
+class LevelResult:
+    target: str
+    channel: str
+    concurrency: int
+    latencies_ms: list[float] = field(default_factory=list)
+    failures: int = 0
+    circuit_open: int = 0
+    elapsed_s: float = 0.0
+    http_requests: int = 0
+
+    @property
+    def ops(self) -> int:
+        return len(self.latencies_ms)
+
+    def as_row(self) -> dict:
+        attempted = self.ops - self.circuit_open
+        return {
+            "target": self.target,
+            "channel": self.channel,
+            "concurrency": self.concurrency,
+            "ops": self.ops,
+            "ok": self.ops - self.failures,
+            "failed": self.failures,
+            "throughput": self.ops / self.elapsed_s if self.elapsed_s else 0.0,
+            "p50_ms": percentile(self.latencies_ms, 50),
+            "p99_ms": percentile(self.latencies_ms, 99),
+            "http_requests": self.http_requests,
+            "retries": max(0, self.http_requests - attempted),
+            "circuit_open": self.circuit_open,
+        }
+
+
+_COLUMNS = [
+    ("target", "target"),
+    ("channel", "channel"),
+    ("concurrency", "conc"),
+    ("ops", "ops"),
+    ("failed", "failed"),
+    ("throughput", "ops/s"),
+    ("p50_ms", "p50 ms"),
+    ("p99_ms", "p99 ms"),
+    ("retries", "retries"),
+    ("circuit_open", "cb open"),
+]
+
+
+# ---------------------------------------------------------------------------
+# Load driver
+# ---------------------------------------------------------------------------
+
+
+async def _drive(op, total: int, concurrency: int, result: LevelResult) -> None:
+    """Run *op(i)* for i in range(total) with at most *concurrency* in flight."""
+    from app.core.circuit_breaker import CircuitOpenError
+
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                await op(i)
+            except Exception as exc:  # noqa: BLE001 — every failure is a data point
+                result.failures += 1
+                if isinstance(exc, CircuitOpenError) or isinstance(exc.__cause__, CircuitOpenError):
+                    result.circuit_open += 1
+            result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed_s = time.perf_counter() - started
+
+
+def _reset_breakers() -> None:
+    from app.channels import _http
+
+    _http._circuit_breakers.clear()
+
+
+# ---------------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------------
+
+
+def _bench_tenant():
+    from app.models.tenant import Tenant
+
+    return Tenant(
+        id=uuid.uuid4(),
+        name="Bench Hotel",
+        slug=f"bench-{uuid.uuid4().hex[:8]}",
+        status="ACTIVE",
+        whatsapp_phone_number_id=_PHONE_NUMBER_ID,
+        whatsapp_access_token=_ACCESS_TOKEN,
+        messenger_access_token=_ACCESS_TOKEN,
+        instagram_access_token=_ACCESS_TOKEN,
+    )
+
+
+async def bench_router(channel: str, total: int, concurrency: int) -> LevelResult:
+    from app.channels.router import channel_router
+
+    tenant = _bench_tenant()
+    result = LevelResult("router", channel, concurrency)
+
+    async def op(i: int) -> None:
+        await channel_router.send_text(channel, tenant, _RECIPIENT, f"benchmark message {i}")
+
+    await _drive(op, total, concurrency, result)
+    return result
+
+
+async def _seed_worker_rows(total: int) -> tuple[str, str, list[str]]:
+    """Insert a tenant, one conversation and *total* PENDING outbound messages."""
+    from app.core.database import async_session
+    from app.models.contact import Contact
+    from app.models.conversation import Conversation
+    from app.models.message import Message
+
+    tenant = _bench_tenant()
+    contact = Contact(
+        id=uuid.uuid4(), tenant_id=tenant.id, first_name="Guest", mobile_no=_RECIPIENT
+    )
+    conversation = Conversation(
+        id=uuid.uuid4(),
+        tenant_id=tenant.id,
+        contact_id=contact.id,
+        channel="WHATSAPP",
+        status="OPEN",
+    )
+
+    message_ids = [uuid.uuid4() for _ in range(total)]
+
+    async with async_session() as db:
+        db.add_all([tenant, contact, conversation])
+        await db.flush()
+        db.add_all(
+            Message(
+                id=mid,
+                tenant_id=tenant.id,
+                conversation_id=conversation.id,
+                direction="OUTBOUND",
+                type="TEXT",
+                content="benchmark",
+                status="PENDING",
+            )
+            for mid in message_ids
+        )
+        await db.commit()
+
+    return str(tenant.id), str(conversation.id), [str(mid) for mid in message_ids]
+
+
+async def bench_worker(channel: str, total: int, concurrency: int) -> LevelResult:
+    from app.workers.process_outgoing_message import process_outgoing_message
+
+    tenant_id, conversation_id, message_ids = await _seed_worker_rows(total)
+    result = LevelResult("worker", channel, concurrency)
+
+    async def op(i: int) -> None:
+        await process_outgoing_message(
+            {"job_id": f"bench-{i}"},
+            tenant_id=tenant_id,
+            conversation_id=conversation_id,
+            message_id=message_ids[i],
+            recipient_id=_RECIPIENT,
+            channel=channel,
+            content=f"benchmark message {i}",
+        )
+
+    await _drive(op, total, concurrency, result)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--targets", default="router,worker", help="router,worker")
+    parser.add_argument("--channels", default="WHATSAPP", help="WHATSAPP,MESSENGER,INSTAGRAM")
+    parser.add_argument("--concurrency", default="1,8,32,128")
+    parser.add_argument("--requests", type=int, default=400, help="sends per level")
+    parser.add_argument("--latency", default="fixed:20", help="simulator latency, kind[:a[:b]]")
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--server-error", type=float, default=0.0)
+    parser.add_argument("--token-error", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument(
+        "--backoff-scale",
+        type=float,
+        default=1.0,
+        help="multiplier for _http retry delays (1.0 = production timings)",
+    )
+    parser.add_argument("--database-url", default=None, help="defaults to a temp SQLite file")
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="fail if any p99 exceeds")
+    parser.add_argument("--json", dest="json_path", default=None, help="write results as JSON")
+    parser.add_argument("--log-level", default="ERROR")
+    return parser
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    import uvicorn
+
+    port = free_port()
+    prepare_env(
+        database_url=args.database_url,
+        META_GRAPH_API_URL=f"http://127.0.0.1:{port}",
+        SOCKETIO_MESSAGE_QUEUE_ENABLED="false",
+        REALTIME_STREAM_ENABLED="false",
+    )
+
+    configure_quiet_logging(args.log_level)
+
+    from app.channels import _http
+
+    _http._BASE_DELAY *= args.backoff_scale
+    _http._MAX_DELAY *= args.backoff_scale
+
+    simulator = MetaGraphSimulator(
+        SimulatorConfig(
+            latency=LatencyModel.parse(args.latency),
+            rate_limit_ratio=args.rate_limit,
+            server_error_ratio=args.server_error,
+            token_error_ratio=args.token_error,
+            seed=args.seed,
+        )
+    )
+    server = uvicorn.Server(
+        uvicorn.Config(simulator, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+    )
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    if "worker" in targets:
+        serialize_sqlite_transactions()
+        await create_tables(_WORKER_TABLES)
+
+    runners = {"router": bench_router, "worker": bench_worker}
+    rows: list[dict] = []
+    try:
+        for target in targets:
+            for channel in [c.strip().upper() for c in args.channels.split(",") if c.strip()]:
+                if target == "worker" and channel != "WHATSAPP":
+                    # process_outgoing_message only resolves the WhatsApp adapter.
+                    continue
+                for concurrency in parse_int_list(args.concurrency):
+                    _reset_breakers()
+                    simulator.stats.reset()
+                    level = await runners[target](channel, args.requests, concurrency)
+                    level.http_requests = simulator.stats.requests
+                    rows.append(level.as_row())
+    finally:
+        server.should_exit = True
+        await server_task
+
+    return rows
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    rows = asyncio.run(run(args))
+
+    print_table(rows, _COLUMNS)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+
+    if args.max_p99_ms is not None:
+        slow = [r for r in rows if r["p99_ms"] > args.max_p99_ms]
+        if slow:
+            print(f"p99 budget of {args.max_p99_ms:.0f} ms exceeded in {len(slow)} level(s)")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""HTTP middleware stack benchmark: BaseHTTPMiddleware vs pure ASGI.
+
+Builds two copies of the app's middleware stack around the same two
+endpoints and drives them in-process through the ASGI interface, so the
+numbers contain only the middleware and routing cost, with no sockets or
+HTTP parsing:
+
+  legacy  the previous stack — RequestIDMiddleware and SlowAPIMiddleware as
+          ``BaseHTTPMiddleware`` plus the two ``@app.middleware("http")``
+          functions (trailing slash, security headers).
+  asgi    the current stack from app/core/middleware.py and
+          app/core/request_id.py.
+
+Both stacks sit on top of CORSMiddleware, with an in-memory limiter whose
+default limit is never reached.
+
+Endpoints:
+  ping    ``GET /ping/`` — a trivial JSON response (trailing slash exercises
+          the path rewrite).
+  stream  ``GET /stream`` — a StreamingResponse of ``--stream-kib`` KiB in
+          64 KiB chunks.
+
+For every (stack, endpoint, concurrency) level it reports requests/sec and
+p50/p99 latency.
+
+Examples::
+
+    python -m benchmarks.bench_middleware
+    python -m benchmarks.bench_middleware --concurrency 1,16,64 --requests 5000
+    python -m benchmarks.bench_middleware --endpoints stream --stream-kib 8192 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+
+from benchmarks._support import (
+    configure_quiet_logging,
+    parse_int_list,
+    percentile,
+    prepare_env,
+    print_table,
+)
+
+_CHUNK = b"x" * 65_536
+
+STACKS = ("legacy", "asgi")
+
+
+# ---------------------------------------------------------------------------
+# App construction
+# ---------------------------------------------------------------------------
+
+
+def _install_legacy(app) -> None:
+    """The stack main.py used before the pure-ASGI rewrite (kept for comparison)."""
+    import uuid
+
+    import structlog
+    from slowapi.middleware import SlowAPIMiddleware
+    from starlette.middleware.base import BaseHTTPMiddleware
+
+    class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+            structlog.contextvars.clear_contextvars()
+            structlog.contextvars.bind_contextvars(request_id=request_id)
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
+
+    app.add_middleware(LegacyRequestIDMiddleware)
+    app.add_middleware(SlowAPIMiddleware)
+
+    @app.middleware("http")
+    async def strip_trailing_slash_middleware(request, call_next):
+        path = request.scope["path"]
+        if path != "/" and path.endswith("/"):
+            request.scope["path"] = path.rstrip("/")
+        return await call_next(request)
+
+    @app.middleware("http")
+    async def security_headers_middleware(request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        if request.url.scheme == "https":
+            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        return response
+
+
+def _install_asgi(app) -> None:
+    from app.core.middleware import (
+        RateLimitMiddleware,
+        SecurityHeadersMiddleware,
+        TrailingSlashMiddleware,
+    )
+    from app.core.request_id import RequestIDMiddleware
+
+    app.add_middleware(RequestIDMiddleware)
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(TrailingSlashMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+
+
+def build_app(stack: str, *, stream_kib: int = 1024, rate_limit: str = "1000000/minute"):
+    """Return a FastAPI app with */ping* and */stream* behind the given *stack*."""
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import StreamingResponse
+    from slowapi import Limiter, _rate_limit_exceeded_handler
+    from slowapi.errors import RateLimitExceeded
+    from slowapi.util import get_remote_address
+
+    app = FastAPI(redirect_slashes=False)
+    chunks, tail = divmod(stream_kib * 1024, len(_CHUNK))
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            for _ in range(chunks):
+                yield _CHUNK
+            if tail:
+                yield _CHUNK[:tail]
+
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000"],
+        allow_credentials=True,
+        allow_methods=["GET"],
+        allow_headers=["Authorization", "X-Request-ID"],
+    )
+    app.state.limiter = Limiter(key_func=get_remote_address, default_limits=[rate_limit])
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    {"legacy": _install_legacy, "asgi": _install_asgi}[stack](app)
+    return app
+
+
+# ---------------------------------------------------------------------------
+# In-process ASGI driver
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Reply:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    body_messages: int
+
+
+async def call(
+    app, path: str, *, scheme: str = "http", headers: dict[str, str] | None = None
+) -> Reply:
+    """Run one GET request through *app* and collect the response."""
+    raw_headers = [(b"host", b"testserver")]
+    raw_headers += [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": scheme,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 443 if scheme == "https" else 80),
+    }
+    sent_request = False
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # never disconnects
+
+    start: dict = {}
+    body: list[bytes] = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return Reply(
+        status=start["status"],
+        headers={k.decode().lower(): v.decode() for k, v in start["headers"]},
+        body=b"".join(body),
+        body_messages=len(body),
+    )
+
+
+@dataclass
+class LevelResult:
+    stack: str
+    endpoint: str
+    concurrency: int
+    latencies_ms: list[float] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    def as_row(self) -> dict:
+        return {
+            "stack": self.stack,
+            "endpoint": self.endpoint,
+            "concurrency": self.concurrency,
+            "requests": len(self.latencies_ms),
+            "rps": len(self.latencies_ms) / self.elapsed_s if self.elapsed_s else 0.0,
+            "p50_ms": percentile(self.latencies_ms, 50),
+            "p99_ms": percentile(self.latencies_ms, 99),
+        }
+
+
+_COLUMNS = [
+    ("stack", "stack"),
+    ("endpoint", "endpoint"),
+    ("concurrency", "conc"),
+    ("requests", "reqs"),
+    ("rps", "req/s"),
+    ("p50_ms", "p50 ms"),
+    ("p99_ms", "p99 ms"),
+]
+
+_PATHS = {"ping": "/ping/", "stream": "/stream"}
+
+
+async def bench_level(app, stack: str, endpoint: str, total: int, concurrency: int) -> LevelResult:
+    result = LevelResult(stack=stack, endpoint=endpoint, concurrency=concurrency)
+    path = _PATHS[endpoint]
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        for _ in counter:
+            started = time.perf_counter()
+            reply = await call(app, path)
+            if reply.status != 200:
+                raise RuntimeError(f"{stack} {path} answered {reply.status}")
+            result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed_s = time.perf_counter() - started
+    return result
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--stacks", default=",".join(STACKS))
+    parser.add_argument("--endpoints", default="ping,stream", help="ping,stream")
+    parser.add_argument("--concurrency", default="1,16,64")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per ping level")
+    parser.add_argument(
+        "--stream-requests", type=int, default=200, help="requests per stream level"
+    )
+
+    parser.add_argument("--stream-kib", type=int, default=1024, help="streamed body size")
+    parser.add_argument("--json", dest="json_path", default=None, help="write results as JSON")
+    parser.add_argument("--log-level", default="ERROR")
+    return parser
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    prepare_env()
+    configure_quiet_logging(args.log_level)
+
+    rows: list[dict] = []
+    for endpoint in [e.strip() for e in args.endpoints.split(",") if e.strip()]:
+        total = args.stream_requests if endpoint == "stream" else args.requests
+        for concurrency in parse_int_list(args.concurrency):
+            for stack in [s.strip() for s in args.stacks.split(",") if s.strip()]:
+                app = build_app(stack, stream_kib=args.stream_kib)
+                await call(app, _PATHS[endpoint])  # build the middleware stack
+                level = await bench_level(app, stack, endpoint, total, concurrency)
+                rows.append(level.as_row())
+    return rows
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    rows = asyncio.run(run(args))
+
+    print_table(rows, _COLUMNS)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,754 @@
+"""Socket.io fan-out benchmark: thousands of simulated attendants on one replica.
+
+Starts the realtime server (``socket_manager.socket_app`` under uvicorn) in a
+child process, against a throwaway SQLite database seeded with tenants, hotel
+units, users of every role and conversations.  The parent then:
+
+  1. connects ``--clients`` simulated browsers.  Each one speaks Engine.IO 4 /
+     Socket.IO 5 over a raw WebSocket, authenticates with a real JWT, and
+     joins one conversation its role is allowed to see;
+  2. injects ``--messages`` inbound messages at ``--rate`` per second through
+     each target:
+       emit    ``emitter.emit_new_message`` (conversation + admins + unit rooms)
+       worker  ``process_incoming_message`` (DB write + tenant-wide fan-out)
+  3. records every ``message:new`` each client receives.
+
+The server stamps each message with ``time.time()`` just before calling the
+target.  Clients and server share the host clock, so latency is the full path:
+emit, encode, socket write, client receive.
+
+For every (clients, target) level it reports:
+  - deliveries and average fan-out per message;
+  - per-delivery latency p50/p95/p99/max;
+  - per-message completion p99 (time until the last recipient got it);
+  - connect p99;
+  - server RSS per connection;
+  - server CPU per connect and per delivery.
+
+Examples::
+
+    # Default: 1000 and 3000 clients over 8 tenants, both targets
+    python -m benchmarks.bench_socketio --clients 1000,3000
+
+    # Through the Redis emit bus and replay stream (needs a local Redis)
+    python -m benchmarks.bench_socketio --redis-url redis://localhost:6379/0
+
+    # CI gate on emit fan-out latency
+    python -m benchmarks.bench_socketio --clients 500 --targets emit --max-p99-ms 50
+
+    # CI smoke run: exit 1 on connect/injection failures or a silent level
+    python -m benchmarks.bench_socketio --clients 200 --messages 50 --strict
+
+All clients run on one event loop in the parent.  At very high client counts
+that loop, not the server, becomes the bottleneck; compare ``client lag``
+(the worst event-loop delay seen by the parent) with the latencies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from benchmarks._support import (
+    configure_quiet_logging,
+    create_tables,
+    enable_sqlite_wal,
+    free_port,
+    parse_int_list,
+    percentile,
+    prepare_env,
+    print_table,
+)
+
+_TABLES = (
+    "tenants",
+    "users",
+    "industries",
+    "territories",
+    "contacts",
+    "tags",
+    "conversations",
+    "conversation_tags",
+    "messages",
+    "conversation_inbox_state",
+)
+
+# Role mix of the simulated workforce (cumulative weights)
+_ROLE_MIX = (("ATTENDANT", 0.80), ("HEAD", 0.90), ("SALES", 0.95), ("TENANT_ADMIN", 1.0))
+
+
+# ---------------------------------------------------------------------------
+# Seed data
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Seat:
+    """One simulated browser: a user, its token and the conversation it opens."""
+
+    user_id: str
+    tenant_id: str
+    role: str
+    hotel_unit: str | None
+    token: str
+    conversation_id: str
+
+
+@dataclass
+class SeededConversation:
+    id: str
+    tenant_id: str
+    hotel_unit: str
+    phone: str
+
+
+def _pick_role(rng: random.Random) -> str:
+    roll = rng.random()
+    return next(role for role, cumulative in _ROLE_MIX if roll < cumulative)
+
+
+async def seed(
+    *,
+    clients: int,
+    tenants: int,
+    units: int,
+    conversations: int,
+    rng: random.Random,
+) -> tuple[list[Seat], list[SeededConversation]]:
+    """Insert tenants, users and conversations; return one Seat per client."""
+    from app.core.database import async_session
+    from app.core.security import create_access_token
+    from app.models.contact import Contact
+    from app.models.conversation import Conversation
+    from app.models.tenant import Tenant
+    from app.models.user import User
+
+    seats: list[Seat] = []
+    seeded: list[SeededConversation] = []
+    phone_seq = iter(range(10**7))
+
+    async with async_session() as db:
+        tenant_rows = [
+            Tenant(id=uuid.uuid4(), name=f"Bench Hotel {t}", slug=f"bench-{uuid.uuid4().hex[:8]}")
+            for t in range(tenants)
+        ]
+        db.add_all(tenant_rows)
+        await db.flush()
+
+        users: list[User] = []
+        for i in range(clients):
+            tenant = tenant_rows[i % tenants]
+            role = _pick_role(rng)
+            users.append(
+                User(
+                    id=uuid.uuid4(),
+                    tenant_id=tenant.id,
+                    email=f"bench{i}@example.test",
+                    password_hash="!",
+                    name=f"Bench User {i}",
+                    role=role,
+                    status="ACTIVE",
+                    hotel_unit=(
+                        f"Unit {rng.randrange(units)}" if role in ("ATTENDANT", "HEAD") else None
+                    ),
+                )
+            )
+        db.add_all(users)
+        await db.flush()
+
+        by_tenant: dict[uuid.UUID, list[SeededConversation]] = {}
+        for tenant in tenant_rows:
+            for c in range(conversations):
+                phone = f"55119{next(phone_seq):08d}"
+                contact = Contact(
+                    id=uuid.uuid4(), tenant_id=tenant.id, first_name="Guest", mobile_no=phone
+                )
+                conversation = Conversation(
+                    id=uuid.uuid4(),
+                    tenant_id=tenant.id,
+                    contact_id=contact.id,
+                    channel="WHATSAPP",
+                    status="OPEN",
+                    hotel_unit=f"Unit {c % units}",
+                    ia_locked=True,
+                )
+                db.add_all([contact, conversation])
+                row = SeededConversation(
+                    str(conversation.id), str(tenant.id), conversation.hotel_unit, phone
+                )
+                by_tenant.setdefault(tenant.id, []).append(row)
+                seeded.append(row)
+        await db.commit()
+
+    for user in users:
+        candidates = by_tenant[user.tenant_id]
+        if user.role == "ATTENDANT":
+            # ATTENDANT may only join conversations of their own unit
+            candidates = [c for c in candidates if c.hotel_unit == user.hotel_unit] or candidates
+        seats.append(
+            Seat(
+                user_id=str(user.id),
+                tenant_id=str(user.tenant_id),
+                role=user.role,
+                hotel_unit=user.hotel_unit,
+                token=create_access_token(user.id, user.tenant_id),
+                conversation_id=rng.choice(candidates).id,
+            )
+        )
+    return seats, seeded
+
+
+# ---------------------------------------------------------------------------
+# Server process
+# ---------------------------------------------------------------------------
+
+
+def _process_stats() -> dict:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            rss = int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:  # not Linux — peak RSS is the best we have
+        rss = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return {"cpu_s": usage.ru_utime + usage.ru_stime, "rss_bytes": rss}
+
+
+def build_server_app():
+    """socket_app plus a /bench control API that runs injections in-process."""
+    import socketio
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    from app.realtime.emitter import emit_new_message
+    from app.realtime.socket_manager import sio
+    from app.workers.process_incoming_message import process_incoming_message
+
+    # SQLite has a single writer and the worker holds one session open while a
+    # second one writes usage counters; run worker jobs one at a time locally.
+    # With --database-url pointing at Postgres the lock only costs ordering.
+    worker_lock = asyncio.Lock()
+
+    async def emit(request: Request) -> JSONResponse:
+        body = await request.json()
+        await emit_new_message(
+            body["tenant_id"],
+            body["conversation_id"],
+            {"id": body["key"], "content": "benchmark", "benchSentAt": time.time()},
+            conversation={"id": body["conversation_id"], "hotelUnit": body["hotel_unit"]},
+            hotel_unit=body["hotel_unit"],
+        )
+        return JSONResponse({"ok": True})
+
+    async def incoming(request: Request) -> JSONResponse:
+        body = await request.json()
+        async with worker_lock:
+            await process_incoming_message(
+                {"job_id": f"bench-{body['key']}"},
+                tenant_id=body["tenant_id"],
+                channel="WHATSAPP",
+                message_data={
+                    "type": "TEXT",
+                    "content": "benchmark",
+                    "external_id": body["key"],
+                    "metadata": {"benchKey": body["key"], "benchSentAt": time.time()},
+                },
+                contact_phone=body["phone"],
+                contact_name="Guest",
+            )
+        return JSONResponse({"ok": True})
+
+    async def stats(request: Request) -> JSONResponse:
+        sockets = len(sio.manager.rooms.get("/", {}).get(None, {}))
+        return JSONResponse({**_process_stats(), "sockets": sockets})
+
+    control = Starlette(
+        routes=[
+            Route("/bench/emit", emit, methods=["POST"]),
+            Route("/bench/incoming", incoming, methods=["POST"]),
+            Route("/bench/stats", stats, methods=["GET"]),
+        ]
+    )
+    return socketio.ASGIApp(sio, other_asgi_app=control, socketio_path="socket.io")
+
+
+def _serve(port: int, log_level: str) -> None:
+    """Child-process entry point (environment inherited from the parent)."""
+    import uvicorn
+
+    configure_quiet_logging(log_level)
+    enable_sqlite_wal()
+    uvicorn.run(
+        build_server_app(),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+        lifespan="off",
+        backlog=4096,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Simulated client
+# ---------------------------------------------------------------------------
+
+
+def parse_packet(raw: str) -> tuple[str, object] | None:
+    """Return (event, data) for a Socket.io EVENT packet on the default namespace."""
+    if not raw.startswith("42"):
+        return None
+    body = raw[2:]
+    while body and body[0].isdigit():  # skip an ack id
+        body = body[1:]
+    event, *args = json.loads(body)
+    return event, (args[0] if args else None)
+
+
+def sent_at(payload: dict) -> tuple[str, float] | None:
+    """Extract (message key, server timestamp) from a bench message:new payload."""
+    message = payload.get("message") or {}
+    if "benchSentAt" in message:
+        return message["id"], message["benchSentAt"]
+    metadata = message.get("metadata") or {}
+    if "benchSentAt" in metadata:
+        return metadata["benchKey"], metadata["benchSentAt"]
+    return None
+
+
+@dataclass
+class FanoutRecorder:
+    latencies_ms: list[float] = field(default_factory=list)
+    last_delivery: dict[str, float] = field(default_factory=dict)
+
+    def record(self, payload: dict, received: float) -> None:
+        stamped = sent_at(payload)
+        if stamped is None:
+            return
+        key, sent = stamped
+        latency = (received - sent) * 1000.0
+        self.latencies_ms.append(latency)
+        self.last_delivery[key] = max(latency, self.last_delivery.get(key, 0.0))
+
+    def reset(self) -> None:
+        self.latencies_ms.clear()
+        self.last_delivery.clear()
+
+
+class SimulatedClient:
+    """Minimal Engine.IO 4 / Socket.IO 5 WebSocket client for one Seat."""
+
+    def __init__(self, url: str, seat: Seat, recorder: FanoutRecorder) -> None:
+        self.url = url
+        self.seat = seat
+        self.recorder = recorder
+        self._ws = None
+        self._reader: asyncio.Task | None = None
+
+    async def connect(self, timeout: float) -> float:
+        """Open, authenticate and join; return the elapsed seconds."""
+        from websockets.asyncio.client import connect
+
+        started = time.perf_counter()
+        self._ws = await connect(self.url, max_size=None, open_timeout=timeout)
+        await asyncio.wait_for(self._handshake(), timeout)
+        self._reader = asyncio.get_running_loop().create_task(self._read())
+        return time.perf_counter() - started
+
+    async def _handshake(self) -> None:
+        ws = self._ws
+        opened = await ws.recv()
+        if not opened.startswith("0"):
+            raise ConnectionError(f"unexpected Engine.IO open packet {opened[:40]!r}")
+        await ws.send("40" + json.dumps({"token": self.seat.token}))
+        while True:
+            packet = await ws.recv()
+            if packet == "2":
+                await ws.send("3")
+            elif packet.startswith("40"):
+                break
+            elif packet.startswith("44"):
+                raise ConnectionError(f"connect refused: {packet[2:]}")
+
+        join = ["conversation:join", {"conversationId": self.seat.conversation_id}]
+        await ws.send("42" + json.dumps(join))
+        while True:
+            packet = await ws.recv()
+            if packet == "2":
+                await ws.send("3")
+                continue
+            parsed = parse_packet(packet) if isinstance(packet, str) else None
+            if parsed and parsed[0] == "conversation:joined":
+                return
+            if parsed and parsed[0] == "error":
+                raise ConnectionError(f"join failed: {parsed[1]}")
+
+    async def _read(self) -> None:
+        ws = self._ws
+        try:
+            async for packet in ws:
+                if packet == "2":
+                    await ws.send("3")
+                elif isinstance(packet, str) and packet.startswith('42["message:new"'):
+                    received = time.time()
+                    self.recorder.record(parse_packet(packet)[1], received)
+        except Exception:  # noqa: BLE001 — a dropped client just stops recording
+            return
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._ws is not None:
+            await self._ws.close()
+
+
+# ---------------------------------------------------------------------------
+# Levels
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class LevelResult:
+    clients: int
+    target: str
+    connected: int = 0
+    connect_failures: int = 0
+    connect_ms: list[float] = field(default_factory=list)
+    messages: int = 0
+    inject_failures: int = 0
+    latencies_ms: list[float] = field(default_factory=list)
+    completion_ms: list[float] = field(default_factory=list)
+    rss_per_conn_kb: float = 0.0
+    cpu_per_connect_ms: float = 0.0
+    cpu_per_delivery_us: float = 0.0
+    client_lag_ms: float = 0.0
+
+    def as_row(self) -> dict:
+        deliveries = len(self.latencies_ms)
+        return {
+            "clients": self.clients,
+            "target": self.target,
+            "connected": self.connected,
+            "connect_failed": self.connect_failures,
+            "connect_p99_ms": percentile(self.connect_ms, 99),
+            "messages": self.messages,
+            "inject_failed": self.inject_failures,
+            "deliveries": deliveries,
+            "fanout": deliveries / self.messages if self.messages else 0.0,
+            "p50_ms": percentile(self.latencies_ms, 50),
+            "p95_ms": percentile(self.latencies_ms, 95),
+            "p99_ms": percentile(self.latencies_ms, 99),
+            "max_ms": max(self.latencies_ms, default=0.0),
+            "completion_p99_ms": percentile(self.completion_ms, 99),
+            "rss_per_conn_kb": self.rss_per_conn_kb,
+            "cpu_per_connect_ms": self.cpu_per_connect_ms,
+            "cpu_per_delivery_us": self.cpu_per_delivery_us,
+            "client_lag_ms": self.client_lag_ms,
+        }
+
+
+_COLUMNS = [
+    ("clients", "clients"),
+    ("target", "target"),
+    ("connected", "conn"),
+    ("connect_p99_ms", "conn p99"),
+    ("messages", "msgs"),
+    ("fanout", "fanout"),
+    ("p50_ms", "p50 ms"),
+    ("p95_ms", "p95 ms"),
+    ("p99_ms", "p99 ms"),
+    ("max_ms", "max ms"),
+    ("completion_p99_ms", "done p99"),
+    ("rss_per_conn_kb", "KB/conn"),
+    ("cpu_per_connect_ms", "cpu ms/conn"),
+    ("cpu_per_delivery_us", "cpu us/dlv"),
+    ("client_lag_ms", "client lag"),
+]
+
+
+class _LagProbe:
+    """Worst event-loop delay seen by the parent while it is running."""
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.worst_ms = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = (time.perf_counter() - started - self.interval) * 1000.0
+            self.worst_ms = max(self.worst_ms, lag)
+
+    def __enter__(self) -> _LagProbe:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._task.cancel()
+
+
+async def _connect_all(
+    url: str, seats: list[Seat], recorder: FanoutRecorder, concurrency: int, timeout: float
+) -> tuple[list[SimulatedClient], list[float], int]:
+    clients: list[SimulatedClient] = []
+    connect_ms: list[float] = []
+    failures = 0
+    pending = iter(seats)
+
+    async def worker() -> None:
+        nonlocal failures
+        for seat in pending:
+            client = SimulatedClient(url, seat, recorder)
+            try:
+                connect_ms.append(await client.connect(timeout) * 1000.0)
+                clients.append(client)
+            except Exception:  # noqa: BLE001 — counted, not fatal
+                failures += 1
+                await client.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return clients, connect_ms, failures
+
+
+async def _inject(
+    http,
+    target: str,
+    conversations: list[SeededConversation],
+    count: int,
+    rate: float,
+    rng: random.Random,
+) -> int:
+    """Send *count* injections at *rate* per second; return the failure count."""
+    path = "/bench/emit" if target == "emit" else "/bench/incoming"
+    failures = 0
+
+    async def one(i: int) -> None:
+        nonlocal failures
+        conv = rng.choice(conversations)
+        body = {
+            "key": f"{target}-{i}-{uuid.uuid4().hex[:8]}",
+            "tenant_id": conv.tenant_id,
+            "conversation_id": conv.id,
+            "hotel_unit": conv.hotel_unit,
+            "phone": conv.phone,
+        }
+        try:
+            resp = await http.post(path, json=body)
+            resp.raise_for_status()
+        except Exception:  # noqa: BLE001 — counted, not fatal
+            failures += 1
+
+    tasks = []
+    started = time.perf_counter()
+    for i in range(count):
+        delay = started + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i)))
+    await asyncio.gather(*tasks)
+    return failures
+
+
+async def run_level(
+    args: argparse.Namespace,
+    http,
+    url: str,
+    seats: list[Seat],
+    conversations: list[SeededConversation],
+    targets: list[str],
+    rng: random.Random,
+) -> list[LevelResult]:
+    recorder = FanoutRecorder()
+    before = (await http.get("/bench/stats")).json()
+    with _LagProbe() as connect_lag:
+        clients, connect_ms, connect_failures = await _connect_all(
+            url, seats, recorder, args.connect_concurrency, args.connect_timeout
+        )
+    await asyncio.sleep(1.0)  # let allocations settle before sampling RSS
+    connected = (await http.get("/bench/stats")).json()
+
+    rss_per_conn_kb = cpu_per_connect_ms = 0.0
+    if clients:
+        rss_per_conn_kb = (connected["rss_bytes"] - before["rss_bytes"]) / len(clients) / 1024
+        cpu_per_connect_ms = (connected["cpu_s"] - before["cpu_s"]) / len(clients) * 1000
+
+    results: list[LevelResult] = []
+    try:
+        for target in targets:
+            recorder.reset()
+            start_stats = (await http.get("/bench/stats")).json()
+            with _LagProbe() as inject_lag:
+                failures = await _inject(http, target, conversations, args.messages, args.rate, rng)
+                await asyncio.sleep(args.settle)
+            end_stats = (await http.get("/bench/stats")).json()
+
+            level = LevelResult(
+                clients=len(seats),
+                target=target,
+                connected=len(clients),
+                connect_failures=connect_failures,
+                connect_ms=connect_ms,
+                messages=args.messages,
+                inject_failures=failures,
+                latencies_ms=list(recorder.latencies_ms),
+                completion_ms=list(recorder.last_delivery.values()),
+                rss_per_conn_kb=rss_per_conn_kb,
+                cpu_per_connect_ms=cpu_per_connect_ms,
+                client_lag_ms=max(connect_lag.worst_ms, inject_lag.worst_ms),
+            )
+            if level.latencies_ms:
+                level.cpu_per_delivery_us = (
+                    (end_stats["cpu_s"] - start_stats["cpu_s"]) / len(level.latencies_ms) * 1e6
+                )
+            results.append(level)
+    finally:
+        await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
+        await asyncio.sleep(0.5)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", default="1000,3000", help="simulated sockets per level")
+    parser.add_argument("--targets", default="emit,worker", help="emit,worker")
+    parser.add_argument("--tenants", type=int, default=8)
+    parser.add_argument("--units", type=int, default=4, help="hotel units per tenant")
+    parser.add_argument("--conversations", type=int, default=50, help="conversations per tenant")
+    parser.add_argument("--messages", type=int, default=200, help="injections per target and level")
+    parser.add_argument("--rate", type=float, default=50.0, help="injections per second")
+    parser.add_argument(
+        "--settle", type=float, default=2.0, help="seconds to wait for late deliveries"
+    )
+    parser.add_argument("--connect-concurrency", type=int, default=200)
+    parser.add_argument("--connect-timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--admission-rate",
+        default="0",
+        help="SOCKETIO_ADMISSION_RATE for the server (0 = admission control off)",
+    )
+    parser.add_argument(
+        "--redis-url",
+        default=None,
+        help="enable the Redis emit bus, presence and replay stream (default: in-memory only)",
+    )
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--database-url", default=None, help="defaults to a temp SQLite file")
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="fail if any p99 exceeds")
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="fail on connect or injection failures, or a level with no deliveries",
+    )
+    parser.add_argument("--json", dest="json_path", default=None, help="write results as JSON")
+    parser.add_argument("--log-level", default="ERROR")
+    return parser
+
+
+def _raise_fd_limit() -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        target = hard if hard != resource.RLIM_INFINITY else 65536
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    import httpx
+
+    _raise_fd_limit()
+    levels = parse_int_list(args.clients)
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    prepare_env(
+        database_url=args.database_url,
+        REDIS_URL=args.redis_url or "",
+        SOCKETIO_MESSAGE_QUEUE_ENABLED="true" if args.redis_url else "false",
+        REALTIME_STREAM_ENABLED="true" if args.redis_url else "false",
+        SOCKETIO_ADMISSION_RATE=args.admission_rate,
+    )
+    configure_quiet_logging(args.log_level)
+    enable_sqlite_wal()
+    await create_tables(_TABLES)
+
+    rng = random.Random(args.seed)
+    seats, conversations = await seed(
+        clients=max(levels),
+        tenants=args.tenants,
+        units=args.units,
+        conversations=args.conversations,
+        rng=rng,
+    )
+
+    port = free_port()
+    server = multiprocessing.get_context("spawn").Process(
+        target=_serve, args=(port, args.log_level), daemon=True
+    )
+    server.start()
+    base_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket"
+
+    rows: list[dict] = []
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as http:
+            for _ in range(300):
+                try:
+                    (await http.get("/bench/stats")).raise_for_status()
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("benchmark server did not start")
+
+            for count in levels:
+                levels_run = await run_level(
+                    args, http, ws_url, seats[:count], conversations, targets, rng
+                )
+                rows.extend(level.as_row() for level in levels_run)
+    finally:
+        server.terminate()
+        server.join(timeout=10)
+
+    return rows
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    rows = asyncio.run(run(args))
+
+    print_table(rows, _COLUMNS)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+
+    if args.max_p99_ms is not None:
+        slow = [r for r in rows if r["p99_ms"] > args.max_p99_ms]
+        if slow:
+            print(f"p99 budget of {args.max_p99_ms:.0f} ms exceeded in {len(slow)} level(s)")
+            sys.exit(1)
+
+    if args.strict:
+        broken = [
+            r for r in rows if r["connect_failed"] or r["inject_failed"] or not r["deliveries"]
+        ]
+        if broken:
+            print(f"{len(broken)} level(s) had failures or delivered nothing")
+            sys.exit(1)
+
+
+
+if __name__ == "__main__":
+    main()
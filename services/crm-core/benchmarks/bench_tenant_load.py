@@ -0,0 +1,181 @@
+"""Tenant load benchmark: eager vs lazy/cached token decryption.
+
+Seeds ``--tenants`` tenants, each with all three channel access tokens
+encrypted under a throwaway TOKEN_ENCRYPTION_KEY.  It then repeatedly loads
+them with ``select(...)`` in a fresh session, the way webhook routing, n8n
+auth and the workers do.
+
+Models:
+  eager  the previous mapping — every token decrypted on load with
+         ``decrypt_token`` (a mapped copy of the tenants table).
+  lazy   the current ``Tenant`` — ciphertext on load, decrypted on
+         attribute access through the process-local LRU.
+
+Access patterns:
+  none   only ``slug`` / ``status`` are read (routing, auth).
+  one    the WhatsApp token is also read (building a send adapter).
+
+For every (model, access) pair it reports loads/sec, tenants/sec and p50/p99
+latency of one load.
+
+Examples::
+
+    python -m benchmarks.bench_tenant_load
+    python -m benchmarks.bench_tenant_load --tenants 1 --loads 5000
+    python -m benchmarks.bench_tenant_load --database-url postgresql+asyncpg://... --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks._support import configure_quiet_logging, percentile, prepare_env, print_table
+
+MODELS = ("eager", "lazy")
+ACCESS = ("none", "one")
+
+_TOKEN_COLUMNS = ("whatsapp_access_token", "instagram_access_token", "messenger_access_token")
+
+
+def _eager_model():
+    """Map a copy of the tenants table whose token columns decrypt on load."""
+    from sqlalchemy import MetaData
+    from sqlalchemy.orm import DeclarativeBase
+    from sqlalchemy.types import Text, TypeDecorator
+
+    from app.core.encryption import decrypt_token, encrypt_token
+    from app.models.tenant import Tenant
+
+    class EagerEncryptedText(TypeDecorator):
+        impl = Text
+        cache_ok = True
+
+        def process_bind_param(self, value, dialect):
+            return None if value is None else encrypt_token(value)
+
+        def process_result_value(self, value, dialect):
+            return None if value is None else decrypt_token(value)
+
+    table = Tenant.__table__.to_metadata(MetaData())
+    for name in _TOKEN_COLUMNS:
+        table.c[name].type = EagerEncryptedText()
+
+    class _Base(DeclarativeBase):
+        metadata = table.metadata
+
+    class EagerTenant(_Base):
+        __table__ = table
+
+    return EagerTenant
+
+
+async def seed(count: int) -> None:
+    from app.core.database import async_session
+    from app.models.tenant import Tenant
+
+    async with async_session() as session:
+        for i in range(count):
+            session.add(
+                Tenant(
+                    name=f"Hotel {i}",
+                    slug=f"hotel-{i}",
+                    whatsapp_phone_number_id=f"10{i:08d}",
+                    **{name: f"EAA{name[:2]}{i:06d}" + "x" * 180 for name in _TOKEN_COLUMNS},
+                )
+            )
+        await session.commit()
+
+
+async def bench_pair(model, model_name: str, access: str, loads: int) -> dict:
+    from sqlalchemy import select
+
+    from app.core.database import async_session
+    from app.core.encryption import clear_decrypt_cache
+
+    clear_decrypt_cache()
+    latencies_ms: list[float] = []
+    tenants = 0
+    started = time.perf_counter()
+    for _ in range(loads):
+        t0 = time.perf_counter()
+        async with async_session() as session:
+            rows = (await session.execute(select(model))).scalars().all()
+            for tenant in rows:
+                if tenant.status != "ACTIVE" or not tenant.slug:
+                    raise RuntimeError("unexpected tenant row")
+                if access == "one" and not tenant.whatsapp_access_token.startswith("EAA"):
+                    raise RuntimeError("token did not decrypt")
+        tenants += len(rows)
+        latencies_ms.append((time.perf_counter() - t0) * 1000.0)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "model": model_name,
+        "access": access,
+        "loads": loads,
+        "loads_per_s": loads / elapsed,
+        "tenants_per_s": tenants / elapsed,
+        "p50_ms": percentile(latencies_ms, 50),
+        "p99_ms": percentile(latencies_ms, 99),
+    }
+
+
+_COLUMNS = [
+    ("model", "model"),
+    ("access", "access"),
+    ("loads", "loads"),
+    ("loads_per_s", "loads/s"),
+    ("tenants_per_s", "tenants/s"),
+    ("p50_ms", "p50 ms"),
+    ("p99_ms", "p99 ms"),
+]
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tenants", type=int, default=50, help="rows returned by each load")
+    parser.add_argument("--loads", type=int, default=500, help="loads per (model, access) pair")
+    parser.add_argument("--models", default=",".join(MODELS))
+    parser.add_argument("--access", default=",".join(ACCESS))
+    parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    parser.add_argument("--json", dest="json_path", default=None, help="write results as JSON")
+    parser.add_argument("--log-level", default="ERROR")
+    return parser
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    from cryptography.fernet import Fernet
+
+    prepare_env(database_url=args.database_url, TOKEN_ENCRYPTION_KEY=Fernet.generate_key().decode())
+    configure_quiet_logging(args.log_level)
+
+    from app.models.tenant import Tenant
+    from benchmarks._support import create_tables
+
+    await create_tables(["tenants"])
+    await seed(args.tenants)
+    models = {"eager": _eager_model(), "lazy": Tenant}
+
+    rows: list[dict] = []
+    for access in [a.strip() for a in args.access.split(",") if a.strip()]:
+        for name in [m.strip() for m in args.models.split(",") if m.strip()]:
+            await bench_pair(models[name], name, access, min(args.loads, 20))  # warm-up
+            rows.append(await bench_pair(models[name], name, access, args.loads))
+    return rows
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    rows = asyncio.run(run(args))
+
+    print_table(rows, _COLUMNS)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
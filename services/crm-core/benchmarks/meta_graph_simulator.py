@@ -0,0 +1,368 @@
+"""Local Meta Graph API stand-in for offline channel-layer testing.
+
+Implements the subset of the Graph API v21.0 surface that the channel
+adapters and workers actually call:
+
+  POST /{version}/{phone_number_id}/messages   WhatsApp send + mark-as-read
+  POST /{version}/{phone_number_id}/media      WhatsApp media upload
+  POST /{version}/me/messages                  Messenger / Instagram send
+  GET  /{version}/{media_id}                   WhatsApp media URL lookup
+  GET  /cdn/{media_id}                         Binary download of that URL
+
+Responses mirror Meta's JSON shapes closely enough for
+``WhatsAppAdapter``, ``MessengerAdapter``, ``InstagramAdapter`` and
+``process_media_download`` to run unmodified.  Point them at the simulator
+with ``META_GRAPH_API_URL=http://127.0.0.1:<port>``.
+
+Behaviour is controlled by ``SimulatorConfig``:
+
+  - latency        : per-request delay drawn from a ``LatencyModel``
+  - rate_limit_ratio / server_error_ratio / token_error_ratio :
+                     probability of answering 429, 5xx (500/502/503) or
+                     401 OAuthException #190 instead of succeeding
+  - valid_tokens   : if set, any other token is rejected with #190
+
+Faults are drawn from a seeded RNG so runs are reproducible.  Every answered
+request is counted in ``SimulatorStats`` so benchmarks can derive retry
+counts (requests served minus logical sends).
+
+Standalone usage::
+
+    python -m benchmarks.meta_graph_simulator --port 8900 \\
+        --latency lognormal:80:0.5 --rate-limit 0.02 --server-error 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import math
+import random
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+_LATENCY_KINDS = {"none", "fixed", "uniform", "normal", "lognormal", "exponential"}
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Per-request latency distribution (all values in milliseconds).
+
+    kind:
+      none         no delay
+      fixed        always ``a`` ms
+      uniform      uniform in [a, b] ms
+      normal       mean ``a`` ms, stddev ``b`` ms (clamped at 0)
+      lognormal    median ``a`` ms, shape sigma ``b`` (long right tail)
+      exponential  mean ``a`` ms
+    """
+
+    kind: str = "none"
+    a: float = 0.0
+    b: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.kind not in _LATENCY_KINDS:
+            raise ValueError(
+                f"Unknown latency kind {self.kind!r}; expected one of {_LATENCY_KINDS}"
+            )
+
+    @classmethod
+    def parse(cls, spec: str) -> LatencyModel:
+        """Parse ``kind[:a[:b]]`` — e.g. ``fixed:50`` or ``lognormal:80:0.5``."""
+        parts = spec.split(":")
+        values = [float(p) for p in parts[1:3]]
+        values += [0.0] * (2 - len(values))
+        return cls(parts[0], values[0], values[1])
+
+    def sample(self, rng: random.Random) -> float:
+        """Return a delay in seconds."""
+        if self.kind == "none":
+            ms = 0.0
+        elif self.kind == "fixed":
+            ms = self.a
+        elif self.kind == "uniform":
+            ms = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            ms = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            ms = rng.lognormvariate(math.log(max(self.a, 1e-3)), self.b)
+        else:  # exponential
+            ms = rng.expovariate(1.0 / self.a) if self.a > 0 else 0.0
+        return max(0.0, ms) / 1000.0
+
+
+@dataclass
+class SimulatorConfig:
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    rate_limit_ratio: float = 0.0
+    server_error_ratio: float = 0.0
+    token_error_ratio: float = 0.0
+    valid_tokens: set[str] | None = None
+    seed: int | None = None
+
+
+@dataclass
+class SimulatorStats:
+    requests: int = 0
+    by_status: Counter = field(default_factory=Counter)
+    by_endpoint: Counter = field(default_factory=Counter)
+    media_uploads: int = 0
+
+    @property
+    def errors(self) -> int:
+        return sum(n for status, n in self.by_status.items() if status >= 400)
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.by_status.clear()
+        self.by_endpoint.clear()
+        self.media_uploads = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "by_status": {str(k): v for k, v in sorted(self.by_status.items())},
+            "by_endpoint": dict(self.by_endpoint),
+            "media_uploads": self.media_uploads,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Meta-shaped error bodies
+# ---------------------------------------------------------------------------
+
+
+def _meta_error(
+    status: int, code: int, message: str, error_type: str = "OAuthException"
+) -> JSONResponse:
+    return JSONResponse(
+        {
+            "error": {
+                "message": message,
+                "type": error_type,
+                "code": code,
+                "fbtrace_id": uuid.uuid4().hex[:22],
+            }
+        },
+        status_code=status,
+    )
+
+
+def _extract_token(request: Request) -> str | None:
+    header = request.headers.get("authorization", "")
+    if header.lower().startswith("bearer "):
+        return header.split(" ", 1)[1]
+    return request.query_params.get("access_token")
+
+
+# ---------------------------------------------------------------------------
+# Simulator
+# ---------------------------------------------------------------------------
+
+
+class MetaGraphSimulator:
+    """ASGI application emulating the Graph API endpoints used by crm-core."""
+
+    def __init__(self, config: SimulatorConfig | None = None) -> None:
+        self.config = config or SimulatorConfig()
+        self.stats = SimulatorStats()
+        self._rng = random.Random(self.config.seed)
+        self._media: dict[str, tuple[bytes, str]] = {}
+        self.app = Starlette(
+            routes=[
+                Route("/cdn/{media_id}", self._download_media, methods=["GET"]),
+                Route("/{version}/me/messages", self._page_messages, methods=["POST"]),
+                Route("/{version}/{phone_number_id}/messages", self._wa_messages, methods=["POST"]),
+                Route(
+                    "/{version}/{phone_number_id}/media", self._wa_upload_media, methods=["POST"]
+                ),
+                Route("/{version}/{media_id}", self._wa_media_url, methods=["GET"]),
+            ]
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.app(scope, receive, send)
+
+    # ------------------------------------------------------------------
+    # Shared request pipeline
+    # ------------------------------------------------------------------
+
+    async def _gate(self, request: Request, rate_limit_code: int) -> Response | None:
+        """Apply latency and fault injection; return an error response or None."""
+        delay = self.config.latency.sample(self._rng)
+        if delay:
+            await asyncio.sleep(delay)
+
+        token = _extract_token(request)
+        if not token:
+            return _meta_error(
+                400, 2500, "An active access token must be used to query information."
+            )
+
+        if self.config.valid_tokens is not None and token not in self.config.valid_tokens:
+            return _meta_error(401, 190, "Invalid OAuth access token - Cannot parse access token")
+
+        roll = self._rng.random()
+        threshold = self.config.token_error_ratio
+        if roll < threshold:
+            return _meta_error(401, 190, "Error validating access token: Session has expired.")
+        threshold += self.config.rate_limit_ratio
+        if roll < threshold:
+            return _meta_error(429, rate_limit_code, f"(#{rate_limit_code}) Rate limit hit")
+        threshold += self.config.server_error_ratio
+        if roll < threshold:
+            status = self._rng.choice((500, 502, 503))
+            return _meta_error(
+                status, 2, "An unexpected error has occurred. Please retry your request later."
+            )
+        return None
+
+    def _record(self, endpoint: str, response: Response) -> Response:
+        self.stats.requests += 1
+        self.stats.by_status[response.status_code] += 1
+        self.stats.by_endpoint[endpoint] += 1
+        return response
+
+    # ------------------------------------------------------------------
+    # WhatsApp Cloud API
+    # ------------------------------------------------------------------
+
+    async def _wa_messages(self, request: Request) -> Response:
+        error = await self._gate(request, rate_limit_code=130429)
+        if error is not None:
+            return self._record("wa_messages", error)
+
+        body = await request.json()
+        if body.get("status") == "read":
+            return self._record("wa_mark_read", JSONResponse({"success": True}))
+
+        recipient = str(body.get("to", ""))
+        return self._record(
+            "wa_messages",
+            JSONResponse(
+                {
+                    "messaging_product": "whatsapp",
+                    "contacts": [{"input": recipient, "wa_id": recipient}],
+                    "messages": [{"id": f"wamid.SIM{uuid.uuid4().hex}"}],
+                }
+            ),
+        )
+
+    async def _wa_upload_media(self, request: Request) -> Response:
+        error = await self._gate(request, rate_limit_code=130429)
+        if error is not None:
+            return self._record("wa_media_upload", error)
+
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            return self._record(
+                "wa_media_upload",
+                _meta_error(
+                    400, 100, "(#100) The parameter file is required.", "GraphMethodException"
+                ),
+
+            )
+        content = await upload.read()
+        mime_type = str(form.get("type") or upload.content_type or "application/octet-stream")
+        media_id = str(self._rng.randrange(10**15, 10**16))
+        self._media[media_id] = (content, mime_type)
+        self.stats.media_uploads += 1
+        return self._record("wa_media_upload", JSONResponse({"id": media_id}))
+
+    async def _wa_media_url(self, request: Request) -> Response:
+        error = await self._gate(request, rate_limit_code=130429)
+        if error is not None:
+            return self._record("wa_media_url", error)
+
+        media_id = request.path_params["media_id"]
+        content, mime_type = self._media.get(media_id, (media_id.encode() * 64, "image/jpeg"))
+        base = str(request.base_url).rstrip("/")
+        return self._record(
+            "wa_media_url",
+            JSONResponse(
+                {
+                    "messaging_product": "whatsapp",
+                    "url": f"{base}/cdn/{media_id}",
+                    "mime_type": mime_type,
+                    "sha256": hashlib.sha256(content).hexdigest(),
+                    "file_size": len(content),
+                    "id": media_id,
+                }
+            ),
+        )
+
+    async def _download_media(self, request: Request) -> Response:
+        media_id = request.path_params["media_id"]
+        content, mime_type = self._media.get(media_id, (media_id.encode() * 64, "image/jpeg"))
+        return self._record("cdn_download", Response(content, media_type=mime_type))
+
+    # ------------------------------------------------------------------
+    # Messenger / Instagram Send API
+    # ------------------------------------------------------------------
+
+    async def _page_messages(self, request: Request) -> Response:
+        error = await self._gate(request, rate_limit_code=613)
+        if error is not None:
+            return self._record("page_messages", error)
+
+        body = await request.json()
+        recipient = str((body.get("recipient") or {}).get("id", ""))
+        if body.get("sender_action"):
+            return self._record("page_sender_action", JSONResponse({"recipient_id": recipient}))
+        return self._record(
+            "page_messages",
+            JSONResponse({"recipient_id": recipient, "message_id": f"m_SIM{uuid.uuid4().hex}"}),
+        )
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the local Meta Graph API simulator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="none", help="kind[:a[:b]], e.g. lognormal:80:0.5")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="ratio of 429 responses")
+    parser.add_argument("--server-error", type=float, default=0.0, help="ratio of 5xx responses")
+    parser.add_argument("--token-error", type=float, default=0.0, help="ratio of #190 responses")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> SimulatorConfig:
+    return SimulatorConfig(
+        latency=LatencyModel.parse(args.latency),
+        rate_limit_ratio=args.rate_limit,
+        server_error_ratio=args.server_error,
+        token_error_ratio=args.token_error,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    args = build_arg_parser().parse_args()
+    simulator = MetaGraphSimulator(config_from_args(args))
+    uvicorn.run(simulator, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Shared fixtures for the tests/ suite.
+
+``tenant_db`` yields an AsyncSession on a fresh in-memory SQLite database
+holding one "hotel" Tenant, whose id is in ``session.info["tenant_id"]``.
+Only the tables a module needs are created, since a full ``create_all``
+fails on SQLite, where index names are global.  The conversation core
+(``CORE_TABLES``) is always created; a module adds more with::
+
+    pytestmark = pytest.mark.tables("messages", "conversation_inbox_state")
+
+The engine is instrumented, so ``query_stats.begin()`` / ``end()`` count
+its statements.
+"""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.models  # noqa: F401 — resolve the relationships between the tables
+from app.core.database import _instrument
+from app.models.base import Base
+from app.models.tenant import Tenant
+
+CORE_TABLES = (
+    "tenants",
+    "users",
+    "industries",
+    "territories",
+    "contacts",
+    "tags",
+    "conversations",
+    "conversation_tags",
+)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "tables(*names): extra tables for the tenant_db fixture")
+
+
+@pytest.fixture
+async def tenant_db(request):
+    marker = request.node.get_closest_marker("tables")
+    names = [*CORE_TABLES, *(marker.args if marker else ())]
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    _instrument(engine, "test")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[Base.metadata.tables[name] for name in names]
+        )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        tenant = Tenant(name="Hotel", slug="hotel")
+        session.add(tenant)
+        await session.flush()
+        session.info["tenant_id"] = tenant.id
+        yield session
+    await engine.dispose()
@@ -0,0 +1,215 @@
+"""Tests for the background audit writer: commit staging, journal, batching, diffs and spill."""
+
+from __future__ import annotations
+
+import os
+import uuid
+from datetime import UTC, datetime, timedelta
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401 — resolve the audit_logs foreign keys
+from app.core import audit_writer as audit_writer_module
+from app.core.after_commit import wait_after_commit
+from app.core.audit_writer import AuditRecord, AuditWriter
+from app.core.config import settings
+from app.models.audit_log import AuditLog
+from app.services.audit_log_service import audit_log_service
+
+TENANT = uuid.uuid4()
+
+
+class _Snapshot(BaseModel):
+    id: uuid.UUID
+    name: str
+    stage: str
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.lists: dict[str, list] = {}
+        self.hashes: dict[str, dict] = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    @property
+    def journal(self) -> dict:
+        return self.hashes.get(audit_writer_module._JOURNAL_KEY, {})
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    async def hscan(self, key, cursor, count):
+        return 0, {k.encode(): v.encode() for k, v in self.hashes.get(key, {}).items()}
+
+    async def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(v.encode() for v in values)
+
+    async def lpush(self, key, *values):
+        for value in values:
+            self.lists.setdefault(key, []).insert(0, value)
+
+    async def lpop(self, key, count):
+        items = self.lists.get(key, [])
+        popped, self.lists[key] = items[:count], items[count:]
+        return popped or None
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append(getattr(self._redis, name)(*args, **kwargs))
+
+        return queue
+
+    async def execute(self):
+        calls, self._calls = self._calls, []
+        return [await call for call in calls]
+
+
+@pytest.fixture
+async def sessions():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(AuditLog.__table__.create)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _rows(sessions) -> list[AuditLog]:
+    async with sessions() as session:
+        result = await session.execute(select(AuditLog).order_by(AuditLog.created_at))
+        return list(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_records_are_written_only_when_the_transaction_commits(sessions, monkeypatch):
+    redis = _FakeRedis()
+    writer = AuditWriter(session_factory=sessions, flush_interval=60.0, redis_url="redis://fake")
+    writer._redis = redis
+    monkeypatch.setattr(audit_writer_module, "audit_writer", writer)
+    entity_id = uuid.uuid4()
+
+    async with sessions() as db:
+        await audit_log_service.log(
+            db=db,
+            tenant_id=TENANT,
+            action="DEAL_UPDATED",
+            entity="Deal",
+            old_data=_Snapshot(id=entity_id, name="Suite", stage="LEAD"),
+            new_data=_Snapshot(id=entity_id, name="Suite", stage="WON"),
+        )
+        assert not writer._pending  # nothing leaves the request before commit
+        await db.commit()
+        await wait_after_commit(db)  # as get_db does before responding
+    assert len(writer._pending) == 1
+    assert len(redis.journal) == 1  # written ahead before the request returns
+
+    async with sessions() as db:
+        await audit_log_service.log(db=db, tenant_id=TENANT, action="DEAL_DELETED")
+        await db.rollback()
+        await wait_after_commit(db)
+    assert len(writer._pending) == 1
+
+    assert await writer.flush()
+    assert not redis.journal
+    [row] = await _rows(sessions)
+    assert row.action == "DEAL_UPDATED"
+    assert row.old_data == {"stage": "LEAD"}
+    assert row.new_data == {"stage": "WON"}
+
+
+@pytest.mark.asyncio
+async def test_records_on_a_read_session_are_not_lost(sessions, monkeypatch):
+    writer = AuditWriter(session_factory=sessions, flush_interval=60.0)
+    monkeypatch.setattr(audit_writer_module, "audit_writer", writer)
+
+    for async_writes in (True, False):
+        monkeypatch.setattr(settings, "AUDIT_ASYNC_WRITES", async_writes)
+        async with sessions() as db:
+            db.info["read_only"] = True  # as get_read_db does; never committed
+            await audit_log_service.log(db=db, tenant_id=TENANT, action="LGPD_DATA_EXPORT")
+            await wait_after_commit(db)  # as get_read_db does before responding
+
+    # Without Redis to journal to, the rows are inserted before the request returns
+    assert not writer._pending
+    assert [row.action for row in await _rows(sessions)] == ["LGPD_DATA_EXPORT"] * 2
+
+
+@pytest.mark.asyncio
+async def test_overflow_spills_to_redis_and_is_drained(sessions):
+    redis = _FakeRedis()
+    writer = AuditWriter(
+        session_factory=sessions, queue_size=2, batch_size=2, redis_url="redis://fake"
+    )
+    writer._redis = redis
+    records = [AuditRecord(tenant_id=TENANT, action=f"A{i}", new_data={"n": i}) for i in range(5)]
+
+    await writer.submit(records)
+    assert len(writer._pending) == 2 and len(writer._overflow) == 3
+    assert len(redis.journal) == 5
+
+    assert await writer.flush()
+    assert [row.action for row in await _rows(sessions)] == ["A0", "A1", "A2", "A3", "A4"]
+    assert not redis.lists[audit_writer_module._SPILL_KEY]
+    assert not redis.journal
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_spilled_and_retried_without_duplicates(sessions, monkeypatch):
+    redis = _FakeRedis()
+    writer = AuditWriter(session_factory=sessions, redis_url="redis://fake")
+    writer._redis = redis
+    record = AuditRecord(tenant_id=TENANT, action="CONTACT_CREATED")
+
+    async def db_down(rows):
+        return False
+
+    real_write = writer._write
+    monkeypatch.setattr(writer, "_write", db_down)
+    await writer.submit([record])
+    assert not await writer.flush()
+    assert len(redis.lists[audit_writer_module._SPILL_KEY]) == 1
+    assert not redis.journal  # moved to the spill list
+
+
+    monkeypatch.setattr(writer, "_write", real_write)
+    assert await real_write([record.to_row()])  # e.g. written by a replica before it crashed
+    writer._next_spill_check = 0.0
+    assert await writer.flush()
+    assert [row.id for row in await _rows(sessions)] == [record.id]
+
+
+@pytest.mark.asyncio
+async def test_journal_left_by_a_dead_process_is_recovered(sessions):
+    redis = _FakeRedis()
+    crashed = AuditWriter(session_factory=sessions, flush_interval=60.0, redis_url="redis://fake")
+    crashed._redis = redis
+    old = datetime.now(UTC) - timedelta(seconds=audit_writer_module._JOURNAL_GRACE + 1)
+    orphan = AuditRecord(tenant_id=TENANT, action="LGPD_DATA_EXPORT", created_at=old)
+    in_flight = AuditRecord(tenant_id=TENANT, action="CONTACT_CREATED")
+    await crashed.submit([orphan, in_flight])
+    # SIGKILL: the queued rows are gone, the journal is not
+
+    survivor = AuditWriter(session_factory=sessions, redis_url="redis://fake")
+    survivor._redis = redis
+    assert await survivor.flush()
+
+    assert [row.id for row in await _rows(sessions)] == [orphan.id]
+    # Recent entries may still belong to a live process and are left alone
+    assert list(redis.journal) == [str(in_flight.id)]
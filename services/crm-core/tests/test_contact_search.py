@@ -0,0 +1,142 @@
+"""Tests for indexed contact search: normalised keys, phone digits and ranking."""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+from pathlib import Path
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+from sqlalchemy import select
+
+from app.core import list_counts
+from app.core.search_text import normalize_search_text, phone_digits
+from app.models.contact import Contact, contact_search_keys
+from app.models.conversation import Conversation
+from app.schemas.contact import ContactListParams
+from app.schemas.conversation import ConversationListParams
+from app.services.contact_service import contact_service
+from app.services.conversation_service import conversation_service
+
+pytestmark = pytest.mark.tables("conversation_inbox_state", "conversation_read_cursors")
+
+
+@pytest.fixture
+async def db(tenant_db):
+    list_counts._count_cache.clear()
+    tenant_id = tenant_db.info["tenant_id"]
+    for first, last, mobile in (
+        ("João", "da Silva", "+55 (11) 99876-5432"),
+        ("Joana", "Souza", "+55 21 3333-1111"),
+        ("Ana", "Joaquina", None),
+        ("Maria", "Conceição", "5511912340000"),
+    ):
+        contact = Contact(
+            tenant_id=tenant_id,
+            first_name=first,
+            last_name=last,
+            full_name=f"{first} {last}",
+            mobile_no=mobile,
+        )
+        tenant_db.add(contact)
+        await tenant_db.flush()
+        tenant_db.add(Conversation(tenant_id=tenant_id, contact_id=contact.id, channel="WHATSAPP"))
+    await tenant_db.commit()
+    yield tenant_db
+
+
+async def _names(db, search: str) -> list[str]:
+    result = await contact_service.list_contacts(
+        db=db, tenant_id=db.info["tenant_id"], params=ContactListParams(search=search)
+    )
+    return [c.full_name for c in result.data]
+
+
+def test_keys_fold_accents_and_keep_phone_digits():
+    assert normalize_search_text("  João ", "CONCEIÇÃO") == "joao conceicao"
+    assert phone_digits("+55 (11) 99876-5432", None, "21 3333") == "5511998765432 213333"
+
+
+def test_migration_backfill_matches_the_model_keys():
+    versions = Path(__file__).parents[1] / "alembic" / "versions"
+    path = next(versions.glob("*_add_contact_search_keys.py"))
+    spec = importlib.util.spec_from_file_location("add_contact_search_keys", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    row = {
+        "id": 1,
+        "full_name": None,
+        "first_name": "Estêvão",
+        "last_name": "  da CONCEIÇÃO",
+        "email": "Estevao@Example.com",
+        "company_name": "Agência Sol",
+        "mobile_no": "+55 (11) 99876-5432",
+        "phone": "",
+    }
+    fields = {k: v for k, v in row.items() if k != "id"}
+    keys = contact_search_keys(**fields)
+    assert migration._search_keys(row) == {
+        "_id": 1,
+        "_search_text": keys["search_text"],
+        "_phone_digits": keys["phone_digits"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_is_accent_insensitive_and_prefix_ranked(db):
+    assert await _names(db, "joao silva") == ["João da Silva"]
+    assert await _names(db, "CONCEICAO") == ["Maria Conceição"]
+    # Names starting with the term come before matches inside the name
+    names = await _names(db, "joa")
+    assert set(names) == {"João da Silva", "Joana Souza", "Ana Joaquina"}
+    assert names[-1] == "Ana Joaquina"
+    # One or two letters only match the start of the name
+    assert await _names(db, "an") == ["Ana Joaquina"]
+
+
+@pytest.mark.asyncio
+async def test_phone_search_ignores_formatting(db):
+    assert await _names(db, "98765-432") == ["João da Silva"]
+    assert await _names(db, "(21) 3333") == ["Joana Souza"]
+
+    contact = (await db.execute(select(Contact).where(Contact.first_name == "Joana"))).scalar_one()
+    contact.mobile_no = "+55 48 4000-2000"
+    await db.commit()
+    assert await _names(db, "40002000") == ["Joana Souza"]
+
+
+@pytest.mark.asyncio
+async def test_conversation_search_matches_the_contact(db):
+    result = await conversation_service.list_conversations(
+        db=db,
+        tenant_id=db.info["tenant_id"],
+        user_role="ADMIN",
+        user_id=None,
+        user_hotel_unit=None,
+        params=ConversationListParams(search="joão"),
+    )
+    assert result.total_count == 1
+    assert result.data[0].contact.full_name == "João da Silva"
+
+
+@pytest.mark.asyncio
+async def test_search_total_is_reused_until_the_cache_expires(db, monkeypatch):
+    async def total(count: str = "cached"):
+        params = ContactListParams(search="jo", count=count)
+        page = await contact_service.list_contacts(db, db.info["tenant_id"], params)
+        return page.total_count, page.total_is_estimate
+
+    assert await total() == (2, False)
+    db.add(Contact(tenant_id=db.info["tenant_id"], first_name="Jonas", full_name="Jonas"))
+    await db.commit()
+
+    assert await total() == (2, False)  # served from the cache, no COUNT
+    assert await total("none") == (None, False)
+    assert await total("estimate") == (2, False)  # no planner on SQLite: exact, cached
+
+    list_counts._count_cache.clear()
+    assert await total() == (3, False)
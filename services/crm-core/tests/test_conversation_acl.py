@@ -0,0 +1,117 @@
+"""Tests for the cached conversation:join ACL projection."""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+
+from app.realtime.conversation_acl import ConversationAcl, ConversationAclCache
+
+_ACL = ConversationAcl(
+    tenant_id="t1", assigned_to_id="u1", hotel_unit="Campos", is_opportunity=False
+)
+
+
+def _cache_with_loads(acl: ConversationAcl | None) -> tuple[ConversationAclCache, list[str]]:
+    cache = ConversationAclCache(ttl_seconds=60)
+    loads: list[str] = []
+
+    async def fake_load(conversation_id: str) -> ConversationAcl | None:
+        loads.append(conversation_id)
+        return acl
+
+    cache._load = fake_load  # type: ignore[method-assign]
+    return cache, loads
+
+
+def test_attendant_needs_assignment_or_same_unit():
+    assert _ACL.allows(user_id="u1", role="ATTENDANT", hotel_unit=None)
+    assert _ACL.allows(user_id="u2", role="ATTENDANT", hotel_unit="Campos")
+    assert not _ACL.allows(user_id="u2", role="ATTENDANT", hotel_unit="Penedo")
+    assert not _ACL.allows(user_id="u2", role="ATTENDANT", hotel_unit=None)
+    assert _ACL.allows(user_id="u2", role="SALES", hotel_unit=None)
+
+
+@pytest.mark.asyncio
+async def test_repeat_joins_are_served_from_memory_until_invalidated():
+    cache, loads = _cache_with_loads(_ACL)
+
+    assert await cache.get_acl("c1", "t1") == _ACL
+    assert await cache.get_acl("c1", "t1") == _ACL
+    assert loads == ["c1"]
+
+    cache.invalidate("c1")
+    await cache.get_acl("c1", "t1")
+    assert loads == ["c1", "c1"]
+
+
+@pytest.mark.asyncio
+async def test_other_tenant_is_denied_even_on_a_hit():
+    cache, _ = _cache_with_loads(_ACL)
+    await cache.get_acl("c1", "t1")
+
+    assert await cache.get_acl("c1", "t2") is None
+    assert await cache.get_acl("c1", None) == _ACL  # SUPER_ADMIN
+
+
+@pytest.mark.asyncio
+async def test_missing_conversation_is_not_cached():
+    cache, loads = _cache_with_loads(None)
+
+    assert await cache.get_acl("c1", "t1") is None
+    assert await cache.get_acl("c1", "t1") is None
+    assert loads == ["c1", "c1"]
+
+
+@pytest.mark.asyncio
+async def test_load_racing_an_invalidation_is_not_cached():
+    cache = ConversationAclCache(ttl_seconds=60)
+    loads: list[str] = []
+
+    async def load_then_invalidate(conversation_id: str) -> ConversationAcl:
+        loads.append(conversation_id)
+        if len(loads) == 1:
+            # The row was read before a reassignment committed
+            cache.invalidate(conversation_id)
+        return _ACL
+
+    cache._load = load_then_invalidate  # type: ignore[method-assign]
+
+    assert await cache.get_acl("c1", "t1") == _ACL
+    await cache.get_acl("c1", "t1")
+    assert loads == ["c1", "c1"]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_waits_for_the_commit():
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.core.after_commit import after_commit, wait_after_commit
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    cache, loads = _cache_with_loads(_ACL)
+    await cache.get_acl("c1", "t1")
+
+    async with async_sessionmaker(engine)() as db:
+        await db.execute(text("SELECT 1"))
+        after_commit(db, cache.invalidate, "c1")
+        await db.rollback()
+        await wait_after_commit(db)
+        await cache.get_acl("c1", "t1")
+        assert loads == ["c1"]
+
+        await db.execute(text("SELECT 1"))
+        after_commit(db, cache.invalidate, "c1")
+        await cache.get_acl("c1", "t1")
+        assert loads == ["c1"]
+        await db.commit()
+        await wait_after_commit(db)
+
+    await cache.get_acl("c1", "t1")
+    assert loads == ["c1", "c1"]
+    await engine.dispose()
@@ -0,0 +1,90 @@
+"""Tests for keyset-paginated conversation lists and cached total counts."""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.core import list_counts
+from app.core.exceptions import BadRequestError
+from app.models.conversation import Conversation
+from app.schemas.conversation import ConversationListParams
+from app.services.conversation_service import conversation_service
+
+pytestmark = pytest.mark.tables("conversation_inbox_state", "conversation_read_cursors")
+START = datetime(2026, 5, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+async def db(tenant_db):
+    list_counts._count_cache.clear()
+    # Ties on last_message_at and conversations without messages must
+    # still page without gaps or repeats.
+    for i in range(23):
+        last_at = None if i < 3 else START + timedelta(minutes=i // 2)
+        tenant_db.add(
+            Conversation(
+                tenant_id=tenant_db.info["tenant_id"], channel="WHATSAPP", last_message_at=last_at
+            )
+        )
+    await tenant_db.commit()
+    yield tenant_db
+
+
+async def _list(db, **params):
+    return await conversation_service.list_conversations(
+        db=db,
+        tenant_id=db.info["tenant_id"],
+        user_role="ADMIN",
+        user_id=None,
+        user_hotel_unit=None,
+        params=ConversationListParams(**params),
+    )
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_match_offset_pages(db):
+    offset_ids = []
+    for page in range(1, 6):
+        offset_ids += [c.id for c in (await _list(db, page=page, page_size=5)).data]
+
+    cursor_ids, cursor = [], None
+    while True:
+        result = await _list(db, page_size=5, cursor=cursor)
+        cursor_ids += [c.id for c in result.data]
+        cursor = result.next_cursor
+        if cursor is None:
+            break
+
+    assert len(set(cursor_ids)) == 23
+    assert cursor_ids == offset_ids
+
+
+@pytest.mark.asyncio
+async def test_total_count_is_cached_or_omitted(db):
+    assert (await _list(db, page_size=5)).total_count == 23
+
+    db.add(Conversation(tenant_id=db.info["tenant_id"], channel="WHATSAPP"))
+    await db.commit()
+    assert (await _list(db, page_size=5)).total_count == 23
+    assert (await _list(db, page_size=5, channel="whatsapp")).total_count == 24
+
+    result = await _list(db, page_size=5, count="none")
+    assert result.total_count is None and result.pagination.total == 0
+    # No planner estimate on SQLite; falls back to the counted total
+    result = await _list(db, page_size=5, count="estimate")
+    assert result.total_count == 23 and not result.total_is_estimate
+
+
+@pytest.mark.asyncio
+async def test_cursor_rejects_custom_ordering_and_garbage(db):
+    with pytest.raises(BadRequestError):
+        await _list(db, order_by="created_at desc", cursor="abc")
+    with pytest.raises(BadRequestError):
+        await _list(db, cursor="not-a-cursor")
@@ -0,0 +1,84 @@
+"""Tests for app/realtime/emit_bus.py — batched Redis Socket.io emit bus."""
+
+from __future__ import annotations
+
+import os
+import pickle
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+
+from app.realtime.emit_bus import BatchingRedisManager
+
+
+class _RecordingPipeline:
+    def __init__(self, sink: list, receivers: int) -> None:
+        self._sink = sink
+        self._receivers = receivers
+        self._queued: list[tuple[str, bytes]] = []
+
+    def publish(self, channel: str, blob: bytes) -> None:
+        self._queued.append((channel, blob))
+
+    async def execute(self) -> list[int]:
+        self._sink.append(self._queued)
+        return [self._receivers] * len(self._queued)
+
+
+class _RecordingRedis:
+    def __init__(self, receivers: int = 2) -> None:
+        self.batches: list[list[tuple[str, bytes]]] = []
+        self._receivers = receivers
+
+    def pipeline(self, transaction: bool = True) -> _RecordingPipeline:
+        return _RecordingPipeline(self.batches, self._receivers)
+
+
+def _manager(batch_size: int = 200) -> tuple[BatchingRedisManager, _RecordingRedis]:
+    manager = BatchingRedisManager(
+        "redis://localhost:6379/0", channel="test-bus", batch_size=batch_size
+    )
+
+    fake = _RecordingRedis()
+    manager.redis = fake
+    return manager, fake
+
+
+@pytest.mark.asyncio
+async def test_publishes_are_batched_in_order():
+    manager, fake = _manager()
+    for i in range(5):
+        await manager._publish({"method": "emit", "event": "message:new", "data": {"n": i}})
+    await manager.flush()
+
+    assert len(fake.batches) == 1
+    sent = [pickle.loads(blob) for _, blob in fake.batches[0]]
+    assert [m["data"]["n"] for m in sent] == [0, 1, 2, 3, 4]
+    assert {channel for channel, _ in fake.batches[0]} == {"test-bus"}
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_immediately():
+    manager, fake = _manager(batch_size=3)
+    for i in range(3):
+        await manager._publish({"method": "emit", "event": "message:status", "data": i})
+
+    assert len(fake.batches) == 1 and len(fake.batches[0]) == 3
+
+
+@pytest.mark.asyncio
+async def test_write_only_emit_publishes_without_local_clients():
+    """Worker path: an uninitialised manager still publishes every emit."""
+    import socketio
+
+    manager, fake = _manager()
+    server = socketio.AsyncServer(async_mode="asgi", client_manager=manager)
+    await server.emit("conversation:updated", {"conversationId": "c1"}, room="tenant:t1")
+    await manager.flush()
+
+    message = pickle.loads(fake.batches[0][0][1])
+    assert message["event"] == "conversation:updated"
+    assert message["room"] == "tenant:t1"
+    assert message["host_id"] == manager.host_id
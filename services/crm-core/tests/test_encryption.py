@@ -74,3 +74,57 @@ def test_encrypt_empty_string():
     from app.core.encryption import encrypt_token
     result = encrypt_token("")
     assert result == ""
+
+
+def test_decrypt_token_cached_decrypts_each_ciphertext_once():
+    """Repeat reads of the same ciphertext are served from the LRU."""
+    from cryptography.fernet import Fernet
+    key = Fernet.generate_key().decode()
+    with _patch_key(key):
+        _reset_encryption()
+        from app.core import encryption
+        encryption.clear_decrypt_cache()
+        encrypted = encryption.encrypt_token("EAA-cached-token")
+
+        with patch.object(encryption, "decrypt_token", wraps=encryption.decrypt_token) as spy:
+            assert encryption.decrypt_token_cached(encrypted) == "EAA-cached-token"
+            assert encryption.decrypt_token_cached(encrypted) == "EAA-cached-token"
+            assert encryption.decrypt_token_cached("plain-token") == "plain-token"
+        assert spy.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_tenant_tokens_stay_encrypted_until_read():
+    """Loaded Tenant rows hold ciphertext; the public attribute decrypts on access."""
+    from cryptography.fernet import Fernet
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.models.tenant import Tenant
+
+    key = Fernet.generate_key().decode()
+    with _patch_key(key):
+        _reset_encryption()
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Tenant.__table__.create)
+
+        async with AsyncSession(engine) as session:
+            session.add(Tenant(name="Hotel", slug="hotel", whatsapp_access_token="EAA-secret"))
+            await session.commit()
+
+        async with AsyncSession(engine) as session:
+            query = select(Tenant).where(Tenant.slug == "hotel")
+            tenant = (await session.execute(query)).scalar_one()
+            assert tenant._whatsapp_access_token.startswith("enc:")
+            assert tenant.whatsapp_access_token == "EAA-secret"
+            assert tenant.instagram_access_token is None
+
+            tenant.whatsapp_access_token = "EAA-rotated"
+            await session.commit()
+            column = Tenant.__table__.c.whatsapp_access_token
+            stored = (await session.execute(select(column))).scalar_one()
+
+            assert stored.startswith("enc:")
+
+        await engine.dispose()
@@ -0,0 +1,145 @@
+"""Tests for the conversation_inbox_state read model and the single-query inbox."""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.core import query_stats
+from app.models.contact import Contact
+from app.models.conversation import Conversation
+from app.models.conversation_inbox_state import ConversationInboxState
+from app.models.message import Message
+from app.models.tag import Tag
+from app.models.user import User
+from app.schemas.conversation import ConversationListParams
+from app.services.conversation_service import conversation_service
+from app.services.inbox_state_service import PREVIEW_MAX_CHARS, inbox_state_service
+from app.services.message_service import message_service
+
+pytestmark = pytest.mark.tables(
+    "messages", "conversation_inbox_state", "conversation_read_cursors"
+)
+START = datetime(2026, 5, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+async def db(tenant_db):
+    tenant_id = tenant_db.info["tenant_id"]
+    users = [
+        User(
+            tenant_id=tenant_id,
+            email=f"{name}@hotel.test",
+            password_hash="x",
+            name=name,
+            role="TENANT_ADMIN",
+        )
+        for name in ("ana", "rui")
+    ]
+    contact = Contact(tenant_id=tenant_id, first_name="Guest")
+    tenant_db.add_all([*users, contact])
+    await tenant_db.flush()
+    conversation = Conversation(
+        tenant_id=tenant_id,
+        contact_id=contact.id,
+        assigned_to_id=users[0].id,
+        channel="WHATSAPP",
+        tags=[Tag(tenant_id=tenant_id, name="VIP")],
+    )
+    tenant_db.add(conversation)
+    await tenant_db.commit()
+    tenant_db.info.update(conversation=conversation, users=users)
+    yield tenant_db
+
+
+async def _inbound(db, minutes: int, content: str) -> None:
+    """Persist an inbound message the way process_incoming_message does."""
+    conversation = db.info["conversation"]
+    message = Message(
+        tenant_id=conversation.tenant_id,
+        conversation_id=conversation.id,
+        direction="INBOUND",
+        type="TEXT",
+        content=content,
+        sender_name="Guest",
+        timestamp=START + timedelta(minutes=minutes),
+    )
+    db.add(message)
+    await db.flush()
+    await inbox_state_service.record_message(db, message)
+    await db.commit()
+
+
+async def _state(db) -> ConversationInboxState:
+    return await db.get(ConversationInboxState, db.info["conversation"].id, populate_existing=True)
+
+
+@pytest.mark.asyncio
+async def test_state_tracks_last_message_unread_and_unanswered(db):
+    await _inbound(db, 0, "Oi,\n  tem   vaga?")
+    await _inbound(db, 1, "x" * 500)
+    state = await _state(db)
+    assert (state.unread_count, state.last_message_direction) == (2, "INBOUND")
+    assert len(state.last_message_preview) == PREVIEW_MAX_CHARS
+    assert state.first_unanswered_inbound_at.replace(tzinfo=UTC) == START
+
+    reply = await message_service.save_outbound_message(
+        db, db.info["tenant_id"], db.info["conversation"].id, "Temos sim!", sender_name="Ana"
+    )
+    await db.commit()
+    state = await _state(db)
+    assert (state.last_message_id, state.last_sender_name) == (reply.id, "Ana")
+    assert state.unread_count == 0
+    assert state.first_unanswered_inbound_at is None
+
+    # A late delivery of an older message is unread but keeps the newest preview
+    await _inbound(db, -5, "Oi, tem vaga?")
+    state = await _state(db)
+    assert (state.unread_count, state.last_message_preview) == (1, "Temos sim!")
+
+
+@pytest.mark.asyncio
+async def test_inbox_is_one_query_with_per_user_read_state(db):
+    ana, rui = db.info["users"]
+    await _inbound(db, 0, "Oi, tem   vaga?")
+    await inbox_state_service.mark_read(
+        db, db.info["tenant_id"], db.info["conversation"].id, ana.id
+    )
+    await db.commit()
+    await _inbound(db, 1, "Para amanhã")
+
+    async def inbox(user):
+        stats, token = query_stats.begin()
+        try:
+            page = await conversation_service.list_conversations(
+                db,
+                db.info["tenant_id"],
+                "TENANT_ADMIN",
+                user.id,
+                None,
+                ConversationListParams(count="none"),
+            )
+        finally:
+            query_stats.end("test", stats, token)
+        return page.data[0], stats.queries
+
+    item, queries = await inbox(ana)
+    assert queries == 1
+    assert (item.lastMessage, item.unreadCount, item.is_unread) == ("Para amanhã", 1, True)
+    assert item.contact.first_name == "Guest" and item.assigned_to.id == ana.id
+    assert [tag.name for tag in item.tags] == ["VIP"]
+
+    await inbox_state_service.mark_read(
+        db, db.info["tenant_id"], db.info["conversation"].id, ana.id
+    )
+    await db.commit()
+    item, _ = await inbox(ana)
+    assert (item.unreadCount, item.is_unread) == (0, False)
+    item, _ = await inbox(rui)
+    assert item.is_unread
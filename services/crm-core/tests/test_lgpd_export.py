@@ -0,0 +1,93 @@
+"""Tests for the LGPD data export route and the audit row it must leave behind."""
+
+from __future__ import annotations
+
+import os
+import uuid
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401 — resolve foreign keys between the tables below
+from app.api.v1 import lgpd
+from app.core import audit_writer as audit_writer_module
+from app.core.audit_writer import AuditWriter
+from app.core.database import Base, get_db
+from app.core.dependencies import get_current_user
+from app.core.principal_cache import Principal
+from app.models.audit_log import AuditLog
+from app.models.contact import Contact
+
+_TABLES = (
+    "tenants",
+    "contacts",
+    "conversations",
+    "messages",
+    "leads",
+    "deals",
+    "audit_logs",
+)
+
+TENANT = uuid.uuid4()
+
+
+@pytest.fixture
+async def sessions():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    tables = [Base.metadata.tables[name] for name in _TABLES]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync: Base.metadata.create_all(sync, tables=tables))
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_export_commits_its_audit_row(sessions, monkeypatch):
+    writer = AuditWriter(session_factory=sessions, flush_interval=60.0)
+    monkeypatch.setattr(audit_writer_module, "audit_writer", writer)
+
+    async with sessions() as db:
+        contact = Contact(tenant_id=TENANT, first_name="Ana", email="ana@example.com")
+        db.add(contact)
+        await db.commit()
+
+    async def _get_db():
+        async with sessions() as session:
+            yield session
+            await session.commit()
+
+    async def _get_current_user(request: Request) -> Principal:
+        principal = Principal(
+            id=uuid.uuid4(),
+            tenant_id=TENANT,
+            name="Agent",
+            role="ATTENDANT",
+            hotel_unit=None,
+            status="ACTIVE",
+        )
+        request.state.tenant_id = TENANT
+        return principal
+
+    # get_read_db is deliberately left alone: the export must not depend on it
+    app = FastAPI()
+    app.include_router(lgpd.router)
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_current_user] = _get_current_user
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(f"/contacts/{contact.id}/export")
+    assert response.status_code == 200
+    await writer.flush()
+
+    async with sessions() as db:
+        rows = (await db.execute(select(AuditLog))).scalars().all()
+    assert [(row.action, row.entity_id) for row in rows] == [
+        ("LGPD_DATA_EXPORT", str(contact.id))
+    ]
@@ -0,0 +1,118 @@
+"""Tests for the in-process rate-limit strategies and their Redis reconciliation."""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+from limits import parse
+from limits.storage import MemoryStorage
+
+from app.core import local_rate_limit
+from app.core.local_rate_limit import LocalSlidingWindowRateLimiter, LocalTokenBucketRateLimiter
+from app.core.rate_limit import N8N_RATE_LIMIT, n8n_rate_limit, remember_tenant_plan
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock(6000.0)  # start of a 60 s window
+    monkeypatch.setattr(local_rate_limit.time, "time", clock.time)
+    return clock
+
+
+class _FakePipeline:
+    def __init__(self, store: dict[str, int]) -> None:
+        self.store = store
+        self.ops: list[tuple[str, int]] = []
+
+    def incrby(self, key, amount):
+        self.ops.append((key, amount))
+
+    def expire(self, key, seconds):
+        self.ops.append((key, -1))
+
+    async def execute(self):
+        replies = []
+        for key, amount in self.ops:
+            if amount == -1:
+                replies.append(True)
+            else:
+                self.store[key] = self.store.get(key, 0) + amount
+                replies.append(self.store[key])
+        return replies
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, int] = {}
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self.store)
+
+
+def _limiter(cls, redis=None):
+    limiter = cls(MemoryStorage(), redis_url="redis://fake" if redis else "")
+    limiter._redis = redis
+    limiter._ensure_sync = lambda: None
+    return limiter
+
+
+def test_sliding_window_carries_the_previous_window(clock):
+    limiter = _limiter(LocalSlidingWindowRateLimiter)
+    item = parse("10/minute")
+
+    assert all(limiter.hit(item, "k") for _ in range(10))
+    assert not limiter.hit(item, "k")
+
+    # A quarter into the next window, 75% of the previous 10 hits still count
+    clock.now += 75
+    assert [limiter.hit(item, "k") for _ in range(3)] == [True, True, False]
+    assert limiter.get_window_stats(item, "k").remaining == 0
+
+
+def test_token_bucket_refills_continuously(clock):
+    limiter = _limiter(LocalTokenBucketRateLimiter)
+    item = parse("10/minute")
+
+    assert all(limiter.hit(item, "k") for _ in range(10))
+    assert not limiter.hit(item, "k")
+
+    clock.now += 12  # two tokens
+    assert [limiter.hit(item, "k") for _ in range(3)] == [True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_sync_folds_in_other_replicas_consumption(clock):
+    redis = _FakeRedis()
+    replica_a = _limiter(LocalSlidingWindowRateLimiter, redis)
+    replica_b = _limiter(LocalSlidingWindowRateLimiter, redis)
+    item = parse("10/minute")
+
+    assert all(replica_b.hit(item, "k") for _ in range(6))
+    await replica_b.sync()
+    assert replica_a.hit(item, "k")
+    await replica_a.sync()
+
+    assert redis.store == {f"rl:{item.key_for('k')}:100": 7}
+    assert replica_a.get_window_stats(item, "k").remaining == 3
+    assert [replica_a.hit(item, "k") for _ in range(4)] == [True, True, True, False]
+
+
+def test_n8n_limit_follows_the_tenant_plan():
+    remember_tenant_plan("hotel-a", "ENTERPRISE")
+    remember_tenant_plan("hotel-b", None)
+
+    assert n8n_rate_limit("hotel-a:123") == "30000/minute"
+    assert n8n_rate_limit("hotel-b:123") == N8N_RATE_LIMIT
+    assert n8n_rate_limit("unknown:123") == N8N_RATE_LIMIT
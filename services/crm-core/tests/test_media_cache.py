@@ -0,0 +1,183 @@
+"""Tests for app/channels/media_cache.py — upload-once outbound media cache."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import httpx
+import pytest
+from httpx import AsyncClient
+
+from app.channels.media_cache import OutboundMediaCache
+from app.core.config import settings
+
+_TOKEN = "EAAB-test-token-0123456789"
+
+
+class _FakeGraph:
+    """Serves /cdn/<name> downloads and counts /media uploads per token."""
+
+    def __init__(self, valid_tokens: set[str] | None = None) -> None:
+        self.valid_tokens = valid_tokens if valid_tokens is not None else {_TOKEN}
+        self.downloads = 0
+        self.uploads = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "GET" and request.url.path.startswith("/cdn/"):
+            self.downloads += 1
+            content = request.url.path.encode() * 64
+            return httpx.Response(200, content=content, headers={"content-type": "image/jpeg"})
+        if request.method == "POST" and request.url.path.endswith("/media"):
+            token = request.headers.get("authorization", "").removeprefix("Bearer ")
+            if token not in self.valid_tokens:
+                return httpx.Response(401, json={"error": {"code": 190}})
+            self.uploads += 1
+            return httpx.Response(200, json={"id": f"media-{self.uploads}"})
+        return httpx.Response(404)
+
+
+def _client(graph: _FakeGraph) -> AsyncClient:
+    return AsyncClient(transport=httpx.MockTransport(graph))
+
+
+@pytest.fixture(autouse=True)
+def _allow_graph_test(monkeypatch):
+    monkeypatch.setattr(settings, "WHATSAPP_MEDIA_ALLOWED_SCHEMES", ["http", "https"])
+    monkeypatch.setattr(settings, "WHATSAPP_MEDIA_ALLOWED_HOSTS", ["graph.test"])
+
+
+async def _get(
+    cache: OutboundMediaCache, client: AsyncClient, url: str, phone: str = "111"
+) -> str | None:
+    return await cache.get_media_id(
+        url=url, media_type="image", phone_number_id=phone, access_token=_TOKEN, client=client
+    )
+
+
+@pytest.mark.asyncio
+async def test_same_url_uploads_once_per_phone_number():
+    graph = _FakeGraph()
+    cache = OutboundMediaCache()
+    async with _client(graph) as client:
+        first = await _get(cache, client, "http://graph.test/cdn/room-1")
+        second = await _get(cache, client, "http://graph.test/cdn/room-1")
+        other_phone = await _get(cache, client, "http://graph.test/cdn/room-1", phone="222")
+
+    assert first and first == second
+    assert other_phone and other_phone != first
+    assert graph.uploads == 2
+    assert graph.downloads == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_share_one_upload():
+    graph = _FakeGraph()
+    cache = OutboundMediaCache()
+    async with _client(graph) as client:
+        ids = await asyncio.gather(
+            *(_get(cache, client, "http://graph.test/cdn/suite") for _ in range(10))
+        )
+
+    assert len(set(ids)) == 1 and ids[0]
+    assert graph.uploads == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_failure_returns_none_for_link_fallback():
+    graph = _FakeGraph(valid_tokens={"some-other-token"})
+    cache = OutboundMediaCache()
+    async with _client(graph) as client:
+        assert await _get(cache, client, "http://graph.test/cdn/lobby") is None
+    assert graph.uploads == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_fall_back_when_the_leader_is_cancelled():
+    started = asyncio.Event()
+
+    async def hang(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.sleep(60)
+        raise AssertionError("unreachable")
+
+    cache = OutboundMediaCache()
+    async with AsyncClient(transport=httpx.MockTransport(hang)) as client:
+        leader = asyncio.create_task(_get(cache, client, "http://graph.test/cdn/slow"))
+        await started.wait()
+        waiter = asyncio.create_task(_get(cache, client, "http://graph.test/cdn/slow"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await asyncio.wait_for(waiter, timeout=1) is None
+    assert not cache._inflight
+
+
+@pytest.mark.asyncio
+async def test_oversized_downloads_are_abandoned_while_streaming():
+    chunks_sent = 0
+
+    async def body():
+        nonlocal chunks_sent
+        for _ in range(100):
+            chunks_sent += 1
+            yield b"x" * (1024 * 1024)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body(), headers={"content-type": "image/jpeg"})
+
+    cache = OutboundMediaCache()
+    async with AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await _get(cache, client, "http://graph.test/cdn/huge") is None
+    assert chunks_sent <= 6  # image limit is 5 MiB
+
+
+@pytest.mark.asyncio
+async def test_urls_outside_the_allowlist_are_never_fetched(monkeypatch):
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return httpx.Response(302, headers={"location": "http://169.254.169.254/latest/"})
+
+    cache = OutboundMediaCache()
+    async with AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await _get(cache, client, "http://internal.test/cdn/a") is None
+        assert await _get(cache, client, "ftp://graph.test/cdn/a") is None
+        # A redirect off the allowlist is not followed
+        assert await _get(cache, client, "http://graph.test/cdn/moved") is None
+
+        # Without a host list only public addresses are allowed
+        monkeypatch.setattr(settings, "WHATSAPP_MEDIA_ALLOWED_HOSTS", [])
+        assert await _get(cache, client, "http://127.0.0.1/cdn/a") is None
+
+    assert requested == ["http://graph.test/cdn/moved"]
+
+
+@pytest.mark.asyncio
+async def test_public_only_downloads_connect_to_the_checked_address(monkeypatch):
+    monkeypatch.setattr(settings, "WHATSAPP_MEDIA_ALLOWED_HOSTS", [])
+    # A rebinding resolver: any lookup after the check answers an internal address
+    answers = iter([["93.184.216.34"], ["10.0.0.5"]])
+
+    async def getaddrinfo(host, port, *args, **kwargs):
+        return [(2, 1, 6, "", (address, port)) for address in next(answers)]
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+    graph = _FakeGraph()
+    seen: list[tuple[str, str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            sni = request.extensions.get("sni_hostname", "")
+            seen.append((request.url.host, request.headers["host"], sni))
+        return graph(request)
+
+    url = "https://cdn.example:8443/cdn/a"
+    async with AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await _get(OutboundMediaCache(), client, url) == "media-1"
+
+
+    assert seen == [("93.184.216.34", "cdn.example:8443", "cdn.example")]
@@ -0,0 +1,148 @@
+"""Query-count regression tests for message read paths (no relationship cascades)."""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.core import query_stats
+from app.models.contact import Contact
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.schemas.message import MessageListParams
+from app.services.inbox_state_service import inbox_state_service
+from app.services.message_service import message_service
+
+pytestmark = pytest.mark.tables("messages", "conversation_inbox_state")
+START = datetime(2026, 5, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+async def db(tenant_db):
+    tenant_id = tenant_db.info["tenant_id"]
+    contact = Contact(tenant_id=tenant_id, first_name="Ana")
+    tenant_db.add(contact)
+    await tenant_db.flush()
+    conversation = Conversation(tenant_id=tenant_id, contact_id=contact.id, channel="WHATSAPP")
+    tenant_db.add(conversation)
+    await tenant_db.flush()
+    messages = [
+        Message(
+            tenant_id=tenant_id,
+            conversation_id=conversation.id,
+            direction="INBOUND",
+            type="TEXT",
+            content=f"msg {i}",
+            external_message_id=f"wamid.{i}",
+            # Pairs share a timestamp, so paging must break ties on id
+            timestamp=START + timedelta(minutes=i // 2),
+        )
+        for i in range(120)
+    ]
+    tenant_db.add_all(messages)
+    await tenant_db.flush()
+    await inbox_state_service.record_messages(tenant_db, messages)
+    await tenant_db.commit()
+    tenant_db.expunge_all()
+    tenant_db.info["conversation_id"] = conversation.id
+    yield tenant_db
+
+
+async def _counted(coro):
+    stats, token = query_stats.begin()
+    try:
+        result = await coro
+    finally:
+        query_stats.end("test", stats, token)
+    return result, stats.queries
+
+
+@pytest.mark.asyncio
+async def test_a_50_message_page_costs_at_most_two_queries(db):
+    page, queries = await _counted(
+        message_service.list_messages(
+            db, db.info["tenant_id"], db.info["conversation_id"], MessageListParams(limit=50)
+        )
+    )
+    assert len(page.data) == 50 and page.total == 120 and page.has_more
+    assert queries <= 2
+
+    older, queries = await _counted(
+        message_service.list_messages(
+            db,
+            db.info["tenant_id"],
+            db.info["conversation_id"],
+            MessageListParams(limit=50, cursor=page.next_cursor),
+        )
+    )
+    assert older.data[-1].timestamp <= page.data[0].timestamp
+    assert queries <= 2
+
+
+async def _page(db, **params):
+    return await message_service.list_messages(
+        db, db.info["tenant_id"], db.info["conversation_id"], MessageListParams(**params)
+    )
+
+
+@pytest.mark.asyncio
+async def test_cursors_page_both_ways_over_every_message_once(db):
+    chronological = list(
+        await db.scalars(select(Message.id).order_by(Message.timestamp, Message.id))
+    )
+    page = await _page(db, limit=7)
+    backward = [m.id for m in page.data]
+    while page.has_more:
+        page = await _page(db, limit=7, cursor=page.next_cursor)
+        backward = [m.id for m in page.data] + backward
+    assert backward == chronological
+
+    forward = [m.id for m in page.data]
+    while page.has_newer:
+        page = await _page(db, limit=7, cursor=page.prev_cursor)
+        forward += [m.id for m in page.data]
+    assert forward == chronological and page.prev_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_around_centres_the_page_on_a_message(db):
+    anchor = await db.scalar(select(Message.id).where(Message.external_message_id == "wamid.60"))
+    page, queries = await _counted(_page(db, limit=9, around=anchor))
+    ids = [m.id for m in page.data]
+    assert len(ids) == 9 and ids.index(anchor) == 4
+    assert page.has_more and page.has_newer and queries <= 2
+
+    newer = await _page(db, limit=9, cursor=page.prev_cursor)
+    older = await _page(db, limit=9, cursor=page.next_cursor)
+    assert older.data[-1].timestamp <= page.data[0].timestamp
+    assert page.data[-1].timestamp <= newer.data[0].timestamp
+    assert not {m.id for m in older.data + newer.data} & set(ids)
+
+    # Bare message UUIDs are still accepted as "older than this message"
+    legacy = await _page(db, limit=4, cursor=str(anchor))
+    assert [m.id for m in legacy.data] == ids[:4]
+
+
+@pytest.mark.asyncio
+async def test_status_update_is_a_single_statement(db):
+    updated, queries = await _counted(message_service.update_message_status(db, "wamid.7", "READ"))
+    assert updated.status == "READ" and updated.content == "msg 7"
+    assert queries == 1
+
+
+@pytest.mark.asyncio
+async def test_loading_a_message_does_not_load_its_conversation(db):
+    message, queries = await _counted(
+        db.scalar(select(Message).where(Message.external_message_id == "wamid.1"))
+    )
+    assert queries == 1
+    with pytest.raises(InvalidRequestError):
+        message.conversation  # noqa: B018 — explicit loading only
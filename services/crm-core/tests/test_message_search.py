@@ -0,0 +1,117 @@
+"""Tests for message search: role scoping, filters, snippets and cursor paging."""
+
+from __future__ import annotations
+
+import os
+import uuid
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.contact import Contact
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.schemas.message import MessageSearchParams
+from app.services.message_search_service import _document, message_search_service
+
+pytestmark = pytest.mark.tables("messages")
+START = datetime(2026, 5, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+async def db(tenant_db):
+    tenant_id = tenant_db.info["tenant_id"]
+    for unit, channel, name in (
+        ("Centro", "WHATSAPP", "Ana Lima"),
+        ("Praia", "INSTAGRAM", "Rui Costa"),
+    ):
+        contact = Contact(
+            tenant_id=tenant_id, first_name=name.split()[0], full_name=name, mobile_no="5511"
+        )
+        tenant_db.add(contact)
+        await tenant_db.flush()
+        conversation = Conversation(
+            tenant_id=tenant_id, contact_id=contact.id, channel=channel, hotel_unit=unit
+        )
+        tenant_db.add(conversation)
+        await tenant_db.flush()
+        for i in range(3):
+            tenant_db.add(
+                Message(
+                    tenant_id=tenant_id,
+                    conversation_id=conversation.id,
+                    direction="INBOUND" if i < 2 else "OUTBOUND",
+                    type="TEXT",
+                    content=f"<b>Msg {i}</b>: posso fazer late check-out amanhã?",
+                    timestamp=START + timedelta(hours=i),
+                )
+            )
+        tenant_db.add(
+            Message(
+                tenant_id=tenant_id,
+                conversation_id=conversation.id,
+                direction="INBOUND",
+                type="TEXT",
+                content="Obrigado!",
+                timestamp=START,
+            )
+        )
+    await tenant_db.commit()
+    yield tenant_db
+
+
+async def _search(db, role="ADMIN", hotel_unit=None, **params):
+    return await message_search_service.search_messages(
+        db=db,
+        tenant_id=db.info["tenant_id"],
+        user_role=role,
+        user_id=uuid.uuid4(),
+        user_hotel_unit=hotel_unit,
+        params=MessageSearchParams(**params),
+    )
+
+
+def test_query_expression_matches_the_migrated_index():
+    versions = Path(__file__).parents[1] / "alembic" / "versions"
+    migration = next(versions.glob("*_add_message_search_index.py"))
+    expression = str(_document(Message.content).compile(dialect=postgresql.dialect()))
+    assert expression.replace("messages.content", "content") in migration.read_text()
+
+
+@pytest.mark.asyncio
+async def test_results_are_scoped_filtered_and_carry_context(db):
+    assert len((await _search(db, q="check-out")).data) == 6
+    scoped = await _search(db, role="HEAD", hotel_unit="Praia", q="check-out")
+    assert {hit.contact_name for hit in scoped.data} == {"Rui Costa"}
+
+    inbound = await _search(db, q="late", channel="whatsapp", direction="inbound")
+    assert [hit.timestamp.hour for hit in inbound.data] == [1, 0]  # newest first
+    assert {(hit.channel, hit.direction) for hit in inbound.data} == {("WHATSAPP", "INBOUND")}
+
+    windowed = await _search(db, q="late", date_from=START + timedelta(hours=2))
+    assert {hit.timestamp.hour for hit in windowed.data} == {2}
+
+
+@pytest.mark.asyncio
+async def test_snippets_are_escaped_and_highlighted(db):
+    [hit, *_] = (await _search(db, q="check-out", limit=1)).data
+    assert "&lt;b&gt;" in hit.snippet and "<b>" not in hit.snippet
+    assert "<mark>check-out</mark>" in hit.snippet
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_through_every_hit_once(db):
+    seen, cursor = [], None
+    while True:
+        result = await _search(db, q="amanhã", limit=4, cursor=cursor)
+        seen += [hit.id for hit in result.data]
+        if not result.has_more:
+            break
+        cursor = result.next_cursor
+    assert len(seen) == len(set(seen)) == 6
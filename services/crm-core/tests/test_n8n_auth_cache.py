@@ -0,0 +1,145 @@
+"""Tests for cached n8n X-API-Key resolution, negative caching and invalidation."""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.exceptions import ForbiddenError, UnauthorizedError
+from app.models.tenant import Tenant
+from app.n8n import auth, tenant_cache
+from app.n8n.tenant_cache import N8nAuthCache
+
+
+class _CountingSession:
+    """AsyncSession proxy that counts executed statements."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self.queries = 0
+
+    async def execute(self, *args, **kwargs):
+        self.queries += 1
+        return await self._session.execute(*args, **kwargs)
+
+
+@pytest.fixture
+async def db(monkeypatch):
+    cache = N8nAuthCache(ttl_seconds=30, negative_ttl_seconds=10)
+    monkeypatch.setattr(auth, "n8n_auth_cache", cache)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Tenant.__table__.create)
+    async with AsyncSession(engine) as session:
+        session.add(
+            Tenant(
+                name="Hotel",
+                slug="hotel",
+                status="ACTIVE",
+                whatsapp_phone_number_id="1055",
+                whatsapp_access_token="EAA-token",
+            )
+        )
+        await session.commit()
+        yield _CountingSession(session)
+    await engine.dispose()
+
+
+def _request():
+    return SimpleNamespace(state=SimpleNamespace())
+
+
+@pytest.mark.asyncio
+async def test_valid_key_is_resolved_once(db):
+    first = await auth.get_n8n_tenant(_request(), "hotel:1055", db)
+    second = await auth.get_n8n_tenant(_request(), "hotel:1055", db)
+
+    assert second is first
+    assert first.slug == "hotel" and first.whatsapp_access_token == "EAA-token"
+    assert db.queries == 1
+
+
+@pytest.mark.asyncio
+async def test_bad_keys_are_negatively_cached(db):
+    for _ in range(3):
+        with pytest.raises(UnauthorizedError):
+            await auth.get_n8n_tenant(_request(), "nope:1055", db)
+        with pytest.raises(UnauthorizedError, match="channel identifier"):
+            await auth.get_n8n_tenant(_request(), "hotel:999", db)
+
+    assert db.queries == 2
+
+
+@pytest.mark.asyncio
+async def test_bad_key_spray_does_not_evict_valid_tenants(db, monkeypatch):
+    monkeypatch.setattr(tenant_cache, "_NEGATIVE_MAX_SIZE", 3)
+    await auth.get_n8n_tenant(_request(), "hotel:1055", db)
+
+    for i in range(10):
+        with pytest.raises(UnauthorizedError):
+            await auth.get_n8n_tenant(_request(), f"spray{i}:1055", db)
+    assert db.queries == 11
+
+    await auth.get_n8n_tenant(_request(), "hotel:1055", db)
+    assert db.queries == 11
+    # Only the most recent rejections are kept
+    with pytest.raises(UnauthorizedError):
+        await auth.get_n8n_tenant(_request(), "spray9:1055", db)
+    with pytest.raises(UnauthorizedError):
+        await auth.get_n8n_tenant(_request(), "spray0:1055", db)
+    assert db.queries == 12
+
+
+@pytest.mark.asyncio
+async def test_tenant_update_invalidates_cached_keys(db):
+
+    await auth.get_n8n_tenant(_request(), "hotel:1055", db)
+
+    tenant = (await db._session.execute(Tenant.__table__.select())).one()
+    await db._session.execute(Tenant.__table__.update().values(status="SUSPENDED"))
+    await auth.n8n_auth_cache.invalidate_tenant(tenant.id, tenant.slug)
+
+    with pytest.raises(ForbiddenError):
+        await auth.get_n8n_tenant(_request(), "hotel:1055", db)
+    assert db.queries == 2
+
+
+@pytest.mark.asyncio
+async def test_lookup_racing_a_committed_update_is_not_cached(db, monkeypatch):
+    from app.core.after_commit import after_commit, wait_after_commit
+
+    cache = auth.n8n_auth_cache
+    tenant = (await db._session.execute(Tenant.__table__.select())).one()
+    load_snapshot = auth.load_tenant_snapshot
+
+    async def load_then_update(session, slug):
+        # An admin update commits while this lookup holds the old row
+        snapshot = await load_snapshot(session, slug)
+        await cache.invalidate_tenant(tenant.id, tenant.slug)
+        return snapshot
+
+    monkeypatch.setattr(auth, "load_tenant_snapshot", load_then_update)
+    await auth.get_n8n_tenant(_request(), "hotel:1055", db)
+    monkeypatch.setattr(auth, "load_tenant_snapshot", load_snapshot)
+
+    await auth.get_n8n_tenant(_request(), "hotel:1055", db)
+    assert db.queries == 2
+
+    # Queued invalidations only run once the admin transaction commits
+    await db._session.execute(Tenant.__table__.update().values(status="SUSPENDED"))
+    after_commit(db._session, cache.invalidate_tenant, tenant.id, tenant.slug)
+    await auth.get_n8n_tenant(_request(), "hotel:1055", db)
+    assert db.queries == 2
+    await db._session.commit()
+    await wait_after_commit(db._session)
+
+    with pytest.raises(ForbiddenError):
+        await auth.get_n8n_tenant(_request(), "hotel:1055", db)
+    assert db.queries == 3
@@ -0,0 +1,147 @@
+"""Tests for the two-tier principal cache used by HTTP and socket auth."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+
+from app.core.principal_cache import Principal, PrincipalCache
+
+_USER_ID = uuid.uuid4()
+_TENANT_ID = uuid.uuid4()
+_PRINCIPAL = Principal(
+    id=_USER_ID,
+    tenant_id=_TENANT_ID,
+    name="Ana",
+    role="ATTENDANT",
+    hotel_unit="Campos",
+    status="ACTIVE",
+)
+
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.published: list[tuple[str, str]] = []
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+def _cache(redis: _FakeRedis | None, ttl: float = 60) -> PrincipalCache:
+    cache = PrincipalCache(ttl_seconds=ttl, redis_ttl_seconds=300)
+    cache._redis = redis
+    cache._redis_url = "redis://fake" if redis is not None else None
+    cache.ensure_listener = lambda: None  # type: ignore[method-assign]
+    return cache
+
+
+def test_principal_round_trips_through_json():
+    assert Principal.from_json(_PRINCIPAL.to_json()) == _PRINCIPAL
+
+
+@pytest.mark.asyncio
+async def test_local_tier_expires():
+    cache = _cache(None, ttl=0.01)
+    await cache.put(_PRINCIPAL)
+    assert await cache.get(_USER_ID, _TENANT_ID, path="http") == _PRINCIPAL
+    await asyncio.sleep(0.02)
+    assert await cache.get(_USER_ID, _TENANT_ID, path="http") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_between_replicas():
+    redis = _FakeRedis()
+    await _cache(redis).put(_PRINCIPAL)
+
+    other_replica = _cache(redis)
+    assert await other_replica.get(_USER_ID, _TENANT_ID, path="socket") == _PRINCIPAL
+    assert await other_replica.get(_USER_ID, None, path="socket") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_clears_both_tiers_and_broadcasts():
+    redis = _FakeRedis()
+    cache = _cache(redis)
+    await cache.put(_PRINCIPAL)
+
+    await cache.invalidate_user(_USER_ID, _TENANT_ID)
+
+    assert redis.values == {}
+    assert redis.published == [(cache.channel, str(_USER_ID))]
+    assert await cache.get(_USER_ID, _TENANT_ID, path="http") is None
+
+
+@pytest.mark.asyncio
+async def test_deactivation_is_not_undone_by_a_concurrent_lookup(tmp_path, monkeypatch):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.core.after_commit import wait_after_commit
+    from app.core.database import Base
+    from app.core.principal_cache import load_principal, principal_cache
+    from app.models.tenant import Tenant
+    from app.models.user import User
+    from app.services.user_service import user_service
+
+    monkeypatch.setattr(principal_cache, "_redis_url", None)
+    principal_cache.clear()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[Base.metadata.tables[t] for t in ("tenants", "users")]
+        )
+    async with AsyncSession(engine, expire_on_commit=False) as setup:
+        tenant = Tenant(name="Hotel", slug="hotel")
+        setup.add(tenant)
+        await setup.flush()
+        admin, agent = (
+            User(tenant_id=tenant.id, email=f"{n}@hotel.test", password_hash="x", name=n, role=r)
+            for n, r in (("admin", "TENANT_ADMIN"), ("agent", "ATTENDANT"))
+        )
+        setup.add_all([admin, agent])
+        await setup.commit()
+
+    async def lookup() -> Principal:
+        """What get_current_user does on a cache miss, on its own connection."""
+        cached = await principal_cache.get(agent.id, tenant.id, path="http")
+        if cached is not None:
+            return cached
+        loaded_at = principal_cache.stamp()
+        async with AsyncSession(engine) as reader:
+            principal = await load_principal(reader, agent.id, tenant.id)
+        await principal_cache.put(principal, loaded_at=loaded_at)
+        return principal
+
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as writer:
+            await user_service.deactivate_user(writer, tenant.id, agent.id, admin.id)
+            # Flushed, not committed: a concurrent request still reads ACTIVE
+            assert (await lookup()).status == "ACTIVE"
+            # ...and one that read before the commit stores its result after it
+            loaded_at = principal_cache.stamp()
+            async with AsyncSession(engine) as reader:
+                in_flight = await load_principal(reader, agent.id, tenant.id)
+            await writer.commit()
+            await wait_after_commit(writer)
+            await principal_cache.put(in_flight, loaded_at=loaded_at)
+
+        assert (await lookup()).status == "INACTIVE"
+    finally:
+        principal_cache.clear()
+        await engine.dispose()
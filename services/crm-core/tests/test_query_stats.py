@@ -0,0 +1,81 @@
+"""Tests for per-unit DB query accounting, slow-query fingerprints and the debug headers."""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import query_stats
+from app.core.config import settings
+from app.core.database import _instrument
+from app.core.middleware import QueryStatsMiddleware
+
+
+def test_fingerprint_collapses_literals_and_placeholders():
+    a, digest_a = query_stats.fingerprint(
+        "SELECT * FROM contacts WHERE id = $1 AND name = 'Ana'  LIMIT 20"
+    )
+    b, digest_b = query_stats.fingerprint(
+        "SELECT *\n FROM contacts WHERE id = $7 AND name = 'Bo''b' LIMIT 50"
+    )
+
+    assert a == b == "SELECT * FROM contacts WHERE id = ? AND name = ? LIMIT ?"
+    assert digest_a == digest_b
+    in_list = query_stats.fingerprint("SELECT 1 WHERE id IN (?, ?, ?)")[0]
+    assert in_list == "SELECT ? WHERE id IN (?+)"
+
+
+
+@pytest.mark.asyncio
+async def test_statements_are_counted_against_the_current_unit(monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.0)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    _instrument(engine, "test")
+
+    stats, token = query_stats.begin()
+    async with engine.connect() as conn:
+        for _ in range(3):
+            await conn.execute(text("SELECT 1"))
+    query_stats.end("test", stats, token)
+
+    async with engine.connect() as conn:  # outside any unit: not counted
+        await conn.execute(text("SELECT 1"))
+
+    assert stats.queries == 3
+    assert stats.seconds > 0
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_middleware_reports_queries_in_debug_headers(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    _instrument(engine, "test")
+
+    app = FastAPI()
+
+    @app.get("/two")
+    async def two():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return {}
+
+    transport = httpx.ASGITransport(app=QueryStatsMiddleware(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        monkeypatch.setattr(settings, "DB_DEBUG_HEADERS", False)
+        assert "x-db-queries" not in (await client.get("/two")).headers
+
+        monkeypatch.setattr(settings, "DB_DEBUG_HEADERS", True)
+        response = await client.get("/two")
+
+    assert response.headers["x-db-queries"] == "2"
+    assert float(response.headers["x-db-time-ms"]) >= 0
+    await engine.dispose()
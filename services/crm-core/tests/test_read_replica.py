@@ -0,0 +1,98 @@
+"""Tests for read-replica routing, lag fallback and read-your-writes stickiness."""
+
+from __future__ import annotations
+
+import os
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+from sqlalchemy import Integer, String, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+import app.core.database  # noqa: F401 — registers the write-tracking listeners
+from app.core.config import settings
+from app.core.read_replica import ReplicaRouter
+
+
+class _FakeReplica:
+    """Engine stand-in whose lag probe returns a configurable value."""
+
+    dialect = SimpleNamespace(name="postgresql")
+
+    def __init__(self, lag: float) -> None:
+        self.lag = lag
+        self.probes = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        self.probes += 1
+        replica = self
+
+        class _Conn:
+            async def execute(self, _stmt):
+                return SimpleNamespace(scalar=lambda: replica.lag)
+
+
+        yield _Conn()
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_LAG_CHECK_SECONDS", 60.0)
+    replica = _FakeReplica(lag=30.0)
+    router = ReplicaRouter(replica)
+
+    assert await router.use_replica("u1") is False
+    assert await router.use_replica("u1") is False
+    assert replica.probes == 1  # probe result is cached between checks
+
+
+@pytest.mark.asyncio
+async def test_writer_is_pinned_to_primary_for_the_sticky_window(monkeypatch):
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 5.0)
+    router = ReplicaRouter(_FakeReplica(lag=0.0))
+
+    await router.mark_write("u1")
+    assert await router.use_replica("u1") is False
+    assert await router.use_replica("u2") is True
+
+    router._sticky["u1"] = 0.0  # window elapsed
+    assert await router.use_replica("u1") is True
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Row(_Base):
+    __tablename__ = "replica_test_rows"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(20))
+
+
+@pytest.mark.asyncio
+async def test_sessions_record_whether_they_wrote():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(_Base.metadata.create_all)
+
+    async with AsyncSession(engine) as session:
+        await session.get(_Row, 1)
+        assert not session.info.get("wrote")
+
+    async with AsyncSession(engine) as session:
+        await session.execute(update(_Row).where(_Row.id == 1).values(name="x"))
+        assert session.info.get("wrote")
+
+    async with AsyncSession(engine) as session:
+        session.add(_Row(id=2, name="y"))
+        await session.flush()
+        assert session.info.get("wrote")
+
+    await engine.dispose()
@@ -0,0 +1,106 @@
+"""Tests for app/realtime/compact.py — the opt-in MessagePack realtime protocol."""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import msgpack
+import pytest
+
+from app.core.config import settings
+from app.realtime import compact
+from app.realtime.compact import ConversationState, encode_event, negotiate, room_name
+
+
+class _FakeRedis:
+    """Hashes plus a Python rendering of compact._UPDATE_SCRIPT."""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+
+    async def eval(self, script, numkeys, key, ttl, *args):
+        assert script == compact._UPDATE_SCRIPT and numkeys == 1
+        state = self.hashes.setdefault(key, {})
+        changed = []
+        for name, value in zip(args[::2], args[1::2], strict=True):
+            if state.get(name.encode()) != value.encode():
+                state[name.encode()] = value.encode()
+                changed.append(name.encode())
+        version = int(state.get(b"_v", b"0")) + 1
+        state[b"_v"] = str(version).encode()
+        return [version, *changed]
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+@pytest.fixture
+def state():
+    conversation_state = ConversationState(redis_url="redis://fake")
+    conversation_state._redis = _FakeRedis()
+    return conversation_state
+
+
+def test_compact_is_off_unless_enabled():
+    assert settings.REALTIME_COMPACT_ENABLED is False
+    assert negotiate({}, {"protocol": "compact"}) is False
+
+
+def test_negotiation_requires_opt_in_and_msgpack(monkeypatch):
+    monkeypatch.setattr(settings, "REALTIME_COMPACT_ENABLED", True)
+    assert negotiate({}, {"protocol": "compact"}) is True
+    assert negotiate({"QUERY_STRING": "EIO=4&protocol=compact"}, {}) is True
+    assert negotiate({}, {}) is False
+    assert room_name("tenant:t1", True) == "tenant:t1~c"
+    assert room_name("tenant:t1", False) == "tenant:t1"
+
+
+@pytest.mark.asyncio
+async def test_conversation_updates_carry_only_changed_fields(state, monkeypatch):
+    monkeypatch.setattr(compact, "conversation_state", state)
+    first = {"conversationId": "c1", "conversation": {"status": "OPEN", "unread": 1}}
+    second = {
+        "conversationId": "c1",
+        "conversation": {"status": "OPEN", "unread": 2},
+        "lastMessageAt": None,  # not sent; never clears a field
+        "eventId": "1-0",
+    }
+
+    assert msgpack.unpackb(await compact.encode_for("conversation:updated", first, "t1")) == {
+        "conversationId": "c1",
+        "v": 1,
+        "changed": {"conversation.status": "OPEN", "conversation.unread": 1},
+    }
+    assert msgpack.unpackb(await compact.encode_for("conversation:updated", second, "t1")) == {
+        "conversationId": "c1",
+        "v": 2,
+        "changed": {"conversation.unread": 2},
+        "eventId": "1-0",
+    }
+
+
+@pytest.mark.asyncio
+async def test_resync_returns_the_full_object(state):
+    await state.update("t1", "c1", {"conversationId": "c1", "conversation": {"status": "OPEN"}})
+    await state.update("t1", "c1", {"conversationId": "c1", "updates": {"assignedToId": "u1"}})
+
+    assert await state.snapshot("t1", "c1") == {
+        "conversationId": "c1",
+        "v": 2,
+        "full": {"conversation": {"status": "OPEN"}, "updates": {"assignedToId": "u1"}},
+    }
+    assert await state.snapshot("t1", "c2") == {"conversationId": "c2", "reset": True}
+
+
+@pytest.mark.asyncio
+async def test_other_events_and_redis_outages_send_full_frames(monkeypatch):
+    payload = {"conversationId": "c1", "conversation": {"status": "OPEN"}}
+    assert msgpack.unpackb(await compact.encode_for("message:new", payload, "t1")) == payload
+
+    monkeypatch.setattr(compact, "conversation_state", ConversationState(redis_url=None))
+    frame = await compact.encode_for("conversation:updated", payload, "t1")
+    assert msgpack.unpackb(frame) == payload
+    assert encode_event(payload) == frame
@@ -0,0 +1,118 @@
+"""Tests for app/realtime/emitter.py — multi-room emits and update coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+
+from app.realtime import emitter
+
+
+class _RecordingSio:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict, object]] = []
+
+    async def emit(self, event, data, room=None, **kwargs) -> None:
+        self.calls.append((event, data, room))
+
+
+@pytest.fixture
+async def sio(monkeypatch):
+    recorder = _RecordingSio()
+    monkeypatch.setattr(emitter, "_get_sio", lambda: recorder)
+    monkeypatch.setattr(emitter.settings, "REALTIME_COALESCE_MS", 50)
+    emitter._pending_updates.clear()
+    yield recorder
+    timers = [s.timer for s in emitter._pending_updates.values() if s.timer is not None]
+    for timer in timers:
+        timer.cancel()
+    await asyncio.gather(*timers, return_exceptions=True)
+    emitter._pending_updates.clear()
+
+
+@pytest.mark.asyncio
+async def test_new_message_is_one_emit_per_event(sio):
+    await emitter.emit_new_message(
+        "t1",
+        "c1",
+        {"id": "m1", "timestamp": "2024-01-01T00:00:00"},
+        {"id": "c1"},
+        hotel_unit="Campos",
+    )
+
+    events = [call[0] for call in sio.calls]
+    assert events == ["message:new", "conversation:updated"]
+    assert sio.calls[0][2] == ["conversation:c1", "tenant:t1:admins", "tenant:t1:unit:Campos"]
+    assert sio.calls[1][2] == ["tenant:t1:admins", "tenant:t1:unit:Campos"]
+
+
+@pytest.mark.asyncio
+async def test_conversation_updates_are_coalesced_within_window(sio):
+    await emitter.emit_conversation_updated("t1", "c1", {"status": "OPEN"})
+    await emitter.emit_conversation_updated("t1", "c1", {"status": "IN_PROGRESS"})
+    await emitter.emit_conversation_updated("t1", "c1", {"assignedToId": "u1"})
+    assert len(sio.calls) == 1  # leading update goes out immediately
+
+    await asyncio.sleep(0.08)
+    assert len(sio.calls) == 2
+    trailing = sio.calls[1][1]
+    assert trailing["updates"] == {"status": "IN_PROGRESS", "assignedToId": "u1"}
+
+    await asyncio.sleep(0.08)
+    assert "c1" not in emitter._pending_updates
+
+
+@pytest.mark.asyncio
+async def test_flush_sends_pending_update(sio):
+    await emitter.emit_conversation_updated("t1", "c2", {"status": "OPEN"})
+    await emitter.emit_conversation_updated("t1", "c2", {"status": "CLOSED"})
+    await emitter.flush_coalesced_updates()
+
+    assert [call[1]["updates"] for call in sio.calls] == [{"status": "OPEN"}, {"status": "CLOSED"}]
+
+
+def test_resolve_rooms_prunes_tenant_sub_rooms():
+    rooms = emitter.resolve_rooms(
+        [
+            "tenant:t1",
+            "tenant:t1:unit:Campos",
+            None,
+            "tenant:t1",
+            "conversation:c1",
+            "tenant:t2:admins",
+        ]
+
+    )
+    assert rooms == ["tenant:t1", "conversation:c1", "tenant:t2:admins"]
+
+
+def test_socket_in_overlapping_rooms_is_targeted_once():
+    import socketio
+
+    server = socketio.AsyncServer(async_mode="asgi")
+    manager = server.manager
+    manager.basic_enter_room("sid-admin", "/", "tenant:t1:admins", eio_sid="e1")
+    manager.basic_enter_room("sid-admin", "/", "conversation:c1", eio_sid="e1")
+    manager.basic_enter_room("sid-agent", "/", "conversation:c1", eio_sid="e2")
+
+    rooms = emitter.resolve_rooms(["conversation:c1", "tenant:t1:admins"])
+    participants = [sid for sid, _ in manager.get_participants("/", rooms)]
+    assert sorted(participants) == ["sid-admin", "sid-agent"]
+
+
+@pytest.mark.asyncio
+async def test_shadow_rooms_are_emitted_to_only_when_compact_is_enabled(sio, monkeypatch):
+    monkeypatch.setattr(emitter.compact, "msgpack", SimpleNamespace(packb=lambda *a, **k: b"frame"))
+    await emitter.emit_to_rooms("contact:updated", {"id": "x"}, ["tenant:t1"])
+    assert [call[2] for call in sio.calls] == ["tenant:t1"]
+
+    monkeypatch.setattr(emitter.settings, "REALTIME_COMPACT_ENABLED", True)
+    await emitter.emit_to_rooms("contact:updated", {"id": "x"}, ["tenant:t1"])
+    assert [call[2] for call in sio.calls][1:] == ["tenant:t1", "tenant:t1~c"]
+    assert sio.calls[-1][1] == b"frame"
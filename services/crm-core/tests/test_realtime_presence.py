@@ -0,0 +1,227 @@
+"""Tests for the server-side typing throttle and Redis-backed presence."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+
+from app.realtime.presence import PresenceService, TypingThrottle, _entry_from_hash
+
+
+def _recorder() -> tuple[list[bool], object]:
+    sent: list[bool] = []
+
+    async def send(state: bool) -> None:
+        sent.append(state)
+
+    return sent, send
+
+
+@pytest.mark.asyncio
+async def test_keystrokes_collapse_to_one_emit_per_window():
+    throttle = TypingThrottle(interval_ms=50)
+    sent, send = _recorder()
+
+    for _ in range(20):
+        await throttle.submit("c1", "u1", True, send)
+    assert sent == [True]
+
+    await asyncio.sleep(0.08)
+    assert sent == [True]  # same state, nothing to send on the trailing edge
+
+
+@pytest.mark.asyncio
+async def test_stop_inside_the_window_is_sent_on_the_trailing_edge():
+    throttle = TypingThrottle(interval_ms=50)
+    sent, send = _recorder()
+
+    await throttle.submit("c1", "u1", True, send)
+    await throttle.submit("c1", "u1", False, send)
+    assert sent == [True]
+
+    await asyncio.sleep(0.08)
+    assert sent == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_users_and_conversations_are_throttled_independently():
+    throttle = TypingThrottle(interval_ms=50)
+    sent, send = _recorder()
+
+    await throttle.submit("c1", "u1", True, send)
+    await throttle.submit("c1", "u2", True, send)
+    await throttle.submit("c2", "u1", True, send)
+    assert sent == [True, True, True]
+    assert sorted(throttle.forget_user("u1")) == ["c1", "c2"]
+
+
+@pytest.mark.asyncio
+async def test_presence_is_empty_without_redis():
+    service = PresenceService(redis_url=None)
+    assert await service.list_present("t1") == []
+    assert await service.connect("sid", {"tenant_id": "t1", "user_id": "u1"}) is None
+
+
+def test_entry_decodes_redis_hash():
+    entry = _entry_from_hash(
+        "u1",
+        {
+            b"name": b"Ana",
+            b"role": b"ATTENDANT",
+            b"hotel_unit": b"",
+            b"status": b"away",
+            b"last_seen": b"12.5",
+        },
+    )
+    assert entry.hotel_unit is None
+    assert entry.to_payload() == {
+        "userId": "u1",
+        "name": "Ana",
+        "role": "ATTENDANT",
+        "hotelUnit": None,
+        "status": "away",
+        "lastSeen": 12.5,
+    }
+
+
+class _FakeRedis:
+    """The ZSET / HASH subset PresenceService uses, with pipelines."""
+
+    def __init__(self) -> None:
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = False) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    async def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+
+    async def zrange(self, key, start, stop):
+        zset = self.zsets.get(key, {})
+        return [m.encode() for m in sorted(zset, key=zset.get)]
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def hget(self, key, field):
+        value = self.hashes.get(key, {}).get(field)
+        return value.encode() if value is not None else None
+
+    async def hgetall(self, key):
+        return {k.encode(): v.encode() for k, v in self.hashes.get(key, {}).items()}
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        data = self.hashes.setdefault(key, {})
+        if field is not None:
+            data[field] = value
+        data.update(mapping or {})
+
+    async def hsetnx(self, key, field, value):
+        self.hashes.setdefault(key, {}).setdefault(field, value)
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.zsets.pop(key, None)
+            self.hashes.pop(key, None)
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append(getattr(self._redis, name)(*args, **kwargs))
+
+        return queue
+
+    async def execute(self):
+        self._redis.round_trips += 1
+        calls, self._calls = self._calls, []
+
+        return [await call for call in calls]
+
+
+_USER = {"tenant_id": "t1", "user_id": "u1", "name": "Ana", "role": "ATTENDANT"}
+
+
+def _service(ttl: int = 90) -> PresenceService:
+    service = PresenceService(redis_url="redis://fake", ttl_seconds=ttl)
+    service._redis = _FakeRedis()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_one_idle_tab_does_not_mark_the_user_away():
+    service = _service()
+    assert (await service.connect("tab1", _USER)).status == "online"
+    assert await service.connect("tab2", _USER) is None
+
+    assert await service.set_status("tab1", _USER, "away") is None
+    assert (await service.set_status("tab2", _USER, "away")).status == "away"
+    assert (await service.set_status("tab1", _USER, "online")).status == "online"
+
+    # Closing the only active tab leaves the user away, then offline
+    assert (await service.disconnect("tab1", _USER)).status == "away"
+    assert (await service.disconnect("tab2", _USER)).status == "offline"
+
+
+@pytest.mark.asyncio
+async def test_server_heartbeat_keeps_silent_sockets_present(monkeypatch):
+    service = _service(ttl=90)
+    clock = [1000.0]
+    monkeypatch.setattr("app.realtime.presence.time.time", lambda: clock[0])
+    await service.connect("tab1", _USER)
+
+    # No client ping for several TTLs: the process refreshes its own sockets
+    for _ in range(5):
+        clock[0] += service.heartbeat_interval
+        assert await service.refresh_local() == []
+    assert [e.user_id for e in await service.list_present("t1")] == ["u1"]
+
+    await service.disconnect("tab1", _USER)
+    clock[0] += 200
+    assert await service.refresh_local() == []
+    assert await service.list_present("t1") == []
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_two_round_trips_for_every_local_socket():
+    service = _service()
+    users = [{**_USER, "user_id": f"u{i}", "name": f"User {i}"} for i in range(50)]
+    for i, user in enumerate(users):
+        await service.connect(f"tab{i}a", user)
+        await service.connect(f"tab{i}b", user)
+    redis = service._redis
+
+    # Users whose entries expired (e.g. during a Redis outage) come back
+    for user in users[:3]:
+        await redis.delete(service._user_key("t1", user["user_id"]))
+    redis.round_trips = 0
+    changed = await service.refresh_local()
+
+    assert redis.round_trips == 2
+    assert sorted(e.user_id for _, e in changed) == ["u0", "u1", "u2"]
+    assert {tenant for tenant, _ in changed} == {"t1"}
+    assert len(await service.list_present("t1")) == 50
@@ -0,0 +1,135 @@
+"""Tests for the per-tenant realtime event log and missed-event replay."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+
+from app.realtime.event_log import RealtimeEventLog, _parse_id
+
+
+class _FakeStreams:
+    """Just enough of redis.asyncio for XADD / XRANGE / XREVRANGE pipelines."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self._seq = 0
+        self._queued: list = []
+        self.round_trips = 0
+        self.latency = 0.0
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self._seq += 1
+        entries = self.streams.setdefault(key, [])
+        entries.append((f"1000-{self._seq}", dict(fields)))
+        if maxlen is not None:
+            del entries[:-maxlen]
+        self._queued.append(f"1000-{self._seq}".encode())
+
+    def _range(self, key, low, high, count, reverse=False):
+        lo = (0, 0) if low == "-" else _parse_id(low)
+        hi = (2**63, 0) if high == "+" else _parse_id(high)
+        entries = self.streams.get(key, [])
+        selected = [e for e in entries if lo <= _parse_id(e[0]) <= hi]
+        return (selected[::-1] if reverse else selected)[:count]
+
+    def pipeline(self, transaction=False):
+        self._queued = []
+        return self
+
+    def xrange(self, key, start, end, count=None):
+        self._queued.append(self._range(key, start, end, count))
+
+    def xrevrange(self, key, start, end, count=None):
+        self._queued.append(self._range(key, end, start, count, reverse=True))
+
+    async def execute(self):
+        self.round_trips += 1
+        await asyncio.sleep(self.latency)
+        return self._queued
+
+
+@pytest.fixture
+def log(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "REALTIME_STREAM_MAXLEN", 5)
+    monkeypatch.setattr(settings, "REALTIME_REPLAY_MAX_EVENTS", 3)
+    monkeypatch.setattr(settings, "REALTIME_STREAM_APPEND_WAIT_MS", 50.0)
+
+    event_log = RealtimeEventLog(redis_url="redis://fake")
+    event_log._redis = _FakeStreams()
+    return event_log
+
+
+@pytest.mark.asyncio
+async def test_replay_returns_only_missed_events_for_the_sockets_rooms(log):
+    first = await log.append("t1", "message:new", {"n": 1}, ["conversation:c1", "tenant:t1:admins"])
+    await log.append("t1", "message:new", {"n": 2}, ["conversation:c1", "tenant:t1:admins"])
+    await log.append("t1", "message:new", {"n": 3}, ["conversation:c2", "tenant:t1:unit:Penedo"])
+
+    result = await log.replay("t1", first, {"tenant:t1", "conversation:c1"})
+
+    assert not result.reset
+    assert [e["payload"]["n"] for e in result.events] == [2]
+    assert result.events[0]["payload"]["eventId"] == result.events[0]["id"]
+    assert result.last_event_id == "1000-3"
+
+
+@pytest.mark.asyncio
+async def test_ephemeral_events_are_not_logged(log):
+    assert await log.append("t1", "conversation:typing", {}, ["conversation:c1"]) is None
+    assert log._redis.streams == {}
+
+
+@pytest.mark.asyncio
+async def test_gap_older_than_the_stream_requests_a_reset(log):
+    first = await log.append("t1", "message:new", {"n": 0}, ["tenant:t1"])
+    for n in range(1, 6):
+        await log.append("t1", "message:new", {"n": n}, ["tenant:t1"])
+
+    result = await log.replay("t1", first, {"tenant:t1"})  # trimmed by MAXLEN=5
+    assert result.reset and result.events == []
+
+
+@pytest.mark.asyncio
+async def test_too_many_missed_events_requests_a_reset(log):
+    first = await log.append("t1", "message:new", {"n": 0}, ["tenant:t1"])
+    for n in range(1, 5):
+        await log.append("t1", "message:new", {"n": n}, ["tenant:t1"])
+
+    assert (await log.replay("t1", first, {"tenant:t1"})).reset
+
+
+@pytest.mark.asyncio
+async def test_unknown_or_malformed_ids_request_a_reset(log):
+    await log.append("t1", "message:new", {"n": 0}, ["tenant:t1"])
+
+    assert (await log.replay("t1", "9999-1", {"tenant:t1"})).reset
+    assert (await log.replay("t1", "not-an-id", {"tenant:t1"})).reset
+    assert (await log.replay("t2", "1000-1", {"tenant:t2"})).reset
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_share_one_round_trip(log):
+    ids = await asyncio.gather(
+        *(log.append("t1", "message:new", {"n": n}, ["tenant:t1"]) for n in range(10))
+    )
+
+    assert ids == [f"1000-{n}" for n in range(1, 11)]
+    assert log._redis.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_redis_emits_without_an_id_and_still_appends(log):
+    log._redis.latency = 0.2
+
+    assert await log.append("t1", "message:new", {"n": 1}, ["tenant:t1"]) is None
+
+    await log.flush()
+    assert [fields["p"] for _, fields in log._redis.streams["realtime:stream:t1"]] == ['{"n": 1}']
@@ -0,0 +1,35 @@
+"""Tests for socket connect admission control."""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-unit-tests-must-be-32-chars-long")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+import pytest
+
+from app.realtime.admission import AdmissionLimiter, AdmissionRejectedError
+
+
+def test_burst_is_admitted_immediately_then_spread():
+    limiter = AdmissionLimiter(rate=10, burst=5, max_wait=10, jitter=0)
+    assert [limiter.reserve() for _ in range(5)] == [0.0] * 5
+
+    waits = [limiter.reserve() for _ in range(3)]
+    assert waits == pytest.approx([0.1, 0.2, 0.3], abs=0.01)
+
+
+def test_connect_beyond_max_wait_is_rejected_without_consuming_a_slot():
+    limiter = AdmissionLimiter(rate=10, burst=1, max_wait=0.15, jitter=0)
+    limiter.reserve()
+    limiter.reserve()  # waits 0.1s
+    with pytest.raises(AdmissionRejectedError):
+        limiter.reserve()  # would wait 0.2s
+    with pytest.raises(AdmissionRejectedError):
+        limiter.reserve()
+
+
+def test_zero_rate_disables_admission_control():
+    limiter = AdmissionLimiter(rate=0, burst=0, max_wait=0)
+    assert all(limiter.reserve() == 0.0 for _ in range(1000))